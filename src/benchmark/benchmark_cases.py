@@ -0,0 +1,281 @@
+"""Hot paths of the bound evaluation and of the optimizers."""
+
+from typing import Callable, List
+
+import numpy as np
+
+from h_mitigator.fat_cross_perform import FatCrossPerform
+from h_mitigator.optimize_mitigator import OptimizeMitigator
+from h_mitigator.single_server_mit_perform import SingleServerMitPerform
+from msob_and_fp.optimize_fp_bound import OptimizeFPBound
+from msob_and_fp.optimize_server_bound import OptimizeServerBound
+from msob_and_fp.overlapping_tandem_perform import OverlappingTandemPerform
+from msob_and_fp.square_perform import SquarePerform
+from nc_arrivals.markov_modulated import MMOOFluid
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.performance_bounds import backlog_prob, delay_prob, output
+from nc_operations.single_server_bandwidth import SingleServerBandwidth
+from nc_operations.single_server_perform import SingleServerPerform
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.initial_simplex import InitialSimplex
+from optimization.nelder_mead_parameters import NelderMeadParameters
+from optimization.opt_method import OptMethod
+from optimization.optimize import Optimize
+from optimization.sim_anneal_param import SimAnnealParams
+from utils.perform_parameter import PerformParameter
+
+DELAY_PROB6 = PerformParameter(perform_metric=PerformEnum.DELAY_PROB, value=6)
+DELAY3 = PerformParameter(perform_metric=PerformEnum.DELAY, value=1e-3)
+
+SINGLE_SERVER = SingleServerPerform(arr_list=[DM1(lamb=1.0)],
+                                    server=ConstantRateServer(rate=2.0),
+                                    perform_param=DELAY_PROB6)
+
+SINGLE_SERVER_MIT = SingleServerMitPerform(
+    arr_list=[DM1(lamb=1.0)],
+    server=ConstantRateServer(rate=2.0),
+    perform_param=DELAY_PROB6)
+
+SINGLE_SERVER_BANDWIDTH = SingleServerBandwidth(
+    arr_list=[MMOOFluid(mu=0.2, lamb=0.5, peak_rate=2.6)],
+    s_e2e=ConstantRateServer(rate=2.0),
+    perform_param=DELAY_PROB6)
+
+FAT_CROSS = FatCrossPerform(
+    arr_list=[DM1(lamb=0.4), DM1(lamb=3.5)],
+    ser_list=[ConstantRateServer(rate=4.5),
+              ConstantRateServer(rate=0.4)],
+    perform_param=DELAY_PROB6)
+
+SQUARE = SquarePerform(
+    arr_list=[DM1(lamb=2.3),
+              DM1(lamb=4.5),
+              DM1(lamb=1.7),
+              DM1(lamb=4.5)],
+    ser_list=[
+        ConstantRateServer(rate=9.8),
+        ConstantRateServer(rate=8.8),
+        ConstantRateServer(rate=4.0),
+        ConstantRateServer(rate=3.6)
+    ],
+    perform_param=DELAY3)
+
+OVERLAPPING_TANDEM = OverlappingTandemPerform(
+    arr_list=[DM1(lamb=2.3), DM1(lamb=4.5),
+              DM1(lamb=1.7)],
+    ser_list=[
+        ConstantRateServer(rate=1.2),
+        ConstantRateServer(rate=6.2),
+        ConstantRateServer(rate=7.3)
+    ],
+    perform_param=DELAY3)
+
+
+class BenchmarkCase(object):
+    """One timed call without arguments."""
+    def __init__(self, name: str, fun: Callable, group: str) -> None:
+        """
+        :param name:  unique name, key of the JSON baseline
+        :param fun:   function that is timed
+        :param group: "evaluation" for a single bound evaluation,
+                      "optimization" for an optimized bound
+        """
+        self.name = name
+        self.fun = fun
+        self.group = group
+
+
+def evaluation_cases() -> List[BenchmarkCase]:
+    """
+    :return: single evaluations of the performance bounds and of every
+             bound of the settings
+    """
+    arr = DM1(lamb=1.0)
+    ser = ConstantRateServer(rate=2.0)
+
+    cases = [
+        BenchmarkCase(name="backlog_prob",
+                      fun=lambda: backlog_prob(
+                          arr=arr, ser=ser, theta=0.5, backlog_value=5.0),
+                      group="evaluation"),
+        BenchmarkCase(name="delay_prob",
+                      fun=lambda: delay_prob(
+                          arr=arr, ser=ser, theta=0.5, delay_value=5),
+                      group="evaluation"),
+        BenchmarkCase(name="output",
+                      fun=lambda: output(
+                          arr=arr, ser=ser, theta=0.5, delta_time=5),
+                      group="evaluation")
+    ]
+
+    # parameters close to the optima
+    for setting, param_list in [(SINGLE_SERVER, [0.7]),
+                                (SINGLE_SERVER_MIT, [0.7]),
+                                (SINGLE_SERVER_BANDWIDTH, [0.6]),
+                                (FAT_CROSS, [0.25]), (SQUARE, [1.2, 1.4]),
+                                (OVERLAPPING_TANDEM, [1.0, 2.7])]:
+        cases.append(
+            BenchmarkCase(name=f"{setting.to_name()}.standard_bound",
+                          fun=lambda setting=setting, param_list=param_list:
+                          setting.standard_bound(param_list=param_list),
+                          group="evaluation"))
+
+    for setting, param_l_list in [(SINGLE_SERVER_MIT, [0.7, 1.0]),
+                                  (FAT_CROSS, [0.24, 5.0])]:
+        cases.append(
+            BenchmarkCase(name=f"{setting.to_name()}.h_mit_bound",
+                          fun=lambda setting=setting, param_l_list=
+                          param_l_list: setting.h_mit_bound(
+                              param_l_list=param_l_list),
+                          group="evaluation"))
+
+    for setting, param_list in [(SQUARE, [1.2]), (OVERLAPPING_TANDEM, [1.6])]:
+        cases.append(
+            BenchmarkCase(name=f"{setting.to_name()}.server_bound",
+                          fun=lambda setting=setting, param_list=param_list:
+                          setting.server_bound(param_list=param_list),
+                          group="evaluation"))
+
+    for setting, param_list in [(SQUARE, [1.1, 1.4]),
+                                (OVERLAPPING_TANDEM, [1.6])]:
+        cases.append(
+            BenchmarkCase(name=f"{setting.to_name()}.fp_bound",
+                          fun=lambda setting=setting, param_list=param_list:
+                          setting.fp_bound(param_list=param_list),
+                          group="evaluation"))
+
+    return cases
+
+
+def optimize_single_server(opt_method: OptMethod) -> float:
+    """
+    :param opt_method: optimization method
+    :return:           optimized standard_bound of the single server
+    """
+    optimizer = Optimize(setting=SINGLE_SERVER, number_param=1)
+
+    if opt_method == OptMethod.GRID_SEARCH:
+        return optimizer.grid_search(bound_list=[(0.1, 5.0)], delta=0.1)
+
+    elif opt_method == OptMethod.ADAPTIVE_GRID:
+        return optimizer.adaptive_grid_search(bound_list=[(0.1, 5.0)],
+                                              delta=0.1)
+
+    elif opt_method == OptMethod.PATTERN_SEARCH:
+        return optimizer.pattern_search(start_list=[0.5],
+                                        delta=3.0,
+                                        delta_min=0.01)
+
+    elif opt_method == OptMethod.MULTI_START:
+        return optimizer.multi_start_search(bound_list=[(0.1, 5.0)],
+                                            rng=np.random.default_rng(0))
+
+    elif opt_method == OptMethod.NELDER_MEAD:
+        return optimizer.nelder_mead(simplex=InitialSimplex(
+            parameters_to_optimize=1).uniform_dist(
+                max_theta=0.9, rng=np.random.default_rng(0)))
+
+    elif opt_method == OptMethod.BASIN_HOPPING:
+        return optimizer.basin_hopping(start_list=[0.5])
+
+    elif opt_method == OptMethod.SIMULATED_ANNEALING:
+        return optimizer.sim_annealing(start_list=[0.5],
+                                       sim_anneal_params=SimAnnealParams())
+
+    elif opt_method == OptMethod.DIFFERENTIAL_EVOLUTION:
+        return optimizer.diff_evolution(bound_list=[(0.1, 5.0)])
+
+    elif opt_method == OptMethod.BFGS:
+        return optimizer.bfgs(start_list=[0.5])
+
+    elif opt_method == OptMethod.BOUNDED_THETA:
+        return optimizer.bounded_theta_search()
+
+    elif opt_method == OptMethod.GS_OLD:
+        return optimizer.grid_search_old(bound_list=[(0.1, 5.0)], delta=0.1)
+
+    elif opt_method == OptMethod.NM_OLD:
+        return optimizer.nelder_mead_old(
+            simplex=InitialSimplex(parameters_to_optimize=1).uniform_dist(
+                max_theta=0.9, rng=np.random.default_rng(0)),
+            nelder_mead_param=NelderMeadParameters())
+
+    else:
+        raise NameError(f"Optimization parameter {opt_method} is infeasible")
+
+
+def optimization_cases() -> List[BenchmarkCase]:
+    """
+    :return: every OptMethod on the single server as well as the grid
+             searches of the network settings
+    """
+    cases = [
+        BenchmarkCase(name=f"{SINGLE_SERVER.to_name()}.{opt_method.name}",
+                      fun=lambda opt_method=opt_method: optimize_single_server(
+                          opt_method=opt_method),
+                      group="optimization") for opt_method in OptMethod
+    ]
+
+    cases += [
+        BenchmarkCase(name=f"{FAT_CROSS.to_name()}.GRID_SEARCH",
+                      fun=lambda: Optimize(setting=FAT_CROSS, number_param=1).
+                      grid_search(bound_list=[(0.1, 5.0)], delta=0.1),
+                      group="optimization"),
+        BenchmarkCase(
+            name=f"{FAT_CROSS.to_name()}.h_mit.GRID_SEARCH",
+            fun=lambda: OptimizeMitigator(setting_h_mit=FAT_CROSS,
+                                          number_param=2).grid_search(
+                                              bound_list=[(0.1, 5.0),
+                                                          (0.9, 6.0)],
+                                              delta=0.1),
+            group="optimization"),
+        BenchmarkCase(
+            name=f"{FAT_CROSS.to_name()}.h_mit.ADAPTIVE_GRID",
+            fun=lambda: OptimizeMitigator(setting_h_mit=FAT_CROSS,
+                                          number_param=2).adaptive_grid_search(
+                                              bound_list=[(0.1, 5.0),
+                                                          (0.9, 6.0)],
+                                              delta=0.1),
+            group="optimization"),
+        BenchmarkCase(
+            name=f"{FAT_CROSS.to_name()}.h_mit.MULTI_START",
+            fun=lambda: OptimizeMitigator(setting_h_mit=FAT_CROSS,
+                                          number_param=2).multi_start_search(
+                                              bound_list=[(0.1, 5.0),
+                                                          (0.9, 6.0)],
+                                              rng=np.random.default_rng(0)),
+            group="optimization"),
+        BenchmarkCase(name=f"{SQUARE.to_name()}.GRID_SEARCH",
+                      fun=lambda: Optimize(setting=SQUARE, number_param=2).
+                      grid_search(bound_list=[(0.1, 10.0), (1.1, 10.0)],
+                                  delta=0.1,
+                                  vectorized=True),
+                      group="optimization"),
+        BenchmarkCase(
+            name=f"{SQUARE.to_name()}.server_bound.GRID_SEARCH",
+            fun=lambda: OptimizeServerBound(setting_msob_fp=SQUARE,
+                                            number_param=1).grid_search(
+                                                bound_list=[(0.1, 10.0)],
+                                                delta=0.1),
+            group="optimization"),
+        BenchmarkCase(name=f"{SQUARE.to_name()}.fp_bound.GRID_SEARCH",
+                      fun=lambda: OptimizeFPBound(setting_msob_fp=SQUARE,
+                                                  number_param=2).
+                      grid_search(bound_list=[(0.1, 10.0), (1.1, 10.0)],
+                                  delta=0.1),
+                      group="optimization"),
+        BenchmarkCase(name=f"{SQUARE.to_name()}.fp_bound.ADAPTIVE_GRID",
+                      fun=lambda: OptimizeFPBound(setting_msob_fp=SQUARE,
+                                                  number_param=2).
+                      adaptive_grid_search(bound_list=[(0.1, 10.0),
+                                                       (1.1, 10.0)],
+                                           delta=0.1),
+                      group="optimization")
+    ]
+
+    return cases
+
+
+def all_cases() -> List[BenchmarkCase]:
+    return evaluation_cases() + optimization_cases()
@@ -0,0 +1,187 @@
+"""Runs the benchmark cases and compares them with a JSON baseline.
+
+    PYTHONPATH=src python src/benchmark/run_benchmark.py --save baseline.json
+    PYTHONPATH=src python src/benchmark/run_benchmark.py \\
+        --baseline baseline.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+import warnings
+from timeit import default_timer as timer
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmark.benchmark_cases import BenchmarkCase, all_cases
+
+# minimal duration of one timing round in seconds
+MIN_ROUND_TIME = 0.2
+
+# number of timing rounds, the fastest one is reported
+ROUNDS = 3
+
+# relative slowdown (or growth of the peak memory) that is a regression
+TOLERANCE = 0.25
+
+# absolute growth of the peak memory in bytes that is always ignored
+MEMORY_SLACK = 64 * 1024
+
+
+def measure(case: BenchmarkCase,
+            min_round_time=MIN_ROUND_TIME,
+            rounds=ROUNDS) -> Dict[str, float]:
+    """
+    :param case:           benchmark case
+    :param min_round_time: the call is repeated until a round takes at least
+                           this long
+    :param rounds:         number of timing rounds
+    :return:               seconds per call, calls per second and peak
+                           memory of a single call in bytes
+    """
+    # numbers of calls per round: 1, 2, 4, ... until min_round_time is hit
+    number = 1
+    while True:
+        start = timer()
+        for _ in range(number):
+            case.fun()
+        elapsed = timer() - start
+
+        if elapsed >= min_round_time:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(rounds - 1):
+        start = timer()
+        for _ in range(number):
+            case.fun()
+        best = min(best, (timer() - start) / number)
+
+    # tracemalloc slows the call down, i.e., it is not timed
+    tracemalloc.start()
+    case.fun()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "seconds_per_call": best,
+        "calls_per_second": 1 / best,
+        "peak_memory_bytes": peak_memory
+    }
+
+
+def run_benchmarks(cases: List[BenchmarkCase],
+                   min_round_time=MIN_ROUND_TIME,
+                   rounds=ROUNDS) -> dict:
+    """
+    :param cases:          benchmark cases
+    :param min_round_time: see measure
+    :param rounds:         see measure
+    :return:               results including the environment, can be stored
+                           as a JSON baseline
+    """
+    results = {}
+
+    with np.errstate(all="warn"), warnings.catch_warnings():
+        # e.g., deprecated methods and overflows must not flood the report
+        warnings.simplefilter("ignore")
+
+        for case in cases:
+            results[case.name] = dict(measure(case=case,
+                                              min_round_time=min_round_time,
+                                              rounds=rounds),
+                                      group=case.group)
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cases": results
+    }
+
+
+def find_regressions(results: dict,
+                     baseline: dict,
+                     tolerance=TOLERANCE) -> List[str]:
+    """
+    :param results:   output of run_benchmarks
+    :param baseline:  output of an earlier run_benchmarks
+    :param tolerance: relative slowdown / memory growth that is accepted
+    :return:          one message per regression
+    """
+    regressions = []
+
+    for name, result in results["cases"].items():
+        if name not in baseline["cases"]:
+            continue
+
+        reference = baseline["cases"][name]
+
+        if result["seconds_per_call"] > (
+                1 + tolerance) * reference["seconds_per_call"]:
+            regressions.append(
+                f"{name}: {result['seconds_per_call']:.3g}s per call, "
+                f"baseline {reference['seconds_per_call']:.3g}s")
+
+        if result["peak_memory_bytes"] > (
+                1 + tolerance
+        ) * reference["peak_memory_bytes"] + MEMORY_SLACK:
+            regressions.append(
+                f"{name}: peak memory {result['peak_memory_bytes']} bytes, "
+                f"baseline {reference['peak_memory_bytes']} bytes")
+
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    print(f"{'case':<55} {'calls/s':>12} {'s/call':>10} {'peak KiB':>9}")
+
+    for name, result in results["cases"].items():
+        print(f"{name:<55} {result['calls_per_second']:>12.1f} "
+              f"{result['seconds_per_call']:>10.2e} "
+              f"{result['peak_memory_bytes'] / 1024:>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", help="store the results as JSON baseline")
+    parser.add_argument("--baseline",
+                        help="compare the results with this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--filter",
+                        default="",
+                        help="only run cases whose name contains this")
+    parser.add_argument("--min-round-time",
+                        type=float,
+                        default=MIN_ROUND_TIME)
+    args = parser.parse_args(argv)
+
+    cases = [case for case in all_cases() if args.filter in case.name]
+    results = run_benchmarks(cases=cases, min_round_time=args.min_round_time)
+    print_report(results=results)
+
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = find_regressions(results=results,
+                                       baseline=baseline,
+                                       tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""On-disk checkpoint of a Monte Carlo parameter sweep."""
+
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+# seconds between two checkpoints
+CHECKPOINT_INTERVAL = 60.0
+
+
+class SweepCheckpoint(object):
+    """
+    Stores the sampled parameter array, the partial result array, the rows
+    that are already done, the state of the random number generator after
+    sampling and the fingerprint of the study, see
+    ParameterSweep.study_fingerprint.
+    """
+    def __init__(self, path: str, interval=CHECKPOINT_INTERVAL) -> None:
+        """
+        :param path:     file name, e.g., "study.npz"
+        :param interval: minimal number of seconds between two saves
+        """
+        self.path = path
+        self.interval = interval
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def save(self, param_array: np.ndarray, res_array: np.ndarray,
+             done: np.ndarray, rng_state: tuple, fingerprint: str) -> None:
+        """
+        Writes the checkpoint atomically, i.e., a crash while saving keeps
+        the previous checkpoint.
+
+        :param param_array: Monte Carlo parameter array
+        :param res_array:   (partial) result array
+        :param done:        boolean mask of the finished rows
+        :param rng_state:   np.random.get_state()
+        :param fingerprint: identifies the study that is checkpointed
+        """
+        tmp_path = self.path + ".tmp"
+
+        with open(tmp_path, "wb") as tmp_file:
+            np.savez(tmp_file,
+                     param_array=param_array,
+                     res_array=res_array,
+                     done=done,
+                     rng_key=rng_state[1],
+                     rng_pos=rng_state[2],
+                     rng_has_gauss=rng_state[3],
+                     rng_cached_gaussian=rng_state[4],
+                     fingerprint=np.array(fingerprint))
+
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, tuple]:
+        """
+        :return: param_array, res_array, done and rng_state
+        """
+        with np.load(self.path) as checkpoint:
+            rng_state = ("MT19937", checkpoint["rng_key"],
+                         int(checkpoint["rng_pos"]),
+                         int(checkpoint["rng_has_gauss"]),
+                         float(checkpoint["rng_cached_gaussian"]))
+
+            return (checkpoint["param_array"], checkpoint["res_array"],
+                    checkpoint["done"], rng_state)
+
+    def load_fingerprint(self) -> Optional[str]:
+        """
+        :return: fingerprint of the checkpointed study, None if there is none
+        """
+        with np.load(self.path) as checkpoint:
+            if "fingerprint" not in checkpoint:
+                return None
+
+            return str(checkpoint["fingerprint"])
@@ -1,15 +1,68 @@
 """Takes the Monte Carlo Enum and returns the random vector"""
 
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
 import numpy as np
 
 from bound_evaluation.mc_enum import MCEnum
 from bound_evaluation.monte_carlo_dist import MonteCarloDist
 from nc_arrivals.arrival_enum import ArrivalEnum
 
+# number of rows that are drawn from one spawned generator
+SAMPLE_BLOCK_SIZE = 1024
+
+# number of consecutive blocks without any accepted row before giving up
+MAX_REJECTED_BLOCKS = 100
+
+# independent streams that are spawned from one seed
+SAMPLE_STREAM = 0
+EVALUATION_STREAM = 1
+
+
+def spawn_seed_seq(seed: int, stream: int,
+                   index: int) -> np.random.SeedSequence:
+    """
+    Equals SeedSequence(seed).spawn(...)[stream].spawn(...)[index], but can be
+    created independently in every worker process.
+
+    :param seed:   seed of the study
+    :param stream: stream, e.g., SAMPLE_STREAM
+    :param index:  block or row index within the stream
+    :return:       seed sequence
+    """
+    return np.random.SeedSequence(entropy=seed, spawn_key=(stream, index))
+
+
+@contextmanager
+def seeded_global_rng(seed_seq: np.random.SeedSequence) -> Iterator[None]:
+    """
+    Seeds the global np.random state within the block, e.g., for optimizers
+    that draw from it, and restores the caller's state afterwards.
+
+    :param seed_seq: seed sequence, see spawn_seed_seq
+    """
+    global_state = np.random.get_state()
+    np.random.seed(seed_seq.generate_state(4))
+
+    try:
+        yield
+    finally:
+        np.random.set_state(global_state)
+
+
+def mc_enum_to_dist(arrival_enum: ArrivalEnum,
+                    mc_dist: MonteCarloDist,
+                    number_flows: int,
+                    number_servers: int,
+                    total_iterations: int,
+                    rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    :param rng: random number generator, None uses the global np.random state
+    """
+    if rng is None:
+        rng = np.random
 
-def mc_enum_to_dist(arrival_enum: ArrivalEnum, mc_dist: MonteCarloDist,
-                    number_flows: int, number_servers: int,
-                    total_iterations: int) -> np.ndarray:
     size_array = [
         total_iterations,
         arrival_enum.number_parameters() * number_flows + number_servers
@@ -17,12 +70,13 @@ def mc_enum_to_dist(arrival_enum: ArrivalEnum, mc_dist: MonteCarloDist,
     ]
 
     if arrival_enum == ArrivalEnum.MMOODisc:
-        probabilities = np.random.uniform(
-            low=0.0, high=1.0, size=[total_iterations, 2 * number_flows])
+        probabilities = rng.uniform(low=0.0,
+                                    high=1.0,
+                                    size=[total_iterations, 2 * number_flows])
         if mc_dist.mc_enum == MCEnum.UNIFORM:
             return np.concatenate(
                 (probabilities,
-                 np.random.uniform(
+                 rng.uniform(
                      low=0.0,
                      high=mc_dist.param_list[0],
                      size=[total_iterations, number_flows + number_servers])),
@@ -30,7 +84,7 @@ def mc_enum_to_dist(arrival_enum: ArrivalEnum, mc_dist: MonteCarloDist,
         elif mc_dist.mc_enum == MCEnum.EXPONENTIAL:
             return np.concatenate(
                 (probabilities,
-                 np.random.exponential(
+                 rng.exponential(
                      scale=1 / mc_dist.param_list[0],
                      size=[total_iterations, number_flows + number_servers])),
                 axis=1)
@@ -38,14 +92,14 @@ def mc_enum_to_dist(arrival_enum: ArrivalEnum, mc_dist: MonteCarloDist,
         elif mc_dist.mc_enum == MCEnum.PARETO:
             return np.concatenate(
                 (probabilities,
-                 np.random.pareto(
+                 rng.pareto(
                      a=mc_dist.param_list[0],
                      size=[total_iterations, number_flows + number_servers])),
                 axis=1)
         elif mc_dist.mc_enum == MCEnum.LOG_NORMAL:
             return np.concatenate(
                 (probabilities,
-                 np.random.lognormal(
+                 rng.lognormal(
                      mean=mc_dist.param_list[0],
                      sigma=mc_dist.param_list[1],
                      size=[total_iterations, number_flows + number_servers])),
@@ -53,7 +107,7 @@ def mc_enum_to_dist(arrival_enum: ArrivalEnum, mc_dist: MonteCarloDist,
         elif mc_dist.mc_enum == MCEnum.CHI_SQUARED:
             return np.concatenate(
                 (probabilities,
-                 np.random.chisquare(
+                 rng.chisquare(
                      df=mc_dist.param_list[0],
                      size=[total_iterations, number_flows + number_servers])),
                 axis=1)
@@ -63,22 +117,121 @@ def mc_enum_to_dist(arrival_enum: ArrivalEnum, mc_dist: MonteCarloDist,
 
     else:
         if mc_dist.mc_enum == MCEnum.UNIFORM:
-            return np.random.uniform(low=0.0,
-                                     high=mc_dist.param_list[0],
-                                     size=size_array)
+            return rng.uniform(low=0.0,
+                               high=mc_dist.param_list[0],
+                               size=size_array)
         elif mc_dist.mc_enum == MCEnum.EXPONENTIAL:
-            return np.random.exponential(scale=1 / mc_dist.param_list[0],
-                                         size=size_array)
+            return rng.exponential(scale=1 / mc_dist.param_list[0],
+                                   size=size_array)
         # watch out: scale is the expectation 1 / lambda
         elif mc_dist.mc_enum == MCEnum.PARETO:
-            return np.random.pareto(a=mc_dist.param_list[0], size=size_array)
+            return rng.pareto(a=mc_dist.param_list[0], size=size_array)
         elif mc_dist.mc_enum == MCEnum.LOG_NORMAL:
-            return np.random.lognormal(mean=mc_dist.param_list[0],
-                                       sigma=mc_dist.param_list[1],
-                                       size=size_array)
+            return rng.lognormal(mean=mc_dist.param_list[0],
+                                 sigma=mc_dist.param_list[1],
+                                 size=size_array)
         elif mc_dist.mc_enum == MCEnum.CHI_SQUARED:
-            return np.random.chisquare(df=mc_dist.param_list[0],
-                                       size=size_array)
+            return rng.chisquare(df=mc_dist.param_list[0], size=size_array)
         else:
             raise NameError(
                 f"Distribution parameter {mc_dist.mc_enum} is infeasible")
+
+
+def mc_enum_to_dist_block(arrival_enum: ArrivalEnum, mc_dist: MonteCarloDist,
+                          number_flows: int, number_servers: int,
+                          total_iterations: int, seed: Optional[int],
+                          block_index: int) -> np.ndarray:
+    """
+    Draws one block of rows from its own spawned generator, i.e., every block
+    can be reproduced on its own.
+
+    :param seed:        seed of the study, None draws from the global
+                        np.random state
+    :param block_index: index of the block
+    :return:            rows block_index * SAMPLE_BLOCK_SIZE, ... of the
+                        parameter array
+    """
+    start = block_index * SAMPLE_BLOCK_SIZE
+
+    if seed is None:
+        rng = None
+    else:
+        rng = np.random.default_rng(
+            spawn_seed_seq(seed=seed, stream=SAMPLE_STREAM,
+                           index=block_index))
+
+    return mc_enum_to_dist(
+        arrival_enum=arrival_enum,
+        mc_dist=mc_dist,
+        number_flows=number_flows,
+        number_servers=number_servers,
+        total_iterations=min(SAMPLE_BLOCK_SIZE, total_iterations - start),
+        rng=rng)
+
+
+def mc_enum_to_dist_chunks(arrival_enum: ArrivalEnum, mc_dist: MonteCarloDist,
+                           number_flows: int, number_servers: int,
+                           total_iterations: int,
+                           seed: Optional[int]) -> Iterator[np.ndarray]:
+    """
+    Yields the parameter array block by block on demand. The concatenated
+    blocks only depend on the seed, not on how they are consumed.
+
+    :param seed: seed of the study, None draws the blocks one after another
+                 from the global np.random state
+    :return:     blocks of at most SAMPLE_BLOCK_SIZE rows
+    """
+    for block_index in range(-(-total_iterations // SAMPLE_BLOCK_SIZE)):
+        yield mc_enum_to_dist_block(arrival_enum=arrival_enum,
+                                    mc_dist=mc_dist,
+                                    number_flows=number_flows,
+                                    number_servers=number_servers,
+                                    total_iterations=total_iterations,
+                                    seed=seed,
+                                    block_index=block_index)
+
+
+def mc_enum_to_dist_accepted_chunks(arrival_enum: ArrivalEnum,
+                                    mc_dist: MonteCarloDist,
+                                    number_flows: int, number_servers: int,
+                                    total_iterations: int, seed: Optional[int],
+                                    accept: Callable) -> Iterator[np.ndarray]:
+    """
+    Rejection sampling: draws full blocks until total_iterations rows are
+    accepted and yields the accepted rows of every block.
+
+    :param seed:   seed of the study, None draws from the global np.random
+                   state
+    :param accept: maps a block to the boolean mask of its accepted rows
+    :return:       blocks of at most SAMPLE_BLOCK_SIZE accepted rows
+    """
+    number_accepted = 0
+    block_index = 0
+    rejected_blocks = 0
+
+    while number_accepted < total_iterations:
+        param_block = mc_enum_to_dist_block(
+            arrival_enum=arrival_enum,
+            mc_dist=mc_dist,
+            number_flows=number_flows,
+            number_servers=number_servers,
+            total_iterations=(block_index + 1) * SAMPLE_BLOCK_SIZE,
+            seed=seed,
+            block_index=block_index)
+        block_index += 1
+
+        param_block = param_block[accept(param_block), ]
+        param_block = param_block[:total_iterations - number_accepted, ]
+
+        if param_block.shape[0] == 0:
+            rejected_blocks += 1
+            if rejected_blocks >= MAX_REJECTED_BLOCKS:
+                raise ValueError(
+                    f"no row of {MAX_REJECTED_BLOCKS * SAMPLE_BLOCK_SIZE} "
+                    f"consecutive samples is accepted")
+            continue
+
+        rejected_blocks = 0
+        number_accepted += param_block.shape[0]
+
+        yield param_block
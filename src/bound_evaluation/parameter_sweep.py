@@ -0,0 +1,538 @@
+"""Monte Carlo parameter sweep that is shared by all studies.
+
+Every row of the sampled parameter array is turned into arrivals and
+servers, the resulting setting is checked for its utilization and then
+handed to a comparator. The rows are processed in chunks, either serially
+or across a process pool, and every finished chunk is streamed to a sink.
+Large studies are sampled, evaluated and written to disk in blocks, such
+that the memory does not grow with the number of iterations.
+"""
+
+import json
+from multiprocessing import Pool
+from timeit import default_timer as timer
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from tqdm import tqdm
+
+from bound_evaluation.checkpoint import SweepCheckpoint
+from bound_evaluation.mc_enum_to_dist import (
+    EVALUATION_STREAM, mc_enum_to_dist, mc_enum_to_dist_accepted_chunks,
+    mc_enum_to_dist_chunks, seeded_global_rng, spawn_seed_seq)
+from bound_evaluation.monte_carlo_dist import MonteCarloDist
+from bound_evaluation.result_writer import ResultWriter
+from nc_arrivals.arrival_distribution import ArrivalDistribution
+from nc_arrivals.arrival_enum import ArrivalEnum
+from nc_arrivals.ebb import EBB
+from nc_arrivals.markov_modulated import MMOODisc, MMOOFluid
+from nc_arrivals.qt import DM1, MD1, MM1
+from nc_arrivals.regulated_arrivals import (DetermTokenBucket,
+                                            LeakyBucketMassOne)
+from nc_server.constant_rate_server import ConstantRateServer
+from utils.perform_parameter import PerformParameter
+
+# number of rows that are sent to a worker process at once
+CHUNKSIZE = 64
+
+
+def param_row_to_arr_list(param_row: np.ndarray, arrival_enum: ArrivalEnum,
+                          number_flows: int) -> List[ArrivalDistribution]:
+    """
+    :param param_row:    one row of the Monte Carlo parameter array
+    :param arrival_enum: arrival process
+    :param number_flows: number of flows
+    :return:             list of arrivals
+    """
+    if arrival_enum == ArrivalEnum.DM1:
+        return [DM1(lamb=param_row[j]) for j in range(number_flows)]
+
+    elif arrival_enum == ArrivalEnum.MD1:
+        return [MD1(lamb=param_row[j], mu=1.0) for j in range(number_flows)]
+
+    elif arrival_enum == ArrivalEnum.MM1:
+        return [MM1(lamb=param_row[j], mu=1.0) for j in range(number_flows)]
+
+    elif arrival_enum == ArrivalEnum.MMOODisc:
+        return [
+            MMOODisc(stay_on=param_row[j],
+                     stay_off=param_row[number_flows + j],
+                     peak_rate=param_row[2 * number_flows + j])
+            for j in range(number_flows)
+        ]
+
+    elif arrival_enum == ArrivalEnum.MMOOFluid:
+        return [
+            MMOOFluid(mu=param_row[j],
+                      lamb=param_row[number_flows + j],
+                      peak_rate=param_row[2 * number_flows + j])
+            for j in range(number_flows)
+        ]
+
+    elif arrival_enum == ArrivalEnum.EBB:
+        return [
+            EBB(factor_m=param_row[j],
+                decay=param_row[number_flows + j],
+                rho_single=param_row[2 * number_flows + j])
+            for j in range(number_flows)
+        ]
+
+    elif arrival_enum == ArrivalEnum.MassOne:
+        # NOTE: n is fixed
+        return [
+            LeakyBucketMassOne(sigma_single=param_row[j],
+                               rho_single=param_row[number_flows + j],
+                               n=20) for j in range(number_flows)
+        ]
+
+    elif arrival_enum == ArrivalEnum.TBConst:
+        return [
+            DetermTokenBucket(sigma_single=param_row[j],
+                              rho_single=param_row[number_flows + j],
+                              n=1) for j in range(number_flows)
+        ]
+
+    else:
+        raise NotImplementedError(f"Arrival parameter {arrival_enum.name} "
+                                  f"is infeasible")
+
+
+def param_row_to_ser_list(param_row: np.ndarray, arrival_enum: ArrivalEnum,
+                          number_flows: int,
+                          number_servers: int) -> List[ConstantRateServer]:
+    """
+    :param param_row:      one row of the Monte Carlo parameter array
+    :param arrival_enum:   arrival process
+    :param number_flows:   number of flows
+    :param number_servers: number of servers
+    :return:               list of servers (1 parameter each)
+    """
+    return [
+        ConstantRateServer(
+            rate=param_row[arrival_enum.number_parameters() * number_flows +
+                           j]) for j in range(number_servers)
+    ]
+
+
+class ParameterSweep(object):
+    """
+    Monte Carlo parameter sweep.
+
+    All callables have to be picklable (e.g., classes, module-level functions
+    or functools.partial of them) to run the sweep in a process pool.
+    """
+    def __init__(self,
+                 setting_factory: Callable,
+                 comparator: Callable,
+                 arrival_enum: ArrivalEnum,
+                 number_flows: int,
+                 number_servers: int,
+                 perform_param: PerformParameter,
+                 mc_dist: MonteCarloDist,
+                 number_results: int,
+                 target_util=0.0,
+                 row_filter: Optional[Callable] = None,
+                 seed: Optional[int] = None) -> None:
+        """
+        :param setting_factory: called with arr_list, ser_list and
+                                perform_param, returns the setting
+        :param comparator:      called with setting, returns number_results
+                                values
+        :param arrival_enum:    arrival process
+        :param number_flows:    number of flows
+        :param number_servers:  number of servers
+        :param perform_param:   performance parameter
+        :param mc_dist:         distribution of the parameters
+        :param number_results:  number of columns of the result array
+        :param target_util:     only rows with a utilization within
+                                [target_util, 1] are sampled, 0.0 to keep
+                                all
+        :param row_filter:      maps the comparator's result row to the row
+                                that is stored, e.g., to write nan's
+        :param seed:            seed of the study. The parameters are drawn
+                                block-wise from spawned generators and the
+                                global np.random state is reseeded per row,
+                                such that the results do not depend on the
+                                number of processes. None uses the global
+                                np.random state.
+        """
+        self.setting_factory = setting_factory
+        self.comparator = comparator
+        self.arrival_enum = arrival_enum
+        self.number_flows = number_flows
+        self.number_servers = number_servers
+        self.perform_param = perform_param
+        self.mc_dist = mc_dist
+        self.number_results = number_results
+        self.target_util = target_util
+        self.row_filter = row_filter
+        self.seed = seed
+
+    def number_parameters(self) -> int:
+        """
+        :return: number of columns of the parameter array
+        """
+        return self.arrival_enum.number_parameters() * self.number_flows + \
+            self.number_servers
+
+    def study_fingerprint(self) -> str:
+        """
+        :return: everything that determines the parameter array and the
+                 meaning of the results, e.g., to check that a checkpoint
+                 belongs to this study
+        """
+        return json.dumps({
+            "arrival_enum": self.arrival_enum.name,
+            "number_flows": self.number_flows,
+            "number_servers": self.number_servers,
+            "number_parameters": self.number_parameters(),
+            "number_results": self.number_results,
+            "mc_dist": self.mc_dist.to_name(),
+            "mc_param": [float(param) for param in self.mc_dist.param_list],
+            "target_util": float(self.target_util),
+            "seed": self.seed,
+            "perform_param": str(self.perform_param)
+        }, sort_keys=True)
+
+    def utilization_array(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        Approximate utilization of many rows at once. The arrivals and
+        servers are built from whole parameter columns, such that their
+        average rates and the setting's utilization are evaluated
+        elementwise.
+
+        :param param_array: rows of the parameter array
+        :return:            utilization of every row
+        """
+        param_columns = param_array.T
+
+        setting = self.setting_factory(
+            arr_list=param_row_to_arr_list(param_row=param_columns,
+                                           arrival_enum=self.arrival_enum,
+                                           number_flows=self.number_flows),
+            ser_list=param_row_to_ser_list(param_row=param_columns,
+                                           arrival_enum=self.arrival_enum,
+                                           number_flows=self.number_flows,
+                                           number_servers=self.number_servers),
+            perform_param=self.perform_param)
+
+        return np.asarray(setting.approximate_utilization(), dtype=float)
+
+    def accept_utilization(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        :param param_array: rows of the parameter array
+        :return:            True for the rows within [target_util, 1]
+        """
+        with np.errstate(all="ignore"):
+            util = self.utilization_array(param_array=param_array)
+
+        return (util >= self.target_util) & (util <= 1)
+
+    def sample_param_chunks(self,
+                            total_iterations: int) -> Iterable[np.ndarray]:
+        """
+        :param total_iterations: number of rows
+        :return:                 blocks of the parameter array, only rows
+                                 within the target utilization are drawn
+        """
+        if self.target_util > 0.0:
+            return mc_enum_to_dist_accepted_chunks(
+                arrival_enum=self.arrival_enum,
+                mc_dist=self.mc_dist,
+                number_flows=self.number_flows,
+                number_servers=self.number_servers,
+                total_iterations=total_iterations,
+                seed=self.seed,
+                accept=self.accept_utilization)
+
+        return mc_enum_to_dist_chunks(arrival_enum=self.arrival_enum,
+                                      mc_dist=self.mc_dist,
+                                      number_flows=self.number_flows,
+                                      number_servers=self.number_servers,
+                                      total_iterations=total_iterations,
+                                      seed=self.seed)
+
+    def sample_param_array(self, total_iterations: int) -> np.ndarray:
+        """
+        :param total_iterations: number of rows
+        :return:                 Monte Carlo parameter array
+        """
+        if self.seed is None and self.target_util == 0.0:
+            return mc_enum_to_dist(arrival_enum=self.arrival_enum,
+                                   mc_dist=self.mc_dist,
+                                   number_flows=self.number_flows,
+                                   number_servers=self.number_servers,
+                                   total_iterations=total_iterations)
+
+        return np.concatenate(
+            list(self.sample_param_chunks(total_iterations=total_iterations)))
+
+    def evaluate_row(self,
+                     param_row: np.ndarray,
+                     row_index: Optional[int] = None) -> np.ndarray:
+        """
+        :param param_row: one row of the parameter array
+        :param row_index: index of the row in the whole study
+        :return:          result row, nan if the row is not valid
+        """
+        res_row = np.full(self.number_results, np.nan)
+
+        setting = self.setting_factory(
+            arr_list=param_row_to_arr_list(param_row=param_row,
+                                           arrival_enum=self.arrival_enum,
+                                           number_flows=self.number_flows),
+            ser_list=param_row_to_ser_list(param_row=param_row,
+                                           arrival_enum=self.arrival_enum,
+                                           number_flows=self.number_flows,
+                                           number_servers=self.number_servers),
+            perform_param=self.perform_param)
+
+        if self.target_util > 0.0:
+            util = setting.approximate_utilization()
+            if util < self.target_util or util > 1:
+                return res_row
+
+        if self.seed is not None and row_index is not None:
+            # e.g., for the initial simplex or stochastic optimizers
+            with seeded_global_rng(seed_seq=spawn_seed_seq(
+                    seed=self.seed, stream=EVALUATION_STREAM,
+                    index=row_index)):
+                res_row[:] = self.comparator(setting=setting)
+        else:
+            res_row[:] = self.comparator(setting=setting)
+
+        if self.row_filter is not None:
+            res_row = self.row_filter(res_row)
+
+        return res_row
+
+    def evaluate_chunk(self, chunk: Tuple[np.ndarray,
+                                          np.ndarray]) -> np.ndarray:
+        """
+        :param chunk: row indices and the corresponding rows of the
+                      parameter array
+        :return:      the corresponding result rows
+        """
+        row_indices, param_chunk = chunk
+        res_chunk = np.empty([param_chunk.shape[0], self.number_results])
+
+        for i in range(param_chunk.shape[0]):
+            res_chunk[i, ] = self.evaluate_row(param_row=param_chunk[i, ],
+                                               row_index=int(row_indices[i]))
+
+        return res_chunk
+
+    def run(self,
+            param_array: np.ndarray,
+            processes=1,
+            chunksize=CHUNKSIZE,
+            sink: Optional[Callable] = None,
+            row_indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluates all rows of param_array.
+
+        :param param_array: Monte Carlo parameter array
+        :param processes:   number of worker processes, None uses all cores
+        :param chunksize:   number of rows per task
+        :param sink:        called with start index and result chunk as
+                            soon as a chunk is done
+        :param row_indices: indices of the rows in the whole study, default
+                            is 0, 1, ...
+        :return:            result array, row i belongs to param_array[i]
+        """
+        total_iterations = param_array.shape[0]
+        res_array = np.empty([total_iterations, self.number_results])
+
+        if row_indices is None:
+            row_indices = np.arange(total_iterations)
+
+        starts = range(0, total_iterations, chunksize)
+        chunks = split_into_chunks(param_array=param_array,
+                                   row_indices=row_indices,
+                                   chunksize=chunksize)
+
+        def collect(res_chunks: Iterable[np.ndarray]) -> None:
+            with tqdm(total=total_iterations) as progress_bar:
+                for start, res_chunk in zip(starts, res_chunks):
+                    res_array[start:start + res_chunk.shape[0], ] = res_chunk
+
+                    if sink is not None:
+                        sink(start, res_chunk)
+
+                    progress_bar.update(res_chunk.shape[0])
+
+        if processes == 1:
+            collect(res_chunks=map(self.evaluate_chunk, chunks))
+
+        else:
+            with Pool(processes=processes) as pool:
+                # imap keeps the order of the chunks
+                collect(res_chunks=pool.imap(self.evaluate_chunk, chunks))
+
+        return res_array
+
+    def sample_and_run(self,
+                       total_iterations: int,
+                       processes=1,
+                       chunksize=CHUNKSIZE,
+                       checkpoint: Optional[SweepCheckpoint] = None
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Samples the parameter array and evaluates it. With a checkpoint, the
+        progress is saved periodically and an existing checkpoint is resumed,
+        i.e., its parameter array and RNG state are restored and only the
+        rows that are not done yet are evaluated.
+
+        :param total_iterations: number of rows
+        :param processes:        number of worker processes
+        :param chunksize:        number of rows per task
+        :param checkpoint:       checkpoint file, None to keep all in memory
+        :return:                 parameter array and result array
+        """
+        if checkpoint is None:
+            param_array = self.sample_param_array(
+                total_iterations=total_iterations)
+
+            return param_array, self.run(param_array=param_array,
+                                         processes=processes,
+                                         chunksize=chunksize)
+
+        fingerprint = self.study_fingerprint()
+
+        if checkpoint.exists():
+            if checkpoint.load_fingerprint() != fingerprint:
+                raise ValueError(
+                    f"checkpoint {checkpoint.path} belongs to another study, "
+                    f"expected {fingerprint}")
+
+            param_array, res_array, done, rng_state = checkpoint.load()
+
+            if param_array.shape != (total_iterations,
+                                     self.number_parameters()) or \
+                    res_array.shape != (total_iterations,
+                                        self.number_results):
+                raise ValueError(
+                    f"checkpoint {checkpoint.path} with shapes "
+                    f"{param_array.shape} and {res_array.shape} does not "
+                    f"belong to this sweep")
+
+            np.random.set_state(rng_state)
+
+        else:
+            param_array = self.sample_param_array(
+                total_iterations=total_iterations)
+            res_array = np.full([total_iterations, self.number_results],
+                                np.nan)
+            done = np.zeros(total_iterations, dtype=bool)
+            rng_state = np.random.get_state()
+
+            checkpoint.save(param_array=param_array,
+                            res_array=res_array,
+                            done=done,
+                            rng_state=rng_state,
+                            fingerprint=fingerprint)
+
+        todo = np.flatnonzero(~done)
+        last_save = [timer()]
+
+        def save_progress(start: int, res_chunk: np.ndarray) -> None:
+            rows = todo[start:start + res_chunk.shape[0]]
+            res_array[rows, ] = res_chunk
+            done[rows] = True
+
+            if timer() - last_save[0] >= checkpoint.interval:
+                checkpoint.save(param_array=param_array,
+                                res_array=res_array,
+                                done=done,
+                                rng_state=rng_state,
+                                fingerprint=fingerprint)
+                last_save[0] = timer()
+
+        if todo.size > 0:
+            self.run(param_array=param_array[todo, ],
+                     processes=processes,
+                     chunksize=chunksize,
+                     sink=save_progress,
+                     row_indices=todo)
+
+        checkpoint.save(param_array=param_array,
+                        res_array=res_array,
+                        done=done,
+                        rng_state=rng_state,
+                        fingerprint=fingerprint)
+
+        return param_array, res_array
+
+    def sample_and_stream(self,
+                          total_iterations: int,
+                          writer: ResultWriter,
+                          processes=1,
+                          chunksize=CHUNKSIZE,
+                          block_sink: Optional[Callable] = None
+                          ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Samples, evaluates and writes the study in blocks of
+        SAMPLE_BLOCK_SIZE rows, i.e., neither the parameter array nor the
+        result array are kept in memory.
+
+        :param total_iterations: number of rows
+        :param writer:           writer of the parameter and result blocks
+        :param processes:        number of worker processes
+        :param chunksize:        number of rows per task
+        :param block_sink:       called with start index, parameter and
+                                 result block as soon as a block is written,
+                                 e.g., to update statistics
+        :return:                 memory-mapped parameter and result array
+        """
+        pool = None if processes == 1 else Pool(processes=processes)
+        start = 0
+
+        try:
+            with tqdm(total=total_iterations) as progress_bar:
+                for param_block in self.sample_param_chunks(
+                        total_iterations=total_iterations):
+                    if start == 0:
+                        writer.open(total_iterations=total_iterations,
+                                    number_parameters=param_block.shape[1],
+                                    number_results=self.number_results)
+
+                    chunks = split_into_chunks(
+                        param_array=param_block,
+                        row_indices=np.arange(start,
+                                              start + param_block.shape[0]),
+                        chunksize=chunksize)
+
+                    if pool is None:
+                        res_chunks = map(self.evaluate_chunk, chunks)
+                    else:
+                        res_chunks = pool.imap(self.evaluate_chunk, chunks)
+
+                    res_block = np.concatenate(list(res_chunks))
+                    writer.write(start=start,
+                                 param_block=param_block,
+                                 res_block=res_block)
+                    if block_sink is not None:
+                        block_sink(start, param_block, res_block)
+
+                    start += param_block.shape[0]
+                    progress_bar.update(param_block.shape[0])
+
+        finally:
+            if pool is not None:
+                pool.terminate()
+            writer.close()
+
+        return writer.load()
+
+
+def split_into_chunks(param_array: np.ndarray, row_indices: np.ndarray,
+                      chunksize: int) -> Iterable[tuple]:
+    """
+    :param param_array: rows of the parameter array
+    :param row_indices: indices of these rows in the whole study
+    :param chunksize:   number of rows per chunk
+    :return:            tasks for ParameterSweep.evaluate_chunk
+    """
+    return ((row_indices[start:start + chunksize],
+             param_array[start:start + chunksize, ])
+            for start in range(0, param_array.shape[0], chunksize))
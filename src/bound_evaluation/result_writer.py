@@ -0,0 +1,80 @@
+"""Streams the parameter and result blocks of a sweep to disk."""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class ResultWriter(object):
+    """
+    Writes the parameter array and the result array block by block into two
+    memory-mapped .npy files, i.e., only the current block has to be kept in
+    memory and the files can be read with np.load.
+    """
+    def __init__(self, path: str) -> None:
+        """
+        :param path: prefix of the files, e.g., "study" for "study_param.npy"
+                     and "study_res.npy"
+        """
+        self.path = path
+        self.param_array: Optional[np.memmap] = None
+        self.res_array: Optional[np.memmap] = None
+
+    @property
+    def param_path(self) -> str:
+        return self.path + "_param.npy"
+
+    @property
+    def res_path(self) -> str:
+        return self.path + "_res.npy"
+
+    def open(self, total_iterations: int, number_parameters: int,
+             number_results: int) -> None:
+        """
+        Creates (or overwrites) both files.
+
+        :param total_iterations:  number of rows
+        :param number_parameters: number of columns of the parameter array
+        :param number_results:    number of columns of the result array
+        """
+        self.param_array = np.lib.format.open_memmap(
+            self.param_path,
+            mode="w+",
+            dtype=float,
+            shape=(total_iterations, number_parameters))
+        self.res_array = np.lib.format.open_memmap(
+            self.res_path,
+            mode="w+",
+            dtype=float,
+            shape=(total_iterations, number_results))
+        # rows that are never written stay nan
+        self.res_array[:] = np.nan
+
+    def write(self, start: int, param_block: np.ndarray,
+              res_block: np.ndarray) -> None:
+        """
+        :param start:       index of the first row of the block
+        :param param_block: rows of the parameter array
+        :param res_block:   the corresponding result rows
+        """
+        if self.param_array is None:
+            raise RuntimeError("writer has to be opened first")
+
+        stop = start + param_block.shape[0]
+        self.param_array[start:stop, ] = param_block
+        self.res_array[start:stop, ] = res_block
+
+    def close(self) -> None:
+        if self.param_array is not None:
+            self.param_array.flush()
+            self.res_array.flush()
+            self.param_array = None
+            self.res_array = None
+
+    def load(self, mmap_mode="r") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param mmap_mode: see np.load, None reads both arrays into memory
+        :return:          parameter array and result array
+        """
+        return (np.load(self.param_path, mmap_mode=mmap_mode),
+                np.load(self.res_path, mmap_mode=mmap_mode))
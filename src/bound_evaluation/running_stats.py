@@ -0,0 +1,103 @@
+"""Statistics of a vector that arrives block by block, e.g., of a streamed
+sweep, without keeping the whole vector in memory."""
+
+from math import inf, nan
+from typing import List, Optional
+
+import numpy as np
+
+# size of the sample for the median, i.e., the median is exact up to this
+# number of values
+MEDIAN_SAMPLE_SIZE = 10**6
+
+
+class RunningStats(object):
+    """
+    nan-aware maximum (with its row), mean and median, i.e., the counterparts
+    of np.nanargmax, np.nanmean and np.nanmedian.
+
+    The median is computed from a uniform sample (reservoir sampling) of
+    sample_size values, i.e., it is approximate for longer vectors.
+    """
+    def __init__(self,
+                 sample_size: Optional[int] = MEDIAN_SAMPLE_SIZE,
+                 seed=0) -> None:
+        """
+        :param sample_size: size of the sample for the median, None keeps all
+                            values, i.e., the median is exact
+        :param seed:        seed of the reservoir sampling
+        """
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+
+        # number of non-nan values
+        self.count = 0
+        self.sum = 0.0
+        self.max_value = -inf
+        # index of the maximum in the whole vector and the corresponding row,
+        # e.g., of the parameter array
+        self.max_index: Optional[int] = None
+        self.max_row: Optional[np.ndarray] = None
+
+        self._blocks: List[np.ndarray] = []
+        self._sample = np.empty(0 if sample_size is None else sample_size)
+
+    def update(self,
+               values: np.ndarray,
+               start: int,
+               rows: Optional[np.ndarray] = None) -> None:
+        """
+        :param values: next block of the vector
+        :param start:  index of the first value of the block in the vector
+        :param rows:   rows that belong to the values, the one of the maximum
+                       is kept
+        """
+        not_nan = ~np.isnan(values)
+        valid = values[not_nan]
+        if valid.size == 0:
+            return
+
+        index_max = int(np.nanargmax(values))
+        # the first maximum is kept, as by np.nanargmax
+        if self.max_index is None or values[index_max] > self.max_value:
+            self.max_value = float(values[index_max])
+            self.max_index = start + index_max
+            if rows is not None:
+                self.max_row = np.array(rows[index_max], dtype=float)
+
+        self.sum += float(np.sum(valid))
+        self._add_to_sample(valid=valid)
+        self.count += valid.size
+
+    def _add_to_sample(self, valid: np.ndarray) -> None:
+        if self.sample_size is None:
+            self._blocks.append(valid.copy())
+            return
+
+        # fill the reservoir first
+        number_fill = min(max(self.sample_size - self.count, 0), valid.size)
+        self._sample[self.count:self.count + number_fill] = valid[:number_fill]
+
+        # then the i-th value replaces a random entry with probability
+        # sample_size / (i + 1)
+        rest = valid[number_fill:]
+        if rest.size > 0:
+            position = np.arange(self.count + number_fill,
+                                 self.count + valid.size)
+            replace = self.rng.integers(0, position + 1)
+            keep = replace < self.sample_size
+            self._sample[replace[keep]] = rest[keep]
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count > 0 else nan
+
+    def median(self) -> float:
+        if self.count == 0:
+            return nan
+
+        if self.sample_size is None:
+            return float(np.median(np.concatenate(self._blocks)))
+
+        return float(
+            np.median(self._sample[:min(self.count, self.sample_size)]))
@@ -1,13 +1,155 @@
 """This file takes arrays and writes them into dictionaries"""
 
+from typing import Optional
 from warnings import warn
 
 import numpy as np
 
 from bound_evaluation.change_enum import ChangeEnum
+from bound_evaluation.running_stats import MEDIAN_SAMPLE_SIZE, RunningStats
 from nc_arrivals.arrival_enum import ArrivalEnum
 
 
+class TwoColResults(object):
+    """
+    Statistics of two_col_array_to_results that are updated block by block,
+    e.g., while a sweep is streamed to disk, i.e., the result array is never
+    read as a whole.
+    """
+    def __init__(self,
+                 compare_metric: ChangeEnum = ChangeEnum.RATIO_REF_NEW,
+                 sample_size: Optional[int] = MEDIAN_SAMPLE_SIZE) -> None:
+        """
+        :param compare_metric: ratio or difference of the two columns
+        :param sample_size:    see RunningStats, None for the exact median
+        """
+        if compare_metric not in (ChangeEnum.RATIO_REF_NEW,
+                                  ChangeEnum.DIFF_REF_NEW):
+            raise NotImplementedError(
+                f"Metric={compare_metric.name} is not implemented")
+
+        self.compare_metric = compare_metric
+        self.improvement = RunningStats(sample_size=sample_size)
+        self.iterations = 0
+        self.number_improved = 0
+        self.count_nan = np.zeros(2, dtype=int)
+
+    def update(self, start: int, param_block: np.ndarray,
+               res_block: np.ndarray) -> None:
+        """
+        :param start:       index of the first row of the block
+        :param param_block: rows of the parameter array
+        :param res_block:   the corresponding result rows
+        """
+        if res_block.shape[1] != 2:
+            raise NameError(
+                f"Array must have 2 columns, not {res_block.shape[1]}")
+
+        if self.compare_metric == ChangeEnum.RATIO_REF_NEW:
+            improvement_vec = np.divide(res_block[:, 0], res_block[:, 1])
+        else:
+            improvement_vec = np.subtract(res_block[:, 0], res_block[:, 1])
+
+        # the results and parameters of the optimum are kept
+        self.improvement.update(values=improvement_vec,
+                                start=start,
+                                rows=np.column_stack((res_block, param_block)))
+
+        self.iterations += res_block.shape[0]
+        self.number_improved += int(np.sum(res_block[:, 0] > res_block[:, 1]))
+        self.count_nan += np.count_nonzero(np.isnan(res_block), axis=0)
+
+    @property
+    def valid_iterations(self) -> int:
+        """rows where the standard bound is not nan"""
+        return self.iterations - int(self.count_nan[0])
+
+    def to_results(self, arrival_enum: ArrivalEnum, number_servers: int,
+                   valid_iterations: int) -> dict:
+        """Writes the statistics into a dictionary"""
+        if self.improvement.max_index is None:
+            raise ValueError("All-NaN slice encountered")
+
+        iterations = self.iterations
+        opt_standard_bound = self.improvement.max_row[0]
+        opt_h_mit_bound = self.improvement.max_row[1]
+        param_row = self.improvement.max_row[2:]
+        opt_improvement = self.improvement.max_value
+
+        mean_improvement = self.improvement.mean
+        median_improvement = self.improvement.median()
+
+        number_improved = self.number_improved
+
+        count_nan_standard = self.count_nan[0]
+        count_nan_h_mit = self.count_nan[1]
+
+        if count_nan_standard != count_nan_h_mit:
+            warn(f"number of nan's does not match, "
+                 f"{count_nan_standard} != {count_nan_h_mit}")
+
+        if valid_iterations < iterations * 0.2:
+            warn(f"way too many nan's: "
+                 f"{iterations - valid_iterations} out of {iterations}!")
+
+            if valid_iterations < 100:
+                raise ValueError("result is useless")
+
+        res_dict = {
+            "Name": "Value",
+            "arrival_distribution": arrival_enum.name
+        }
+
+        for j in range(number_servers):
+            if arrival_enum == ArrivalEnum.DM1:
+                res_dict[f"lamb{j + 1}"] = format(param_row[j], '.3f')
+                res_dict[f"rate{j + 1}"] = format(
+                    param_row[number_servers + j], '.3f')
+
+            elif arrival_enum == ArrivalEnum.MD1:
+                res_dict[f"lamb{j + 1}"] = format(param_row[j], '.3f')
+                res_dict[f"rate{j + 1}"] = format(
+                    param_row[number_servers + j], '.3f')
+                res_dict[f"packet_size{j + 1}"] = format(
+                    param_row[number_servers + j], '.3f')
+
+            elif arrival_enum == ArrivalEnum.MMOOFluid:
+                res_dict[f"mu{j + 1}"] = format(param_row[j], '.3f')
+                res_dict[f"lamb{j + 1}"] = format(
+                    param_row[number_servers + j], '.3f')
+                res_dict[f"burst{j + 1}"] = format(
+                    param_row[2 * number_servers + j], '.3f')
+                res_dict[f"rate{j + 1}"] = format(
+                    param_row[3 * number_servers + j], '.3f')
+
+            elif arrival_enum == ArrivalEnum.EBB:
+                res_dict[f"M{j + 1}"] = format(param_row[j], '.3f')
+                res_dict[f"b{j + 1}"] = format(
+                    param_row[number_servers + j], '.3f')
+                res_dict[f"rho{j + 1}"] = format(
+                    param_row[2 * number_servers + j], '.3f')
+                res_dict[f"rate{j + 1}"] = format(
+                    param_row[3 * number_servers + j], '.3f')
+
+            else:
+                raise NotImplementedError(
+                    f"Arrival parameter={arrival_enum.name} is not "
+                    f"implemented")
+
+        res_dict.update({
+            "opt standard standard_bound": opt_standard_bound,
+            "opt h-mitigator standard_bound": opt_h_mit_bound,
+            "optimum improvement": format(opt_improvement, '.3f'),
+            "mean improvement": mean_improvement,
+            "median improvement": median_improvement,
+            "number improved": number_improved,
+            "valid iterations": valid_iterations,
+            "share improved": number_improved / valid_iterations
+        })
+
+        return res_dict
+
+
 def two_col_array_to_results(
         arrival_enum: ArrivalEnum,
         param_array: np.array,
@@ -16,95 +158,12 @@ def two_col_array_to_results(
         valid_iterations: int,
         compare_metric: ChangeEnum = ChangeEnum.RATIO_REF_NEW) -> dict:
     """Writes the array values into a dictionary"""
-    if res_array.shape[1] != 2:
-        raise NameError(f"Array must have 2 columns, not {res_array.shape[1]}")
-
-    iterations = int(res_array.shape[0])
+    results = TwoColResults(compare_metric=compare_metric, sample_size=None)
+    results.update(start=0, param_block=param_array, res_block=res_array)
 
-    if compare_metric == ChangeEnum.RATIO_REF_NEW:
-        improvement_vec = np.divide(res_array[:, 0], res_array[:, 1])
-    elif compare_metric == ChangeEnum.DIFF_REF_NEW:
-        improvement_vec = np.subtract(res_array[:, 0], res_array[:, 1])
-    else:
-        raise NotImplementedError(
-            f"Metric={compare_metric.name} is not implemented")
-
-    row_max = np.nanargmax(improvement_vec)
-
-    opt_standard_bound = res_array[row_max, 0]
-    opt_h_mit_bound = res_array[row_max, 1]
-    opt_improvement = improvement_vec[row_max]
-
-    mean_improvement = np.nanmean(improvement_vec)
-    median_improvement = np.nanmedian(improvement_vec)
-
-    # number_improved = np.sum(np.greater(res_array[:, 0], res_array[:, 1]))
-    number_improved = np.sum(res_array[:, 0] > res_array[:, 1])
-
-    count_nan = np.count_nonzero(np.isnan(res_array), axis=0)
-    count_nan_standard = count_nan[0]
-    count_nan_h_mit = count_nan[1]
-
-    if count_nan_standard != count_nan_h_mit:
-        warn(f"number of nan's does not match, "
-             f"{count_nan_standard} != {count_nan_h_mit}")
-
-    if valid_iterations < iterations * 0.2:
-        warn(f"way too many nan's: "
-             f"{iterations - valid_iterations} out of {iterations}!")
-
-        if valid_iterations < 100:
-            raise ValueError("result is useless")
-
-    res_dict = {"Name": "Value", "arrival_distribution": arrival_enum.name}
-
-    for j in range(number_servers):
-        if arrival_enum == ArrivalEnum.DM1:
-            res_dict[f"lamb{j + 1}"] = format(param_array[row_max, j], '.3f')
-            res_dict[f"rate{j + 1}"] = format(
-                param_array[row_max, number_servers + j], '.3f')
-
-        elif arrival_enum == ArrivalEnum.MD1:
-            res_dict[f"lamb{j + 1}"] = format(param_array[row_max, j], '.3f')
-            res_dict[f"rate{j + 1}"] = format(
-                param_array[row_max, number_servers + j], '.3f')
-            res_dict[f"packet_size{j + 1}"] = format(
-                param_array[row_max, number_servers + j], '.3f')
-
-        elif arrival_enum == ArrivalEnum.MMOOFluid:
-            res_dict[f"mu{j + 1}"] = format(param_array[row_max, j], '.3f')
-            res_dict[f"lamb{j + 1}"] = format(
-                param_array[row_max, number_servers + j], '.3f')
-            res_dict[f"burst{j + 1}"] = format(
-                param_array[row_max, 2 * number_servers + j], '.3f')
-            res_dict[f"rate{j + 1}"] = format(
-                param_array[row_max, 3 * number_servers + j], '.3f')
-
-        elif arrival_enum == ArrivalEnum.EBB:
-            res_dict[f"M{j + 1}"] = format(param_array[row_max, j], '.3f')
-            res_dict[f"b{j + 1}"] = format(
-                param_array[row_max, number_servers + j], '.3f')
-            res_dict[f"rho{j + 1}"] = format(
-                param_array[row_max, 2 * number_servers + j], '.3f')
-            res_dict[f"rate{j + 1}"] = format(
-                param_array[row_max, 3 * number_servers + j], '.3f')
-
-        else:
-            raise NotImplementedError(
-                f"Arrival parameter={arrival_enum.name} is not implemented")
-
-    res_dict.update({
-        "opt standard standard_bound": opt_standard_bound,
-        "opt h-mitigator standard_bound": opt_h_mit_bound,
-        "optimum improvement": format(opt_improvement, '.3f'),
-        "mean improvement": mean_improvement,
-        "median improvement": median_improvement,
-        "number improved": number_improved,
-        "valid iterations": valid_iterations,
-        "share improved": number_improved / valid_iterations
-    })
-
-    return res_dict
+    return results.to_results(arrival_enum=arrival_enum,
+                              number_servers=number_servers,
+                              valid_iterations=valid_iterations)
 
 
 def three_col_array_to_results(
@@ -60,6 +60,23 @@ def compare_mitigator(setting: SettingMitigator,
         if h_mit_bound > standard_bound:
             h_mit_bound = standard_bound
 
+    elif opt_method == OptMethod.MULTI_START:
+        theta_bounds = [(0.1, 4.0)]
+
+        standard_bound = Optimize(setting=setting,
+                                  number_param=1,
+                                  print_x=print_x).grid_search(
+                                      bound_list=theta_bounds, delta=0.1)
+
+        bound_array = theta_bounds + [(0.9, 4.0)] * number_l
+        start_list_new = [0.5] + [1.0] * number_l
+
+        h_mit_bound = OptimizeMitigator(setting_h_mit=setting,
+                                        number_param=number_l + 1,
+                                        print_x=print_x).multi_start_search(
+                                            bound_list=bound_array,
+                                            start_list=start_list_new)
+
     elif opt_method == OptMethod.NELDER_MEAD:
         theta_start = 0.5
 
@@ -199,6 +216,25 @@ def compare_time(setting: SettingMitigator,
         stop = timer()
         time_lyapunov = stop - start
 
+    elif opt_method == OptMethod.MULTI_START:
+        bound_array = [(0.1, 4.0)]
+
+        start = timer()
+        Optimize(setting=setting,
+                 number_param=1).grid_search(bound_list=bound_array, delta=0.1)
+        stop = timer()
+        time_standard = stop - start
+
+        bound_array += [(0.9, 4.0)] * number_l
+        start_list = [0.5] + [1.0] * number_l
+
+        start = timer()
+        OptimizeMitigator(setting_h_mit=setting, number_param=number_l +
+                          1).multi_start_search(bound_list=bound_array,
+                                                start_list=start_list)
+        stop = timer()
+        time_lyapunov = stop - start
+
     elif opt_method == OptMethod.NELDER_MEAD:
         start_simplex = InitialSimplex(parameters_to_optimize=1).uniform_dist(
             max_theta=1.0)
@@ -1,25 +1,23 @@
 """Compute optimal and average improvement for different parameters."""
 
 import csv
+from functools import partial
+from typing import Optional
 
 import numpy as np
-from tqdm import tqdm
 
 from bound_evaluation.change_enum import ChangeEnum
+from bound_evaluation.checkpoint import SweepCheckpoint
 from bound_evaluation.mc_enum import MCEnum
-from bound_evaluation.mc_enum_to_dist import mc_enum_to_dist
 from bound_evaluation.monte_carlo_dist import MonteCarloDist
-from h_mitigator.array_to_results import two_col_array_to_results
+from bound_evaluation.parameter_sweep import ParameterSweep
+from bound_evaluation.result_writer import ResultWriter
+from h_mitigator.array_to_results import (TwoColResults,
+                                          two_col_array_to_results)
 from h_mitigator.compare_mitigator import compare_mitigator
 from h_mitigator.fat_cross_perform import FatCrossPerform
 from nc_arrivals.arrival_enum import ArrivalEnum
-from nc_arrivals.ebb import EBB
-from nc_arrivals.markov_modulated import MMOOFluid
-from nc_arrivals.qt import DM1, MD1
-from nc_arrivals.regulated_arrivals import (LeakyBucketMassOne,
-                                            DetermTokenBucket)
 from nc_operations.perform_enum import PerformEnum
-from nc_server.constant_rate_server import ConstantRateServer
 from optimization.opt_method import OptMethod
 from utils.perform_parameter import PerformParameter
 
@@ -28,116 +26,101 @@ from utils.perform_parameter import PerformParameter
 ########################################################################
 
 
-def csv_fat_cross_param_power(arrival_enum: ArrivalEnum, number_flows: int,
+def filter_fat_cross_row(res_row: np.ndarray,
+                         perform_param: PerformParameter) -> np.ndarray:
+    """
+    :param res_row:       standard and h-mitigator bound
+    :param perform_param: performance parameter
+    :return:              row, all nan if it is not valid
+    """
+    if (perform_param.perform_metric == PerformEnum.DELAY_PROB
+            and res_row[1] > 1.0):
+        # write as nan if second (in particular both) value(s) are > 1.0
+        res_row[:] = np.nan
+
+    if np.isnan(res_row[0]) or np.isnan(res_row[1]):
+        res_row[:] = np.nan
+
+    return res_row
+
+
+def csv_fat_cross_param_power(arrival_enum: ArrivalEnum,
+                              number_flows: int,
                               number_servers: int,
                               perform_param: PerformParameter,
-                              opt_method: OptMethod, mc_dist: MonteCarloDist,
+                              opt_method: OptMethod,
+                              mc_dist: MonteCarloDist,
                               total_iterations: int,
-                              target_util: float) -> dict:
-    """Chooses parameters by Monte Carlo type random choice."""
-    valid_iterations = total_iterations
+                              target_util: float,
+                              processes=1,
+                              checkpoint_path: Optional[str] = None,
+                              seed: Optional[int] = None,
+                              stream_path: Optional[str] = None) -> dict:
+    """
+    Chooses parameters by Monte Carlo type random choice.
+
+    :param processes:       number of worker processes, None uses all cores.
+                            For deterministic optimizers the results equal
+                            the serial run.
+    :param checkpoint_path: file to checkpoint and resume the sweep, None
+                            keeps everything in memory
+    :param seed:            seed of the Generator streams, None uses the
+                            global np.random state
+    :param stream_path:     prefix of the files that the sweep is written to
+                            block by block instead of keeping it in memory
+    """
+    if stream_path is not None and checkpoint_path is not None:
+        raise ValueError("a streamed sweep cannot be checkpointed, "
+                         "set either stream_path or checkpoint_path")
+
     compare_metric = ChangeEnum.RATIO_REF_NEW
 
-    param_array = mc_enum_to_dist(arrival_enum=arrival_enum,
-                                  mc_dist=mc_dist,
-                                  number_flows=number_flows,
-                                  number_servers=number_servers,
-                                  total_iterations=total_iterations)
-
-    res_array = np.empty([total_iterations, 2])
-
-    # print(res_array)
-
-    for i in tqdm(range(total_iterations), total=total_iterations):
-        if arrival_enum == ArrivalEnum.DM1:
-            arr_list = [
-                DM1(lamb=param_array[i, j]) for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MD1:
-            arr_list = [
-                MD1(lamb=param_array[i, j], mu=1.0)
-                for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MMOOFluid:
-            arr_list = [
-                MMOOFluid(mu=param_array[i, j],
-                          lamb=param_array[i, number_flows + j],
-                          peak_rate=param_array[i, 2 * number_flows + j])
-                for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.EBB:
-            arr_list = [
-                EBB(factor_m=param_array[i, j],
-                    decay=param_array[i, number_flows + j],
-                    rho_single=param_array[i, 2 * number_flows + j])
-                for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MassOne:
-            arr_list = [
-                LeakyBucketMassOne(sigma_single=param_array[i, j],
-                                   rho_single=param_array[i, number_flows + j],
-                                   n=20) for j in range(number_flows)
-            ]
-            # NOTE: n is fixed
-
-        elif arrival_enum == ArrivalEnum.TBConst:
-            arr_list = [
-                DetermTokenBucket(sigma_single=param_array[i, j],
-                                  rho_single=param_array[i, number_flows + j],
-                                  n=1) for j in range(number_flows)
-            ]
-
-        else:
-            raise NotImplementedError(f"Arrival parameter {arrival_enum.name} "
-                                      f"is infeasible")
-
-        ser_list = [
-            ConstantRateServer(
-                rate=param_array[i,
-                                 arrival_enum.number_parameters() *
-                                 number_flows + j])
-            for j in range(number_servers)
-        ]
-
-        fat_cross_setting = FatCrossPerform(arr_list=arr_list,
-                                            ser_list=ser_list,
-                                            perform_param=perform_param)
-
-        computation_necessary = True
-
-        # print(res_array[i, ])
-        if target_util > 0.0:
-            util = fat_cross_setting.approximate_utilization()
-            if util < target_util or util > 1:
-                res_array[i, ] = np.nan
-                computation_necessary = False
-
-        if computation_necessary:
-            # standard_bound, h_mit_bound = compare_mitigator()
-            res_array[i, 0], res_array[i, 1] = compare_mitigator(
-                setting=fat_cross_setting,
-                opt_method=opt_method,
-                number_l=number_servers - 1)
-
-            if (perform_param.perform_metric == PerformEnum.DELAY_PROB
-                    and res_array[i, 1] > 1.0):
-                # write as nan if second (in particular both) value(s) are > 1.0
-                res_array[i, ] = np.nan
-
-        if np.isnan(res_array[i, 0]) or np.isnan(res_array[i, 1]):
-            res_array[i, ] = np.nan
-            valid_iterations -= 1
-
-    res_dict = two_col_array_to_results(arrival_enum=arrival_enum,
-                                        param_array=param_array,
-                                        res_array=res_array,
-                                        number_servers=number_servers,
-                                        valid_iterations=valid_iterations,
-                                        compare_metric=compare_metric)
+    sweep = ParameterSweep(setting_factory=FatCrossPerform,
+                           comparator=partial(compare_mitigator,
+                                              opt_method=opt_method,
+                                              number_l=number_servers - 1),
+                           arrival_enum=arrival_enum,
+                           number_flows=number_flows,
+                           number_servers=number_servers,
+                           perform_param=perform_param,
+                           mc_dist=mc_dist,
+                           number_results=2,
+                           target_util=target_util,
+                           row_filter=partial(filter_fat_cross_row,
+                                              perform_param=perform_param),
+                           seed=seed)
+
+    if stream_path is None:
+        param_array, res_array = sweep.sample_and_run(
+            total_iterations=total_iterations,
+            processes=processes,
+            checkpoint=None if checkpoint_path is None else SweepCheckpoint(
+                path=checkpoint_path))
+
+        valid_iterations = total_iterations - int(
+            np.sum(np.isnan(res_array[:, 0])))
+
+        res_dict = two_col_array_to_results(
+            arrival_enum=arrival_enum,
+            param_array=param_array,
+            res_array=res_array,
+            number_servers=number_servers,
+            valid_iterations=valid_iterations,
+            compare_metric=compare_metric)
+
+    else:
+        # the statistics are updated per block, i.e., the streamed arrays
+        # are not read again
+        results = TwoColResults(compare_metric=compare_metric)
+        sweep.sample_and_stream(total_iterations=total_iterations,
+                                writer=ResultWriter(path=stream_path),
+                                processes=processes,
+                                block_sink=results.update)
+
+        res_dict = results.to_results(
+            arrival_enum=arrival_enum,
+            number_servers=number_servers,
+            valid_iterations=results.valid_iterations)
 
     res_dict.update({
         "iterations": total_iterations,
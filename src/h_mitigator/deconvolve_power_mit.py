@@ -4,7 +4,9 @@ from math import exp, log
 
 from nc_arrivals.arrival import Arrival
 from nc_server.server import Server
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import out_of_bounds
+from utils.helper_functions import k_sig_derivative
+from utils.sigma_rho_cache import memoize_sigma_rho
 
 
 class DeconvolvePowerMit(Arrival):
@@ -19,6 +21,7 @@ class DeconvolvePowerMit(Arrival):
             self.l_power = 1.0
             # raise ParameterOutOfBounds("l must be >= 1")
 
+    @memoize_sigma_rho
     def sigma(self, theta: float) -> float:
         # here, theta can simply be replaced by l * theta
         l_theta = self.l_power * theta
@@ -33,18 +36,43 @@ class DeconvolvePowerMit(Arrival):
             return self.arr.sigma(l_theta) + self.ser.sigma(
                 l_theta) + self.arr.rho(l_theta) + k_sig
 
+    @memoize_sigma_rho
     def rho(self, theta: float) -> float:
         # here, theta can simply be replaced by l * theta
         l_theta = self.l_power * theta
 
-        if self.arr.rho(l_theta) < 0 or self.ser.rho(l_theta) < 0:
-            raise ParameterOutOfBounds("Check rho's sign")
+        # the negated comparisons also catch nan, see NanOnInfeasible
+        if not self.arr.rho(l_theta) >= 0 or not self.ser.rho(l_theta) >= 0:
+            return out_of_bounds("Check rho's sign")
 
-        if self.arr.rho(l_theta) >= self.ser.rho(l_theta):
-            raise ParameterOutOfBounds(
+        if not self.arr.rho(l_theta) < self.ser.rho(l_theta):
+            return out_of_bounds(
                 "The arrivals' rho has to be smaller than the service's rho")
 
         return self.arr.rho(l_theta)
 
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        # sigma is a function of l * theta, i.e., the derivative in l is
+        # theta / l times this derivative
+        l_theta = self.l_power * theta
+        arr_rho_derivative = self.arr.rho_derivative(l_theta)
+
+        res = self.arr.sigma_derivative(l_theta) + self.ser.sigma_derivative(
+            l_theta) + k_sig_derivative(
+                theta=l_theta,
+                rho_diff=self.arr.rho(l_theta) - self.ser.rho(l_theta),
+                rho_diff_derivative=arr_rho_derivative -
+                self.ser.rho_derivative(l_theta))
+
+        if self.arr.is_discrete():
+            return self.l_power * res
+        else:
+            return self.l_power * (res + arr_rho_derivative)
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        return self.l_power * self.arr.rho_derivative(self.l_power * theta)
+
     def is_discrete(self):
         return self.arr.is_discrete()
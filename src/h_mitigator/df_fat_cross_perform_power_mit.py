@@ -1,6 +1,6 @@
 """Compute delay standard_bound and write into csv file."""
 
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 
@@ -14,13 +14,19 @@ from nc_operations.perform_enum import PerformEnum
 from nc_server.constant_rate_server import ConstantRateServer
 from optimization.opt_method import OptMethod
 from optimization.optimize import Optimize
+from optimization.result_cache import ResultCache, optimize_cached
+from optimization.warm_start import (warm_grid_search_sweep,
+                                     warm_pattern_search_sweep)
 from utils.perform_param_list import PerformParamList
 
 
 def fat_cross_power_mit_df(
         arr_list: List[ArrivalDistribution],
-        ser_list: List[ConstantRateServer], opt_method: OptMethod,
-        perform_param_list: PerformParamList) -> pd.DataFrame:
+        ser_list: List[ConstantRateServer],
+        opt_method: OptMethod,
+        perform_param_list: PerformParamList,
+        result_cache: Optional[ResultCache] = None,
+        warm_start=False) -> pd.DataFrame:
     """Compute delay standard_bound for T in T_list and write into dataframe.
 
     Args:
@@ -28,11 +34,23 @@ def fat_cross_power_mit_df(
         ser_list: Service object list
         opt_method: PS or GS
         perform_param_list: list of performance parameter values
+        result_cache: persistent cache of the optimized bounds, None
+            computes every bound
+        warm_start: start every optimization at the previous optimum
+            (only GS or PS, without result_cache)
 
     Returns:
         dataframe
 
     """
+    if warm_start:
+        return fat_cross_power_mit_warm_df(
+            arr_list=arr_list,
+            ser_list=ser_list,
+            opt_method=opt_method,
+            perform_param_list=perform_param_list,
+            result_cache=result_cache)
+
     standard_bound = [0.0] * len(perform_param_list)
     h_mit_bound = [0.0] * len(perform_param_list)
 
@@ -43,39 +61,63 @@ def fat_cross_power_mit_df(
             perform_param=perform_param_list.get_parameter_at_i(i))
 
         if opt_method == OptMethod.GRID_SEARCH:
-            standard_bound[i] = Optimize(setting=setting,
-                                         number_param=1).grid_search(
-                                             bound_list=[(0.1, 10.0)],
-                                             delta=0.1)
-            h_mit_bound[i] = OptimizeMitigator(setting_h_mit=setting,
-                                               number_param=2).grid_search(
-                                                   bound_list=[(0.1, 5.0),
-                                                               (0.9, 10.0)],
-                                                   delta=0.05)
+            standard_bound[i] = optimize_cached(
+                result_cache,
+                Optimize(setting=setting, number_param=1),
+                "grid_search",
+                bound_list=[(0.1, 10.0)],
+                delta=0.1)
+            h_mit_bound[i] = optimize_cached(
+                result_cache,
+                OptimizeMitigator(setting_h_mit=setting, number_param=2),
+                "grid_search",
+                bound_list=[(0.1, 5.0), (0.9, 10.0)],
+                delta=0.05)
+
+        elif opt_method == OptMethod.ADAPTIVE_GRID:
+            standard_bound[i] = optimize_cached(
+                result_cache,
+                Optimize(setting=setting, number_param=1),
+                "adaptive_grid_search",
+                bound_list=[(0.1, 10.0)],
+                delta=0.1)
+            h_mit_bound[i] = optimize_cached(
+                result_cache,
+                OptimizeMitigator(setting_h_mit=setting, number_param=2),
+                "adaptive_grid_search",
+                bound_list=[(0.1, 5.0), (0.9, 10.0)],
+                delta=0.05)
 
         elif opt_method == OptMethod.PATTERN_SEARCH:
-            standard_bound[i] = Optimize(setting=setting,
-                                         number_param=1).pattern_search(
-                                             start_list=[0.5],
-                                             delta=3.0,
-                                             delta_min=0.01)
-
-            h_mit_bound[i] = OptimizeMitigator(setting_h_mit=setting,
-                                               number_param=2).pattern_search(
-                                                   start_list=[0.5, 2.0],
-                                                   delta=3.0,
-                                                   delta_min=0.01)
+            standard_bound[i] = optimize_cached(
+                result_cache,
+                Optimize(setting=setting, number_param=1),
+                "pattern_search",
+                start_list=[0.5],
+                delta=3.0,
+                delta_min=0.01)
+
+            h_mit_bound[i] = optimize_cached(
+                result_cache,
+                OptimizeMitigator(setting_h_mit=setting, number_param=2),
+                "pattern_search",
+                start_list=[0.5, 2.0],
+                delta=3.0,
+                delta_min=0.01)
 
         elif opt_method == OptMethod.GS_OLD:
-            standard_bound[i] = Optimize(setting=setting,
-                                         number_param=1).grid_search_old(
-                                             bound_list=[(0.1, 5.0)],
-                                             delta=0.1)
-            h_mit_bound[i] = OptimizeMitigator(setting_h_mit=setting,
-                                               number_param=2).grid_search_old(
-                                                   bound_list=[(0.1, 5.0),
-                                                               (0.9, 6.0)],
-                                                   delta=0.1)
+            standard_bound[i] = optimize_cached(
+                result_cache,
+                Optimize(setting=setting, number_param=1),
+                "grid_search_old",
+                bound_list=[(0.1, 5.0)],
+                delta=0.1)
+            h_mit_bound[i] = optimize_cached(
+                result_cache,
+                OptimizeMitigator(setting_h_mit=setting, number_param=2),
+                "grid_search_old",
+                bound_list=[(0.1, 5.0), (0.9, 6.0)],
+                delta=0.1)
 
         else:
             raise ValueError(
@@ -92,6 +134,65 @@ def fat_cross_power_mit_df(
     return results_df
 
 
+def fat_cross_power_mit_warm_df(
+        arr_list: List[ArrivalDistribution],
+        ser_list: List[ConstantRateServer],
+        opt_method: OptMethod,
+        perform_param_list: PerformParamList,
+        result_cache: Optional[ResultCache] = None) -> pd.DataFrame:
+    """Warm-started counterpart of fat_cross_power_mit_df, i.e., the
+    optimization of every performance parameter starts at the optimum of
+    the previous one."""
+    if result_cache is not None:
+        raise ValueError("warm start does not support a result cache")
+
+    optimizer_list = []
+    mitigator_list = []
+    for i in range(len(perform_param_list)):
+        setting = FatCrossPerform(
+            arr_list=arr_list,
+            ser_list=ser_list,
+            perform_param=perform_param_list.get_parameter_at_i(i))
+        optimizer_list.append(Optimize(setting=setting, number_param=1))
+        mitigator_list.append(
+            OptimizeMitigator(setting_h_mit=setting, number_param=2))
+
+    if opt_method == OptMethod.GRID_SEARCH:
+        standard_bound, _ = warm_grid_search_sweep(
+            optimizer_list=optimizer_list,
+            bound_list=[(0.1, 10.0)],
+            delta=0.1)
+        h_mit_bound, _ = warm_grid_search_sweep(optimizer_list=mitigator_list,
+                                                bound_list=[(0.1, 5.0),
+                                                            (0.9, 10.0)],
+                                                delta=0.05)
+
+    elif opt_method == OptMethod.PATTERN_SEARCH:
+        standard_bound, _ = warm_pattern_search_sweep(
+            optimizer_list=optimizer_list,
+            start_list=[0.5],
+            delta=3.0,
+            delta_min=0.01)
+        h_mit_bound, _ = warm_pattern_search_sweep(
+            optimizer_list=mitigator_list,
+            start_list=[0.5, 2.0],
+            delta=3.0,
+            delta_min=0.01)
+
+    else:
+        raise ValueError(
+            f"Optimization parameter {opt_method} has no warm start")
+
+    results_df = pd.DataFrame(
+        {
+            "standard_bound": standard_bound,
+            "h_mit_bound": h_mit_bound
+        },
+        index=perform_param_list.values_list)
+
+    return results_df[["standard_bound", "h_mit_bound"]]
+
+
 if __name__ == '__main__':
     DELAY_PROB_LIST = PerformParamList(perform_metric=PerformEnum.DELAY_PROB,
                                        values_list=range(4, 11))
@@ -58,6 +58,17 @@ def single_server_df(arr_list: List[ArrivalDistribution],
                                                               (0.9, 8.0)],
                                                   delta=0.05)
 
+        elif opt_method == OptMethod.ADAPTIVE_GRID:
+            standard_bound[_i] = Optimize(setting=setting,
+                                          number_param=1).adaptive_grid_search(
+                                              bound_list=[(0.1, 4.0)],
+                                              delta=0.1)
+            new_bound[_i] = OptimizeMitigator(
+                setting_h_mit=setting,
+                number_param=2).adaptive_grid_search(bound_list=[(0.1, 4.0),
+                                                                 (0.9, 8.0)],
+                                                     delta=0.05)
+
         elif opt_method == OptMethod.PATTERN_SEARCH:
             standard_bound[_i] = Optimize(setting=setting,
                                           number_param=1).pattern_search(
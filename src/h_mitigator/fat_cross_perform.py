@@ -1,20 +1,29 @@
 """Fat tree topology."""
 
+from math import nan
 from typing import List
 
+import numpy as np
+
 from h_mitigator.deconvolve_power_mit import DeconvolvePowerMit
 from h_mitigator.setting_mitigator import SettingMitigator
 from nc_arrivals.arrival import Arrival
 from nc_arrivals.arrival_distribution import ArrivalDistribution
+from nc_arrivals.theta_limit import arrival_theta_limit
 from nc_operations.arb_scheduling import LeftoverARB
-from nc_operations.single_hop_bound import single_hop_bound
 from nc_operations.operations import AggregateList, Deconvolve
+from nc_operations.operator_plan import OperatorPlanMixin
+from nc_operations.performance_bounds_derivative import (
+    bound_partials, chain_theta, single_hop_bound_gradient)
+from nc_operations.single_hop_bound import (single_hop_bound,
+                                            single_hop_bound_array,
+                                            single_hop_log_bound)
 from nc_server.server import Server
 from nc_server.server_distribution import ServerDistribution
 from utils.perform_parameter import PerformParameter
 
 
-class FatCrossPerform(SettingMitigator):
+class FatCrossPerform(OperatorPlanMixin, SettingMitigator):
     """Fat tree cross topology with the Simple topology as a sub-problem."""
     def __init__(self, arr_list: List[ArrivalDistribution],
                  ser_list: List[ServerDistribution],
@@ -29,9 +38,10 @@ class FatCrossPerform(SettingMitigator):
 
         self.number_servers = len(ser_list)
 
-    def standard_bound(self, param_list: List[float]) -> float:
-        theta = param_list[0]
-
+    def standard_s_e2e(self) -> Server:
+        """
+        :return: end-to-end service of the foi
+        """
         output_list: List[Arrival] = [
             Deconvolve(arr=self.arr_list[i], ser=self.ser_list[i])
             for i in range(1, self.number_servers)
@@ -39,16 +49,55 @@ class FatCrossPerform(SettingMitigator):
         # we use i + 1, since i = 0 is the foi
 
         aggregated_cross: Arrival = AggregateList(arr_list=output_list,
+                                                  indep=True,
                                                   p_list=[])
-        s_e2e: Server = LeftoverARB(ser=self.ser_list[0],
-                                    cross_arr=aggregated_cross)
+
+        return LeftoverARB(ser=self.ser_list[0], cross_arr=aggregated_cross)
+
+    def standard_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
 
         return single_hop_bound(foi=self.arr_list[0],
-                                s_e2e=s_e2e,
+                                s_e2e=self.standard_s_e2e(),
                                 theta=theta,
                                 perform_param=self.perform_param)
 
-    def h_mit_bound(self, param_l_list: List[float]) -> float:
+    def standard_log_bound(self, param_list: List[float]) -> float:
+        return single_hop_log_bound(foi=self.arr_list[0],
+                                    s_e2e=self.standard_s_e2e(),
+                                    theta=param_list[0],
+                                    perform_param=self.perform_param)
+
+    def standard_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        # the operator tree does not depend on theta and is compiled only once
+        plan = self.operator_plans(
+            name="standard", build_trees=lambda: [self.standard_s_e2e()])[0]
+
+        return single_hop_bound_array(foi=self.arr_list[0],
+                                      s_e2e=plan.bind(),
+                                      theta=param_array[:, 0],
+                                      perform_param=self.perform_param)
+
+    def theta_upper_bound(self, p_array: np.ndarray) -> np.ndarray:
+        plan = self.operator_plans(
+            name="standard", build_trees=lambda: [self.standard_s_e2e()])[0]
+
+        return np.full(
+            p_array.shape[0],
+            min(plan.theta_upper_bound()[0],
+                arrival_theta_limit(arr=self.arr_list[0])))
+
+    def standard_bound_gradient(self, param_list: List[float]) -> np.ndarray:
+        return single_hop_bound_gradient(foi=self.arr_list[0],
+                                         s_e2e=self.standard_s_e2e(),
+                                         theta=param_list[0],
+                                         perform_param=self.perform_param)
+
+    def h_mit_s_e2e(self, param_l_list: List[float]) -> LeftoverARB:
+        """
+        :param param_l_list: theta and Lyapunov parameters
+        :return:             end-to-end service of the foi
+        """
         output_list: List[Arrival] = [
             DeconvolvePowerMit(arr=self.arr_list[i],
                                ser=self.ser_list[i],
@@ -58,15 +107,55 @@ class FatCrossPerform(SettingMitigator):
         # we use i + 1, since i = 0 is the foi
 
         aggregated_cross: Arrival = AggregateList(arr_list=output_list,
+                                                  indep=True,
                                                   p_list=[])
-        s_e2e: Server = LeftoverARB(ser=self.ser_list[0],
-                                    cross_arr=aggregated_cross)
 
+        return LeftoverARB(ser=self.ser_list[0], cross_arr=aggregated_cross)
+
+    def h_mit_bound(self, param_l_list: List[float]) -> float:
         return single_hop_bound(foi=self.arr_list[0],
-                                s_e2e=s_e2e,
+                                s_e2e=self.h_mit_s_e2e(
+                                    param_l_list=param_l_list),
                                 theta=param_l_list[0],
                                 perform_param=self.perform_param)
 
+    def h_mit_log_bound(self, param_l_list: List[float]) -> float:
+        return single_hop_log_bound(foi=self.arr_list[0],
+                                    s_e2e=self.h_mit_s_e2e(
+                                        param_l_list=param_l_list),
+                                    theta=param_l_list[0],
+                                    perform_param=self.perform_param)
+
+    def h_mit_bound_gradient(self, param_l_list: List[float]) -> np.ndarray:
+        theta = param_l_list[0]
+        s_e2e = self.h_mit_s_e2e(param_l_list=param_l_list)
+
+        partials = bound_partials(foi=self.arr_list[0],
+                                  s_e2e=s_e2e,
+                                  theta=theta,
+                                  perform_param=self.perform_param)
+        if np.isnan(partials[0]):
+            return np.full(self.number_servers, nan)
+
+        res = np.empty(self.number_servers)
+        res[0] = chain_theta(partials=partials,
+                             foi=self.arr_list[0],
+                             s_e2e=s_e2e,
+                             theta=theta)
+
+        # the outputs are functions of l * theta, and they add to the sigma
+        # and subtract from the rho of s_e2e
+        for i, output in enumerate(s_e2e.cross_arr.arr_list, start=1):
+            if param_l_list[i] < 1.0:
+                # l is set to 1.0
+                res[i] = 0.0
+            else:
+                res[i] = theta / param_l_list[i] * (
+                    partials[1] * output.sigma_derivative(theta) -
+                    partials[3] * output.rho_derivative(theta))
+
+        return res
+
     def approximate_utilization(self) -> float:
         sum_average_rates = 0.0
         for arrival in self.arr_list:
@@ -1,6 +1,6 @@
 """Optimize theta and all Lyapunov l's"""
 
-from math import inf
+from math import inf, nan
 from typing import List
 
 import numpy as np
@@ -10,32 +10,55 @@ from optimization.initial_simplex import InitialSimplex
 from optimization.nelder_mead_parameters import NelderMeadParameters
 from optimization.optimize import Optimize
 from utils.exceptions import ParameterOutOfBounds
+from utils.sigma_rho_cache import invalidate_sigma_rho_cache
 
 
 class OptimizeMitigator(Optimize):
     """Optimize class"""
+    # infeasible_exceptions of Optimize without ValueError
+    infeasible_exceptions = (OverflowError, ParameterOutOfBounds)
+
     def __init__(self,
                  setting_h_mit: SettingMitigator,
                  number_param: int,
-                 print_x=False) -> None:
+                 print_x=False,
+                 log_domain=False) -> None:
         super().__init__(setting=setting_h_mit,
                          number_param=number_param,
-                         print_x=print_x)
+                         print_x=print_x,
+                         log_domain=log_domain)
         self.setting_h_mit = setting_h_mit
         self.number_param = number_param
         self.print_x = print_x
 
-    def eval_except(self, param_list: List[float]) -> float:
-        """
-        Shortens the exception handling and case distinction in a small method.
+    def _bound(self, param_list: List[float]) -> float:
+        return self.setting_h_mit.h_mit_bound(param_l_list=param_list)
+
+    def _log_bound(self, param_list: List[float]) -> float:
+        return self.setting_h_mit.h_mit_log_bound(param_l_list=param_list)
+
+    def _bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        return self.setting_h_mit.h_mit_bound_array(param_array=param_array)
+
+    def eval_gradient(self, param_list: List[float]) -> np.ndarray:
+        invalidate_sigma_rho_cache()
+        self.stats.gradients += 1
 
-        :param param_list: theta parameter and Lyapunov parameters l_i
-        :return:           function to_value
-        """
         try:
-            return self.setting_h_mit.h_mit_bound(param_l_list=param_list)
+            gradient = self.setting_h_mit.h_mit_bound_gradient(
+                param_l_list=param_list)
+            if self.log_domain:
+                # gradient of the log-bound
+                gradient = gradient / self.setting_h_mit.h_mit_bound(
+                    param_l_list=param_list)
         except (ParameterOutOfBounds, OverflowError):
-            return inf
+            return np.full(len(param_list), nan)
+
+        return gradient
+
+    def theta_upper_bound(self, param_array: np.ndarray) -> np.ndarray:
+        # no feasibility oracle for the h_mit_bound
+        return np.full(param_array.shape[0], inf)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,11 @@
 """Implements new Lyapunov Output Bound"""
 
-from math import exp, inf
+from math import exp, inf, nan
 from warnings import warn
 
 from nc_arrivals.arrival import Arrival
 from nc_operations.get_sigma_rho import get_sigma_rho
+from nc_operations.performance_bounds_log import log_one_minus_exp
 from nc_operations.stability_check import stability_check
 from nc_server.server import Server
 
@@ -21,7 +22,9 @@ def output_power_mit(arr: Arrival,
 
     l_theta = l_power * theta
 
-    stability_check(arr=arr, ser=ser, theta=l_theta, indep=True)
+    if not stability_check(arr=arr, ser=ser, theta=l_theta, indep=True):
+        return nan
+
     sigma_l_sum, rho_l_diff = get_sigma_rho(arr=arr,
                                             ser=ser,
                                             theta=l_theta,
@@ -56,7 +59,9 @@ def delay_prob_power_mit(arr: Arrival,
 
     l_theta = l_power * theta
 
-    stability_check(arr=arr, ser=ser, theta=l_theta, indep=True)
+    if not stability_check(arr=arr, ser=ser, theta=l_theta, indep=True):
+        return nan
+
     sigma_l_sum, rho_l_diff = get_sigma_rho(arr=arr,
                                             ser=ser,
                                             theta=l_theta,
@@ -74,3 +79,61 @@ def delay_prob_power_mit(arr: Arrival,
 
     except ZeroDivisionError:
         return inf
+
+
+def log_output_power_mit(arr: Arrival,
+                         ser: Server,
+                         theta: float,
+                         delta_time: int,
+                         l_power=1.0) -> float:
+    """Logarithm of output_power_mit"""
+    if l_power < 1.0:
+        l_power = 1.0
+
+    l_theta = l_power * theta
+
+    if not stability_check(arr=arr, ser=ser, theta=l_theta, indep=True):
+        return nan
+
+    sigma_l_sum, rho_l_diff = get_sigma_rho(arr=arr,
+                                            ser=ser,
+                                            theta=l_theta,
+                                            indep=True)
+
+    if arr.is_discrete():
+        log_numerator = theta * arr.rho(
+            theta=l_theta) * delta_time + theta * sigma_l_sum
+
+    else:
+        log_numerator = theta * arr.rho(
+            theta=l_theta) * (delta_time + 1) + theta * sigma_l_sum
+
+    return log_numerator - log_one_minus_exp(l_theta * rho_l_diff) / l_power
+
+
+def log_delay_prob_power_mit(arr: Arrival,
+                             ser: Server,
+                             theta: float,
+                             delay: int,
+                             l_power=1.0) -> float:
+    """Logarithm of delay_prob_power_mit"""
+    if l_power < 1.0:
+        l_power = 1.0
+
+    l_theta = l_power * theta
+
+    if not stability_check(arr=arr, ser=ser, theta=l_theta, indep=True):
+        return nan
+
+    sigma_l_sum, rho_l_diff = get_sigma_rho(arr=arr,
+                                            ser=ser,
+                                            theta=l_theta,
+                                            indep=True)
+
+    if not arr.is_discrete():
+        warn("discretized version is not implemented")
+
+    log_numerator = -theta * ser.rho(
+        theta=l_theta) * delay + theta * sigma_l_sum
+
+    return log_numerator - log_one_minus_exp(l_theta * rho_l_diff) / l_power
@@ -3,6 +3,9 @@
 from abc import abstractmethod
 from typing import List
 
+import numpy as np
+
+from utils.helper_functions import evaluate_rows, log_of_bound
 from utils.setting import Setting
 
 
@@ -16,3 +19,31 @@ class SettingMitigator(Setting):
         :param param_l_list: theta and Lyapunov parameters
         """
         pass
+
+    def h_mit_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        new Lyapunov standard_bound for many parameter sets at once
+
+        :param param_array: one row of theta and Lyapunov parameters per point
+        """
+        return evaluate_rows(fun=self.h_mit_bound, param_array=param_array)
+
+    def h_mit_log_bound(self, param_l_list: List[float]) -> float:
+        """
+        Logarithm of the new Lyapunov standard_bound. Override this method
+        with a log-domain evaluation that does not overflow.
+
+        :param param_l_list: theta and Lyapunov parameters
+        """
+        return log_of_bound(self.h_mit_bound(param_l_list=param_l_list))
+
+    def h_mit_bound_gradient(self, param_l_list: List[float]) -> np.ndarray:
+        """
+        Analytic gradient of the new Lyapunov standard_bound, nan if
+        infeasible. Override this method to replace the finite differences
+        of the gradient-based optimizers.
+
+        :param param_l_list: theta and Lyapunov parameters
+        """
+        raise NotImplementedError(
+            f"{self.to_name()} has no analytic gradient")
@@ -2,13 +2,20 @@
 
 from typing import List
 
-from h_mitigator.performance_bounds_power_mit import (delay_prob_power_mit,
-                                                      output_power_mit)
+import numpy as np
+
+from h_mitigator.performance_bounds_power_mit import (
+    delay_prob_power_mit, log_delay_prob_power_mit, log_output_power_mit,
+    output_power_mit)
 from h_mitigator.setting_mitigator import SettingMitigator
 from nc_arrivals.arrival_distribution import ArrivalDistribution
 from nc_arrivals.qt import DM1
-from nc_operations.single_hop_bound import single_hop_bound
 from nc_operations.perform_enum import PerformEnum
+from nc_operations.performance_bounds_derivative import (
+    single_hop_bound_gradient)
+from nc_operations.single_hop_bound import (single_hop_bound,
+                                            single_hop_bound_array,
+                                            single_hop_log_bound)
 from nc_server.constant_rate_server import ConstantRateServer
 from utils.perform_parameter import PerformParameter
 
@@ -47,6 +54,51 @@ class SingleServerMitPerform(SettingMitigator):
                                 indep=self.indep,
                                 p=p)
 
+    def standard_log_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
+
+        if self.indep:
+            p = 1.0
+        else:
+            p = param_list[1]
+
+        return single_hop_log_bound(foi=self.arr_list[0],
+                                    s_e2e=self.server,
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    indep=self.indep,
+                                    p=p)
+
+    def standard_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        theta = param_array[:, 0]
+
+        if self.indep:
+            p = 1.0
+        else:
+            p = param_array[:, 1]
+
+        return single_hop_bound_array(foi=self.arr_list[0],
+                                      s_e2e=self.server,
+                                      theta=theta,
+                                      perform_param=self.perform_param,
+                                      indep=self.indep,
+                                      p=p)
+
+    def standard_bound_gradient(self, param_list: List[float]) -> np.ndarray:
+        theta = param_list[0]
+
+        if self.indep:
+            p = 1.0
+        else:
+            p = param_list[1]
+
+        return single_hop_bound_gradient(foi=self.arr_list[0],
+                                         s_e2e=self.server,
+                                         theta=theta,
+                                         perform_param=self.perform_param,
+                                         indep=self.indep,
+                                         p=p)
+
     def h_mit_bound(self, param_l_list: List[float]) -> float:
         if not self.indep:
             raise NotImplementedError
@@ -70,6 +122,29 @@ class SingleServerMitPerform(SettingMitigator):
                 f"{self.perform_param.perform_metric} is "
                 f"not implemented")
 
+    def h_mit_log_bound(self, param_l_list: List[float]) -> float:
+        if not self.indep:
+            raise NotImplementedError
+
+        if self.perform_param.perform_metric == PerformEnum.OUTPUT:
+            return log_output_power_mit(arr=self.arr_list[0],
+                                        ser=self.server,
+                                        theta=param_l_list[0],
+                                        delta_time=self.perform_param.value,
+                                        l_power=param_l_list[1])
+
+        elif self.perform_param.perform_metric == PerformEnum.DELAY_PROB:
+            return log_delay_prob_power_mit(arr=self.arr_list[0],
+                                            ser=self.server,
+                                            theta=param_l_list[0],
+                                            delay=self.perform_param.value,
+                                            l_power=param_l_list[1])
+
+        else:
+            raise NotImplementedError(
+                f"{self.perform_param.perform_metric} is "
+                f"not implemented")
+
     def approximate_utilization(self) -> float:
         sum_average_rates = 0.0
         for arrival in self.arr_list:
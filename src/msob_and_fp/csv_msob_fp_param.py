@@ -1,27 +1,29 @@
 """Compute optimal and average improvement for different parameters."""
 
 import csv
+import os
+from functools import partial
 from math import inf
+from typing import Optional
 from warnings import warn
 
 import numpy as np
-from tqdm import tqdm
 
 from bound_evaluation.change_enum import ChangeEnum
 from bound_evaluation.manipulate_data import remove_full_nan_rows
+from bound_evaluation.checkpoint import SweepCheckpoint
 from bound_evaluation.mc_enum import MCEnum
-from bound_evaluation.mc_enum_to_dist import mc_enum_to_dist
 from bound_evaluation.monte_carlo_dist import MonteCarloDist
+from bound_evaluation.parameter_sweep import ParameterSweep
+from bound_evaluation.result_writer import ResultWriter
 from msob_and_fp.compare_avoid_dep import (compare_avoid_dep_211,
                                            compare_avoid_dep_212)
-from msob_and_fp.msob_fp_array_to_results import msob_fp_array_to_results
+from msob_and_fp.msob_fp_array_to_results import (MSOBFPResults,
+                                                   msob_fp_array_to_results)
 from msob_and_fp.overlapping_tandem_perform import OverlappingTandemPerform
 from msob_and_fp.square_perform import SquarePerform
 from nc_arrivals.arrival_enum import ArrivalEnum
-from nc_arrivals.markov_modulated import MMOODisc, MMOOFluid
-from nc_arrivals.qt import DM1, MD1
 from nc_operations.perform_enum import PerformEnum
-from nc_server.constant_rate_server import ConstantRateServer
 from optimization.opt_method import OptMethod
 from utils.exceptions import NotEnoughResults
 from utils.perform_parameter import PerformParameter
@@ -31,107 +33,36 @@ from utils.perform_parameter import PerformParameter
 ########################################################################
 
 
-def csv_msob_fp_param(name: str,
-                      number_flows: int,
-                      number_servers: int,
-                      arrival_enum: ArrivalEnum,
-                      perform_param: PerformParameter,
-                      opt_method: OptMethod,
-                      mc_dist: MonteCarloDist,
-                      comparator: callable,
-                      compare_metric: ChangeEnum,
-                      total_iterations: int,
-                      target_util: float,
-                      filter_standard_inf=False) -> dict:
-    """Chooses parameters by Monte Carlo type random choice."""
-    param_array = mc_enum_to_dist(arrival_enum=arrival_enum,
-                                  mc_dist=mc_dist,
-                                  number_flows=number_flows,
-                                  number_servers=number_servers,
-                                  total_iterations=total_iterations)
-
-    res_array = np.empty([total_iterations, 3])
-    # 3 approaches to compare
+MSOB_FP_SETTINGS = {
+    "overlapping_tandem": OverlappingTandemPerform,
+    "square": SquarePerform
+}
+
+
+def filter_msob_fp_row(res_row: np.ndarray, perform_param: PerformParameter,
+                       filter_standard_inf: bool) -> np.ndarray:
+    """
+    :param res_row:             standard, server and fp bound
+    :param perform_param:       performance parameter
+    :param filter_standard_inf: write nan if the standard bound is inf
+    :return:                    row, all nan if it is not valid
+    """
+    if (perform_param.perform_metric == PerformEnum.DELAY_PROB
+            and np.nanmin(res_row) > 1.0):
+        # np.nanmin(res_row) is the smallest value
+        res_row[:] = np.nan
+    elif np.nanmin(res_row) == inf:
+        res_row[:] = np.nan
+
+    if filter_standard_inf and res_row[0] == inf:
+        res_row[:] = np.nan
+
+    return res_row
 
-    for i in tqdm(range(total_iterations), total=total_iterations):
-        if arrival_enum == ArrivalEnum.DM1:
-            arr_list = [
-                DM1(lamb=param_array[i, j]) for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MD1:
-            arr_list = [
-                MD1(lamb=param_array[i, j], mu=1.0)
-                for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MMOODisc:
-            arr_list = [
-                MMOODisc(stay_on=param_array[i, j],
-                         stay_off=param_array[i, number_flows + j],
-                         peak_rate=param_array[i, 2 * number_flows + j])
-                for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MMOOFluid:
-            arr_list = [
-                MMOOFluid(mu=param_array[i, j],
-                          lamb=param_array[i, number_flows + j],
-                          peak_rate=param_array[i, 2 * number_flows + j])
-                for j in range(number_flows)
-            ]
-
-        else:
-            raise NotImplementedError(f"Arrival parameter {arrival_enum.name} "
-                                      f"is infeasible")
-
-        ser_list = [
-            ConstantRateServer(
-                rate=param_array[i,
-                                 arrival_enum.number_parameters() *
-                                 number_flows + j])
-            for j in range(number_servers)
-        ]
-
-        if name == "overlapping_tandem":
-            setting = OverlappingTandemPerform(arr_list=arr_list,
-                                               ser_list=ser_list,
-                                               perform_param=perform_param)
-
-        elif name == "square":
-            setting = SquarePerform(arr_list=arr_list,
-                                    ser_list=ser_list,
-                                    perform_param=perform_param)
-
-        else:
-            raise NotImplementedError("this topology is not implemented")
-
-        computation_necessary = True
-
-        if target_util > 0.0:
-            util = setting.approximate_utilization()
-            if util < target_util or util > 1:
-                res_array[i, ] = np.nan
-                computation_necessary = False
-
-        if computation_necessary:
-            # standard_bound, server_bound, fp_bound = compare_avoid_dep()
-            res_array[i, 0], res_array[i, 1], res_array[i, 2] = comparator(
-                setting=setting)
-
-            if (perform_param.perform_metric == PerformEnum.DELAY_PROB
-                    and np.nanmin(res_array[i, ]) > 1.0):
-                # np.nanmin(res_array[i, ]) is the smallest value
-                res_array[i, ] = np.nan
-            elif np.nanmin(res_array[i, ]) == inf:
-                res_array[i, ] = np.nan
-
-            if filter_standard_inf and res_array[i, 0] == inf:
-                res_array[i, ] = np.nan
-
-    res_array_no_full_nan = remove_full_nan_rows(full_array=res_array)
-    valid_iterations = res_array_no_full_nan.shape[0]
 
+def check_valid_iterations(valid_iterations: int,
+                           total_iterations: int) -> None:
+    """Warns about many and raises for too many invalid rows"""
     if valid_iterations < total_iterations * 0.2:
         warn(f"Many nan's: {total_iterations - valid_iterations} nans "
              f"out of {total_iterations}!")
@@ -139,6 +70,11 @@ def csv_msob_fp_param(name: str,
         if valid_iterations < 100:
             raise NotEnoughResults("result is useless")
 
+
+def res_array_name(name: str, arrival_enum: ArrivalEnum,
+                   perform_param: PerformParameter, valid_iterations: int,
+                   filter_standard_inf: bool) -> str:
+    """File name of the valid rows of the result array"""
     res_name = name
     res_name += f"_res_array_{perform_param.to_name()}_" \
         f"{arrival_enum.name}_validiter_{valid_iterations}"
@@ -146,18 +82,132 @@ def csv_msob_fp_param(name: str,
     if filter_standard_inf:
         res_name += "_filter_standard_inf"
 
-    np.savetxt(fname=res_name + ".csv", X=res_array_no_full_nan, delimiter=",")
-
-    res_dict = msob_fp_array_to_results(title=name,
-                                        arrival_enum=arrival_enum,
-                                        perform_param=perform_param,
-                                        opt_method=opt_method,
-                                        mc_dist=mc_dist,
-                                        param_array=param_array,
-                                        res_array=res_array,
-                                        number_flows=number_flows,
-                                        number_servers=number_servers,
-                                        compare_metric=compare_metric)
+    return res_name
+
+
+def csv_msob_fp_param(name: str,
+                      number_flows: int,
+                      number_servers: int,
+                      arrival_enum: ArrivalEnum,
+                      perform_param: PerformParameter,
+                      opt_method: OptMethod,
+                      mc_dist: MonteCarloDist,
+                      comparator: callable,
+                      compare_metric: ChangeEnum,
+                      total_iterations: int,
+                      target_util: float,
+                      filter_standard_inf=False,
+                      processes=1,
+                      checkpoint_path: Optional[str] = None,
+                      seed: Optional[int] = None,
+                      stream_path: Optional[str] = None) -> dict:
+    """
+    Chooses parameters by Monte Carlo type random choice.
+
+    :param processes:       number of worker processes, None uses all cores
+    :param checkpoint_path: file to checkpoint and resume the sweep, None
+                            keeps everything in memory
+    :param seed:            seed of the Generator streams, None uses the
+                            global np.random state
+    :param stream_path:     prefix of the files that the sweep is written to
+                            block by block instead of keeping it in memory
+    """
+    if name not in MSOB_FP_SETTINGS:
+        raise NotImplementedError("this topology is not implemented")
+
+    if stream_path is not None and checkpoint_path is not None:
+        raise ValueError("a streamed sweep cannot be checkpointed, "
+                         "set either stream_path or checkpoint_path")
+
+    sweep = ParameterSweep(setting_factory=MSOB_FP_SETTINGS[name],
+                           comparator=comparator,
+                           arrival_enum=arrival_enum,
+                           number_flows=number_flows,
+                           number_servers=number_servers,
+                           perform_param=perform_param,
+                           mc_dist=mc_dist,
+                           number_results=3,
+                           target_util=target_util,
+                           row_filter=partial(
+                               filter_msob_fp_row,
+                               perform_param=perform_param,
+                               filter_standard_inf=filter_standard_inf),
+                           seed=seed)
+    # 3 approaches to compare
+
+    if stream_path is None:
+        param_array, res_array = sweep.sample_and_run(
+            total_iterations=total_iterations,
+            processes=processes,
+            checkpoint=None if checkpoint_path is None else SweepCheckpoint(
+                path=checkpoint_path))
+
+        res_array_no_full_nan = remove_full_nan_rows(full_array=res_array)
+        valid_iterations = res_array_no_full_nan.shape[0]
+
+        check_valid_iterations(valid_iterations=valid_iterations,
+                               total_iterations=total_iterations)
+
+        res_name = res_array_name(name=name,
+                                  arrival_enum=arrival_enum,
+                                  perform_param=perform_param,
+                                  valid_iterations=valid_iterations,
+                                  filter_standard_inf=filter_standard_inf)
+        np.savetxt(fname=res_name + ".csv",
+                   X=res_array_no_full_nan,
+                   delimiter=",")
+
+        res_dict = msob_fp_array_to_results(title=name,
+                                            arrival_enum=arrival_enum,
+                                            perform_param=perform_param,
+                                            opt_method=opt_method,
+                                            mc_dist=mc_dist,
+                                            param_array=param_array,
+                                            res_array=res_array,
+                                            number_flows=number_flows,
+                                            number_servers=number_servers,
+                                            compare_metric=compare_metric)
+
+    else:
+        # the statistics and the csv of the valid rows are updated per
+        # block, i.e., the streamed arrays are not read again
+        results = MSOBFPResults(compare_metric=compare_metric,
+                                perform_param=perform_param)
+        # the number of valid rows, i.e., the file name, is known at the end
+        partial_csv_name = stream_path + "_res_array.csv"
+
+        with open(partial_csv_name, 'w') as res_file:
+
+            def update_block(start: int, param_block: np.ndarray,
+                             res_block: np.ndarray) -> None:
+                results.update(start=start,
+                               param_block=param_block,
+                               res_block=res_block)
+                np.savetxt(fname=res_file,
+                           X=remove_full_nan_rows(full_array=res_block),
+                           delimiter=",")
+
+            sweep.sample_and_stream(total_iterations=total_iterations,
+                                    writer=ResultWriter(path=stream_path),
+                                    processes=processes,
+                                    block_sink=update_block)
+
+        check_valid_iterations(valid_iterations=results.valid_iterations,
+                               total_iterations=total_iterations)
+
+        res_name = res_array_name(name=name,
+                                  arrival_enum=arrival_enum,
+                                  perform_param=perform_param,
+                                  valid_iterations=results.valid_iterations,
+                                  filter_standard_inf=filter_standard_inf)
+        os.replace(partial_csv_name, res_name + ".csv")
+
+        res_dict = results.to_results(title=name,
+                                      arrival_enum=arrival_enum,
+                                      opt_method=opt_method,
+                                      mc_dist=mc_dist,
+                                      number_flows=number_flows,
+                                      number_servers=number_servers)
 
     res_dict.update({
         "iterations": total_iterations,
@@ -1,23 +1,21 @@
 """Compute optimal and average improvement for different parameters."""
 
 import csv
+from functools import partial
+from typing import Optional
 
 import numpy as np
-from tqdm import tqdm
 
 from bound_evaluation.change_enum import ChangeEnum
+from bound_evaluation.checkpoint import SweepCheckpoint
 from bound_evaluation.mc_enum import MCEnum
-from bound_evaluation.mc_enum_to_dist import mc_enum_to_dist
 from bound_evaluation.monte_carlo_dist import MonteCarloDist
+from bound_evaluation.parameter_sweep import ParameterSweep
 from msob_and_fp.compare_avoid_dep import compare_time_211, compare_time_212
+from msob_and_fp.csv_msob_fp_param import MSOB_FP_SETTINGS
 from msob_and_fp.msob_fp_array_to_results import time_array_to_results
-from msob_and_fp.overlapping_tandem_perform import OverlappingTandemPerform
-from msob_and_fp.square_perform import SquarePerform
 from nc_arrivals.arrival_enum import ArrivalEnum
-from nc_arrivals.markov_modulated import MMOODisc, MMOOFluid
-from nc_arrivals.qt import DM1, MD1
 from nc_operations.perform_enum import PerformEnum
-from nc_server.constant_rate_server import ConstantRateServer
 from optimization.opt_method import OptMethod
 from utils.perform_parameter import PerformParameter
 
@@ -26,90 +24,70 @@ from utils.perform_parameter import PerformParameter
 ########################################################################
 
 
-def csv_msob_fp_time(name: str, number_flows: int, number_servers: int,
+def filter_msob_fp_time_row(time_row: np.ndarray,
+                            perform_param: PerformParameter) -> np.ndarray:
+    """
+    :param time_row:      computation times of the 3 approaches
+    :param perform_param: performance parameter
+    :return:              row, all nan if it is not valid
+    """
+    if (perform_param.perform_metric == PerformEnum.DELAY_PROB
+            and np.nanmin(time_row) > 1.0):
+        # np.nanmin(time_row) is the smallest value
+        time_row[:] = np.nan
+
+    return time_row
+
+
+def csv_msob_fp_time(name: str,
+                     number_flows: int,
+                     number_servers: int,
                      arrival_enum: ArrivalEnum,
-                     perform_param: PerformParameter, opt_method: OptMethod,
-                     mc_dist: MonteCarloDist, comparator: callable,
-                     total_iterations: int, target_util: float) -> dict:
-    """Chooses parameters by Monte Carlo type random choice."""
-
-    param_array = mc_enum_to_dist(arrival_enum=arrival_enum,
-                                  mc_dist=mc_dist,
-                                  number_flows=number_flows,
-                                  number_servers=number_servers,
-                                  total_iterations=total_iterations)
-
-    time_array = np.empty([total_iterations, 3])
+                     perform_param: PerformParameter,
+                     opt_method: OptMethod,
+                     mc_dist: MonteCarloDist,
+                     comparator: callable,
+                     total_iterations: int,
+                     target_util: float,
+                     processes=1,
+                     checkpoint_path: Optional[str] = None,
+                     seed: Optional[int] = None) -> dict:
+    """
+    Chooses parameters by Monte Carlo type random choice.
+
+    :param processes:       only 1, parallel workers compete for the cores
+                            and distort the measured times
+    :param checkpoint_path: file to checkpoint and resume the sweep, None
+                            keeps everything in memory
+    :param seed:            seed of the Generator streams, None uses the
+                            global np.random state
+    """
+    if name not in MSOB_FP_SETTINGS:
+        raise NotImplementedError("this topology is not implemented")
+
+    if processes != 1:
+        raise ValueError("the computation times are measured "
+                         "sequentially, set processes=1")
+
+    sweep = ParameterSweep(setting_factory=MSOB_FP_SETTINGS[name],
+                           comparator=comparator,
+                           arrival_enum=arrival_enum,
+                           number_flows=number_flows,
+                           number_servers=number_servers,
+                           perform_param=perform_param,
+                           mc_dist=mc_dist,
+                           number_results=3,
+                           target_util=target_util,
+                           row_filter=partial(filter_msob_fp_time_row,
+                                              perform_param=perform_param),
+                           seed=seed)
     # 3 approaches to compare
 
-    for i in tqdm(range(total_iterations), total=total_iterations):
-        if arrival_enum == ArrivalEnum.DM1:
-            arr_list = [
-                DM1(lamb=param_array[i, j]) for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MD1:
-            arr_list = [
-                MD1(lamb=param_array[i, j], mu=1.0)
-                for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MMOODisc:
-            arr_list = [
-                MMOODisc(stay_on=param_array[i, j],
-                         stay_off=param_array[i, number_flows + j],
-                         peak_rate=param_array[i, 2 * number_flows + j])
-                for j in range(number_flows)
-            ]
-
-        elif arrival_enum == ArrivalEnum.MMOOFluid:
-            arr_list = [
-                MMOOFluid(mu=param_array[i, j],
-                          lamb=param_array[i, number_flows + j],
-                          peak_rate=param_array[i, 2 * number_flows + j])
-                for j in range(number_flows)
-            ]
-
-        else:
-            raise NotImplementedError(f"Arrival parameter {arrival_enum.name} "
-                                      f"is infeasible")
-
-        ser_list = [
-            ConstantRateServer(
-                rate=param_array[i,
-                                 arrival_enum.number_parameters() *
-                                 number_flows + j])
-            for j in range(number_servers)
-        ]
-
-        if name == "overlapping_tandem":
-            setting = OverlappingTandemPerform(arr_list=arr_list,
-                                               ser_list=ser_list,
-                                               perform_param=perform_param)
-        elif name == "square":
-            setting = SquarePerform(arr_list=arr_list,
-                                    ser_list=ser_list,
-                                    perform_param=perform_param)
-        else:
-            raise NotImplementedError("this topology is not implemented")
-
-        computation_necessary = True
-
-        if target_util > 0.0:
-            util = setting.approximate_utilization()
-            if util < target_util or util > 1:
-                time_array[i, ] = np.nan
-                computation_necessary = False
-
-        if computation_necessary:
-            # standard_bound, server_bound, fp_bound = compare_avoid_dep()
-            time_array[i, 0], time_array[i, 1], time_array[i, 2] = comparator(
-                setting=setting)
-
-            if (perform_param.perform_metric == PerformEnum.DELAY_PROB
-                    and np.nanmin(time_array[i, ]) > 1.0):
-                # np.nanmin(time_array[i, ]) is the smallest value
-                time_array[i, ] = np.nan
+    param_array, time_array = sweep.sample_and_run(
+        total_iterations=total_iterations,
+        processes=processes,
+        checkpoint=None if checkpoint_path is None else SweepCheckpoint(
+            path=checkpoint_path))
 
     time_dict = time_array_to_results(title=name, time_array=time_array)
 
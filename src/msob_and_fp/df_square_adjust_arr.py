@@ -1,6 +1,6 @@
 """Compute performance bounds and creates a data frames."""
 
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 
@@ -14,12 +14,16 @@ from nc_arrivals.markov_modulated import MMOOFluid
 from nc_operations.perform_enum import PerformEnum
 from nc_server.constant_rate_server import ConstantRateServer
 from optimization.optimize import Optimize
+from optimization.result_cache import ResultCache, optimize_cached
 from utils.perform_parameter import PerformParameter
 
 
 def square_adjust_arr_df(list_arr_list: List[List[ArrivalDistribution]],
-                         ser_list: List[ConstantRateServer], server_index: int,
-                         perform_param: PerformParameter) -> pd.DataFrame:
+                         ser_list: List[ConstantRateServer],
+                         server_index: int,
+                         perform_param: PerformParameter,
+                         result_cache: Optional[ResultCache] = None
+                         ) -> pd.DataFrame:
     """Compute delay standard_bound for T in T_list and write into dataframe.
 
     Args:
@@ -27,6 +31,8 @@ def square_adjust_arr_df(list_arr_list: List[List[ArrivalDistribution]],
         ser_list: Service object list
         server_index: index of the server to be analyzed
         perform_param: performance parameter
+        result_cache: persistent cache of the optimized bounds, None
+            computes every bound
 
     Returns:
         dataframe
@@ -47,18 +53,26 @@ def square_adjust_arr_df(list_arr_list: List[List[ArrivalDistribution]],
                                                    ser_list=ser_list,
                                                    perform_param=perform_param)
 
-        standard_bound[i] = Optimize(setting=overlapping_tandem_setting,
-                                     number_param=2).grid_search(
-                                         bound_list=two_param_bounds,
-                                         delta=delta_val)
-        server_bound[i] = OptimizeServerBound(
-            setting_msob_fp=overlapping_tandem_setting,
-            number_param=1).grid_search(bound_list=one_param_bounds,
-                                        delta=delta_val)
-        fp_bound[i] = OptimizeFPBound(
-            setting_msob_fp=overlapping_tandem_setting,
-            number_param=2).grid_search(bound_list=two_param_bounds,
-                                        delta=delta_val)
+        standard_bound[i] = optimize_cached(
+            result_cache,
+            Optimize(setting=overlapping_tandem_setting, number_param=2),
+            "grid_search",
+            bound_list=two_param_bounds,
+            delta=delta_val)
+        server_bound[i] = optimize_cached(
+            result_cache,
+            OptimizeServerBound(setting_msob_fp=overlapping_tandem_setting,
+                                number_param=1),
+            "grid_search",
+            bound_list=one_param_bounds,
+            delta=delta_val)
+        fp_bound[i] = optimize_cached(
+            result_cache,
+            OptimizeFPBound(setting_msob_fp=overlapping_tandem_setting,
+                            number_param=2),
+            "grid_search",
+            bound_list=two_param_bounds,
+            delta=delta_val)
 
         utilizations[i] = overlapping_tandem_setting.server_util(
             server_index=server_index)
@@ -2,12 +2,14 @@
 
 import csv
 from math import inf
+from typing import Optional
 
 import numpy as np
 
 from bound_evaluation.change_enum import ChangeEnum
 from bound_evaluation.manipulate_data import remove_full_nan_rows
 from bound_evaluation.monte_carlo_dist import MonteCarloDist
+from bound_evaluation.running_stats import MEDIAN_SAMPLE_SIZE, RunningStats
 from nc_arrivals.arrival_enum import ArrivalEnum
 from nc_operations.perform_enum import PerformEnum
 from optimization.opt_method import OptMethod
@@ -15,6 +17,233 @@ from utils.exceptions import IllegalArgumentError
 from utils.perform_parameter import PerformParameter
 
 
+class MSOBFPResults(object):
+    """
+    Statistics of msob_fp_array_to_results that are updated block by block,
+    e.g., while a sweep is streamed to disk, i.e., the result array is never
+    read as a whole.
+    """
+    def __init__(self,
+                 compare_metric: ChangeEnum,
+                 perform_param: PerformParameter,
+                 sample_size: Optional[int] = MEDIAN_SAMPLE_SIZE) -> None:
+        """
+        :param compare_metric: metric of the change w.r.t. the standard bound
+        :param perform_param:  performance parameter
+        :param sample_size:    see RunningStats, None for the exact median
+        """
+        if compare_metric not in (ChangeEnum.RATIO_REF_NEW,
+                                  ChangeEnum.RATIO_NEW_REF,
+                                  ChangeEnum.RELATIVE_CHANGE):
+            raise NotImplementedError(
+                f"Metric={compare_metric.name} is not implemented")
+
+        self.compare_metric = compare_metric
+        self.perform_param = perform_param
+
+        self.server_bound = RunningStats(sample_size=sample_size)
+        self.pmoo_fp = RunningStats(sample_size=sample_size)
+        self.improved_server_bound = RunningStats(sample_size=sample_size)
+        self.improved_pmoo_fp = RunningStats(sample_size=sample_size)
+
+        self.iterations = 0
+        self.valid_iterations = 0
+        # standard bound, server bound, PMOO_FP
+        self.number_valid = np.zeros(3, dtype=int)
+        self.number_improved = np.zeros(3, dtype=int)
+        self.number_best = np.zeros(3, dtype=int)
+
+    def _change_vec(self, res_block: np.ndarray, column: int) -> np.ndarray:
+        if self.compare_metric == ChangeEnum.RATIO_REF_NEW:
+            return np.divide(res_block[:, 0], res_block[:, column])
+
+        if self.compare_metric == ChangeEnum.RATIO_NEW_REF:
+            return np.divide(res_block[:, column], res_block[:, 0])
+
+        abs_vec = np.subtract(res_block[:, 0], res_block[:, column])
+        return np.divide(abs_vec, res_block[:, 0])
+
+    def update(self, start: int, param_block: np.ndarray,
+               res_block: np.ndarray) -> None:
+        """
+        :param start:       index of the first row of the block
+        :param param_block: rows of the parameter array
+        :param res_block:   the corresponding result rows
+        """
+        if res_block.shape[1] != 3:
+            raise IllegalArgumentError(f"Array must have 3 columns,"
+                                       f"not {res_block.shape[1]}")
+
+        with np.errstate(all='warn'):
+            change_vec_server_bound = self._change_vec(res_block=res_block,
+                                                       column=1)
+            change_vec_pmoo_fp = self._change_vec(res_block=res_block,
+                                                  column=2)
+
+        self.server_bound.update(values=change_vec_server_bound,
+                                 start=start,
+                                 rows=param_block)
+        self.pmoo_fp.update(values=change_vec_pmoo_fp,
+                            start=start,
+                            rows=param_block)
+        self.improved_server_bound.update(
+            values=change_vec_server_bound[res_block[:, 0] > res_block[:, 1]],
+            start=start)
+        self.improved_pmoo_fp.update(
+            values=change_vec_pmoo_fp[res_block[:, 0] > res_block[:, 2]],
+            start=start)
+
+        res_block_no_full_nan = remove_full_nan_rows(full_array=res_block)
+
+        if (self.perform_param.perform_metric == PerformEnum.DELAY_PROB
+                or self.perform_param.perform_metric
+                == PerformEnum.BACKLOG_PROB):
+            self.number_valid += np.sum(res_block_no_full_nan < 1, axis=0)
+        else:
+            self.number_valid += np.sum(res_block_no_full_nan < inf, axis=0)
+
+        self.number_improved[1:] += np.sum(
+            res_block_no_full_nan[:, [0]] > res_block_no_full_nan[:, 1:],
+            axis=0)
+
+        best_approach = np.nanargmin(res_block_no_full_nan, axis=1)
+        self.number_best += np.bincount(best_approach, minlength=3)
+
+        self.iterations += res_block.shape[0]
+        self.valid_iterations += res_block_no_full_nan.shape[0]
+
+    def to_results(self, title: str, arrival_enum: ArrivalEnum,
+                   opt_method: OptMethod, mc_dist: MonteCarloDist,
+                   number_flows: int, number_servers: int) -> dict:
+        """
+        Writes the statistics into a dictionary and the parameters of the
+        optimal improvements into a csv file.
+        """
+        if (self.server_bound.max_index is None
+                or self.pmoo_fp.max_index is None):
+            raise ValueError("All-NaN slice encountered")
+
+        perform_param = self.perform_param
+        compare_metric = self.compare_metric
+
+        param_row_server_bound = self.server_bound.max_row
+        opt_server_bound = self.server_bound.max_value
+        mean_server_bound = self.server_bound.mean
+        median_improved_server_bound = self.improved_server_bound.median()
+
+        param_row_pmoo_fp = self.pmoo_fp.max_row
+        opt_pmoo_fp = self.pmoo_fp.max_value
+        mean_pmoo_fp = self.pmoo_fp.mean
+        median_improved_pmoo_fp = self.improved_pmoo_fp.median()
+
+        res_dict = {
+            "Name": "Value",
+            "topology": title,
+            "arrival_distribution": arrival_enum.name
+        }
+
+        opt_dict = {
+            "Name": "Value",
+            "topology": title,
+            "arrival_distribution": arrival_enum.name
+        }
+
+        for j in range(number_flows):
+            if arrival_enum == ArrivalEnum.DM1:
+                opt_dict[f"pmoo_fp_lamb{j + 1}"] = format(
+                    param_row_pmoo_fp[j], '.3f')
+                opt_dict[f"server_bound_lamb{j + 1}"] = format(
+                    param_row_server_bound[j], '.3f')
+
+            elif arrival_enum == ArrivalEnum.MD1:
+                opt_dict[f"pmoo_fp_lamb{j + 1}"] = format(
+                    param_row_pmoo_fp[j], '.3f')
+                opt_dict[f"ser_bound_lamb{j + 1}"] = format(
+                    param_row_server_bound[j], '.3f')
+
+            elif arrival_enum == ArrivalEnum.MMOODisc:
+                opt_dict[f"pmoo_fp_stay_on{j + 1}"] = format(
+                    param_row_pmoo_fp[j], '.3f')
+                opt_dict[f"pmoo_fp_stay_off{j + 1}"] = format(
+                    param_row_pmoo_fp[number_flows + j], '.3f')
+                opt_dict[f"pmoo_fp_burst{j + 1}"] = format(
+                    param_row_pmoo_fp[2 * number_flows + j], '.3f')
+
+                opt_dict[f"ser_bound_stay_on{j + 1}"] = format(
+                    param_row_server_bound[j], '.3f')
+                opt_dict[f"ser_bound_stay_off{j + 1}"] = format(
+                    param_row_server_bound[number_flows + j], '.3f')
+                opt_dict[f"ser_bound_burst{j + 1}"] = format(
+                    param_row_server_bound[2 * number_flows + j], '.3f')
+
+            elif arrival_enum == ArrivalEnum.MMOOFluid:
+                opt_dict[f"pmoo_fp_mu{j + 1}"] = format(
+                    param_row_pmoo_fp[j], '.3f')
+                opt_dict[f"pmoo_fp_lamb{j + 1}"] = format(
+                    param_row_pmoo_fp[number_flows + j], '.3f')
+                opt_dict[f"pmoo_fp_burst{j + 1}"] = format(
+                    param_row_pmoo_fp[2 * number_flows + j], '.3f')
+
+                opt_dict[f"ser_bound_mu{j + 1}"] = format(
+                    param_row_server_bound[j], '.3f')
+                opt_dict[f"ser_bound_lamb{j + 1}"] = format(
+                    param_row_server_bound[number_flows + j], '.3f')
+                opt_dict[f"ser_bound_burst{j + 1}"] = format(
+                    param_row_server_bound[2 * number_flows + j], '.3f')
+
+            else:
+                raise NotImplementedError(
+                    f"Arrival parameter={arrival_enum.name} is not "
+                    f"implemented")
+
+        for j in range(number_servers):
+            opt_dict[f"pmoo_fp_rate{j + 1}"] = format(
+                param_row_pmoo_fp[arrival_enum.number_parameters() *
+                                  number_flows + j], '.3f')
+            opt_dict[f"server_bound_rate{j + 1}"] = format(
+                param_row_server_bound[arrival_enum.number_parameters() *
+                                       number_flows + j], '.3f')
+
+        opt_dict.update({
+            "opt_pmoo_fp": format(opt_pmoo_fp, '.3f'),
+            "opt_server_bound": format(opt_server_bound, '.3f'),
+            "valid iterations": self.iterations,
+            "T": perform_param.value,
+            "optimization": opt_method.name,
+            "compare_metric": compare_metric.name,
+            "MCDistribution": mc_dist.to_name(),
+            "MCParam": mc_dist.param_to_string()
+        })
+
+        res_dict.update({
+            "mean_pmoo_fp": mean_pmoo_fp,
+            "mean_server_bound": mean_server_bound,
+            "median_improved_pmoo_fp": median_improved_pmoo_fp,
+            "median_improved_server_bound": median_improved_server_bound,
+            "number standard bound is valid": self.number_valid[0],
+            "number server bound is valid": self.number_valid[1],
+            "number PMOO_FP bound is valid": self.number_valid[2],
+            "number server bound is improvement": self.number_improved[1],
+            "number PMOO_FP is improvement": self.number_improved[2],
+            "valid iterations": self.valid_iterations,
+            "number standard bound is best": self.number_best[0],
+            "number server bound is best": self.number_best[1],
+            "number PMOO_FP bound is best": self.number_best[2],
+        })
+
+        filename = title
+        filename += f"_optimal_{perform_param.to_name()}_" \
+                    f"{arrival_enum.name}_MC{mc_dist.to_name()}_" \
+                    f"{opt_method.name}_{compare_metric.name}"
+
+        with open(filename + ".csv", 'w') as csv_file:
+            writer = csv.writer(csv_file)
+            for key, value in opt_dict.items():
+                writer.writerow([key, value])
+
+        return res_dict
+
+
 def msob_fp_array_to_results(title: str, arrival_enum: ArrivalEnum,
                              perform_param: PerformParameter,
                              opt_method: OptMethod, mc_dist: MonteCarloDist,
@@ -22,180 +251,17 @@ def msob_fp_array_to_results(title: str, arrival_enum: ArrivalEnum,
                              number_flows: int, number_servers: int,
                              compare_metric: ChangeEnum) -> dict:
     """Writes the array values into a dictionary"""
-    if res_array.shape[1] != 3:
-        raise IllegalArgumentError(f"Array must have 3 columns,"
-                                   f"not {res_array.shape[1]}")
-
-    np.seterr(all='warn')
-
-    res_array_no_full_nan = remove_full_nan_rows(full_array=res_array)
-    valid_iterations = res_array_no_full_nan.shape[0]
-
-    if compare_metric == ChangeEnum.RATIO_REF_NEW:
-        change_vec_server_bound = np.divide(res_array[:, 0], res_array[:, 1])
-        change_vec_pmoo_fp = np.divide(res_array[:, 0], res_array[:, 2])
-
-    elif compare_metric == ChangeEnum.RATIO_NEW_REF:
-        change_vec_server_bound = np.divide(res_array[:, 1], res_array[:, 0])
-        change_vec_pmoo_fp = np.divide(res_array[:, 2], res_array[:, 0])
-
-    elif compare_metric == ChangeEnum.RELATIVE_CHANGE:
-        abs_vec_server_bound = np.subtract(res_array[:, 0], res_array[:, 1])
-        change_vec_server_bound = np.divide(abs_vec_server_bound, res_array[:,
-                                                                            0])
-
-        abs_vec_pmoo_fp = np.subtract(res_array[:, 0], res_array[:, 2])
-        change_vec_pmoo_fp = np.divide(abs_vec_pmoo_fp, res_array[:, 0])
-
-    else:
-        raise NotImplementedError(
-            f"Metric={compare_metric.name} is not implemented")
-
-    only_improved_server_bound = change_vec_server_bound[
-        res_array[:, 0] > res_array[:, 1]]
-    only_improved_pmoo_fp = change_vec_pmoo_fp[res_array[:, 0] > res_array[:,
-                                                                           2]]
-
-    row_max_server_bound = np.nanargmax(change_vec_server_bound)
-    opt_server_bound = change_vec_server_bound[row_max_server_bound]
-    mean_server_bound = np.nanmean(change_vec_server_bound)
-    median_improved_server_bound = np.nanmedian(only_improved_server_bound)
-
-    row_max_pmoo_fp = np.nanargmax(change_vec_pmoo_fp)
-    opt_pmoo_fp = change_vec_pmoo_fp[row_max_pmoo_fp]
-    mean_pmoo_fp = np.nanmean(change_vec_pmoo_fp)
-    median_improved_pmoo_fp = np.nanmedian(only_improved_pmoo_fp)
-
-    if (perform_param.perform_metric == PerformEnum.DELAY_PROB
-            or perform_param.perform_metric == PerformEnum.BACKLOG_PROB):
-        number_standard_bound_valid = np.nansum(
-            res_array_no_full_nan[:, 0] < 1)
-        number_server_bound_valid = np.nansum(res_array_no_full_nan[:, 1] < 1)
-        number_pmoo_fp_valid = np.nansum(res_array_no_full_nan[:, 2] < 1)
-    else:
-        number_standard_bound_valid = np.nansum(
-            res_array_no_full_nan[:, 0] < inf)
-        number_server_bound_valid = np.nansum(
-            res_array_no_full_nan[:, 1] < inf)
-        number_pmoo_fp_valid = np.nansum(res_array_no_full_nan[:, 2] < inf)
-
-    number_improved_server_bound = np.sum(
-        res_array_no_full_nan[:, 0] > res_array_no_full_nan[:, 1])
-    number_improved_pmoo_fp = np.sum(
-        res_array_no_full_nan[:, 0] > res_array_no_full_nan[:, 2])
-
-    best_approach = np.nanargmin(res_array_no_full_nan, axis=1)
-    standard_best = np.count_nonzero(best_approach == 0)
-    server_best = np.count_nonzero(best_approach == 1)
-    fp_best = np.count_nonzero(best_approach == 2)
-
-    res_dict = {
-        "Name": "Value",
-        "topology": title,
-        "arrival_distribution": arrival_enum.name
-    }
-
-    opt_dict = {
-        "Name": "Value",
-        "topology": title,
-        "arrival_distribution": arrival_enum.name
-    }
-
-    for j in range(number_flows):
-        if arrival_enum == ArrivalEnum.DM1:
-            opt_dict[f"pmoo_fp_lamb{j + 1}"] = format(
-                param_array[row_max_pmoo_fp, j], '.3f')
-            opt_dict[f"server_bound_lamb{j + 1}"] = format(
-                param_array[row_max_server_bound, j], '.3f')
-
-        elif arrival_enum == ArrivalEnum.MD1:
-            opt_dict[f"pmoo_fp_lamb{j + 1}"] = format(
-                param_array[row_max_pmoo_fp, j], '.3f')
-            opt_dict[f"ser_bound_lamb{j + 1}"] = format(
-                param_array[row_max_server_bound, j], '.3f')
-
-        elif arrival_enum == ArrivalEnum.MMOODisc:
-            opt_dict[f"pmoo_fp_stay_on{j + 1}"] = format(
-                param_array[row_max_pmoo_fp, j], '.3f')
-            opt_dict[f"pmoo_fp_stay_off{j + 1}"] = format(
-                param_array[row_max_pmoo_fp, number_flows + j], '.3f')
-            opt_dict[f"pmoo_fp_burst{j + 1}"] = format(
-                param_array[row_max_pmoo_fp, 2 * number_flows + j], '.3f')
-
-            opt_dict[f"ser_bound_stay_on{j + 1}"] = format(
-                param_array[row_max_server_bound, j], '.3f')
-            opt_dict[f"ser_bound_stay_off{j + 1}"] = format(
-                param_array[row_max_server_bound, number_flows + j], '.3f')
-            opt_dict[f"ser_bound_burst{j + 1}"] = format(
-                param_array[row_max_server_bound, 2 * number_flows + j], '.3f')
-
-        elif arrival_enum == ArrivalEnum.MMOOFluid:
-            opt_dict[f"pmoo_fp_mu{j + 1}"] = format(
-                param_array[row_max_pmoo_fp, j], '.3f')
-            opt_dict[f"pmoo_fp_lamb{j + 1}"] = format(
-                param_array[row_max_pmoo_fp, number_flows + j], '.3f')
-            opt_dict[f"pmoo_fp_burst{j + 1}"] = format(
-                param_array[row_max_pmoo_fp, 2 * number_flows + j], '.3f')
-
-            opt_dict[f"ser_bound_mu{j + 1}"] = format(
-                param_array[row_max_server_bound, j], '.3f')
-            opt_dict[f"ser_bound_lamb{j + 1}"] = format(
-                param_array[row_max_server_bound, number_flows + j], '.3f')
-            opt_dict[f"ser_bound_burst{j + 1}"] = format(
-                param_array[row_max_server_bound, 2 * number_flows + j], '.3f')
-
-        else:
-            raise NotImplementedError(
-                f"Arrival parameter={arrival_enum.name} is not implemented")
-
-    for j in range(number_servers):
-        opt_dict[f"pmoo_fp_rate{j + 1}"] = format(
-            param_array[row_max_pmoo_fp,
-                        arrival_enum.number_parameters() * number_flows + j],
-            '.3f')
-        opt_dict[f"server_bound_rate{j + 1}"] = format(
-            param_array[row_max_server_bound,
-                        arrival_enum.number_parameters() * number_flows + j],
-            '.3f')
-
-    opt_dict.update({
-        "opt_pmoo_fp": format(opt_pmoo_fp, '.3f'),
-        "opt_server_bound": format(opt_server_bound, '.3f'),
-        "valid iterations": res_array.shape[0],
-        "T": perform_param.value,
-        "optimization": opt_method.name,
-        "compare_metric": compare_metric.name,
-        "MCDistribution": mc_dist.to_name(),
-        "MCParam": mc_dist.param_to_string()
-    })
-
-    res_dict.update({
-        "mean_pmoo_fp": mean_pmoo_fp,
-        "mean_server_bound": mean_server_bound,
-        "median_improved_pmoo_fp": median_improved_pmoo_fp,
-        "median_improved_server_bound": median_improved_server_bound,
-        "number standard bound is valid": number_standard_bound_valid,
-        "number server bound is valid": number_server_bound_valid,
-        "number PMOO_FP bound is valid": number_pmoo_fp_valid,
-        "number server bound is improvement": number_improved_server_bound,
-        "number PMOO_FP is improvement": number_improved_pmoo_fp,
-        "valid iterations": valid_iterations,
-        "number standard bound is best": standard_best,
-        "number server bound is best": server_best,
-        "number PMOO_FP bound is best": fp_best,
-    })
-
-    filename = title
-    filename += f"_optimal_{perform_param.to_name()}_{arrival_enum.name}_" \
-                f"MC{mc_dist.to_name()}_{opt_method.name}_" \
-                f"{compare_metric.name}"
-
-    with open(filename + ".csv", 'w') as csv_file:
-        writer = csv.writer(csv_file)
-        for key, value in opt_dict.items():
-            writer.writerow([key, value])
-
-    return res_dict
+    results = MSOBFPResults(compare_metric=compare_metric,
+                            perform_param=perform_param,
+                            sample_size=None)
+    results.update(start=0, param_block=param_array, res_block=res_array)
+
+    return results.to_results(title=title,
+                              arrival_enum=arrival_enum,
+                              opt_method=opt_method,
+                              mc_dist=mc_dist,
+                              number_flows=number_flows,
+                              number_servers=number_servers)
 
 
 def time_array_to_results(title: str, time_array: np.array) -> dict:
@@ -3,6 +3,8 @@
 from math import inf
 from typing import List
 
+import numpy as np
+
 from msob_and_fp.setting_avoid_dep import SettingMSOBFP
 from optimization.optimize import Optimize
 from utils.exceptions import ParameterOutOfBounds
@@ -10,25 +12,34 @@ from utils.exceptions import ParameterOutOfBounds
 
 class OptimizeFPBound(Optimize):
     """Optimize class"""
+    # infeasible_exceptions of Optimize without ValueError
+    infeasible_exceptions = (OverflowError, ParameterOutOfBounds)
+
     def __init__(self,
                  setting_msob_fp: SettingMSOBFP,
                  number_param: int,
-                 print_x=False) -> None:
+                 print_x=False,
+                 log_domain=False) -> None:
         super().__init__(setting=setting_msob_fp,
                          number_param=number_param,
-                         print_x=print_x)
+                         print_x=print_x,
+                         log_domain=log_domain)
         self.setting_msob_fp = setting_msob_fp
         self.number_param = number_param
         self.print_x = print_x
 
-    def eval_except(self, param_list: List[float]) -> float:
-        """
-        Shortens the exception handling and case distinction in a small method.
-
-        :param param_list: theta parameter
-        :return:           function to_value
-        """
-        try:
-            return self.setting_msob_fp.fp_bound(param_list=param_list)
-        except (ParameterOutOfBounds, OverflowError):
-            return inf
+    def _bound(self, param_list: List[float]) -> float:
+        return self.setting_msob_fp.fp_bound(param_list=param_list)
+
+    def _log_bound(self, param_list: List[float]) -> float:
+        return self.setting_msob_fp.fp_log_bound(param_list=param_list)
+
+    def _bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        return self.setting_msob_fp.fp_bound_array(param_array=param_array)
+
+    def eval_gradient(self, param_list: List[float]) -> np.ndarray:
+        raise NotImplementedError("the fp_bound has no analytic gradient")
+
+    def theta_upper_bound(self, param_array: np.ndarray) -> np.ndarray:
+        # no feasibility oracle for the fp_bound
+        return np.full(param_array.shape[0], inf)
@@ -2,17 +2,25 @@
 
 from typing import List
 
+import numpy as np
+
 from msob_and_fp.setting_avoid_dep import SettingMSOBFP
 from nc_arrivals.arrival_distribution import ArrivalDistribution
 from nc_arrivals.regulated_arrivals import DetermTokenBucket
+from nc_arrivals.theta_limit import arrival_theta_limit
 from nc_operations.arb_scheduling import LeftoverARB
 from nc_operations.operations import AggregateTwo, Convolve, Deconvolve
-from nc_operations.single_hop_bound import single_hop_bound
+from nc_operations.operator_plan import PLACEHOLDER_P, OperatorPlanMixin
+from nc_operations.single_hop_bound import (min_single_hop_bound,
+                                            single_hop_bound,
+                                            single_hop_bound_array,
+                                            single_hop_log_bound)
 from nc_server.constant_rate_server import ConstantRateServer
+from nc_server.server import Server
 from utils.perform_parameter import PerformParameter
 
 
-class OverlappingTandemPerform(SettingMSOBFP):
+class OverlappingTandemPerform(OperatorPlanMixin, SettingMSOBFP):
     def __init__(self, arr_list: List[ArrivalDistribution],
                  ser_list: List[ConstantRateServer],
                  perform_param: PerformParameter) -> None:
@@ -20,12 +28,13 @@ class OverlappingTandemPerform(SettingMSOBFP):
         self.ser_list = ser_list
         self.perform_param = perform_param
 
-    def standard_bound(self, param_list: List[float]) -> float:
-        # conducts a PMOO analysis -> case distinction necessary
-        theta = param_list[0]
-        p = param_list[1]
+    def standard_s_e2e_list(self, p: float) -> List[Server]:
+        """
+        PMOO analysis -> case distinction necessary
 
-        foi = self.arr_list[0]
+        :param p: Hoelder p
+        :return:  end-to-end services of both cases
+        """
         a_2 = self.arr_list[1]
         a_3 = self.arr_list[2]
 
@@ -42,12 +51,6 @@ class OverlappingTandemPerform(SettingMSOBFP):
 
         s_e2e_1 = Convolve(ser1=conv_s1_s2_lo, ser2=s3_lo, indep=False, p=p)
 
-        res_1 = single_hop_bound(foi=foi,
-                                 s_e2e=s_e2e_1,
-                                 theta=theta,
-                                 perform_param=self.perform_param,
-                                 indep=True)
-
         d_2_1 = Deconvolve(arr=a_2, ser=s_1)
         conv_s2_s3_lo = LeftoverARB(ser=Convolve(ser1=LeftoverARB(
             ser=s_2, cross_arr=d_2_1),
@@ -57,18 +60,56 @@ class OverlappingTandemPerform(SettingMSOBFP):
 
         s_e2e_2 = Convolve(ser1=s1_lo, ser2=conv_s2_s3_lo, indep=False, p=p)
 
-        res_2 = single_hop_bound(foi=foi,
-                                 s_e2e=s_e2e_2,
-                                 theta=theta,
-                                 perform_param=self.perform_param,
-                                 indep=True)
+        return [s_e2e_1, s_e2e_2]
 
-        return min(res_1, res_2)
+    def standard_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
+        p = param_list[1]
 
-    def server_bound(self, param_list: List[float]) -> float:
+        return min_single_hop_bound(foi=self.arr_list[0],
+                                    s_e2e_list=self.standard_s_e2e_list(p=p),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    bound_fun=single_hop_bound)
+
+    def standard_log_bound(self, param_list: List[float]) -> float:
         theta = param_list[0]
+        p = param_list[1]
 
-        foi = self.arr_list[0]
+        return min_single_hop_bound(foi=self.arr_list[0],
+                                    s_e2e_list=self.standard_s_e2e_list(p=p),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    bound_fun=single_hop_log_bound)
+
+    def standard_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        plans = self.operator_plans(
+            name="standard",
+            build_trees=lambda: self.standard_s_e2e_list(p=PLACEHOLDER_P))
+
+        return np.minimum.reduce([
+            single_hop_bound_array(foi=self.arr_list[0],
+                                   s_e2e=plan.bind(p=param_array[:, 1]),
+                                   theta=param_array[:, 0],
+                                   perform_param=self.perform_param,
+                                   indep=True) for plan in plans
+        ])
+
+    def theta_upper_bound(self, p_array: np.ndarray) -> np.ndarray:
+        plans = self.operator_plans(
+            name="standard",
+            build_trees=lambda: self.standard_s_e2e_list(p=PLACEHOLDER_P))
+
+        # the minimum over both cases is feasible if one of them is
+        return np.minimum(
+            np.maximum.reduce(
+                [plan.theta_upper_bound(p=p_array[:, 0]) for plan in plans]),
+            arrival_theta_limit(arr=self.arr_list[0]))
+
+    def server_s_e2e_list(self) -> List[Server]:
+        """
+        :return: end-to-end services, one per server that is cut
+        """
         a_2 = self.arr_list[1]
         a_3 = self.arr_list[2]
 
@@ -85,12 +126,6 @@ class OverlappingTandemPerform(SettingMSOBFP):
 
         s_e2e_1 = Convolve(ser1=conv_s1_s2_lo, ser2=s3_lo)
 
-        res_1 = single_hop_bound(foi=foi,
-                                 s_e2e=s_e2e_1,
-                                 theta=theta,
-                                 perform_param=self.perform_param,
-                                 indep=True)
-
         d_2_1 = DetermTokenBucket(sigma_single=0.0, rho_single=s_1.rate, n=1)
         conv_s2_s3_lo = LeftoverARB(ser=Convolve(ser1=LeftoverARB(
             ser=s_2, cross_arr=d_2_1),
@@ -100,18 +135,42 @@ class OverlappingTandemPerform(SettingMSOBFP):
 
         s_e2e_2 = Convolve(ser1=s1_lo, ser2=conv_s2_s3_lo)
 
-        res_2 = single_hop_bound(foi=self.arr_list[0],
-                                 s_e2e=s_e2e_2,
-                                 theta=theta,
-                                 perform_param=self.perform_param,
-                                 indep=True)
+        return [s_e2e_1, s_e2e_2]
 
-        return min(res_1, res_2)
+    def server_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
 
-    def fp_bound(self, param_list: List[float]) -> float:
+        return min_single_hop_bound(foi=self.arr_list[0],
+                                    s_e2e_list=self.server_s_e2e_list(),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    bound_fun=single_hop_bound)
+
+    def server_log_bound(self, param_list: List[float]) -> float:
         theta = param_list[0]
 
-        foi = self.arr_list[0]
+        return min_single_hop_bound(foi=self.arr_list[0],
+                                    s_e2e_list=self.server_s_e2e_list(),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    bound_fun=single_hop_log_bound)
+
+    def server_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        plans = self.operator_plans(name="server",
+                                    build_trees=self.server_s_e2e_list)
+
+        return np.minimum.reduce([
+            single_hop_bound_array(foi=self.arr_list[0],
+                                   s_e2e=plan.bind(),
+                                   theta=param_array[:, 0],
+                                   perform_param=self.perform_param,
+                                   indep=True) for plan in plans
+        ])
+
+    def fp_s_e2e(self) -> Server:
+        """
+        :return: end-to-end service of the flow prolongation
+        """
         a_2 = self.arr_list[1]
         a_3 = self.arr_list[2]
 
@@ -122,14 +181,37 @@ class OverlappingTandemPerform(SettingMSOBFP):
         s_23_conv = Convolve(ser1=s_2, ser2=s_3)
         s_23_lo = LeftoverARB(ser=s_23_conv, cross_arr=a_3)
         s_123_conv = Convolve(ser1=s_1, ser2=s_23_lo)
-        s_e2e = LeftoverARB(ser=s_123_conv, cross_arr=a_2)
 
-        return single_hop_bound(foi=foi,
-                                s_e2e=s_e2e,
+        return LeftoverARB(ser=s_123_conv, cross_arr=a_2)
+
+    def fp_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
+
+        return single_hop_bound(foi=self.arr_list[0],
+                                s_e2e=self.fp_s_e2e(),
                                 theta=theta,
                                 perform_param=self.perform_param,
                                 indep=True)
 
+    def fp_log_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
+
+        return single_hop_log_bound(foi=self.arr_list[0],
+                                    s_e2e=self.fp_s_e2e(),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    indep=True)
+
+    def fp_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        plan = self.operator_plans(name="fp",
+                                   build_trees=lambda: [self.fp_s_e2e()])[0]
+
+        return single_hop_bound_array(foi=self.arr_list[0],
+                                      s_e2e=plan.bind(),
+                                      theta=param_array[:, 0],
+                                      perform_param=self.perform_param,
+                                      indep=True)
+
     def approximate_utilization(self) -> float:
         foi_rate = self.arr_list[0].average_rate()
         a_2_rate = self.arr_list[1].average_rate()
@@ -143,7 +225,7 @@ class OverlappingTandemPerform(SettingMSOBFP):
         util_s_2 = (foi_rate + a_2_rate + a_3_rate) / c_2
         util_s_3 = (foi_rate + a_3_rate) / c_3
 
-        return max(util_s_1, util_s_2, util_s_3)
+        return np.maximum.reduce([util_s_1, util_s_2, util_s_3])
 
     def server_util(self, server_index: int) -> float:
         a_foi_rate = self.arr_list[0].average_rate()
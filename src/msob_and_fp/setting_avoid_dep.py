@@ -3,6 +3,9 @@
 from abc import abstractmethod
 from typing import List
 
+import numpy as np
+
+from utils.helper_functions import evaluate_rows, log_of_bound
 from utils.setting import Setting
 
 
@@ -16,6 +19,23 @@ class SettingMSOBFP(Setting):
         """
         pass
 
+    def server_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        server_bound for many parameter sets at once
+
+        :param param_array: one row of parameters per point
+        """
+        return evaluate_rows(fun=self.server_bound, param_array=param_array)
+
+    def server_log_bound(self, param_list: List[float]) -> float:
+        """
+        Logarithm of the server_bound. Override this method with a
+        log-domain evaluation that does not overflow.
+
+        :param param_list: theta parameter
+        """
+        return log_of_bound(self.server_bound(param_list=param_list))
+
     @abstractmethod
     def fp_bound(self, param_list: List[float]) -> float:
         """
@@ -25,6 +45,23 @@ class SettingMSOBFP(Setting):
         """
         pass
 
+    def fp_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        fp_bound for many parameter sets at once
+
+        :param param_array: one row of parameters per point
+        """
+        return evaluate_rows(fun=self.fp_bound, param_array=param_array)
+
+    def fp_log_bound(self, param_list: List[float]) -> float:
+        """
+        Logarithm of the fp_bound. Override this method with a log-domain
+        evaluation that does not overflow.
+
+        :param param_list: theta parameter
+        """
+        return log_of_bound(self.fp_bound(param_list=param_list))
+
     @abstractmethod
     def server_util(self, server_index: int) -> float:
         """
@@ -1,20 +1,26 @@
 """Splitting triangle network."""
 
-from math import inf
 from typing import List
 
+import numpy as np
+
 from msob_and_fp.setting_avoid_dep import SettingMSOBFP
 from nc_arrivals.arrival_distribution import ArrivalDistribution
 from nc_arrivals.regulated_arrivals import DetermTokenBucket
+from nc_arrivals.theta_limit import arrival_theta_limit
 from nc_operations.arb_scheduling import LeftoverARB
 from nc_operations.operations import Convolve, Deconvolve
-from nc_operations.single_hop_bound import single_hop_bound
+from nc_operations.operator_plan import PLACEHOLDER_P, OperatorPlanMixin
+from nc_operations.single_hop_bound import (min_single_hop_bound,
+                                            single_hop_bound,
+                                            single_hop_bound_array,
+                                            single_hop_log_bound)
 from nc_server.constant_rate_server import ConstantRateServer
-from utils.exceptions import ParameterOutOfBounds
+from nc_server.server import Server
 from utils.perform_parameter import PerformParameter
 
 
-class SquarePerform(SettingMSOBFP):
+class SquarePerform(OperatorPlanMixin, SettingMSOBFP):
     def __init__(self, arr_list: List[ArrivalDistribution],
                  ser_list: List[ConstantRateServer],
                  perform_param: PerformParameter) -> None:
@@ -22,10 +28,11 @@ class SquarePerform(SettingMSOBFP):
         self.ser_list = ser_list
         self.perform_param = perform_param
 
-    def standard_bound(self, param_list: List[float]) -> float:
-        theta = param_list[0]
-        p = param_list[1]
-
+    def standard_s_e2e(self, p: float) -> Server:
+        """
+        :param p: Hoelder p
+        :return:  end-to-end service of the standard approach
+        """
         a_2 = self.arr_list[1]
         a_3 = self.arr_list[2]
         a_4 = self.arr_list[3]
@@ -43,17 +50,51 @@ class SquarePerform(SettingMSOBFP):
         s_1_lo = LeftoverARB(ser=s_1, cross_arr=d_3_3)
         s_2_lo = LeftoverARB(ser=s_2, cross_arr=d_4_4)
 
-        s_e2e = Convolve(ser1=s_1_lo, ser2=s_2_lo, indep=False, p=p)
+        return Convolve(ser1=s_1_lo, ser2=s_2_lo, indep=False, p=p)
+
+    def standard_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
+        p = param_list[1]
 
         return single_hop_bound(foi=self.arr_list[0],
-                                s_e2e=s_e2e,
+                                s_e2e=self.standard_s_e2e(p=p),
                                 theta=theta,
                                 perform_param=self.perform_param,
                                 indep=True)
 
-    def server_bound(self, param_list: List[float]) -> float:
+    def standard_log_bound(self, param_list: List[float]) -> float:
         theta = param_list[0]
+        p = param_list[1]
 
+        return single_hop_log_bound(foi=self.arr_list[0],
+                                    s_e2e=self.standard_s_e2e(p=p),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    indep=True)
+
+    def standard_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        plan = self.operator_plans(
+            name="standard",
+            build_trees=lambda: [self.standard_s_e2e(p=PLACEHOLDER_P)])[0]
+
+        return single_hop_bound_array(foi=self.arr_list[0],
+                                      s_e2e=plan.bind(p=param_array[:, 1]),
+                                      theta=param_array[:, 0],
+                                      perform_param=self.perform_param,
+                                      indep=True)
+
+    def theta_upper_bound(self, p_array: np.ndarray) -> np.ndarray:
+        plan = self.operator_plans(
+            name="standard",
+            build_trees=lambda: [self.standard_s_e2e(p=PLACEHOLDER_P)])[0]
+
+        return np.minimum(plan.theta_upper_bound(p=p_array[:, 0]),
+                          arrival_theta_limit(arr=self.arr_list[0]))
+
+    def server_s_e2e_list(self) -> List[Server]:
+        """
+        :return: end-to-end services, one per server that is cut
+        """
         a_2 = self.arr_list[1]
         a_3 = self.arr_list[2]
         a_4 = self.arr_list[3]
@@ -62,54 +103,64 @@ class SquarePerform(SettingMSOBFP):
         s_3 = self.ser_list[2]
         s_4 = self.ser_list[3]
 
-        try:
-            d_3_3 = DetermTokenBucket(sigma_single=0.0,
-                                      rho_single=s_3.rate,
-                                      n=1)
-            d_4_4 = Deconvolve(arr=a_4,
-                               ser=LeftoverARB(ser=s_4,
-                                               cross_arr=Deconvolve(arr=a_2,
-                                                                    ser=s_3)))
-
-            s_1_lo = LeftoverARB(ser=s_1, cross_arr=d_3_3)
-            s_2_lo = LeftoverARB(ser=s_2, cross_arr=d_4_4)
-
-            s_net_1 = Convolve(ser1=s_1_lo, ser2=s_2_lo)
+        d_3_3 = DetermTokenBucket(sigma_single=0.0, rho_single=s_3.rate, n=1)
+        d_4_4 = Deconvolve(arr=a_4,
+                           ser=LeftoverARB(ser=s_4,
+                                           cross_arr=Deconvolve(arr=a_2,
+                                                                ser=s_3)))
 
-            res_1 = single_hop_bound(foi=self.arr_list[0],
-                                     s_e2e=s_net_1,
-                                     theta=theta,
-                                     perform_param=self.perform_param)
+        s_1_lo = LeftoverARB(ser=s_1, cross_arr=d_3_3)
+        s_2_lo = LeftoverARB(ser=s_2, cross_arr=d_4_4)
 
-        except ParameterOutOfBounds:
-            res_1 = inf
+        s_net_1 = Convolve(ser1=s_1_lo, ser2=s_2_lo)
 
-        try:
-            d_3_3 = Deconvolve(arr=a_3,
-                               ser=LeftoverARB(ser=s_3, cross_arr=a_2))
-            d_4_4 = DetermTokenBucket(sigma_single=0.0,
-                                      rho_single=s_4.rate,
-                                      n=1)
+        d_3_3 = Deconvolve(arr=a_3, ser=LeftoverARB(ser=s_3, cross_arr=a_2))
+        d_4_4 = DetermTokenBucket(sigma_single=0.0, rho_single=s_4.rate, n=1)
 
-            s_1_lo = LeftoverARB(ser=s_1, cross_arr=d_3_3)
-            s_2_lo = LeftoverARB(ser=s_2, cross_arr=d_4_4)
+        s_1_lo = LeftoverARB(ser=s_1, cross_arr=d_3_3)
+        s_2_lo = LeftoverARB(ser=s_2, cross_arr=d_4_4)
 
-            s_net_2 = Convolve(ser1=s_1_lo, ser2=s_2_lo)
+        s_net_2 = Convolve(ser1=s_1_lo, ser2=s_2_lo)
 
-            res_2 = single_hop_bound(foi=self.arr_list[0],
-                                     s_e2e=s_net_2,
-                                     theta=theta,
-                                     perform_param=self.perform_param)
+        return [s_net_1, s_net_2]
 
-        except ParameterOutOfBounds:
-            res_2 = inf
+    def server_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
 
-        return min(res_1, res_2)
+        return min_single_hop_bound(foi=self.arr_list[0],
+                                    s_e2e_list=self.server_s_e2e_list(),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    bound_fun=single_hop_bound)
 
-    def fp_bound(self, param_list: List[float]) -> float:
+    def server_log_bound(self, param_list: List[float]) -> float:
         theta = param_list[0]
-        p = param_list[1]
 
+        return min_single_hop_bound(foi=self.arr_list[0],
+                                    s_e2e_list=self.server_s_e2e_list(),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    bound_fun=single_hop_log_bound)
+
+    def server_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        plans = self.operator_plans(name="server",
+                                    build_trees=self.server_s_e2e_list)
+
+        res_list = [
+            single_hop_bound_array(foi=self.arr_list[0],
+                                   s_e2e=plan.bind(),
+                                   theta=param_array[:, 0],
+                                   perform_param=self.perform_param)
+            for plan in plans
+        ]
+
+        return np.minimum.reduce(res_list)
+
+    def fp_s_e2e(self, p: float) -> Server:
+        """
+        :param p: Hoelder p
+        :return:  end-to-end service of the flow prolongation
+        """
         a_2 = self.arr_list[1]
         a_3 = self.arr_list[2]
         a_4 = self.arr_list[3]
@@ -127,14 +178,38 @@ class SquarePerform(SettingMSOBFP):
         s_12_conv = Convolve(ser1=s_1,
                              ser2=LeftoverARB(ser=s_2, cross_arr=d_4_4))
 
-        s_net = LeftoverARB(ser=s_12_conv, cross_arr=d_3_3, indep=False, p=p)
+        return LeftoverARB(ser=s_12_conv, cross_arr=d_3_3, indep=False, p=p)
+
+    def fp_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
+        p = param_list[1]
 
         return single_hop_bound(foi=self.arr_list[0],
-                                s_e2e=s_net,
+                                s_e2e=self.fp_s_e2e(p=p),
                                 theta=theta,
                                 perform_param=self.perform_param,
                                 indep=True)
 
+    def fp_log_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
+        p = param_list[1]
+
+        return single_hop_log_bound(foi=self.arr_list[0],
+                                    s_e2e=self.fp_s_e2e(p=p),
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    indep=True)
+
+    def fp_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        plan = self.operator_plans(
+            name="fp", build_trees=lambda: [self.fp_s_e2e(p=PLACEHOLDER_P)])[0]
+
+        return single_hop_bound_array(foi=self.arr_list[0],
+                                      s_e2e=plan.bind(p=param_array[:, 1]),
+                                      theta=param_array[:, 0],
+                                      perform_param=self.perform_param,
+                                      indep=True)
+
     def approximate_utilization(self) -> float:
         a_foi_rate = self.arr_list[0].average_rate()
         a_3_rate = self.arr_list[2].average_rate()
@@ -146,7 +221,7 @@ class SquarePerform(SettingMSOBFP):
         util_s_1 = (a_foi_rate + a_3_rate) / c_1
         util_s_2 = (a_foi_rate + a_4_rate) / c_2
 
-        return max(util_s_1, util_s_2)
+        return np.maximum(util_s_1, util_s_2)
 
     def server_util(self, server_index: int) -> float:
         a_foi_rate = self.arr_list[0].average_rate()
@@ -2,6 +2,10 @@
 
 from abc import abstractmethod, ABC
 
+import numpy as np
+
+from utils.helper_functions import evaluate_elementwise
+
 
 class Arrival(ABC):
     """Abstract Arrival class."""
@@ -22,6 +26,45 @@ class Arrival(ABC):
         """
         pass
 
+    def sigma_derivative(self, theta: float) -> float:
+        """
+        d sigma / d theta at a feasible theta, optional for the analytic
+        gradients of the bounds
+        :param theta: mgf parameter
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} has no analytic sigma_derivative")
+
+    def rho_derivative(self, theta: float) -> float:
+        """
+        d rho / d theta at a feasible theta, optional for the analytic
+        gradients of the bounds
+        :param theta: mgf parameter
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} has no analytic rho_derivative")
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        """
+        sigma(theta) for an array of thetas, nan where theta is infeasible
+        :param theta: array of mgf parameters
+        """
+        return evaluate_elementwise(fun=self.sigma, theta=theta)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        """
+        rho(theta) for an array of thetas, nan where theta is infeasible
+        :param theta: array of mgf parameters
+        """
+        return evaluate_elementwise(fun=self.rho, theta=theta)
+
+    def sigma_rho_array(self, theta: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        sigma(theta) and rho(theta) for an array of thetas
+        :param theta: array of mgf parameters
+        """
+        return self.sigma_array(theta=theta), self.rho_array(theta=theta)
+
     @abstractmethod
     def is_discrete(self) -> bool:
         """
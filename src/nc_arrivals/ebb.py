@@ -1,9 +1,11 @@
 """Exponentially Bounded Burstiness"""
 
-from math import log
+from math import log, nan
+
+import numpy as np
 
 from nc_arrivals.arrival_distribution import ArrivalDistribution
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import out_of_bounds
 
 
 class EBB(ArrivalDistribution):
@@ -18,16 +20,16 @@ class EBB(ArrivalDistribution):
 
     def sigma(self, theta: float) -> float:
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta={theta} must be > 0")
+            return out_of_bounds(f"theta={theta} must be > 0")
 
         if theta >= self.decay:
-            raise ParameterOutOfBounds(f"theta={theta} must "
-                                       f"be < decay={self.decay}")
+            return out_of_bounds(f"theta={theta} must "
+                                 f"be < decay={self.decay}")
 
         theta_over_decay = theta / self.decay
 
         if log((self.factor_m**theta_over_decay) / (1 - theta_over_decay)) < 0:
-            raise ParameterOutOfBounds("rho must be >= 0")
+            return out_of_bounds("rho must be >= 0")
 
         return (self.n / theta) * log(
             (self.factor_m**theta_over_decay) / (1 - theta_over_decay))
@@ -35,6 +37,29 @@ class EBB(ArrivalDistribution):
     def rho(self, theta=0.0) -> float:
         return self.n * self.rho_single
 
+    def sigma_derivative(self, theta: float) -> float:
+        return (self.n / (self.decay - theta) -
+                self.sigma(theta=theta) + self.n * log(self.factor_m) /
+                self.decay) / theta
+
+    def rho_derivative(self, theta=0.0) -> float:
+        return 0.0
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        theta = np.asarray(theta, dtype=float)
+
+        with np.errstate(all="ignore"):
+            theta_over_decay = theta / self.decay
+            log_part = np.log((self.factor_m**theta_over_decay) /
+                              (1 - theta_over_decay))
+
+            return np.where(
+                (theta <= 0) | (theta >= self.decay) | (log_part < 0), nan,
+                (self.n / theta) * log_part)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.full_like(theta, self.n * self.rho_single, dtype=float)
+
     def is_discrete(self) -> bool:
         return False
 
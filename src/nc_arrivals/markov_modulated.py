@@ -1,9 +1,11 @@
 """Markov Modulated Processes"""
 
-from math import exp, log, sqrt
+from math import exp, log, nan, sqrt
+
+import numpy as np
 
 from nc_arrivals.arrival_distribution import ArrivalDistribution
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import out_of_bounds
 
 
 class MMOOFluid(ArrivalDistribution):
@@ -19,13 +21,38 @@ class MMOOFluid(ArrivalDistribution):
 
     def rho(self, theta: float) -> float:
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta = {theta} must be > 0")
+            return out_of_bounds(f"theta = {theta} must be > 0")
 
         bb = theta * self.peak_rate - self.mu - self.lamb
 
         return 0.5 * self.n * (bb + sqrt(
             (bb**2) + 4 * self.mu * theta * self.peak_rate)) / theta
 
+    def sigma_derivative(self, theta=0.0) -> float:
+        return 0.0
+
+    def rho_derivative(self, theta: float) -> float:
+        bb = theta * self.peak_rate - self.mu - self.lamb
+        sqrt_part = sqrt((bb**2) + 4 * self.mu * theta * self.peak_rate)
+
+        return (0.5 * self.n * (self.peak_rate + self.peak_rate *
+                                (bb + 2 * self.mu) / sqrt_part) -
+                self.rho(theta=theta)) / theta
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.zeros_like(theta, dtype=float)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        theta = np.asarray(theta, dtype=float)
+
+        with np.errstate(all="ignore"):
+            bb = theta * self.peak_rate - self.mu - self.lamb
+
+            return np.where(
+                theta <= 0, nan, 0.5 * self.n *
+                (bb + np.sqrt((bb**2) + 4 * self.mu * theta * self.peak_rate))
+                / theta)
+
     def is_discrete(self) -> bool:
         return False
 
@@ -64,7 +91,7 @@ class MMOODisc(ArrivalDistribution):
 
     def rho(self, theta: float) -> float:
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta = {theta} must be > 0")
+            return out_of_bounds(f"theta = {theta} must be > 0")
 
         if self.stay_on <= 0.0 or self.stay_on >= 1.0:
             raise ValueError(f"p_stay_on = {self.stay_on} must be in (0,1)")
@@ -79,10 +106,48 @@ class MMOODisc(ArrivalDistribution):
         rho_mmoo_disc = log(0.5 * (off_on + sqrt_part))
 
         if rho_mmoo_disc < 0:
-            raise ParameterOutOfBounds("rho must be >= 0")
+            return out_of_bounds("rho must be >= 0")
 
         return rho_mmoo_disc / theta
 
+    def sigma_derivative(self, theta=0.0) -> float:
+        return 0.0
+
+    def rho_derivative(self, theta: float) -> float:
+        exp_theta_peak = exp(theta * self.peak_rate)
+        off_on = self.stay_off + self.stay_on * exp_theta_peak
+        sqrt_part = sqrt(off_on**2 - 4 * (self.stay_off + self.stay_on - 1) *
+                         exp_theta_peak)
+
+        off_on_derivative = self.stay_on * self.peak_rate * exp_theta_peak
+        sqrt_derivative = (off_on * off_on_derivative - 2 *
+                           (self.stay_off + self.stay_on - 1) *
+                           self.peak_rate * exp_theta_peak) / sqrt_part
+
+        return ((off_on_derivative + sqrt_derivative) /
+                (off_on + sqrt_part) - self.rho(theta=theta)) / theta
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.zeros_like(theta, dtype=float)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        theta = np.asarray(theta, dtype=float)
+
+        if not (0.0 < self.stay_on < 1.0 and 0.0 < self.stay_off < 1.0):
+            return np.full_like(theta, nan)
+
+        with np.errstate(all="ignore"):
+            exp_theta_peak = np.exp(theta * self.peak_rate)
+            off_on = self.stay_off + self.stay_on * exp_theta_peak
+            sqrt_part = np.sqrt(off_on**2 - 4 *
+                                (self.stay_off + self.stay_on - 1) *
+                                exp_theta_peak)
+
+            rho_mmoo_disc = np.log(0.5 * (off_on + sqrt_part))
+
+            return np.where((theta <= 0) | (rho_mmoo_disc < 0), nan,
+                            rho_mmoo_disc / theta)
+
     def is_discrete(self) -> bool:
         return True
 
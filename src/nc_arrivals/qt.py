@@ -1,9 +1,11 @@
 """Typical Queueing Theory Processes"""
 
-from math import exp, log
+from math import exp, log, nan
+
+import numpy as np
 
 from nc_arrivals.arrival_distribution import ArrivalDistribution
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import out_of_bounds
 
 
 class DM1(ArrivalDistribution):
@@ -27,14 +29,32 @@ class DM1(ArrivalDistribution):
         :param theta: mgf parameter
         """
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta = {theta} must be > 0")
+            return out_of_bounds(f"theta = {theta} must be > 0")
 
         if theta >= self.lamb:
-            raise ParameterOutOfBounds(
+            return out_of_bounds(
                 f"theta = {theta} must be < lambda = {self.lamb}")
 
         return (self.n / theta) * log(self.lamb / (self.lamb - theta))
 
+    def sigma_derivative(self, theta=0.0) -> float:
+        return 0.0
+
+    def rho_derivative(self, theta: float) -> float:
+        return (self.n / (self.lamb - theta) -
+                self.rho(theta=theta)) / theta
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.zeros_like(theta, dtype=float)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        theta = np.asarray(theta, dtype=float)
+
+        with np.errstate(all="ignore"):
+            return np.where((theta <= 0) | (theta >= self.lamb), nan,
+                            (self.n / theta) *
+                            np.log(self.lamb / (self.lamb - theta)))
+
     def is_discrete(self) -> bool:
         return True
 
@@ -65,10 +85,28 @@ class MD1(ArrivalDistribution):
 
     def rho(self, theta: float) -> float:
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta = {theta} must be > 0")
+            return out_of_bounds(f"theta = {theta} must be > 0")
 
         return (self.n / theta) * self.lamb * (exp(theta / self.mu) - 1)
 
+    def sigma_derivative(self, theta=0.0) -> float:
+        return 0.0
+
+    def rho_derivative(self, theta: float) -> float:
+        return (self.n * self.lamb * exp(theta / self.mu) / self.mu -
+                self.rho(theta=theta)) / theta
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.zeros_like(theta, dtype=float)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        theta = np.asarray(theta, dtype=float)
+
+        with np.errstate(all="ignore"):
+            return np.where(
+                theta <= 0, nan,
+                (self.n / theta) * self.lamb * np.expm1(theta / self.mu))
+
     def is_discrete(self) -> bool:
         return False
 
@@ -101,14 +139,30 @@ class MM1(ArrivalDistribution):
 
     def rho(self, theta: float) -> float:
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta = {theta} must be > 0")
+            return out_of_bounds(f"theta = {theta} must be > 0")
 
         if theta >= self.mu:
-            raise ParameterOutOfBounds(f"theta = {theta} must"
-                                       f"be < mu = {self.mu}")
+            return out_of_bounds(f"theta = {theta} must"
+                                 f"be < mu = {self.mu}")
 
         return self.n * self.lamb / (self.mu - theta)
 
+    def sigma_derivative(self, theta=0.0) -> float:
+        return 0.0
+
+    def rho_derivative(self, theta: float) -> float:
+        return self.n * self.lamb / (self.mu - theta)**2
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.zeros_like(theta, dtype=float)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        theta = np.asarray(theta, dtype=float)
+
+        with np.errstate(all="ignore"):
+            return np.where((theta <= 0) | (theta >= self.mu), nan,
+                            self.n * self.lamb / (self.mu - theta))
+
     def is_discrete(self) -> bool:
         return False
 
@@ -149,10 +203,27 @@ class DPoisson1(ArrivalDistribution):
         :param theta: mgf parameter
         """
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta = {theta} must be > 0")
+            return out_of_bounds(f"theta = {theta} must be > 0")
 
         return (self.n / theta) * self.lamb * (exp(theta) - 1)
 
+    def sigma_derivative(self, theta=0.0) -> float:
+        return 0.0
+
+    def rho_derivative(self, theta: float) -> float:
+        return (self.n * self.lamb * exp(theta) -
+                self.rho(theta=theta)) / theta
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.zeros_like(theta, dtype=float)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        theta = np.asarray(theta, dtype=float)
+
+        with np.errstate(all="ignore"):
+            return np.where(theta <= 0, nan,
+                            (self.n / theta) * self.lamb * np.expm1(theta))
+
     def is_discrete(self) -> bool:
         return True
 
@@ -1,11 +1,13 @@
 """Abstract Leaky-Bucket class."""
 
 from abc import abstractmethod
-from math import erf, exp, inf, log, pi, sqrt
+from math import erf, exp, inf, log, nan, pi, sqrt, tanh
+
+import numpy as np
 
 from nc_arrivals.arrival_distribution import ArrivalDistribution
 from utils.deprecated import deprecated
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import out_of_bounds
 
 
 class RegulatedArrivals(ArrivalDistribution):
@@ -31,6 +33,12 @@ class RegulatedArrivals(ArrivalDistribution):
         """
         return self.n * self.rho_single
 
+    def rho_derivative(self, theta: float) -> float:
+        return 0.0
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.full_like(theta, self.n * self.rho_single, dtype=float)
+
     def is_discrete(self) -> bool:
         """
         :return True if the arrival distribution is discrete, False if not
@@ -61,6 +69,12 @@ class DetermTokenBucket(RegulatedArrivals):
     def sigma(self, theta: float) -> float:
         return self.n * self.sigma_single
 
+    def sigma_derivative(self, theta: float) -> float:
+        return 0.0
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.full_like(theta, self.n * self.sigma_single, dtype=float)
+
     def __str__(self) -> str:
         return f"TBconst_sigma={self.sigma_single}_" \
             f"rho={self.rho_single}_n={self.n}"
@@ -73,11 +87,23 @@ class LeakyBucketMassOne(RegulatedArrivals):
 
     def sigma(self, theta: float) -> float:
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta={theta} must be > 0")
+            return out_of_bounds(f"theta={theta} must be > 0")
 
         return self.n * log(0.5 * (exp(theta * self.sigma_single) +
                                    exp(-theta * self.sigma_single))) / theta
 
+    def sigma_derivative(self, theta: float) -> float:
+        return (self.n * self.sigma_single * tanh(theta * self.sigma_single)
+                - self.sigma(theta=theta)) / theta
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        theta = np.asarray(theta, dtype=float)
+
+        with np.errstate(all="ignore"):
+            return np.where(
+                theta <= 0, nan,
+                self.n * np.log(np.cosh(theta * self.sigma_single)) / theta)
+
     def __str__(self) -> str:
         return f"MassOne_sigma={self.sigma_single}_" \
             f"rho={self.rho_single}_n={self.n}"
@@ -91,7 +117,7 @@ class LeakyBucketMassTwo(RegulatedArrivals):
 
     def sigma(self, theta: float) -> float:
         if theta <= 0:
-            raise ParameterOutOfBounds(f"theta={theta} must be > 0")
+            return out_of_bounds(f"theta={theta} must be > 0")
 
         try:
             return log(1.0 + sqrt(0.5 * pi * self.n * (self.sigma_single**2)) *
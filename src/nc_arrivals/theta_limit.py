@@ -0,0 +1,42 @@
+"""Supremum of theta where the mgf of an arrival exists."""
+
+from math import inf
+
+from nc_arrivals.arrival import Arrival
+from nc_arrivals.arrival_distribution import ArrivalDistribution
+from nc_arrivals.ebb import EBB
+from nc_arrivals.markov_modulated import MMOOFluid
+from nc_arrivals.qt import DM1, MD1, MM1
+
+
+def theta_upper_limit(arr: ArrivalDistribution) -> float:
+    """
+    :param arr: arrival process
+    :return:    supremum of theta where the mgf of the arrival exists
+    """
+    if isinstance(arr, DM1):
+        return arr.lamb
+
+    elif isinstance(arr, MM1):
+        return arr.mu
+
+    elif isinstance(arr, EBB):
+        return arr.decay
+
+    elif isinstance(arr, (MD1, MMOOFluid)):
+        return inf
+
+    else:
+        raise NotImplementedError(
+            f"{arr.__class__.__name__} has no analytic theta interval")
+
+
+def arrival_theta_limit(arr: Arrival) -> float:
+    """
+    :param arr: any arrival
+    :return:    theta_upper_limit, inf if it is not known
+    """
+    try:
+        return theta_upper_limit(arr=arr)
+    except NotImplementedError:
+        return inf
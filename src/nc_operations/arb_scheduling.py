@@ -4,8 +4,9 @@ from nc_arrivals.arrival import Arrival
 from nc_arrivals.regulated_arrivals import DetermTokenBucket
 from nc_server.rate_latency_server import RateLatencyServer
 from nc_server.server import Server
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import out_of_bounds
 from utils.helper_functions import get_q
+from utils.sigma_rho_cache import memoize_sigma_rho
 
 
 class LeftoverARB(Server):
@@ -26,6 +27,7 @@ class LeftoverARB(Server):
             self.p = p
             self.q = get_q(p=p)
 
+    @memoize_sigma_rho
     def sigma(self, theta):
         if isinstance(self.ser, RateLatencyServer) and isinstance(
                 self.cross_arr, DetermTokenBucket):
@@ -35,6 +37,7 @@ class LeftoverARB(Server):
         return self.ser.sigma(theta=self.q * theta) + self.cross_arr.sigma(
             theta=self.p * theta)
 
+    @memoize_sigma_rho
     def rho(self, theta):
         if isinstance(self.ser, RateLatencyServer) and isinstance(
                 self.cross_arr, DetermTokenBucket):
@@ -43,7 +46,28 @@ class LeftoverARB(Server):
         arr_rho_p_theta = self.cross_arr.rho(theta=self.p * theta)
         ser_rho_q_theta = self.ser.rho(theta=self.q * theta)
 
-        if ser_rho_q_theta < 0 or arr_rho_p_theta < 0:
-            raise ParameterOutOfBounds("The rhos must be >= 0")
+        # the negated comparisons also catch nan, see NanOnInfeasible
+        if not ser_rho_q_theta >= 0 or not arr_rho_p_theta >= 0:
+            return out_of_bounds("The rhos must be >= 0")
 
         return ser_rho_q_theta - arr_rho_p_theta
+
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        if isinstance(self.ser, RateLatencyServer) and isinstance(
+                self.cross_arr, DetermTokenBucket):
+            return 0.0
+
+        return self.q * self.ser.sigma_derivative(
+            theta=self.q * theta) + self.p * self.cross_arr.sigma_derivative(
+                theta=self.p * theta)
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        if isinstance(self.ser, RateLatencyServer) and isinstance(
+                self.cross_arr, DetermTokenBucket):
+            return 0.0
+
+        return self.q * self.ser.rho_derivative(
+            theta=self.q * theta) - self.p * self.cross_arr.rho_derivative(
+                theta=self.p * theta)
@@ -0,0 +1,110 @@
+"""Required bandwidth for whole tables of traffic mixes at once."""
+
+from functools import partial
+from multiprocessing import Pool
+from typing import Tuple
+
+import numpy as np
+
+from bound_evaluation.parameter_sweep import (CHUNKSIZE,
+                                              param_row_to_arr_list)
+from nc_arrivals.arrival_enum import ArrivalEnum
+from nc_operations.get_bandwidth import get_bandwidth_brent
+
+
+def required_rates_chunk(chunk: Tuple[np.ndarray, np.ndarray],
+                         arrival_enum: ArrivalEnum, lower_interval: float,
+                         upper_interval: float, indep: bool,
+                         geom_series: bool) -> np.ndarray:
+    """
+    :param chunk: rows of the parameter table and of the target table
+    :return:      required rate per row, nan if the rate is not within
+                  [lower_interval, upper_interval]
+    """
+    param_chunk, target_chunk = chunk
+    rates = np.full(param_chunk.shape[0], np.nan)
+    theta_start = None
+
+    for i in range(param_chunk.shape[0]):
+        arr_list = param_row_to_arr_list(param_row=param_chunk[i],
+                                         arrival_enum=arrival_enum,
+                                         number_flows=1)
+        try:
+            rates[i], theta_opt = get_bandwidth_brent(
+                arr_list=arr_list,
+                target_delay=target_chunk[i, 0],
+                target_delay_prob=target_chunk[i, 1],
+                lower_interval=lower_interval,
+                upper_interval=upper_interval,
+                indep=indep,
+                geom_series=geom_series,
+                theta_start=theta_start,
+                vectorized=True)
+        except ValueError:
+            # no sign change, i.e., the rate is not within the interval
+            continue
+
+        if theta_opt is not None:
+            theta_start = theta_opt
+
+    return rates
+
+
+def required_rates(arrival_enum: ArrivalEnum,
+                   param_array: np.ndarray,
+                   target_array: np.ndarray,
+                   lower_interval: float,
+                   upper_interval: float,
+                   indep=True,
+                   geom_series=True,
+                   processes=1,
+                   chunksize=CHUNKSIZE) -> np.ndarray:
+    """
+    Bulk version of get_bandwidth_from_delay: the minimal rate of a constant
+    rate server per row, such that its optimized delay probability bound
+    meets the row's target.
+
+    :param arrival_enum:   arrival process of all rows
+    :param param_array:    one row of arrival parameters per traffic mix, in
+                           the column order of param_row_to_arr_list
+    :param target_array:   one row (target_delay, target_delay_prob) per
+                           traffic mix, or a single row for all of them
+    :param lower_interval: lower end of the rate interval
+    :param upper_interval: upper end of the rate interval
+    :param indep:          true if arrivals and service are independent
+    :param geom_series:    use geometric series or integral bound
+    :param processes:      number of worker processes, None uses all cores
+    :param chunksize:      number of rows per task
+    :return:               required rate per row, nan if it is not within
+                           [lower_interval, upper_interval]
+    """
+    param_array = np.atleast_2d(param_array)
+    if param_array.shape[1] != arrival_enum.number_parameters():
+        raise ValueError(f"{arrival_enum.name} needs "
+                         f"{arrival_enum.number_parameters()} columns, not "
+                         f"{param_array.shape[1]}")
+
+    target_array = np.broadcast_to(target_array, (param_array.shape[0], 2))
+
+    chunks = [(param_array[start:start + chunksize],
+               target_array[start:start + chunksize])
+              for start in range(0, param_array.shape[0], chunksize)]
+    evaluate_chunk = partial(required_rates_chunk,
+                             arrival_enum=arrival_enum,
+                             lower_interval=lower_interval,
+                             upper_interval=upper_interval,
+                             indep=indep,
+                             geom_series=geom_series)
+
+    if processes == 1:
+        rate_chunks = list(map(evaluate_chunk, chunks))
+
+    else:
+        with Pool(processes=processes) as pool:
+            # map keeps the order of the chunks
+            rate_chunks = pool.map(evaluate_chunk, chunks)
+
+    if not rate_chunks:
+        return np.empty(0)
+
+    return np.concatenate(rate_chunks)
@@ -12,23 +12,57 @@ from nc_operations.single_server_perform import SingleServerPerform
 from nc_server.constant_rate_server import ConstantRateServer
 from optimization.opt_method import OptMethod
 from optimization.optimize import Optimize
+from optimization.warm_start import (warm_grid_search_sweep,
+                                     warm_pattern_search_sweep)
 from utils.perform_param_list import PerformParamList
 
 
 def single_server_df(arr_list: List[ArrivalDistribution],
-                     ser_list: List[ConstantRateServer], opt_method: OptMethod,
-                     perform_param_list: PerformParamList) -> pd.DataFrame:
+                     ser_list: List[ConstantRateServer],
+                     opt_method: OptMethod,
+                     perform_param_list: PerformParamList,
+                     warm_start=False) -> pd.DataFrame:
     """Compute output standard_bound for T in T_list and write into dataframe
     Args:
         arr_list: Arrival object list
         ser_list: Service object list
         opt_method: method name as string, GS or PS
         perform_param_list: list of performance parameter values
+        warm_start: start every optimization at the previous optimum
+            (only GS or PS)
 
     Returns:
         dataframe
     """
 
+    if warm_start:
+        optimizer_list = []
+        for i in range(len(perform_param_list)):
+            setting = SingleServerPerform(
+                arr_list=arr_list,
+                server=ser_list[0],
+                perform_param=perform_param_list.get_parameter_at_i(i))
+            optimizer_list.append(Optimize(setting=setting, number_param=1))
+
+        if opt_method == OptMethod.GRID_SEARCH:
+            bound, _ = warm_grid_search_sweep(optimizer_list=optimizer_list,
+                                              bound_list=[(0.1, 4.0)],
+                                              delta=0.1)
+        elif opt_method == OptMethod.PATTERN_SEARCH:
+            bound, _ = warm_pattern_search_sweep(
+                optimizer_list=optimizer_list,
+                start_list=[0.5],
+                delta=3.0,
+                delta_min=0.01)
+        else:
+            raise NameError(
+                f"Optimization parameter {opt_method} has no warm start")
+
+        delay_bounds_df = pd.DataFrame({"standard_bound": bound},
+                                       index=perform_param_list.values_list)
+
+        return delay_bounds_df[["standard_bound"]]
+
     bound = [0.0] * len(perform_param_list)
 
     for i in range(len(perform_param_list)):
@@ -43,6 +77,15 @@ def single_server_df(arr_list: List[ArrivalDistribution],
                                                                          4.0)],
                                                             delta=0.1)
 
+        elif opt_method == OptMethod.ADAPTIVE_GRID:
+            bound[i] = Optimize(setting=setting,
+                                number_param=1).adaptive_grid_search(
+                                    bound_list=[(0.1, 4.0)], delta=0.1)
+
+        elif opt_method == OptMethod.BOUNDED_THETA:
+            bound[i] = Optimize(setting=setting,
+                                number_param=1).bounded_theta_search()
+
         elif opt_method == OptMethod.PATTERN_SEARCH:
             bound[i] = Optimize(setting=setting,
                                 number_param=1).pattern_search(
@@ -1,6 +1,7 @@
 """Small examples to play with."""
 
-from typing import List
+from math import inf, log
+from typing import List, Optional, Tuple
 
 import numpy as np
 import scipy.optimize
@@ -14,6 +15,9 @@ from optimization.opt_method import OptMethod
 from optimization.optimize import Optimize
 from utils.perform_parameter import PerformParameter
 
+# |log(bound) - log(target)| is capped, e.g., for unstable rates
+LOG_GAP_CAP = 700.0
+
 
 def get_bandwidth_from_delay(arr_list: List[ArrivalDistribution],
                              target_delay: int,
@@ -61,6 +65,15 @@ def get_bandwidth_from_delay(arr_list: List[ArrivalDistribution],
 
         return current_delay_prob - target_delay_prob
 
+    if opt_method == OptMethod.BOUNDED_THETA:
+        return get_bandwidth_brent(arr_list=arr_list,
+                                   target_delay=target_delay,
+                                   target_delay_prob=target_delay_prob,
+                                   lower_interval=lower_interval,
+                                   upper_interval=upper_interval,
+                                   indep=indep,
+                                   geom_series=geom_series)[0]
+
     # np.seterr("raise")
     np.seterr("warn")
 
@@ -71,6 +84,142 @@ def get_bandwidth_from_delay(arr_list: List[ArrivalDistribution],
     return res[0]
 
 
+def optimized_delay_prob(
+        arr_list: List[ArrivalDistribution],
+        rate: float,
+        target_delay: int,
+        indep=True,
+        geom_series=True,
+        theta_start: Optional[float] = None,
+        vectorized=False) -> Tuple[float, Optional[float]]:
+    """
+    Delay probability bound of a constant rate server, optimized by Brent's
+    method over theta (independent case) or a vectorized grid search over
+    theta and p (dependent case).
+
+    :param theta_start: optimal theta of a similar rate, narrows the
+                        search of theta
+    :param vectorized:  replace Brent's method by the vectorized
+                        zoom_theta_search
+    :return:            optimized bound and its theta (None if unknown)
+    """
+    single_server = SingleServerBandwidth(
+        arr_list=arr_list,
+        s_e2e=ConstantRateServer(rate=rate),
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=target_delay),
+        indep=indep,
+        geom_series=geom_series)
+
+    if indep:
+        optimizer = Optimize(setting=single_server, number_param=1)
+        try:
+            if vectorized:
+                bound = optimizer.zoom_theta_search(theta_start=theta_start)
+            else:
+                bound = optimizer.bounded_theta_search(
+                    theta_start=theta_start)
+        except NotImplementedError:
+            bound = optimizer.grid_search(bound_list=[(0.1, 5.0)],
+                                          delta=0.1,
+                                          vectorized=True)
+    else:
+        optimizer = Optimize(setting=single_server, number_param=2)
+        bound = optimizer.grid_search(bound_list=[(0.1, 5.0), (1.1, 5.0)],
+                                      delta=0.1,
+                                      vectorized=True,
+                                      prune=True)
+
+    if bound == inf or optimizer.opt_x is None:
+        return bound, None
+
+    return bound, optimizer.opt_x[0]
+
+
+def get_bandwidth_brent(
+        arr_list: List[ArrivalDistribution],
+        target_delay: int,
+        target_delay_prob: float,
+        lower_interval: float,
+        upper_interval: float,
+        indep=True,
+        geom_series=True,
+        xtol=1e-6,
+        theta_start: Optional[float] = None,
+        vectorized=False) -> Tuple[float, Optional[float]]:
+    """
+    Minimal rate such that the optimized delay probability bound meets the
+    target. Brent's root finder on the log-gap converges superlinearly,
+    i.e., it needs far fewer optimizations than a bisection, and every
+    optimization of theta starts at the optimum of the previous rate.
+
+    :param xtol:        absolute tolerance of the rate
+    :param theta_start: optimal theta of a similar query
+    :param vectorized:  see optimized_delay_prob
+    :return:            required rate and its optimal theta
+    """
+    # the latest optimal theta, shared between the steps of the root finder
+    theta_state = [theta_start]
+
+    def log_gap(rate: float) -> float:
+        bound, theta_opt = optimized_delay_prob(arr_list=arr_list,
+                                                rate=rate,
+                                                target_delay=target_delay,
+                                                indep=indep,
+                                                geom_series=geom_series,
+                                                theta_start=theta_state[0],
+                                                vectorized=vectorized)
+        if theta_opt is not None:
+            theta_state[0] = theta_opt
+
+        if bound <= 0.0:
+            return -LOG_GAP_CAP
+
+        return min(log(bound) - log(target_delay_prob), LOG_GAP_CAP)
+
+    with np.errstate(all="warn"):
+        rate = scipy.optimize.brentq(log_gap,
+                                     a=lower_interval,
+                                     b=upper_interval,
+                                     xtol=xtol)
+
+    return rate, theta_state[0]
+
+
+def get_bandwidths_from_delays(arr_list: List[ArrivalDistribution],
+                               target_list: List[Tuple[int, float]],
+                               lower_interval: float,
+                               upper_interval: float,
+                               indep=True,
+                               geom_series=True) -> np.ndarray:
+    """
+    Dimensions many targets at once. The queries are solved in the order of
+    their targets, such that every query starts at the optimal theta of a
+    similar one.
+
+    :param target_list: list of tuples of target delay and target delay
+                        probability
+    :return:            required rate per target
+    """
+    rates = np.empty(len(target_list))
+    theta_start = None
+
+    for index in sorted(range(len(target_list)),
+                        key=lambda i: target_list[i]):
+        target_delay, target_delay_prob = target_list[index]
+        rates[index], theta_start = get_bandwidth_brent(
+            arr_list=arr_list,
+            target_delay=target_delay,
+            target_delay_prob=target_delay_prob,
+            lower_interval=lower_interval,
+            upper_interval=upper_interval,
+            indep=indep,
+            geom_series=geom_series,
+            theta_start=theta_start)
+
+    return rates
+
+
 if __name__ == '__main__':
     print("Single Server Performance Bounds:\n")
 
@@ -4,7 +4,8 @@ from typing import List
 
 from nc_arrivals.arrival import Arrival
 from nc_server.server import Server
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import out_of_bounds
+from utils.sigma_rho_cache import memoize_sigma_rho
 
 
 class LeftoverGPSPG(Server):
@@ -13,13 +14,26 @@ class LeftoverGPSPG(Server):
         self.ser = ser
         self.phi_foi_weight = phi_list[0] / sum(phi_list)
 
+    @memoize_sigma_rho
     def sigma(self, theta):
         return self.phi_foi_weight * self.ser.sigma(theta=self.phi_foi_weight *
                                                     theta)
 
+    @memoize_sigma_rho
     def rho(self, theta):
-        if self.ser.rho(theta=theta) < 0:
-            raise ParameterOutOfBounds("The rhos must be >= 0")
+        # the negated comparison also catches nan, see NanOnInfeasible
+        if not self.ser.rho(theta=theta) >= 0:
+            return out_of_bounds("The rhos must be >= 0")
 
         return self.phi_foi_weight * self.ser.rho(theta=self.phi_foi_weight *
                                                   theta)
+
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        return self.phi_foi_weight**2 * self.ser.sigma_derivative(
+            theta=self.phi_foi_weight * theta)
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        return self.phi_foi_weight**2 * self.ser.rho_derivative(
+            theta=self.phi_foi_weight * theta)
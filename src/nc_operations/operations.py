@@ -1,6 +1,6 @@
 """Implements all network operations in the sigma-rho calculus."""
 
-from math import exp, log
+from math import exp, expm1, log, nan
 from typing import List
 
 import numpy as np
@@ -11,8 +11,10 @@ from nc_arrivals.regulated_arrivals import DetermTokenBucket
 from nc_operations.stability_check import stability_check
 from nc_server.rate_latency_server import RateLatencyServer
 from nc_server.server import Server
-from utils.exceptions import IllegalArgumentError, ParameterOutOfBounds
-from utils.helper_functions import get_p_n, get_q, is_equal
+from utils.exceptions import IllegalArgumentError, out_of_bounds
+from utils.helper_functions import (get_p_n, get_q, is_equal,
+                                    k_sig_derivative)
+from utils.sigma_rho_cache import memoize_sigma_rho
 
 
 class Deconvolve(Arrival):
@@ -29,6 +31,7 @@ class Deconvolve(Arrival):
             self.p = p
             self.q = get_q(p=p)
 
+    @memoize_sigma_rho
     def sigma(self, theta: float) -> float:
         """
 
@@ -52,6 +55,7 @@ class Deconvolve(Arrival):
         else:
             return arr_sigma_p + ser_sigma_q + arr_rho_p + k_sig
 
+    @memoize_sigma_rho
     def rho(self, theta: float) -> float:
         """
 
@@ -60,23 +64,57 @@ class Deconvolve(Arrival):
         """
         if isinstance(self.arr, DetermTokenBucket) and isinstance(
                 self.ser, RateLatencyServer):
-            stability_check(arr=self.arr, ser=self.ser, theta=theta)
+            if not stability_check(arr=self.arr, ser=self.ser, theta=theta):
+                return nan
+
             return self.arr.arr_rate
 
         arr_rho_p = self.arr.rho(self.p * theta)
 
-        if arr_rho_p < 0 or self.ser.rho(self.q * theta) < 0:
-            raise ParameterOutOfBounds("The rhos must be >= 0")
+        # the negated comparisons also catch nan, see NanOnInfeasible
+        if not arr_rho_p >= 0 or not self.ser.rho(self.q * theta) >= 0:
+            return out_of_bounds("The rhos must be >= 0")
 
-        stability_check(arr=self.arr,
-                        ser=self.ser,
-                        theta=theta,
-                        indep=self.indep,
-                        p=self.p,
-                        q=self.q)
+        if not stability_check(arr=self.arr,
+                               ser=self.ser,
+                               theta=theta,
+                               indep=self.indep,
+                               p=self.p,
+                               q=self.q):
+            return nan
 
         return arr_rho_p
 
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        if isinstance(self.arr, DetermTokenBucket) and isinstance(
+                self.ser, RateLatencyServer):
+            return 0.0
+
+        arr_rho_p = self.arr.rho(self.p * theta)
+        arr_rho_p_derivative = self.p * self.arr.rho_derivative(self.p * theta)
+
+        res = self.p * self.arr.sigma_derivative(
+            self.p * theta) + self.q * self.ser.sigma_derivative(
+                self.q * theta) + k_sig_derivative(
+                    theta=theta,
+                    rho_diff=arr_rho_p - self.ser.rho(self.q * theta),
+                    rho_diff_derivative=arr_rho_p_derivative -
+                    self.q * self.ser.rho_derivative(self.q * theta))
+
+        if self.arr.is_discrete():
+            return res
+        else:
+            return res + arr_rho_p_derivative
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        if isinstance(self.arr, DetermTokenBucket) and isinstance(
+                self.ser, RateLatencyServer):
+            return 0.0
+
+        return self.p * self.arr.rho_derivative(self.p * theta)
+
     def is_discrete(self):
         return self.arr.is_discrete()
 
@@ -95,6 +133,7 @@ class Convolve(Server):
             self.p = p
             self.q = get_q(p=p)
 
+    @memoize_sigma_rho
     def sigma(self, theta: float) -> float:
         if isinstance(self.ser1, RateLatencyServer) and isinstance(
                 self.ser2, RateLatencyServer):
@@ -115,6 +154,7 @@ class Convolve(Server):
         else:
             return ser_1_sigma_p + ser_2_sigma_q
 
+    @memoize_sigma_rho
     def rho(self, theta: float) -> float:
         if isinstance(self.ser1, RateLatencyServer) and isinstance(
                 self.ser2, RateLatencyServer):
@@ -123,8 +163,9 @@ class Convolve(Server):
         ser_1_rho_p = self.ser1.rho(self.p * theta)
         ser_2_rho_q = self.ser2.rho(self.q * theta)
 
-        if ser_1_rho_p < 0 or ser_2_rho_q < 0:
-            raise ParameterOutOfBounds("The rhos must be > 0")
+        # the negated comparisons also catch nan, see NanOnInfeasible
+        if not ser_1_rho_p >= 0 or not ser_2_rho_q >= 0:
+            return out_of_bounds("The rhos must be > 0")
 
         if not is_equal(ser_1_rho_p, ser_2_rho_q):
             return min(ser_1_rho_p, ser_2_rho_q)
@@ -132,6 +173,29 @@ class Convolve(Server):
         else:
             return ser_1_rho_p - 1 / theta
 
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        return _convolve_sigma_derivative(convolve=self, theta=theta)
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        if isinstance(self.ser1, RateLatencyServer) and isinstance(
+                self.ser2, RateLatencyServer):
+            return 0.0
+
+        ser_1_rho_p = self.ser1.rho(self.p * theta)
+        ser_2_rho_q = self.ser2.rho(self.q * theta)
+
+        if not is_equal(ser_1_rho_p, ser_2_rho_q):
+            if ser_1_rho_p < ser_2_rho_q:
+                return self.p * self.ser1.rho_derivative(self.p * theta)
+            else:
+                return self.q * self.ser2.rho_derivative(self.q * theta)
+
+        else:
+            return self.p * self.ser1.rho_derivative(
+                self.p * theta) + 1 / theta**2
+
 
 class ConvolveAlter(Server):
     """Convolution class."""
@@ -154,6 +218,7 @@ class ConvolveAlter(Server):
 
         self.delta = delta
 
+    @memoize_sigma_rho
     def sigma(self, theta: float) -> float:
         if isinstance(self.ser1, RateLatencyServer) and isinstance(
                 self.ser2, RateLatencyServer):
@@ -175,6 +240,7 @@ class ConvolveAlter(Server):
             return ser_1_sigma_p + ser_2_sigma_q - log(1 - exp(-theta *
                                                                self.delta))
 
+    @memoize_sigma_rho
     def rho(self, theta: float) -> float:
         if isinstance(self.ser1, RateLatencyServer) and isinstance(
                 self.ser2, RateLatencyServer):
@@ -183,8 +249,9 @@ class ConvolveAlter(Server):
         ser_1_rho_p = self.ser1.rho(self.p * theta)
         ser_2_rho_q = self.ser2.rho(self.q * theta)
 
-        if ser_1_rho_p < 0 or ser_2_rho_q < 0:
-            raise ParameterOutOfBounds("The rhos must be > 0")
+        # the negated comparisons also catch nan, see NanOnInfeasible
+        if not ser_1_rho_p >= 0 or not ser_2_rho_q >= 0:
+            return out_of_bounds("The rhos must be > 0")
 
         if not is_equal(ser_1_rho_p, ser_2_rho_q):
             return min(ser_1_rho_p, ser_2_rho_q)
@@ -192,6 +259,26 @@ class ConvolveAlter(Server):
         else:
             return ser_1_rho_p - self.delta
 
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        return _convolve_sigma_derivative(convolve=self, theta=theta)
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        if isinstance(self.ser1, RateLatencyServer) and isinstance(
+                self.ser2, RateLatencyServer):
+            return 0.0
+
+        ser_1_rho_p = self.ser1.rho(self.p * theta)
+        ser_2_rho_q = self.ser2.rho(self.q * theta)
+
+        if not is_equal(ser_1_rho_p, ser_2_rho_q) and \
+                ser_2_rho_q < ser_1_rho_p:
+            return self.q * self.ser2.rho_derivative(self.q * theta)
+
+        else:
+            return self.p * self.ser1.rho_derivative(self.p * theta)
+
 
 class AggregateList(Arrival):
     """Multiple (list) aggregation class."""
@@ -214,6 +301,7 @@ class AggregateList(Arrival):
                 self.p_list.append(get_p_n(p_list=p_list))
         self.indep = indep
 
+    @memoize_sigma_rho
     def sigma(self, theta: float) -> float:
         res = 0.0
         if self.indep:
@@ -225,27 +313,44 @@ class AggregateList(Arrival):
 
         return res
 
+    @memoize_sigma_rho
     def rho(self, theta: float) -> float:
         res = 0.0
 
         if self.indep:
             for arrival in self.arr_list:
                 rho_i = arrival.rho(theta)
-                if rho_i < 0:
-                    raise ParameterOutOfBounds("The rhos must be >= 0")
+                if not rho_i >= 0:
+                    return out_of_bounds("The rhos must be >= 0")
 
                 res += rho_i
 
         else:
             for i, arr in enumerate(self.arr_list):
                 rho_i = arr.rho(self.p_list[i] * theta)
-                if rho_i < 0:
-                    raise ParameterOutOfBounds("The rhos must be >= 0")
+                if not rho_i >= 0:
+                    return out_of_bounds("The rhos must be >= 0")
 
                 res += rho_i
 
         return res
 
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        if self.indep:
+            return sum(arr.sigma_derivative(theta) for arr in self.arr_list)
+
+        return sum(p_i * arr.sigma_derivative(p_i * theta)
+                   for p_i, arr in zip(self.p_list, self.arr_list))
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        if self.indep:
+            return sum(arr.rho_derivative(theta) for arr in self.arr_list)
+
+        return sum(p_i * arr.rho_derivative(p_i * theta)
+                   for p_i, arr in zip(self.p_list, self.arr_list))
+
     def is_discrete(self):
         return self.arr_list[0].is_discrete()
 
@@ -267,19 +372,34 @@ class AggregateTwo(Arrival):
             self.p = p
             self.q = get_q(p=p)
 
+    @memoize_sigma_rho
     def sigma(self, theta: float) -> float:
         return self.arr1.sigma(self.p * theta) + self.arr2.sigma(
             self.q * theta)
 
+    @memoize_sigma_rho
     def rho(self, theta: float) -> float:
         arr_1_rho_p_theta = self.arr1.rho(self.p * theta)
         arr_2_rho_q_theta = self.arr2.rho(self.q * theta)
 
-        if arr_1_rho_p_theta < 0 or arr_2_rho_q_theta < 0:
-            raise ParameterOutOfBounds("The rhos must be >= 0")
+        # the negated comparisons also catch nan, see NanOnInfeasible
+        if not arr_1_rho_p_theta >= 0 or not arr_2_rho_q_theta >= 0:
+            return out_of_bounds("The rhos must be >= 0")
 
         return arr_1_rho_p_theta + arr_2_rho_q_theta
 
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        return self.p * self.arr1.sigma_derivative(
+            self.p * theta) + self.q * self.arr2.sigma_derivative(
+                self.q * theta)
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        return self.p * self.arr1.rho_derivative(
+            self.p * theta) + self.q * self.arr2.rho_derivative(
+                self.q * theta)
+
     def is_discrete(self):
         return self.arr1.is_discrete()
 
@@ -294,12 +414,22 @@ class AggregateHomogeneous(Arrival):
             raise NotImplementedError(
                 "only the independet case is implemented")
 
+    @memoize_sigma_rho
     def sigma(self, theta: float) -> float:
         return self.n * self.arr.sigma(theta=theta)
 
+    @memoize_sigma_rho
     def rho(self, theta: float) -> float:
         return self.n * self.arr.rho(theta=theta)
 
+    @memoize_sigma_rho
+    def sigma_derivative(self, theta: float) -> float:
+        return self.n * self.arr.sigma_derivative(theta=theta)
+
+    @memoize_sigma_rho
+    def rho_derivative(self, theta: float) -> float:
+        return self.n * self.arr.rho_derivative(theta=theta)
+
     def is_discrete(self):
         return self.arr.is_discrete()
 
@@ -308,6 +438,40 @@ class AggregateHomogeneous(Arrival):
             return self.n * self.arr.average_rate()
 
 
+def _convolve_sigma_derivative(convolve, theta: float) -> float:
+    """
+    :param convolve: Convolve or ConvolveAlter
+    :param theta:    mgf parameter
+    :return:         derivative of convolve.sigma
+    """
+    if isinstance(convolve.ser1, RateLatencyServer) and isinstance(
+            convolve.ser2, RateLatencyServer):
+        return 0.0
+
+    p, q = convolve.p, convolve.q
+    res = p * convolve.ser1.sigma_derivative(
+        p * theta) + q * convolve.ser2.sigma_derivative(q * theta)
+
+    ser_1_rho_p = convolve.ser1.rho(p * theta)
+    ser_2_rho_q = convolve.ser2.rho(q * theta)
+
+    if not is_equal(ser_1_rho_p, ser_2_rho_q):
+        # k_sig of the negative absolute rho difference
+        sign = 1.0 if ser_1_rho_p < ser_2_rho_q else -1.0
+        return res + k_sig_derivative(
+            theta=theta,
+            rho_diff=sign * (ser_1_rho_p - ser_2_rho_q),
+            rho_diff_derivative=sign *
+            (p * convolve.ser1.rho_derivative(p * theta) -
+             q * convolve.ser2.rho_derivative(q * theta)))
+
+    elif isinstance(convolve, ConvolveAlter):
+        return res - convolve.delta / expm1(theta * convolve.delta)
+
+    else:
+        return res
+
+
 if __name__ == '__main__':
     from timeit import default_timer as timer
 
@@ -0,0 +1,345 @@
+"""Compiles operator trees into flat plans that are evaluated for whole arrays
+of theta (and Hoelder p) without rebuilding any operator object."""
+
+from enum import Enum
+from math import inf, nan
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from nc_arrivals.arrival import Arrival
+from nc_arrivals.regulated_arrivals import DetermTokenBucket
+from nc_arrivals.theta_limit import arrival_theta_limit
+from nc_operations.arb_scheduling import LeftoverARB
+from nc_operations.operations import (AggregateHomogeneous, AggregateList,
+                                      AggregateTwo, Convolve, Deconvolve)
+from nc_server.rate_latency_server import RateLatencyServer
+from nc_server.server import Server
+from utils.helper_functions import EPSILON, get_q_array
+
+# Hoelder p for building trees whose p is only passed at evaluation
+PLACEHOLDER_P = 2.0
+
+
+class StepKind(Enum):
+    """Closed-form formula that is applied in one step of the plan"""
+    LEAF = "leaf"
+    DECONVOLVE = "deconvolve"
+    DECONVOLVE_TB_RL = "deconvolve_tb_rl"
+    CONVOLVE = "convolve"
+    CONVOLVE_RL_RL = "convolve_rl_rl"
+    LEFTOVER_ARB = "leftover_arb"
+    LEFTOVER_ARB_RL_TB = "leftover_arb_rl_tb"
+    AGGREGATE = "aggregate"
+    AGGREGATE_HOMOGENEOUS = "aggregate_homogeneous"
+
+
+class PlanStep(object):
+    """One node of the operator tree in the flat plan."""
+    def __init__(self, kind: StepKind, node: Union[Arrival, Server],
+                 children: List[int], scales: list) -> None:
+        self.kind = kind
+        self.node = node
+        # indices of the children in the plan
+        self.children = children
+        # theta of child i is scales[i] * theta, "p" and "q" refer to the
+        # node's Hoelder p and q
+        self.scales = scales
+        self.free_p = not getattr(node, "indep", True) and hasattr(node, "p")
+
+
+class OperatorPlan(object):
+    """
+    Flat evaluation plan of an operator tree.
+
+    The tree is traversed once and stored in post-order, i.e., the root is
+    the last step. Dependent (indep=False) Deconvolve, Convolve, LeftoverARB
+    and AggregateTwo nodes can be evaluated for a runtime array of p's, such
+    that the tree only has to be built once with a placeholder p.
+    Unknown operators are treated as leaves.
+    """
+    def __init__(self, root: Union[Arrival, Server]) -> None:
+        self.steps: List[PlanStep] = []
+        self._compile(node=root)
+
+    def _compile(self, node: Union[Arrival, Server]) -> int:
+        if isinstance(node, Deconvolve):
+            if isinstance(node.arr, DetermTokenBucket) and isinstance(
+                    node.ser, RateLatencyServer):
+                kind, children, scales = StepKind.DECONVOLVE_TB_RL, [], []
+            else:
+                kind = StepKind.DECONVOLVE
+                children = [self._compile(node.arr), self._compile(node.ser)]
+                scales = ["p", "q"]
+
+        elif isinstance(node, Convolve):
+            if isinstance(node.ser1, RateLatencyServer) and isinstance(
+                    node.ser2, RateLatencyServer):
+                kind, children, scales = StepKind.CONVOLVE_RL_RL, [], []
+            else:
+                kind = StepKind.CONVOLVE
+                children = [
+                    self._compile(node.ser1),
+                    self._compile(node.ser2)
+                ]
+                scales = ["p", "q"]
+
+        elif isinstance(node, LeftoverARB):
+            if isinstance(node.ser, RateLatencyServer) and isinstance(
+                    node.cross_arr, DetermTokenBucket):
+                kind, children, scales = StepKind.LEFTOVER_ARB_RL_TB, [], []
+            else:
+                kind = StepKind.LEFTOVER_ARB
+                children = [
+                    self._compile(node.ser),
+                    self._compile(node.cross_arr)
+                ]
+                scales = ["q", "p"]
+
+        elif isinstance(node, AggregateList):
+            kind = StepKind.AGGREGATE
+            children = [self._compile(arr) for arr in node.arr_list]
+            if node.indep:
+                scales = [1.0] * len(children)
+            else:
+                scales = [float(p_i) for p_i in node.p_list]
+
+        elif isinstance(node, AggregateTwo):
+            kind = StepKind.AGGREGATE
+            children = [self._compile(node.arr1), self._compile(node.arr2)]
+            scales = ["p", "q"]
+
+        elif isinstance(node, AggregateHomogeneous):
+            kind = StepKind.AGGREGATE_HOMOGENEOUS
+            children = [self._compile(node.arr)]
+            scales = [1.0]
+
+        else:
+            kind, children, scales = StepKind.LEAF, [], []
+
+        self.steps.append(
+            PlanStep(kind=kind, node=node, children=children, scales=scales))
+
+        return len(self.steps) - 1
+
+    def sigma_rho_array(self,
+                        theta: np.ndarray,
+                        p: Optional[np.ndarray] = None
+                        ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluates the plan.
+
+        :param theta: array of mgf parameters
+        :param p:     array of Hoelder p's for all dependent nodes, their own
+                      p is used if None
+        :return:      sigma and rho of the root, nan where infeasible
+        """
+        values: List[Optional[Tuple[np.ndarray,
+                                    np.ndarray]]] = [None] * len(self.steps)
+
+        with np.errstate(all="ignore"):
+            thetas = self._step_thetas(theta=theta, p=p)
+
+            # bottom-up: children precede their parents in post-order
+            for i, step in enumerate(self.steps):
+                values[i] = _evaluate_step(
+                    step=step,
+                    theta=thetas[i],
+                    child_values=[values[child] for child in step.children])
+
+        return values[-1]
+
+    def _step_thetas(self,
+                     theta: np.ndarray,
+                     p: Optional[np.ndarray] = None) -> List[np.ndarray]:
+        """
+        :param theta: array of mgf parameters of the root
+        :param p:     array of Hoelder p's for all dependent nodes
+        :return:      theta at which every step is evaluated
+        """
+        thetas: List[Optional[np.ndarray]] = [None] * len(self.steps)
+        thetas[-1] = np.asarray(theta, dtype=float)
+
+        if p is not None:
+            p = np.asarray(p, dtype=float)
+            q = get_q_array(p=p)
+
+        # top-down: parents precede their children in reversed post-order
+        for i in reversed(range(len(self.steps))):
+            step = self.steps[i]
+            if step.free_p and p is not None:
+                p_q = {"p": p, "q": q}
+            else:
+                p_q = {
+                    "p": getattr(step.node, "p", 1.0),
+                    "q": getattr(step.node, "q", 1.0)
+                }
+
+            for child, scale in zip(step.children, step.scales):
+                thetas[child] = p_q.get(scale, scale) * thetas[i]
+
+        return thetas
+
+    def theta_upper_bound(self, p: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Every leaf arrival is evaluated at a multiple of theta, i.e., the
+        plan is infeasible as soon as one of them passes the pole of its mgf.
+
+        :param p: array of Hoelder p's for all dependent nodes
+        :return:  thetas from this bound on are infeasible, inf if no leaf
+                  has a known pole
+        """
+        theta_one = np.ones(1) if p is None else np.ones_like(p, dtype=float)
+        theta_max = np.full_like(theta_one, inf)
+
+        with np.errstate(all="ignore"):
+            thetas = self._step_thetas(theta=theta_one, p=p)
+
+            for step, leaf_theta in zip(self.steps, thetas):
+                if step.kind == StepKind.LEAF and isinstance(
+                        step.node, Arrival):
+                    theta_max = np.minimum(
+                        theta_max,
+                        arrival_theta_limit(arr=step.node) / leaf_theta)
+
+        return theta_max
+
+    def bind(self, p: Optional[np.ndarray] = None) -> "BoundOperatorPlan":
+        """
+        :param p: array of Hoelder p's of the dependent nodes
+        :return:  view of the plan that can be used like an arrival or server
+        """
+        return BoundOperatorPlan(plan=self, p=p)
+
+
+class BoundOperatorPlan(object):
+    """Plan with fixed p's. Offers the array methods of arrivals / servers."""
+    def __init__(self, plan: OperatorPlan,
+                 p: Optional[np.ndarray] = None) -> None:
+        self.plan = plan
+        self.p = p
+
+    def sigma_rho_array(self,
+                        theta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self.plan.sigma_rho_array(theta=theta, p=self.p)
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return self.sigma_rho_array(theta=theta)[0]
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        return self.sigma_rho_array(theta=theta)[1]
+
+    def is_discrete(self) -> bool:
+        return self.plan.steps[-1].node.is_discrete()
+
+
+class OperatorPlanMixin(object):
+    """Mixin of the settings that evaluate compiled operator trees."""
+    def operator_plans(self, name: str,
+                       build_trees: Callable) -> List[OperatorPlan]:
+        """
+        Compiles operator trees of this setting only once.
+
+        :param name:        key of the trees within the setting
+        :param build_trees: returns the list of trees (dependent nodes can
+                            have any p, as p is passed at evaluation)
+        :return:            compiled plans
+        """
+        plans = self.__dict__.setdefault("_operator_plans", {})
+        if name not in plans:
+            plans[name] = [OperatorPlan(root=tree) for tree in build_trees()]
+
+        return plans[name]
+
+
+def _evaluate_step(step: PlanStep, theta: np.ndarray,
+                   child_values: list) -> Tuple[np.ndarray, np.ndarray]:
+    node = step.node
+
+    if step.kind == StepKind.LEAF:
+        return node.sigma_rho_array(theta=theta)
+
+    elif step.kind == StepKind.DECONVOLVE_TB_RL:
+        sigma = np.full_like(theta,
+                             node.arr.burst + node.arr.arr_rate *
+                             node.ser.latency,
+                             dtype=float)
+        rho = np.full_like(
+            theta,
+            node.arr.arr_rate if node.arr.arr_rate < node.ser.rate else nan,
+            dtype=float)
+
+        return sigma, rho
+
+    elif step.kind == StepKind.DECONVOLVE:
+        (arr_sigma_p, arr_rho_p), (ser_sigma_q, ser_rho_q) = child_values
+
+        k_sig = -np.log(1 - np.exp(theta * (arr_rho_p - ser_rho_q))) / theta
+
+        sigma = arr_sigma_p + ser_sigma_q + k_sig
+        if not node.arr.is_discrete():
+            sigma = sigma + arr_rho_p
+
+        rho = np.where((arr_rho_p < 0) | (ser_rho_q < 0) |
+                       (arr_rho_p >= ser_rho_q), nan, arr_rho_p)
+
+        return sigma, rho
+
+    elif step.kind == StepKind.CONVOLVE_RL_RL:
+        return np.full_like(theta,
+                            node.ser1.latency + node.ser2.latency,
+                            dtype=float), np.full_like(theta,
+                                                       min(
+                                                           node.ser1.rate,
+                                                           node.ser2.rate),
+                                                       dtype=float)
+
+    elif step.kind == StepKind.CONVOLVE:
+        (ser_1_sigma_p, ser_1_rho_p), (ser_2_sigma_q, ser_2_rho_q) = \
+            child_values
+
+        equal = np.abs(ser_1_rho_p - ser_2_rho_q) < EPSILON
+        k_sig = -np.log(1 - np.exp(-theta * np.abs(ser_1_rho_p - ser_2_rho_q))
+                        ) / theta
+
+        sigma = ser_1_sigma_p + ser_2_sigma_q + np.where(equal, 0.0, k_sig)
+        rho = np.where(equal, ser_1_rho_p - 1 / theta,
+                       np.minimum(ser_1_rho_p, ser_2_rho_q))
+        rho = np.where((ser_1_rho_p < 0) | (ser_2_rho_q < 0), nan, rho)
+
+        return sigma, rho
+
+    elif step.kind == StepKind.LEFTOVER_ARB_RL_TB:
+        rate_diff = np.float64(node.ser.rate - node.cross_arr.arr_rate)
+        sigma = (node.cross_arr.burst +
+                 node.ser.rate * node.ser.latency) / rate_diff
+
+        return np.full_like(theta, sigma,
+                            dtype=float), np.full_like(theta,
+                                                       rate_diff,
+                                                       dtype=float)
+
+    elif step.kind == StepKind.LEFTOVER_ARB:
+        (ser_sigma_q, ser_rho_q), (arr_sigma_p, arr_rho_p) = child_values
+
+        rho = np.where((ser_rho_q < 0) | (arr_rho_p < 0), nan,
+                       ser_rho_q - arr_rho_p)
+
+        return ser_sigma_q + arr_sigma_p, rho
+
+    elif step.kind == StepKind.AGGREGATE:
+        sigma = sum(child_sigma for child_sigma, _ in child_values)
+        rho = sum(child_rho for _, child_rho in child_values)
+        negative = np.zeros_like(theta, dtype=bool)
+        for _, child_rho in child_values:
+            negative |= child_rho < 0
+
+        return sigma, np.where(negative, nan, rho)
+
+    elif step.kind == StepKind.AGGREGATE_HOMOGENEOUS:
+        sigma, rho = child_values[0]
+
+        return node.n * sigma, node.n * rho
+
+    else:
+        raise NameError(f"{step.kind} is an infeasible step")
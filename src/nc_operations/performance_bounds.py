@@ -1,7 +1,7 @@
 """Performance bounds"""
 
 import warnings
-from math import exp, inf, log
+from math import exp, inf, log, nan
 
 from nc_arrivals.arrival import Arrival
 from nc_operations.get_sigma_rho import get_sigma_rho
@@ -25,7 +25,10 @@ def backlog_prob(arr: Arrival,
     else:
         q = get_q(p=p)
 
-    stability_check(arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q)
+    if not stability_check(
+            arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q):
+        return nan
+
     sigma_sum, rho_diff = get_sigma_rho(arr=arr,
                                         ser=ser,
                                         theta=theta,
@@ -96,7 +99,10 @@ def backlog(arr: Arrival,
     else:
         q = get_q(p=p)
 
-    stability_check(arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q)
+    if not stability_check(
+            arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q):
+        return nan
+
     sigma_sum, rho_diff = get_sigma_rho(arr=arr,
                                         ser=ser,
                                         theta=theta,
@@ -158,7 +164,10 @@ def delay_prob(arr: Arrival,
     else:
         q = get_q(p=p)
 
-    stability_check(arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q)
+    if not stability_check(
+            arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q):
+        return nan
+
     sigma_sum, rho_diff = get_sigma_rho(arr=arr,
                                         ser=ser,
                                         theta=theta,
@@ -238,7 +247,10 @@ def delay(arr: Arrival,
     else:
         q = get_q(p=p)
 
-    stability_check(arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q)
+    if not stability_check(
+            arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q):
+        return nan
+
     sigma_sum, rho_diff = get_sigma_rho(arr=arr,
                                         ser=ser,
                                         theta=theta,
@@ -300,7 +312,10 @@ def output(arr: Arrival,
     else:
         q = get_q(p=p)
 
-    stability_check(arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q)
+    if not stability_check(
+            arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q):
+        return nan
+
     sigma_sum, rho_diff = get_sigma_rho(arr=arr,
                                         ser=ser,
                                         theta=theta,
@@ -0,0 +1,261 @@
+"""Performance bounds for whole arrays of theta (and Hoelder p) at once.
+
+The functions mirror performance_bounds.py. Instead of raising, infeasible
+entries (unstable system, invalid theta or p, overflow) are set to inf.
+"""
+
+from math import inf
+
+import numpy as np
+
+from nc_arrivals.arrival import Arrival
+from nc_server.server import Server
+from utils.exceptions import IllegalArgumentError
+from utils.helper_functions import get_q_array
+
+
+def sigma_rho_array(arr: Arrival,
+                    ser: Server,
+                    theta: np.ndarray,
+                    indep=True,
+                    p=1.0) -> (np.ndarray, np.ndarray, np.ndarray,
+                               np.ndarray):
+    """
+    Array counterpart of stability_check and get_sigma_rho.
+
+    :return: sigma_sum, arr_rho (at p * theta), ser_rho (at q * theta) and
+             the mask of infeasible entries
+    """
+    theta = np.asarray(theta, dtype=float)
+
+    with np.errstate(all="ignore"):
+        if indep:
+            p_theta = theta
+            q_theta = theta
+        else:
+            p_theta = p * theta
+            q_theta = get_q_array(p=p) * theta
+
+        arr_sigma, arr_rho = arr.sigma_rho_array(theta=p_theta)
+        ser_sigma, ser_rho = ser.sigma_rho_array(theta=q_theta)
+        sigma_sum = arr_sigma + ser_sigma
+
+        infeasible = np.isnan(q_theta) | np.isnan(sigma_sum) | np.isnan(
+            arr_rho) | np.isnan(ser_rho) | (arr_rho >= ser_rho)
+
+    return sigma_sum, arr_rho, ser_rho, infeasible
+
+
+def mask_infeasible(res: np.ndarray, infeasible: np.ndarray) -> np.ndarray:
+    """Replaces infeasible entries and nan's by inf."""
+    return np.where(infeasible | np.isnan(res), inf, res)
+
+
+def backlog_prob_array(arr: Arrival,
+                       ser: Server,
+                       theta: np.ndarray,
+                       backlog_value: float,
+                       indep=True,
+                       p=1.0,
+                       geom_series=True) -> np.ndarray:
+    """Implements stationary standard_bound method"""
+    sigma_sum, arr_rho, ser_rho, infeasible = sigma_rho_array(
+        arr=arr, ser=ser, theta=theta, indep=indep, p=p)
+    rho_diff = arr_rho - ser_rho
+
+    with np.errstate(all="ignore"):
+        if not geom_series:
+            if arr.is_discrete():
+                res = np.exp(-theta * backlog_value) * np.exp(
+                    theta * sigma_sum) / (-rho_diff * theta)
+            else:
+                tau_opt = 1 / (theta * ser_rho)
+                opt_res = np.exp(-theta * backlog_value) * np.exp(
+                    theta * (ser_rho * tau_opt + sigma_sum)) / (-rho_diff *
+                                                                theta)
+
+                one_res = np.exp(-theta * backlog_value) * np.exp(
+                    theta * (ser_rho + sigma_sum)) / (-rho_diff * theta)
+
+                res = np.minimum(opt_res, one_res)
+
+        elif arr.is_discrete():
+            res = np.exp(-theta * backlog_value) * np.exp(
+                theta * sigma_sum) / (1 - np.exp(theta * rho_diff))
+        else:
+            tau_opt = np.log(arr_rho / ser_rho) / (theta * rho_diff)
+            opt_res = np.exp(-theta * backlog_value) * np.exp(
+                theta * (arr_rho * tau_opt + sigma_sum)) / (
+                    1 - np.exp(theta * tau_opt * rho_diff))
+
+            one_res = np.exp(-theta * backlog_value) * np.exp(
+                theta * (arr_rho + sigma_sum)) / (1 -
+                                                  np.exp(theta * rho_diff))
+
+            res = np.minimum(opt_res, one_res)
+
+    return mask_infeasible(res=res, infeasible=infeasible)
+
+
+def backlog_array(arr: Arrival,
+                  ser: Server,
+                  theta: np.ndarray,
+                  prob_b: float,
+                  indep=True,
+                  p=1.0,
+                  geom_series=True) -> np.ndarray:
+    """Implements stationary standard_bound method"""
+    if prob_b < 0.0 or prob_b > 1.0:
+        raise IllegalArgumentError(f"prob_b={prob_b} must be in (0,1)")
+
+    sigma_sum, arr_rho, ser_rho, infeasible = sigma_rho_array(
+        arr=arr, ser=ser, theta=theta, indep=indep, p=p)
+    rho_diff = arr_rho - ser_rho
+
+    with np.errstate(all="ignore"):
+        if not geom_series:
+            if arr.is_discrete():
+                res = sigma_sum - np.log(prob_b * theta *
+                                         (-rho_diff)) / theta
+            else:
+                tau_opt = 1 / (theta * ser_rho)
+                log_part = np.log(prob_b * theta * tau_opt * (-rho_diff))
+                opt_res = tau_opt * ser_rho + sigma_sum - log_part / theta
+
+                log_part = np.log(prob_b * theta * (-rho_diff))
+                one_res = ser_rho + sigma_sum - log_part / theta
+
+                res = np.minimum(opt_res, one_res)
+
+        elif arr.is_discrete():
+            log_part = np.log(prob_b * (1 - np.exp(theta * rho_diff)))
+            res = sigma_sum - log_part / theta
+        else:
+            tau_opt = np.log(arr_rho / ser_rho) / (theta * rho_diff)
+            log_part = np.log(prob_b *
+                              (1 - np.exp(theta * tau_opt * rho_diff)))
+            opt_res = tau_opt * arr_rho + sigma_sum - log_part / theta
+
+            log_part = np.log(prob_b * (1 - np.exp(theta * rho_diff)))
+            one_res = arr_rho + sigma_sum - log_part / theta
+
+            res = np.minimum(opt_res, one_res)
+
+    return mask_infeasible(res=res, infeasible=infeasible)
+
+
+def delay_prob_array(arr: Arrival,
+                     ser: Server,
+                     theta: np.ndarray,
+                     delay_value: int,
+                     indep=True,
+                     p=1.0,
+                     geom_series=True) -> np.ndarray:
+    """Implements stationary standard_bound method"""
+    sigma_sum, arr_rho, ser_rho, infeasible = sigma_rho_array(
+        arr=arr, ser=ser, theta=theta, indep=indep, p=p)
+    rho_diff = arr_rho - ser_rho
+
+    with np.errstate(all="ignore"):
+        if not geom_series:
+            if arr.is_discrete():
+                res = np.exp(-theta * ser_rho * delay_value) * np.exp(
+                    theta * sigma_sum) / (-rho_diff * theta)
+            else:
+                tau_opt = 1 / (theta * ser_rho)
+                opt_res = np.exp(-theta * ser_rho * delay_value) * np.exp(
+                    theta * (ser_rho * tau_opt + sigma_sum)) / (
+                        -rho_diff * theta * tau_opt)
+
+                one_res = np.exp(-theta * ser_rho * delay_value) * np.exp(
+                    theta * (ser_rho + sigma_sum)) / (-rho_diff * theta)
+
+                res = np.minimum(opt_res, one_res)
+
+        elif arr.is_discrete():
+            res = np.exp(-theta * ser_rho * delay_value) * np.exp(
+                theta * sigma_sum) / (1 - np.exp(theta * rho_diff))
+        else:
+            tau_opt = np.log(arr_rho / ser_rho) / (theta * rho_diff)
+            opt_res = np.exp(-theta * ser_rho * delay_value) * np.exp(
+                theta * (arr_rho * tau_opt + sigma_sum)) / (
+                    1 - np.exp(theta * tau_opt * rho_diff))
+
+            one_res = np.exp(-theta * ser_rho * delay_value) * np.exp(
+                theta * (arr_rho + sigma_sum)) / (1 -
+                                                  np.exp(theta * rho_diff))
+
+            res = np.minimum(opt_res, one_res)
+
+    return mask_infeasible(res=res, infeasible=infeasible)
+
+
+def delay_array(arr: Arrival,
+                ser: Server,
+                theta: np.ndarray,
+                prob_d: float,
+                indep=True,
+                p=1.0,
+                geom_series=True) -> np.ndarray:
+    """Implements stationary standard_bound method"""
+    if prob_d < 0.0 or prob_d > 1.0:
+        raise IllegalArgumentError(f"prob_b={prob_d} must be in (0,1)")
+
+    sigma_sum, arr_rho, ser_rho, infeasible = sigma_rho_array(
+        arr=arr, ser=ser, theta=theta, indep=indep, p=p)
+    rho_diff = arr_rho - ser_rho
+
+    with np.errstate(all="ignore"):
+        if not geom_series:
+            if arr.is_discrete():
+                log_part = np.log(prob_d * theta * (-rho_diff))
+                res = (sigma_sum - log_part / theta) / ser_rho
+            else:
+                tau_opt = 1 / (theta * ser_rho)
+                log_part = np.log(prob_d * theta * tau_opt * (-rho_diff))
+                opt_res = (tau_opt * ser_rho + sigma_sum -
+                           log_part / theta) / ser_rho
+
+                log_part = np.log(prob_d * theta * (-rho_diff))
+                one_res = (ser_rho + sigma_sum - log_part / theta) / ser_rho
+
+                res = np.minimum(opt_res, one_res)
+
+        elif arr.is_discrete():
+            log_part = np.log(prob_d * (1 - np.exp(theta * rho_diff)))
+            res = (sigma_sum - log_part / theta) / ser_rho
+        else:
+            tau_opt = np.log(arr_rho / ser_rho) / (theta * rho_diff)
+            log_part = np.log(prob_d *
+                              (1 - np.exp(theta * tau_opt * rho_diff)))
+            opt_res = (tau_opt * arr_rho + sigma_sum -
+                       log_part / theta) / ser_rho
+
+            log_part = np.log(prob_d * (1 - np.exp(theta * rho_diff)))
+            one_res = (arr_rho + sigma_sum - log_part / theta) / ser_rho
+
+            res = np.minimum(opt_res, one_res)
+
+    return mask_infeasible(res=res, infeasible=infeasible)
+
+
+def output_array(arr: Arrival,
+                 ser: Server,
+                 theta: np.ndarray,
+                 delta_time: int,
+                 indep=True,
+                 p=1.0) -> np.ndarray:
+    """Implements stationary standard_bound method"""
+    sigma_sum, arr_rho, ser_rho, infeasible = sigma_rho_array(
+        arr=arr, ser=ser, theta=theta, indep=indep, p=p)
+    rho_diff = arr_rho - ser_rho
+
+    with np.errstate(all="ignore"):
+        if arr.is_discrete():
+            res = np.exp(theta * arr_rho * delta_time) * np.exp(
+                theta * sigma_sum) / (1 - np.exp(theta * rho_diff))
+        else:
+            res = np.exp(theta * arr_rho * (delta_time + 1)) * np.exp(
+                theta * sigma_sum) / (1 - np.exp(theta * rho_diff))
+
+    return mask_infeasible(res=res, infeasible=infeasible)
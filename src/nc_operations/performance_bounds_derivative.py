@@ -0,0 +1,213 @@
+"""Analytic derivatives of the single hop bounds (geometric series)"""
+
+from math import expm1, inf, log, nan
+
+import numpy as np
+
+from nc_arrivals.arrival import Arrival
+from nc_operations.get_sigma_rho import get_sigma_rho
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.single_hop_bound import single_hop_bound
+from nc_server.server import Server
+from utils.helper_functions import get_q
+from utils.perform_parameter import PerformParameter
+
+
+def bound_partials(foi: Arrival,
+                   s_e2e: Server,
+                   theta: float,
+                   perform_param: PerformParameter,
+                   indep=True,
+                   p=1.0,
+                   geom_series=True) -> np.ndarray:
+    """
+    Partial derivatives of single_hop_bound, where theta, the sum of the
+    sigmas and the rhos of foi and s_e2e are seen as independent variables.
+    The chain rule with the sigma_derivative's and rho_derivative's of the
+    operator tree gives the derivatives in theta, p, or the parameters of a
+    node.
+
+    The bounds of continuous arrivals are stationary in tau_opt, i.e., tau
+    is kept fixed.
+
+    :param foi:           flow of interest
+    :param s_e2e:         end-to-end service
+    :param theta:         mgf parameter
+    :param perform_param: performance parameter
+    :param indep:         true if foi and s_e2e are independent
+    :param p:             Hoelder p
+    :param geom_series:   only the geometric series bounds are implemented
+    :return:              partial derivatives in theta, sigma_sum,
+                          foi.rho(p * theta) and s_e2e.rho(q * theta), nan if
+                          infeasible
+    """
+    if not geom_series:
+        raise NotImplementedError(
+            "derivatives are only implemented for the geometric series")
+
+    if indep:
+        p = 1.0
+        q = 1.0
+    else:
+        q = get_q(p=p)
+
+    value = single_hop_bound(foi=foi,
+                             s_e2e=s_e2e,
+                             theta=theta,
+                             perform_param=perform_param,
+                             indep=indep,
+                             p=p)
+    # nan within NanOnInfeasible
+    if not value < inf:
+        return np.full(4, nan)
+
+    sigma_sum, rho_diff = get_sigma_rho(arr=foi,
+                                        ser=s_e2e,
+                                        theta=theta,
+                                        indep=indep,
+                                        p=p,
+                                        q=q)
+    arr_rho = foi.rho(theta=p * theta)
+    ser_rho = s_e2e.rho(theta=q * theta)
+    metric = perform_param.perform_metric
+
+    if metric == PerformEnum.OUTPUT:
+        # continuous arrivals have one more time slot
+        delta_time = perform_param.value + (0 if foi.is_discrete() else 1)
+        # exp(theta * rho_diff) / (1 - exp(theta * rho_diff))
+        geom = 1 / expm1(-theta * rho_diff)
+
+        return value * np.array([
+            arr_rho * delta_time + sigma_sum + rho_diff * geom, theta,
+            theta * delta_time + theta * geom, -theta * geom
+        ])
+
+    # share of tau * arr_rho in the exponent
+    arr_share = 0.0 if foi.is_discrete() else 1.0
+    tau = _tau(foi=foi,
+               theta=theta,
+               arr_rho=arr_rho,
+               ser_rho=ser_rho,
+               rho_diff=rho_diff)
+    geom = 1 / expm1(-theta * tau * rho_diff)
+
+    if metric in (PerformEnum.BACKLOG_PROB, PerformEnum.DELAY_PROB):
+        # partial derivatives of the log of the bound
+        log_partials = np.array([
+            arr_share * arr_rho * tau + sigma_sum + tau * rho_diff * geom,
+            theta, arr_share * theta * tau + theta * tau * geom,
+            -theta * tau * geom
+        ])
+
+        if metric == PerformEnum.BACKLOG_PROB:
+            log_partials[0] -= perform_param.value
+        else:
+            log_partials[0] -= ser_rho * perform_param.value
+            log_partials[3] -= theta * perform_param.value
+
+        return value * log_partials
+
+    if metric in (PerformEnum.BACKLOG, PerformEnum.DELAY):
+        log_part = log(perform_param.value * -expm1(theta * tau * rho_diff))
+        backlog_partials = np.array([
+            log_part / theta**2 + tau * rho_diff * geom / theta, 1.0,
+            arr_share * tau + tau * geom, -tau * geom
+        ])
+
+        if metric == PerformEnum.BACKLOG:
+            return backlog_partials
+
+        # the delay is the backlog divided by ser_rho
+        delay_partials = backlog_partials / ser_rho
+        delay_partials[3] -= value / ser_rho
+
+        return delay_partials
+
+    raise NameError(f"{metric} is an infeasible performance metric")
+
+
+def chain_theta(partials: np.ndarray,
+                foi: Arrival,
+                s_e2e: Server,
+                theta: float,
+                p=1.0,
+                q=1.0) -> float:
+    """
+    :param partials: bound_partials at theta
+    :return:         total derivative of the bound in theta
+    """
+    return partials[0] + partials[1] * (
+        p * foi.sigma_derivative(theta=p * theta) +
+        q * s_e2e.sigma_derivative(theta=q * theta)) + partials[2] * p * \
+        foi.rho_derivative(theta=p * theta) + partials[3] * q * \
+        s_e2e.rho_derivative(theta=q * theta)
+
+
+def single_hop_bound_gradient(foi: Arrival,
+                              s_e2e: Server,
+                              theta: float,
+                              perform_param: PerformParameter,
+                              indep=True,
+                              p=1.0,
+                              geom_series=True) -> np.ndarray:
+    """
+    Gradient of single_hop_bound.
+
+    :return: derivative in theta, and in p if not indep, nan if infeasible
+    """
+    partials = bound_partials(foi=foi,
+                              s_e2e=s_e2e,
+                              theta=theta,
+                              perform_param=perform_param,
+                              indep=indep,
+                              p=p,
+                              geom_series=geom_series)
+    if np.isnan(partials[0]):
+        return np.full(1 if indep else 2, nan)
+
+    if indep:
+        p = 1.0
+        q = 1.0
+    else:
+        q = get_q(p=p)
+
+    theta_derivative = chain_theta(partials=partials,
+                                   foi=foi,
+                                   s_e2e=s_e2e,
+                                   theta=theta,
+                                   p=p,
+                                   q=q)
+
+    if indep:
+        return np.array([theta_derivative])
+
+    # q = p / (p - 1), the nodes are evaluated at p * theta and q * theta
+    q_derivative = -1 / (p - 1)**2
+    p_derivative = theta * (
+        partials[1] * (foi.sigma_derivative(theta=p * theta) +
+                       q_derivative * s_e2e.sigma_derivative(theta=q * theta))
+        + partials[2] * foi.rho_derivative(theta=p * theta) +
+        partials[3] * q_derivative * s_e2e.rho_derivative(theta=q * theta))
+
+    return np.array([theta_derivative, p_derivative])
+
+
+def _tau(foi: Arrival, theta: float, arr_rho: float, ser_rho: float,
+         rho_diff: float) -> float:
+    """
+    :return: tau of the smaller one of the tau_opt and tau_1 bounds, 1.0 for
+             discrete arrivals
+    """
+    if foi.is_discrete():
+        return 1.0
+
+    tau_opt = log(arr_rho / ser_rho) / (theta * rho_diff)
+
+    # tau-dependent part of the log of the bound
+    def log_tau_part(tau: float) -> float:
+        return theta * arr_rho * tau - log(-expm1(theta * tau * rho_diff))
+
+    if log_tau_part(tau_opt) <= log_tau_part(1.0):
+        return tau_opt
+
+    return 1.0
@@ -0,0 +1,201 @@
+"""Logarithm of the performance bounds.
+
+The functions mirror performance_bounds.py, but add the exponents instead of
+multiplying exp's, i.e., they neither overflow for large theta nor
+underflow for small violation probabilities.
+"""
+
+import warnings
+from math import exp, expm1, inf, log, log1p, nan
+
+from nc_arrivals.arrival import Arrival
+from nc_operations.get_sigma_rho import get_sigma_rho
+from nc_operations.stability_check import stability_check
+from nc_server.server import Server
+from utils.helper_functions import get_q
+
+
+def log_one_minus_exp(x: float) -> float:
+    """
+    log(1 - exp(x)) for x < 0, accurate for x close to 0 as well as for
+    large -x.
+
+    :param x: exponent
+    :return:  -inf if 1 - exp(x) rounds to 0
+    """
+    if x > -log(2.0):
+        one_minus_exp = -expm1(x)
+        if one_minus_exp <= 0.0:
+            return -inf
+
+        return log(one_minus_exp)
+
+    return log1p(-exp(x))
+
+
+def log_backlog_prob(arr: Arrival,
+                     ser: Server,
+                     theta: float,
+                     backlog_value: float,
+                     indep=True,
+                     p=1.0,
+                     geom_series=True) -> float:
+    """Logarithm of backlog_prob"""
+    if indep:
+        p = 1.0
+        q = 1.0
+    else:
+        q = get_q(p=p)
+
+    if not stability_check(
+            arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q):
+        return nan
+
+    sigma_sum, rho_diff = get_sigma_rho(arr=arr,
+                                        ser=ser,
+                                        theta=theta,
+                                        indep=indep,
+                                        p=p,
+                                        q=q)
+
+    if not geom_series:
+        if arr.is_discrete():
+            return -theta * backlog_value + theta * sigma_sum - log(
+                -rho_diff * theta)
+        else:
+            tau_opt = 1 / (theta * ser.rho(theta=q * theta))
+            opt_res = -theta * backlog_value + theta * (
+                ser.rho(theta=q * theta) * tau_opt + sigma_sum) - log(
+                    -rho_diff * theta)
+
+            tau_1 = 1.0
+            one_res = -theta * backlog_value + theta * (
+                ser.rho(theta=q * theta) * tau_1 + sigma_sum) - log(
+                    -rho_diff * theta)
+
+            if one_res < opt_res:
+                warnings.warn("tau_opt yields a worse result than tau_1")
+
+            return min(opt_res, one_res)
+
+    if arr.is_discrete():
+        return -theta * backlog_value + theta * sigma_sum - log_one_minus_exp(
+            theta * rho_diff)
+    else:
+        tau_opt = log(arr.rho(theta=p * theta) /
+                      ser.rho(theta=q * theta)) / (theta * rho_diff)
+        opt_res = -theta * backlog_value + theta * (
+            arr.rho(theta=p * theta) * tau_opt +
+            sigma_sum) - log_one_minus_exp(theta * tau_opt * rho_diff)
+
+        tau_1 = 1.0
+        one_res = -theta * backlog_value + theta * (
+            arr.rho(theta=p * theta) * tau_1 +
+            sigma_sum) - log_one_minus_exp(theta * tau_1 * rho_diff)
+
+        if one_res < opt_res:
+            warnings.warn("tau_opt yields a worse result than tau_1")
+
+        return min(opt_res, one_res)
+
+
+def log_delay_prob(arr: Arrival,
+                   ser: Server,
+                   theta: float,
+                   delay_value: int,
+                   indep=True,
+                   p=1.0,
+                   geom_series=True) -> float:
+    """Logarithm of delay_prob"""
+    if indep:
+        p = 1.0
+        q = 1.0
+    else:
+        q = get_q(p=p)
+
+    if not stability_check(
+            arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q):
+        return nan
+
+    sigma_sum, rho_diff = get_sigma_rho(arr=arr,
+                                        ser=ser,
+                                        theta=theta,
+                                        indep=indep,
+                                        p=p,
+                                        q=q)
+
+    if not geom_series:
+        if arr.is_discrete():
+            return -theta * ser.rho(
+                theta=q * theta) * delay_value + theta * sigma_sum - log(
+                    -rho_diff * theta)
+        else:
+            tau_opt = 1 / (theta * ser.rho(theta=q * theta))
+            opt_res = -theta * ser.rho(
+                theta=q * theta) * delay_value + theta * (
+                    ser.rho(theta=q * theta) * tau_opt + sigma_sum) - log(
+                        -rho_diff * theta * tau_opt)
+
+            tau_1 = 1.0
+            one_res = -theta * ser.rho(
+                theta=q * theta) * delay_value + theta * (
+                    ser.rho(theta=q * theta) * tau_1 + sigma_sum) - log(
+                        -rho_diff * theta * tau_1)
+
+            if one_res < opt_res:
+                warnings.warn("tau_opt yields a worse result than tau_1")
+
+            return min(opt_res, one_res)
+
+    if arr.is_discrete():
+        return -theta * ser.rho(theta=q * theta) * delay_value + \
+            theta * sigma_sum - log_one_minus_exp(theta * rho_diff)
+    else:
+        tau_opt = log(arr.rho(theta=p * theta) /
+                      ser.rho(theta=q * theta)) / (theta * rho_diff)
+        opt_res = -theta * ser.rho(theta=q * theta) * delay_value + theta * (
+            arr.rho(theta=p * theta) * tau_opt +
+            sigma_sum) - log_one_minus_exp(theta * tau_opt * rho_diff)
+
+        tau_1 = 1.0
+        one_res = -theta * ser.rho(theta=q * theta) * delay_value + theta * (
+            arr.rho(theta=p * theta) * tau_1 +
+            sigma_sum) - log_one_minus_exp(theta * tau_1 * rho_diff)
+
+        if one_res < opt_res:
+            warnings.warn("tau_opt yields a worse result than tau_1")
+
+        return min(opt_res, one_res)
+
+
+def log_output(arr: Arrival,
+               ser: Server,
+               theta: float,
+               delta_time: int,
+               indep=True,
+               p=1.0) -> float:
+    """Logarithm of output"""
+    if indep:
+        p = 1.0
+        q = 1.0
+    else:
+        q = get_q(p=p)
+
+    if not stability_check(
+            arr=arr, ser=ser, theta=theta, indep=indep, p=p, q=q):
+        return nan
+
+    sigma_sum, rho_diff = get_sigma_rho(arr=arr,
+                                        ser=ser,
+                                        theta=theta,
+                                        indep=indep,
+                                        p=p,
+                                        q=q)
+
+    if arr.is_discrete():
+        return theta * arr.rho(theta=p * theta) * delta_time + \
+            theta * sigma_sum - log_one_minus_exp(theta * rho_diff)
+
+    else:
+        return theta * arr.rho(theta=p * theta) * (delta_time + 1) + \
+            theta * sigma_sum - log_one_minus_exp(theta * rho_diff)
@@ -1,11 +1,25 @@
 """Helper function to evaluate a single hop."""
 
+from math import inf, isnan
+from typing import Callable, List
+
+import numpy as np
+
 from nc_arrivals.arrival import Arrival
 from nc_operations.operations import AggregateHomogeneous
 from nc_operations.perform_enum import PerformEnum
 from nc_operations.performance_bounds import (backlog, backlog_prob, delay,
                                               delay_prob, output)
+from nc_operations.performance_bounds_array import (backlog_array,
+                                                    backlog_prob_array,
+                                                    delay_array,
+                                                    delay_prob_array,
+                                                    output_array)
+from nc_operations.performance_bounds_log import (log_backlog_prob,
+                                                  log_delay_prob, log_output)
 from nc_server.server import Server
+from utils.exceptions import ParameterOutOfBounds
+from utils.helper_functions import log_of_bound
 from utils.perform_parameter import PerformParameter
 
 
@@ -68,6 +82,161 @@ def single_hop_bound(foi: Arrival,
                         f"performance metric")
 
 
+def single_hop_log_bound(foi: Arrival,
+                         s_e2e: Server,
+                         theta: float,
+                         perform_param: PerformParameter,
+                         indep=True,
+                         p=1.0,
+                         geom_series=True) -> float:
+    """
+    Logarithm of single_hop_bound. The violation probabilities and the output
+    bound are computed in the log-domain, the backlog and delay bounds do not
+    overflow anyway.
+    """
+    if indep:
+        p = 1.0
+
+    if perform_param.perform_metric == PerformEnum.BACKLOG_PROB:
+        return log_backlog_prob(arr=foi,
+                                ser=s_e2e,
+                                theta=theta,
+                                backlog_value=perform_param.value,
+                                indep=indep,
+                                p=p,
+                                geom_series=geom_series)
+
+    elif perform_param.perform_metric == PerformEnum.DELAY_PROB:
+        return log_delay_prob(arr=foi,
+                              ser=s_e2e,
+                              theta=theta,
+                              delay_value=perform_param.value,
+                              indep=indep,
+                              p=p,
+                              geom_series=geom_series)
+
+    elif perform_param.perform_metric == PerformEnum.OUTPUT:
+        return log_output(arr=foi,
+                          ser=s_e2e,
+                          theta=theta,
+                          delta_time=perform_param.value,
+                          indep=indep,
+                          p=p)
+
+    elif perform_param.perform_metric in (PerformEnum.BACKLOG,
+                                          PerformEnum.DELAY):
+        return log_of_bound(
+            single_hop_bound(foi=foi,
+                             s_e2e=s_e2e,
+                             theta=theta,
+                             perform_param=perform_param,
+                             indep=indep,
+                             p=p,
+                             geom_series=geom_series))
+
+    else:
+        raise NameError(f"{perform_param.perform_metric} is an infeasible "
+                        f"performance metric")
+
+
+def min_single_hop_bound(foi: Arrival,
+                         s_e2e_list: List[Server],
+                         theta: float,
+                         perform_param: PerformParameter,
+                         bound_fun: Callable[..., float] = single_hop_bound,
+                         indep=True) -> float:
+    """
+    Minimum of bound_fun over several end-to-end services, e.g., the cases of
+    a PMOO analysis or the servers that are cut. An infeasible service counts
+    as inf.
+
+    :param foi:           flow of interest
+    :param s_e2e_list:    end-to-end services
+    :param theta:         mgf parameter
+    :param perform_param: performance parameter
+    :param bound_fun:     single_hop_bound or single_hop_log_bound
+    :param indep:         independence of foi and the services
+    :return:              minimal bound, inf if all services are infeasible
+    """
+    res_list = []
+    for s_e2e in s_e2e_list:
+        try:
+            res = bound_fun(foi=foi,
+                            s_e2e=s_e2e,
+                            theta=theta,
+                            perform_param=perform_param,
+                            indep=indep)
+
+        except ParameterOutOfBounds:
+            res = inf
+
+        # nan within NanOnInfeasible
+        res_list.append(inf if isnan(res) else res)
+
+    return min(res_list)
+
+def single_hop_bound_array(foi: Arrival,
+                           s_e2e: Server,
+                           theta: np.ndarray,
+                           perform_param: PerformParameter,
+                           indep=True,
+                           p=1.0,
+                           geom_series=True) -> np.ndarray:
+    """single_hop_bound for an array of thetas (and p's), inf if infeasible"""
+    theta = np.asarray(theta, dtype=float)
+
+    if indep:
+        p = 1.0
+
+    if perform_param.perform_metric == PerformEnum.BACKLOG_PROB:
+        return backlog_prob_array(arr=foi,
+                                  ser=s_e2e,
+                                  theta=theta,
+                                  backlog_value=perform_param.value,
+                                  indep=indep,
+                                  p=p,
+                                  geom_series=geom_series)
+
+    elif perform_param.perform_metric == PerformEnum.BACKLOG:
+        return backlog_array(arr=foi,
+                             ser=s_e2e,
+                             theta=theta,
+                             prob_b=perform_param.value,
+                             indep=indep,
+                             p=p,
+                             geom_series=geom_series)
+
+    elif perform_param.perform_metric == PerformEnum.DELAY_PROB:
+        return delay_prob_array(arr=foi,
+                                ser=s_e2e,
+                                theta=theta,
+                                delay_value=perform_param.value,
+                                indep=indep,
+                                p=p,
+                                geom_series=geom_series)
+
+    elif perform_param.perform_metric == PerformEnum.DELAY:
+        return delay_array(arr=foi,
+                           ser=s_e2e,
+                           theta=theta,
+                           prob_d=perform_param.value,
+                           indep=indep,
+                           p=p,
+                           geom_series=geom_series)
+
+    elif perform_param.perform_metric == PerformEnum.OUTPUT:
+        return output_array(arr=foi,
+                            ser=s_e2e,
+                            theta=theta,
+                            delta_time=perform_param.value,
+                            indep=indep,
+                            p=p)
+
+    else:
+        raise NameError(f"{perform_param.perform_metric} is an infeasible "
+                        f"performance metric")
+
+
 def single_hop_homog_agg(foi_arr_single: Arrival,
                          n: int,
                          s_e2e: Server,
@@ -1,9 +1,15 @@
 """Single server topology class"""
 
-from typing import List
+from math import inf
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 from nc_arrivals.arrival_distribution import ArrivalDistribution
-from nc_operations.single_hop_bound import single_hop_bound
+from nc_operations.single_hop_bound import (single_hop_bound,
+                                            single_hop_bound_array)
+from nc_operations.theta_interval import (feasible_theta_interval,
+                                         stability_theta_max)
 from nc_server.server import Server
 from utils.perform_parameter import PerformParameter
 from utils.setting import Setting
@@ -30,6 +36,8 @@ class SingleServerBandwidth(Setting):
         self.perform_param = perform_param
         self.indep = indep
         self.geom_series = geom_series
+        # cache of stability_theta_max, see theta_upper_bound
+        self._theta_max: Optional[float] = None
 
     def standard_bound(self, param_list: List[float]) -> float:
         theta = param_list[0]
@@ -47,5 +55,46 @@ class SingleServerBandwidth(Setting):
                                 p=p,
                                 geom_series=self.geom_series)
 
+    def standard_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        theta = param_array[:, 0]
+
+        if self.indep:
+            p = 1.0
+        else:
+            p = param_array[:, 1]
+
+        return single_hop_bound_array(foi=self.arr_list[0],
+                                      s_e2e=self.s_e2e,
+                                      theta=theta,
+                                      perform_param=self.perform_param,
+                                      indep=self.indep,
+                                      p=p,
+                                      geom_series=self.geom_series)
+
+    def theta_upper_bound(self, p_array: np.ndarray) -> np.ndarray:
+        # the bisection runs only once, as the oracle is called per
+        # evaluation, e.g., by Optimize.eval_pruned
+        if self._theta_max is None:
+            try:
+                self._theta_max = stability_theta_max(arr=self.arr_list[0],
+                                                      ser=self.s_e2e)
+            except NotImplementedError:
+                self._theta_max = inf
+
+        theta_max = self._theta_max
+
+        if self.indep:
+            return np.full(p_array.shape[0], theta_max)
+
+        # the arrival is evaluated at p * theta
+        return theta_max / p_array[:, 0]
+
+    def theta_interval(self) -> Tuple[float, float]:
+        if not self.indep:
+            raise NotImplementedError("theta interval is only known for "
+                                      "independent arrivals and service")
+
+        return feasible_theta_interval(arr=self.arr_list[0], ser=self.s_e2e)
+
     def approximate_utilization(self) -> float:
         raise NotImplementedError("this method cannot be called")
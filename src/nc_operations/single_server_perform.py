@@ -1,11 +1,20 @@
 """Single server topology class"""
 
-from typing import List
+from math import inf
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 from nc_arrivals.arrival_distribution import ArrivalDistribution
 from nc_arrivals.qt import DM1
 from nc_operations.perform_enum import PerformEnum
-from nc_operations.single_hop_bound import single_hop_bound
+from nc_operations.performance_bounds_derivative import (
+    single_hop_bound_gradient)
+from nc_operations.single_hop_bound import (single_hop_bound,
+                                            single_hop_bound_array,
+                                            single_hop_log_bound)
+from nc_operations.theta_interval import (feasible_theta_interval,
+                                         stability_theta_max)
 from nc_server.constant_rate_server import ConstantRateServer
 from nc_server.server_distribution import ServerDistribution
 from utils.perform_parameter import PerformParameter
@@ -33,6 +42,8 @@ class SingleServerPerform(Setting):
         self.perform_param = perform_param
         self.indep = indep
         self.geom_series = geom_series
+        # cache of stability_theta_max, see theta_upper_bound
+        self._theta_max: Optional[float] = None
 
     def standard_bound(self, param_list: List[float]) -> float:
         theta = param_list[0]
@@ -50,6 +61,79 @@ class SingleServerPerform(Setting):
                                 p=p,
                                 geom_series=self.geom_series)
 
+    def standard_log_bound(self, param_list: List[float]) -> float:
+        theta = param_list[0]
+
+        if self.indep:
+            p = 1.0
+        else:
+            p = param_list[1]
+
+        return single_hop_log_bound(foi=self.arr_list[0],
+                                    s_e2e=self.server,
+                                    theta=theta,
+                                    perform_param=self.perform_param,
+                                    indep=self.indep,
+                                    p=p,
+                                    geom_series=self.geom_series)
+
+    def standard_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        theta = param_array[:, 0]
+
+        if self.indep:
+            p = 1.0
+        else:
+            p = param_array[:, 1]
+
+        return single_hop_bound_array(foi=self.arr_list[0],
+                                      s_e2e=self.server,
+                                      theta=theta,
+                                      perform_param=self.perform_param,
+                                      indep=self.indep,
+                                      p=p,
+                                      geom_series=self.geom_series)
+
+    def standard_bound_gradient(self, param_list: List[float]) -> np.ndarray:
+        theta = param_list[0]
+
+        if self.indep:
+            p = 1.0
+        else:
+            p = param_list[1]
+
+        return single_hop_bound_gradient(foi=self.arr_list[0],
+                                         s_e2e=self.server,
+                                         theta=theta,
+                                         perform_param=self.perform_param,
+                                         indep=self.indep,
+                                         p=p,
+                                         geom_series=self.geom_series)
+
+    def theta_upper_bound(self, p_array: np.ndarray) -> np.ndarray:
+        # the bisection runs only once, as the oracle is called per
+        # evaluation, e.g., by Optimize.eval_pruned
+        if self._theta_max is None:
+            try:
+                self._theta_max = stability_theta_max(arr=self.arr_list[0],
+                                                      ser=self.server)
+            except NotImplementedError:
+                self._theta_max = inf
+
+        theta_max = self._theta_max
+
+        if self.indep:
+            return np.full(p_array.shape[0], theta_max)
+
+        # the arrival is evaluated at p * theta
+        return theta_max / p_array[:, 0]
+
+    def theta_interval(self) -> Tuple[float, float]:
+        if not self.indep:
+            raise NotImplementedError("theta interval is only known for "
+                                      "independent arrivals and service")
+
+        return feasible_theta_interval(arr=self.arr_list[0], ser=self.server)
+
     def approximate_utilization(self) -> float:
         sum_average_rates = 0.0
         for arrival in self.arr_list:
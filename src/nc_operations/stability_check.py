@@ -1,8 +1,10 @@
 """Check the system's stability"""
 
+from math import isnan
+
 from nc_arrivals.arrival import Arrival
 from nc_server.server import Server
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import out_of_bounds
 
 
 def stability_check(arr: Arrival,
@@ -10,23 +12,36 @@ def stability_check(arr: Arrival,
                     theta: float,
                     indep=True,
                     p=1.0,
-                    q=1.0) -> None:
+                    q=1.0) -> bool:
+    """
+    :return: True if stable. Otherwise, raises ParameterOutOfBounds or, within
+             NanOnInfeasible, returns False (also if a rho is nan).
+    """
     if indep:
         # if (arr.rho(theta=theta) < 0 or ser.rho(theta=theta) < 0
         #         or arr.sigma(theta=theta) < 0 or ser.sigma(theta=theta) < 0):
         #     raise ParameterOutOfBounds("parameters must be positive")
 
-        if arr.rho(theta=theta) >= ser.rho(theta=theta):
-            raise ParameterOutOfBounds(
-                f"The arrivals' rho={arr.rho(theta=theta)} has to be "
-                f"smaller than the service's rho={ser.rho(theta=theta)}")
-    else:
-        # if (arr.rho(theta=p * theta) < 0 or ser.rho(theta=q * theta) < 0
-        #         or arr.sigma(theta=p * theta) < 0
-        #         or ser.sigma(theta=q * theta) < 0):
-        #     raise ParameterOutOfBounds("parameters must be positive")
+        p = 1.0
+        q = 1.0
+    # else:
+    #     if (arr.rho(theta=p * theta) < 0 or ser.rho(theta=q * theta) < 0
+    #             or arr.sigma(theta=p * theta) < 0
+    #             or ser.sigma(theta=q * theta) < 0):
+    #         raise ParameterOutOfBounds("parameters must be positive")
+
+    arr_rho = arr.rho(theta=p * theta)
+    if isnan(arr_rho):
+        # infeasible arrivals, the service is not evaluated
+        out_of_bounds(f"The arrivals' rho={arr_rho} is not a number")
+        return False
+
+    ser_rho = ser.rho(theta=q * theta)
+
+    # the negated comparison also catches nan, see NanOnInfeasible
+    if not arr_rho < ser_rho:
+        out_of_bounds(f"The arrivals' rho={arr_rho} has to be "
+                      f"smaller than the service's rho={ser_rho}")
+        return False
 
-        if arr.rho(theta=p * theta) >= ser.rho(theta=q * theta):
-            raise ParameterOutOfBounds(
-                f"The arrivals' rho={arr.rho(theta=p * theta)} has to be "
-                f"smaller than the service's rho={ser.rho(theta=q * theta)}")
+    return True
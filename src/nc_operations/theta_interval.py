@@ -0,0 +1,78 @@
+"""Analytic feasible interval of theta for a single constant rate server."""
+
+from math import inf, isnan
+from typing import Tuple
+
+import scipy.optimize
+
+from nc_arrivals.arrival_distribution import ArrivalDistribution
+from nc_arrivals.theta_limit import theta_upper_limit
+from nc_server.constant_rate_server import ConstantRateServer
+from utils.exceptions import ParameterOutOfBounds
+
+# upper end of the interval if the arrival is stable for every theta
+THETA_SEARCH_LIMIT = 100.0
+
+# thetas beyond are not searched for the stability condition
+THETA_STABLE_LIMIT = 1e6
+
+# relative distance to the poles of the mgf
+POLE_DISTANCE = 1e-9
+
+
+def stability_theta_max(arr: ArrivalDistribution,
+                        ser: ConstantRateServer) -> float:
+    """
+    The effective bandwidth arr.rho(theta) is nondecreasing in theta and
+    starts at the average rate, i.e., the stability condition
+    arr.rho(theta) < ser.rate holds on an interval (0, theta_max).
+
+    :param arr: arrival process of the flow of interest
+    :param ser: constant rate server
+    :return:    theta_max, 0.0 if the system is not stable and inf if it is
+                stable for every theta up to THETA_STABLE_LIMIT
+    """
+    if not isinstance(ser, ConstantRateServer):
+        raise NotImplementedError(
+            f"{ser.__class__.__name__} has no analytic theta interval")
+
+    if arr.average_rate() >= ser.rate:
+        return 0.0
+
+    limit = theta_upper_limit(arr=arr)
+
+    def rate_gap(theta: float) -> float:
+        try:
+            gap = arr.rho(theta=theta) - ser.rate
+        except (OverflowError, ParameterOutOfBounds):
+            return inf
+
+        # nan within NanOnInfeasible
+        return inf if isnan(gap) else gap
+
+    upper = min(THETA_SEARCH_LIMIT, limit * (1 - POLE_DISTANCE))
+    while rate_gap(theta=upper) < 0:
+        if upper >= limit * (1 - POLE_DISTANCE) or upper >= \
+                THETA_STABLE_LIMIT:
+            return limit
+
+        upper = min(2 * upper, limit * (1 - POLE_DISTANCE))
+
+    # only signs are used, i.e., an infinite rate gap is fine
+    return scipy.optimize.bisect(rate_gap,
+                                 a=upper * POLE_DISTANCE,
+                                 b=upper,
+                                 xtol=upper * POLE_DISTANCE)
+
+
+def feasible_theta_interval(arr: ArrivalDistribution,
+                            ser: ConstantRateServer) -> Tuple[float, float]:
+    """
+    :param arr: arrival process of the flow of interest
+    :param ser: constant rate server
+    :return:    lower and upper end of the open interval of stable thetas
+                (capped at THETA_SEARCH_LIMIT), both 0.0 if the system is
+                not stable
+    """
+    return 0.0, min(stability_theta_max(arr=arr, ser=ser),
+                    THETA_SEARCH_LIMIT)
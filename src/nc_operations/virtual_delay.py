@@ -12,9 +12,8 @@ def virtual_delay(tb: DetermTokenBucket,
                   rl: RateLatencyServer) -> float:
     """DNC FIFO Delay Bound"""
     try:
-        stability_check(arr=tb,
-                        ser=rl,
-                        theta=1.0)
+        if not stability_check(arr=tb, ser=rl, theta=1.0):
+            return inf
     except ParameterOutOfBounds:
         return inf
 
@@ -1,5 +1,7 @@
 """Implemented service classes for different distributions"""
 
+import numpy as np
+
 from nc_server.rate_latency_server import RateLatencyServer
 
 
@@ -15,6 +17,9 @@ class ConstantRateServer(RateLatencyServer):
     def rho(self, theta: float) -> float:
         return self.rate
 
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.zeros_like(theta, dtype=float)
+
     def average_rate(self) -> float:
         return self.rate
 
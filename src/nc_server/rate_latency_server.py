@@ -1,5 +1,7 @@
 """Implemented service classes for different distributions"""
 
+import numpy as np
+
 from nc_server.server_distribution import ServerDistribution
 
 
@@ -16,6 +18,18 @@ class RateLatencyServer(ServerDistribution):
     def rho(self, theta: float) -> float:
         return self.rate
 
+    def sigma_derivative(self, theta: float) -> float:
+        return 0.0
+
+    def rho_derivative(self, theta: float) -> float:
+        return 0.0
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.full_like(theta, self.latency, dtype=float)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        return np.full_like(theta, self.rate, dtype=float)
+
     def average_rate(self) -> float:
         return self.rate
 
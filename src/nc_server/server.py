@@ -2,6 +2,10 @@
 
 from abc import abstractmethod, ABC
 
+import numpy as np
+
+from utils.helper_functions import evaluate_elementwise
+
 
 class Server(ABC):
     """Abstract Server class"""
@@ -15,3 +19,25 @@ class Server(ABC):
     def rho(self, theta: float) -> float:
         """Rho method"""
         pass
+
+    def sigma_derivative(self, theta: float) -> float:
+        """d sigma / d theta at a feasible theta, optional"""
+        raise NotImplementedError(
+            f"{self.__class__.__name__} has no analytic sigma_derivative")
+
+    def rho_derivative(self, theta: float) -> float:
+        """d rho / d theta at a feasible theta, optional"""
+        raise NotImplementedError(
+            f"{self.__class__.__name__} has no analytic rho_derivative")
+
+    def sigma_array(self, theta: np.ndarray) -> np.ndarray:
+        """Sigma method for an array of thetas, nan if infeasible"""
+        return evaluate_elementwise(fun=self.sigma, theta=theta)
+
+    def rho_array(self, theta: np.ndarray) -> np.ndarray:
+        """Rho method for an array of thetas, nan if infeasible"""
+        return evaluate_elementwise(fun=self.rho, theta=theta)
+
+    def sigma_rho_array(self, theta: np.ndarray) -> (np.ndarray, np.ndarray):
+        """Sigma and rho method for an array of thetas"""
+        return self.sigma_array(theta=theta), self.rho_array(theta=theta)
@@ -0,0 +1,129 @@
+"""Coarse-to-fine grid search that only refines the most promising cells."""
+
+from math import inf
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import scipy.optimize
+
+# number of grid points per dimension of the first, coarse grid
+COARSE_POINTS = 8
+
+# number of best points whose cells are refined, per dimension of the grid
+KEEP_BEST = 4
+
+# the step shrinks by this factor from one level to the next
+REFINE_FACTOR = 4
+
+
+def adaptive_grid(func: Callable[[np.ndarray], float],
+                  ranges: Tuple[slice, ...],
+                  func_array: Optional[Callable[[np.ndarray],
+                                                np.ndarray]] = None,
+                  coarse_points=COARSE_POINTS,
+                  keep_best: Optional[int] = None,
+                  refine_factor=REFINE_FACTOR,
+                  polish=True) -> Tuple[np.ndarray, float]:
+    """
+    Counterpart of scipy.optimize.brute: starts with a coarse grid over the
+    ranges, keeps the keep_best points and searches their cells (+- one
+    step) on a grid that is refine_factor times finer, until the step of
+    each slice is reached. All grids are subsets of the fine grid of brute,
+    and every point is evaluated at most once.
+
+    The coarse grid has to resolve the feasible region, i.e., if all of its
+    points are infeasible, inf is returned.
+
+    :param func:          objective of one parameter array
+    :param ranges:        tuple of slices, their steps are the final steps
+    :param func_array:    objective of one row of parameters per point, used
+                          instead of func if given
+    :param coarse_points: minimal number of points per dimension of the
+                          coarse grid
+    :param keep_best:     number of cells that are refined per level, None
+                          uses KEEP_BEST**d for d parameters
+    :param refine_factor: shrinking of the step per level
+    :param polish:        local fmin-finish from the best grid point, as in
+                          brute
+    :return:              optimal parameters and function value
+    """
+    lower = np.array([float(range_i.start) for range_i in ranges])
+    upper = np.array([float(range_i.stop) for range_i in ranges])
+    delta = np.array([float(range_i.step) for range_i in ranges])
+
+    if keep_best is None:
+        keep_best = KEEP_BEST**len(ranges)
+
+    # the steps are delta * refine_factor**level, such that every point is
+    # a point of the fine grid np.mgrid[ranges]
+    level = np.floor(
+        np.log(np.maximum((upper - lower) / (coarse_points * delta), 1.0)) /
+        np.log(refine_factor))
+    step = delta * refine_factor**level
+
+    # evaluated points and their values
+    points = np.empty((0, len(ranges)))
+    values = np.empty(0)
+    candidates = _grid(lower=lower, upper=upper, step=step)
+
+    while True:
+        candidates = _new_points(candidates=candidates, points=points)
+
+        if func_array is not None:
+            new_values = func_array(candidates)
+        else:
+            new_values = np.array([func(candidate)
+                                   for candidate in candidates])
+
+        points = np.concatenate((points, candidates))
+        values = np.concatenate((values, new_values))
+
+        if np.all(step <= delta) or not np.any(values < inf):
+            break
+
+        best_points = points[np.argsort(values)[:keep_best]]
+        new_step = np.maximum(step / refine_factor, delta)
+        candidates = np.concatenate([
+            _grid(lower=np.maximum(point - step, lower),
+                  upper=np.minimum(point + step + new_step / 2, upper),
+                  step=new_step) for point in best_points
+        ])
+        step = new_step
+
+    index_min = int(np.argmin(values))
+    if not polish or values[index_min] == inf:
+        return points[index_min], float(values[index_min])
+
+    fmin_res = scipy.optimize.fmin(func=func,
+                                   x0=points[index_min],
+                                   full_output=True,
+                                   disp=False)
+
+    return fmin_res[0], fmin_res[1]
+
+
+def _grid(lower: np.ndarray, upper: np.ndarray,
+          step: np.ndarray) -> np.ndarray:
+    """
+    :return: one row per point of np.mgrid[lower:upper:step]
+    """
+    grid = np.mgrid[tuple(
+        slice(lower[i], upper[i], step[i]) for i in range(lower.shape[0]))]
+
+    return np.reshape(grid, (lower.shape[0], -1)).T
+
+
+def _new_points(candidates: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    :return: the candidates without duplicates and without the points that
+             are evaluated already (up to rounding)
+    """
+    candidates = np.unique(np.round(candidates, decimals=10), axis=0)
+    if points.shape[0] == 0:
+        return candidates
+
+    known = {tuple(point) for point in np.round(points, decimals=10)}
+
+    return candidates[[tuple(candidate) not in known
+                       for candidate in candidates]].reshape(
+                           -1, points.shape[1])
@@ -0,0 +1,337 @@
+"""Lock-step optimization of many independent instances of a setting."""
+
+from math import inf
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from optimization.nelder_mead_parameters import NelderMeadParameters
+from utils.exceptions import WrongDimension
+from utils.setting import Setting
+
+
+class BatchOptimize(object):
+    """
+    Runs the same optimizer on many settings at once, e.g., on all rows of a
+    Monte Carlo study. Every step of the optimizer advances all instances
+    together with one vectorized standard_bound_array call, in which row i
+    belongs to instance i. Instances that have converged are masked out.
+
+    The setting_factory builds a single setting from a block of rows of the
+    instance_array, whose arrivals and servers have array-valued parameters,
+    e.g., with the columns of the rows:
+
+        def factory(rows):
+            return SingleServerPerform(
+                arr_list=param_row_to_arr_list(param_row=rows.T, ...),
+                server=ConstantRateServer(rate=rows[:, -1]),
+                perform_param=perform_param)
+
+    The setting has to override standard_bound_array.
+    """
+    def __init__(self,
+                 setting_factory: Callable[[np.ndarray], Setting],
+                 instance_array: np.ndarray,
+                 number_param: int,
+                 min_active_share=0.5) -> None:
+        """
+        :param setting_factory:  maps rows of instance_array to one setting
+                                 with array-valued parameters
+        :param instance_array:   one row of setting parameters per instance
+        :param number_param:     number of parameters to optimize
+        :param min_active_share: the setting is rebuilt for the remaining
+                                 instances as soon as the share of active
+                                 ones falls below this value
+        """
+        self.setting_factory = setting_factory
+        self.instance_array = np.atleast_2d(instance_array)
+        self.number_param = number_param
+        self.min_active_share = min_active_share
+        # optimal parameters of the last optimization, one row per instance
+        self.opt_x: Optional[np.ndarray] = None
+        # number of standard_bound_array calls and of evaluated rows
+        self.evaluation_calls = 0
+        self.evaluations = 0
+
+    def _batch(self, rows: np.ndarray) -> "_Batch":
+        return _Batch(optimizer=self, rows=rows)
+
+    def pattern_search(self,
+                       start_list: List[float],
+                       delta=3.0,
+                       delta_min=0.01,
+                       max_iterations=10**4) -> np.ndarray:
+        """
+        Lock-step counterpart of Optimize.pattern_search (Hooke and Jeeves).
+
+        :param start_list:     starting values of all instances
+        :param delta:          initial granularity
+        :param delta_min:      final granularity
+        :param max_iterations: stops the instances that have not converged
+                               after this many iterations
+        :return:               optimized standard_bound per instance
+        """
+        if len(start_list) != self.number_param:
+            raise WrongDimension(
+                f"Number of parameters {len(start_list)} is wrong")
+
+        number_instances = self.instance_array.shape[0]
+        res = np.empty(number_instances)
+        self.opt_x = np.empty((number_instances, self.number_param))
+
+        batch = self._batch(rows=np.arange(number_instances))
+        param = np.tile(np.asarray(start_list, dtype=float),
+                        (number_instances, 1))
+        param_new = param.copy()
+        optimum_current = batch.evaluate(param_array=param)
+        optimum_new = optimum_current.copy()
+        delta = np.full(number_instances, float(delta))
+
+        for _ in range(max_iterations):
+            active = delta > delta_min
+            if not active.any():
+                break
+
+            if batch.is_sparse(active=active):
+                batch.store(keep=active,
+                            res=res,
+                            values=optimum_new,
+                            opt_x=self.opt_x,
+                            param=param)
+                batch = self._batch(rows=batch.rows[active])
+                param, param_new, optimum_current, optimum_new, delta = (
+                    param[active], param_new[active],
+                    optimum_current[active], optimum_new[active],
+                    delta[active])
+                active = active[active]
+
+            for index in range(self.number_param):
+                value = param[:, index]
+                candidate = param_new.copy()
+
+                candidate[:, index] = value + delta
+                candidate_plus = batch.evaluate(param_array=candidate)
+
+                candidate[:, index] = value - delta
+                candidate_minus = batch.evaluate(param_array=candidate)
+
+                plus = active & (candidate_plus < optimum_new)
+                minus = active & ~plus & (candidate_minus < optimum_new)
+
+                # as in Optimize.pattern_search, the minus step is kept if
+                # neither step is better
+                param_new[active, index] = np.where(plus, value + delta,
+                                                    value - delta)[active]
+                optimum_new = np.where(
+                    plus, candidate_plus,
+                    np.where(minus, candidate_minus, optimum_new))
+
+            # i.e., exploration step was successful
+            success = active & (optimum_new < optimum_current)
+            param_old = param
+            param = np.where(success[:, None], param_new, param)
+            optimum_current = np.where(success, optimum_new, optimum_current)
+            param_new = np.where(success[:, None], 2 * param - param_old,
+                                 param_new)
+
+            if success.any():
+                # try a pattern step
+                candidate_new = batch.evaluate(param_array=param_new)
+                pattern = success & (candidate_new < optimum_current)
+                param = np.where(pattern[:, None], param_new, param)
+
+            failure = active & ~success
+            param_new = np.where(failure[:, None], param, param_new)
+            delta = np.where(failure, 0.5 * delta, delta)
+
+        batch.store(keep=np.zeros(batch.rows.shape[0], dtype=bool),
+                    res=res,
+                    values=optimum_new,
+                    opt_x=self.opt_x,
+                    param=param)
+
+        return res
+
+    def nelder_mead(self,
+                    simplex: np.ndarray,
+                    nelder_mead_param: Optional[NelderMeadParameters] = None,
+                    sd_min=10**(-2),
+                    max_iterations=10**4) -> np.ndarray:
+        """
+        Lock-step counterpart of Optimize.nelder_mead_old (the Nelder-Mead of
+        sciPy cannot be advanced step by step).
+
+        :param simplex:           initial parameter simplex of all instances,
+                                  or one simplex per instance
+        :param nelder_mead_param: object that contains all the
+                                  Nelder-Mead-parameters
+        :param sd_min:            abort criterion (detect when the changes
+                                  become very small)
+        :param max_iterations:    stops the instances that have not
+                                  converged after this many iterations
+        :return:                  optimized standard_bound per instance
+        """
+        if nelder_mead_param is None:
+            nelder_mead_param = NelderMeadParameters()
+
+        number_instances = self.instance_array.shape[0]
+        simplex = np.array(np.broadcast_to(
+            simplex, (number_instances, ) + np.shape(simplex)[-2:]),
+                           dtype=float)
+
+        number_rows = simplex.shape[1]
+        number_columns = simplex.shape[2]
+        # number of rows is the number of points = number of columns + 1
+        # number of columns is the number of parameters
+        if number_rows != number_columns + 1:
+            raise WrongDimension(
+                f"array argument is not a simplex, rows: {number_rows},"
+                f" columns: {number_columns}")
+
+        reflection_alpha = nelder_mead_param.reflection_alpha
+        expansion_gamma = nelder_mead_param.expansion_gamma
+        contraction_beta = nelder_mead_param.contraction_beta
+        shrink_gamma = nelder_mead_param.shrink_gamma
+
+        res = np.empty(number_instances)
+        self.opt_x = np.empty((number_instances, number_columns))
+
+        batch = self._batch(rows=np.arange(number_instances))
+        y_value = np.column_stack([
+            batch.evaluate(param_array=simplex[:, row])
+            for row in range(number_rows)
+        ])
+        best_index = np.argmin(y_value, axis=1)
+
+        for _ in range(max_iterations):
+            with np.errstate(invalid="ignore"):
+                # nan, i.e., stopped, if any value is inf
+                active = np.std(y_value, axis=1, ddof=1) > sd_min
+
+            if not active.any():
+                break
+
+            if batch.is_sparse(active=active):
+                instance = np.arange(batch.rows.shape[0])
+                batch.store(keep=active,
+                            res=res,
+                            values=y_value[instance, best_index],
+                            opt_x=self.opt_x,
+                            param=simplex[instance, best_index])
+                batch = self._batch(rows=batch.rows[active])
+                simplex, y_value, best_index = (simplex[active],
+                                                y_value[active],
+                                                best_index[active])
+                active = active[active]
+
+            instance = np.arange(batch.rows.shape[0])
+            worst_index = np.argmax(y_value, axis=1)
+            best_index = np.where(active, np.argmin(y_value, axis=1),
+                                  best_index)
+            second_worst_index = np.argsort(y_value, axis=1)[:, -2]
+
+            # compute centroid without worst row
+            without_worst = np.ones(y_value.shape, dtype=bool)
+            without_worst[instance, worst_index] = False
+            centroid = simplex[without_worst].reshape(
+                -1, number_columns, number_columns).mean(axis=1)
+
+            p_reflection = (1 + reflection_alpha) * centroid - \
+                reflection_alpha * simplex[instance, worst_index]
+            y_p_reflection = batch.evaluate(param_array=p_reflection)
+
+            expansion = active & (y_p_reflection < y_value[instance,
+                                                           best_index])
+            contraction = active & ~expansion & (
+                y_p_reflection > y_value[instance, second_worst_index])
+            reflection = active & ~expansion & ~contraction
+
+            replace = contraction & (y_p_reflection < y_value[instance,
+                                                              worst_index])
+            simplex[instance[replace],
+                    worst_index[replace]] = p_reflection[replace]
+            y_value[instance[replace],
+                    worst_index[replace]] = y_p_reflection[replace]
+
+            p_expansion = expansion_gamma * p_reflection + (
+                1 - expansion_gamma) * centroid
+            p_contraction = contraction_beta * simplex[
+                instance, worst_index] + (1 - contraction_beta) * centroid
+            # expansion and contraction are evaluated in the same call
+            p_second = np.where(expansion[:, None], p_expansion,
+                                p_contraction)
+
+            if (expansion | contraction).any():
+                y_p_second = batch.evaluate(param_array=p_second)
+            else:
+                y_p_second = np.full(instance.shape[0], inf)
+
+            take_reflection = reflection | (
+                expansion & ~(y_p_second < y_value[instance, best_index]))
+            take_second = (expansion & ~take_reflection) | (
+                contraction &
+                (y_p_second < y_value[instance, worst_index]))
+            shrink = contraction & ~take_second
+
+            for take, point, value in [
+                (take_reflection, p_reflection, y_p_reflection),
+                (take_second, p_second, y_p_second)
+            ]:
+                simplex[instance[take], worst_index[take]] = point[take]
+                y_value[instance[take], worst_index[take]] = value[take]
+
+            if shrink.any():
+                best_row = simplex[instance, best_index][:, None, :]
+                simplex[shrink] = best_row[shrink] + shrink_gamma * (
+                    simplex[shrink] - best_row[shrink])
+
+                for row in range(number_rows):
+                    y_row = batch.evaluate(param_array=simplex[:, row])
+                    y_value[shrink, row] = y_row[shrink]
+
+        instance = np.arange(batch.rows.shape[0])
+        batch.store(keep=np.zeros(instance.shape[0], dtype=bool),
+                    res=res,
+                    values=y_value[instance, best_index],
+                    opt_x=self.opt_x,
+                    param=simplex[instance, best_index])
+
+        return res
+
+
+class _Batch(object):
+    """Instances that are still optimized, with their setting."""
+    def __init__(self, optimizer: BatchOptimize, rows: np.ndarray) -> None:
+        self.optimizer = optimizer
+        # indices of the instances in instance_array
+        self.rows = rows
+        self.setting = optimizer.setting_factory(
+            optimizer.instance_array[rows])
+
+        if (type(self.setting).standard_bound_array is
+                Setting.standard_bound_array):
+            raise NotImplementedError(
+                f"{self.setting.to_name()} has no vectorized "
+                f"standard_bound_array")
+
+    def evaluate(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        :param param_array: one row of parameters per instance of the batch
+        :return:            standard_bound per instance, inf if infeasible
+        """
+        self.optimizer.evaluation_calls += 1
+        self.optimizer.evaluations += param_array.shape[0]
+
+        res = self.setting.standard_bound_array(param_array=param_array)
+
+        return np.where(np.isnan(res), inf, res)
+
+    def is_sparse(self, active: np.ndarray) -> bool:
+        return np.count_nonzero(
+            active) < self.optimizer.min_active_share * active.shape[0]
+
+    def store(self, keep: np.ndarray, res: np.ndarray, values: np.ndarray,
+              opt_x: np.ndarray, param: np.ndarray) -> None:
+        """Writes the results of the instances that are not kept."""
+        res[self.rows[~keep]] = values[~keep]
+        opt_x[self.rows[~keep]] = param[~keep]
@@ -1,6 +1,6 @@
 """Simple Optimizer"""
 
-from math import inf
+from math import inf, isnan
 from typing import List
 
 import numpy as np
@@ -8,30 +8,43 @@ import scipy.optimize
 
 from nc_arrivals.arrival_distribution import ArrivalDistribution
 from nc_server.constant_rate_server import ConstantRateServer
-from utils.exceptions import ParameterOutOfBounds
+from optimization.adaptive_grid import adaptive_grid
+from utils.exceptions import NanOnInfeasible, ParameterOutOfBounds
 from utils.perform_parameter import PerformParameter
 
 
 def optimizer_perform(fun: callable, arr_list: List[ArrivalDistribution],
                       ser_list: List[ConstantRateServer],
                       perform_param: PerformParameter, ranges: list,
-                      print_x=False) -> float:
+                      print_x=False, adaptive=False) -> float:
+    """
+    :param ranges:   slices of the grid
+    :param adaptive: refine the grid only around the best points, see
+                     adaptive_grid
+    """
     def helper_fun(param_list: [float, float]) -> float:
         try:
-            return fun(param_list=param_list,
-                       perform_param=perform_param,
-                       arr_list=arr_list,
-                       ser_list=ser_list)
+            value = fun(param_list=param_list,
+                        perform_param=perform_param,
+                        arr_list=arr_list,
+                        ser_list=ser_list)
         except (FloatingPointError, OverflowError, ParameterOutOfBounds,
                 ValueError):
             return inf
 
+        # nan within NanOnInfeasible
+        return inf if isnan(value) else value
+
     # np.seterr("raise")
     np.seterr("warn")
 
-    grid_res = scipy.optimize.brute(func=helper_fun,
-                                    ranges=ranges,
-                                    full_output=True)
+    with NanOnInfeasible():
+        if adaptive:
+            grid_res = adaptive_grid(func=helper_fun, ranges=tuple(ranges))
+        else:
+            grid_res = scipy.optimize.brute(func=helper_fun,
+                                            ranges=ranges,
+                                            full_output=True)
 
     if print_x:
         print("grid search optimal x: ", grid_res[0].tolist())
@@ -3,11 +3,14 @@ from enum import Enum
 
 class OptMethod(Enum):
     GRID_SEARCH = "GridSearch"
+    ADAPTIVE_GRID = "AdaptiveGrid"
     NELDER_MEAD = "NelderMead"
     PATTERN_SEARCH = "PatternSearch"
+    MULTI_START = "MultiStart"
     BASIN_HOPPING = "BasinHopping"
     SIMULATED_ANNEALING = "SimulatedAnnealing"
     DIFFERENTIAL_EVOLUTION = "DifferentialEvolution"
     BFGS = "BFGS"
+    BOUNDED_THETA = "BoundedTheta"
     GS_OLD = "GridSearchOld"
     NM_OLD = "NelderMeadOld"
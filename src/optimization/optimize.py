@@ -1,30 +1,86 @@
 """Optimize theta and all other parameters"""
 
-from math import exp, inf
-from typing import List, Tuple
+import copy
+from math import exp, inf, isnan, nan
+from multiprocessing import Pool
+from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import scipy.optimize
 
+from optimization.adaptive_grid import COARSE_POINTS, adaptive_grid
 from optimization.nelder_mead_parameters import NelderMeadParameters
+from optimization.optimizer_stats import OptimizerStats, timed_method
 from optimization.sim_anneal_param import SimAnnealParams
 from utils.deprecated import deprecated
-from utils.exceptions import ParameterOutOfBounds, WrongDimension
+from utils.exceptions import (ParameterOutOfBounds, WrongDimension,
+                              nan_on_infeasible)
 from utils.helper_functions import (average_towards_best_row,
-                                    centroid_without_one_row, expand_grid)
+                                    centroid_without_one_row, evaluate_rows,
+                                    expand_grid, log_of_bound)
 from utils.setting import Setting
+from utils.sigma_rho_cache import invalidate_sigma_rho_cache
+
+# number of pattern searches of the multi-start search
+MULTI_STARTS = 8
 
 
 class Optimize(object):
     """Optimize class"""
+    # exceptions of the optimized bound that make a point infeasible
+    infeasible_exceptions: Tuple[type, ...] = (OverflowError,
+                                               ParameterOutOfBounds,
+                                               ValueError)
+
     def __init__(self,
                  setting: Setting,
                  number_param: int,
-                 print_x=False) -> None:
+                 print_x=False,
+                 log_domain=False) -> None:
+        """
+        :param setting:      setting whose standard_bound is optimized
+        :param number_param: number of parameters
+        :param print_x:      print the optimal parameters
+        :param log_domain:   optimize the log-bound (see
+                             Setting.standard_log_bound) instead, i.e.,
+                             all values and results are log-bounds
+        """
         self.setting = setting
         self.number_param = number_param
         self.print_x = print_x
+        self.log_domain = log_domain
+        # optimal parameters of the last successful optimization
+        self.opt_x: Optional[List[float]] = None
+        # evaluation counters and timing, see OptimizerStats
+        self.stats = OptimizerStats()
+
+    def _bound(self, param_list: List[float]) -> float:
+        """
+        Optimized bound, overridden by the subclasses.
+
+        :param param_list: theta ond other parameters
+        :return:           bound
+        """
+        return self.setting.standard_bound(param_list=param_list)
+
+    def _log_bound(self, param_list: List[float]) -> float:
+        """
+        Logarithm of _bound, used if log_domain.
+
+        :param param_list: theta ond other parameters
+        :return:           log-bound
+        """
+        return self.setting.standard_log_bound(param_list=param_list)
+
+    def _bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        _bound for many parameter sets at once.
+
+        :param param_array: one row of theta and other parameters per point
+        :return:            array of bounds
+        """
+        return self.setting.standard_bound_array(param_array=param_array)
 
     def eval_except(self, param_list: List[float]) -> float:
         """
@@ -33,18 +89,104 @@ class Optimize(object):
         :param param_list: theta ond other parameters
         :return:           function to_value
         """
+        # memoized values of the previous evaluation are not needed anymore
+        invalidate_sigma_rho_cache()
+
         try:
-            return self.setting.standard_bound(param_list=param_list)
+            if self.log_domain:
+                value = self._log_bound(param_list=param_list)
+            else:
+                value = self._bound(param_list=param_list)
+        except self.infeasible_exceptions as exception:
+            return self.stats.record_exception(exception=exception)
+        except FloatingPointError as exception:
+            # aborts the optimization method, see np.seterr("raise")
+            self.stats.record_exception(exception=exception)
+            raise
+
+        # nan within NanOnInfeasible
+        return self.stats.record(param_list=param_list,
+                                 value=inf if isnan(value) else value)
+
+    def eval_gradient(self, param_list: List[float]) -> np.ndarray:
+        """
+        Analytic gradient of eval_except, e.g., for the jac of bfgs.
+
+        :param param_list: theta ond other parameters
+        :return:           gradient, nan if infeasible
+        """
+        invalidate_sigma_rho_cache()
+        self.stats.gradients += 1
+
+        try:
+            gradient = self.setting.standard_bound_gradient(
+                param_list=param_list)
+            if self.log_domain:
+                # gradient of the log-bound
+                gradient = gradient / self.setting.standard_bound(
+                    param_list=param_list)
         except (OverflowError, ParameterOutOfBounds, ValueError):
+            return np.full(len(param_list), nan)
+
+        return gradient
+
+    def eval_except_array(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        Counterpart of eval_except for many parameter sets at once.
+
+        :param param_array: one row of theta and other parameters per point
+        :return:            array of function values, inf if infeasible
+        """
+        if self.log_domain:
+            # the array bounds are not in the log-domain
+            res = evaluate_rows(fun=self._log_bound, param_array=param_array)
+        else:
+            res = self._bound_array(param_array=param_array)
+
+        return self.stats.record_array(param_array=param_array,
+                                       values=np.where(np.isnan(res), inf,
+                                                       res))
+
+    def theta_upper_bound(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        Feasibility oracle of the optimized bound.
+
+        :param param_array: one row of theta and other parameters per point
+        :return:            thetas from this bound on are infeasible
+        """
+        return self.setting.theta_upper_bound(p_array=param_array[:, 1:])
+
+    def eval_pruned(self, param_list: List[float]) -> float:
+        """
+        eval_except that skips points beyond the feasibility oracle.
+
+        :param param_list: theta ond other parameters
+        :return:           function to_value
+        """
+        param_array = np.asarray(param_list, dtype=float).reshape(1, -1)
+        if param_array[0, 0] >= self.theta_upper_bound(
+                param_array=param_array)[0]:
+            self.stats.pruned += 1
             return inf
 
-    def grid_search(self, bound_list: List[Tuple[float, float]],
-                    delta: float) -> float:
+        return self.eval_except(param_list=param_list)
+
+    @timed_method
+    @nan_on_infeasible
+    def grid_search(self,
+                    bound_list: List[Tuple[float, float]],
+                    delta: float,
+                    vectorized=False,
+                    prune=False) -> float:
         """
         Search optimal values along a grid in the parameter space.
 
         :param bound_list: list of tuples of lower and upper bounds
         :param delta:      granularity of the grid search
+        :param vectorized: evaluate the whole grid at once via
+                           eval_except_array instead of point by point
+        :param prune:      skip the grid points beyond the feasibility
+                           oracle theta_upper_bound
         :return:           optimized standard_bound
         """
         if len(bound_list) != self.number_param:
@@ -58,6 +200,21 @@ class Optimize(object):
 
         np.seterr("raise")
 
+        if vectorized or prune:
+            try:
+                grid_res = self.brute_array(ranges=tuple(list_slices),
+                                            vectorized=vectorized,
+                                            prune=prune)
+
+            except FloatingPointError:
+                return inf
+
+            self.opt_x = np.atleast_1d(grid_res[0]).tolist()
+            if self.print_x:
+                print(f"grid search optimal x: {grid_res[0].tolist()}")
+
+            return grid_res[1]
+
         # grid_res = scipy.optimize.brute(
         #     func=self.eval_except, ranges=tuple(list_slices),
         #     full_output=True)
@@ -71,29 +228,274 @@ class Optimize(object):
         except FloatingPointError:
             return inf
 
+        self.opt_x = np.atleast_1d(grid_res[0]).tolist()
         if self.print_x:
             print(f"grid search optimal x: {grid_res[0].tolist()}")
 
         return grid_res[1]
 
+    def brute_array(self,
+                    ranges: Tuple[slice, ...],
+                    vectorized=True,
+                    prune=False) -> Tuple[np.ndarray, float]:
+        """
+        Counterpart of scipy.optimize.brute (with its default fmin-finish).
+        Infeasible grid points are masked as inf and do not abort the search.
+
+        :param ranges:     tuple of slices that span the grid
+        :param vectorized: evaluate the grid via eval_except_array
+        :param prune:      only evaluate the grid points below
+                           theta_upper_bound, also during the fmin-finish
+        :return:           optimal parameters and optimized standard_bound
+        """
+        grid = np.mgrid[ranges]
+        param_array = np.reshape(grid, (len(ranges), -1)).T
+
+        if prune:
+            feasible = param_array[:, 0] < self.theta_upper_bound(
+                param_array=param_array)
+            self.stats.pruned += int(np.count_nonzero(~feasible))
+            eval_fun = self.eval_pruned
+        else:
+            feasible = np.ones(param_array.shape[0], dtype=bool)
+            eval_fun = self.eval_except
+
+        grid_values = np.full(param_array.shape[0], inf)
+        if vectorized:
+            grid_values[feasible] = self.eval_except_array(
+                param_array=param_array[feasible])
+        else:
+            grid_values[feasible] = [
+                self.eval_except(param_list=param_row)
+                for param_row in param_array[feasible]
+            ]
+        index_min = np.argmin(grid_values)
+
+        try:
+            fmin_res = scipy.optimize.fmin(func=eval_fun,
+                                           x0=param_array[index_min],
+                                           full_output=True,
+                                           disp=False)
+
+        except FloatingPointError:
+            return param_array[index_min], grid_values[index_min]
+
+        return fmin_res[0], fmin_res[1]
+
+    @timed_method
+    @nan_on_infeasible
+    def adaptive_grid_search(self,
+                             bound_list: List[Tuple[float, float]],
+                             delta: float,
+                             coarse_points=COARSE_POINTS,
+                             keep_best: Optional[int] = None,
+                             polish=True,
+                             vectorized=False) -> float:
+        """
+        Coarse-to-fine counterpart of grid_search (see adaptive_grid): only
+        the cells of the best points are refined down to delta.
+
+        :param bound_list:    list of tuples of lower and upper bounds
+        :param delta:         granularity of the finest grid
+        :param coarse_points: minimal number of points per dimension of the
+                              coarse grid
+        :param keep_best:     number of cells that are refined per level,
+                              see adaptive_grid
+        :param polish:        local fmin-finish from the best grid point
+        :param vectorized:    evaluate each level at once via
+                              eval_except_array
+        :return:              optimized standard_bound
+        """
+        if len(bound_list) != self.number_param:
+            raise WrongDimension(
+                f"Number of parameters {len(bound_list)} is wrong")
+
+        np.seterr("raise")
+
+        try:
+            grid_res = adaptive_grid(
+                func=self.eval_except,
+                ranges=tuple(
+                    slice(lower, upper, delta) for lower, upper in bound_list),
+                func_array=self.eval_except_array if vectorized else None,
+                coarse_points=coarse_points,
+                keep_best=keep_best,
+                polish=polish)
+
+        except FloatingPointError:
+            return inf
+
+        self.opt_x = np.atleast_1d(grid_res[0]).tolist()
+        if self.print_x:
+            print(f"adaptive grid search optimal x: {self.opt_x}")
+
+        return grid_res[1]
+
+    @timed_method
+    @nan_on_infeasible
+    def bounded_theta_search(self,
+                             xatol=1e-4,
+                             theta_start: Optional[float] = None) -> float:
+        """
+        Brent's method on the log-bound within the analytic feasible interval
+        of theta (see Setting.theta_interval). The bound is a smooth function
+        of theta, such that a few dozen evaluations replace a fine grid.
+
+        :param xatol:       absolute tolerance of theta
+        :param theta_start: optimum of a similar setting, e.g., of the
+                            previous step of a sweep. Only
+                            (theta_start / 2, 2 * theta_start) is searched,
+                            unless the optimum hits an inner edge.
+        :return:            optimized standard_bound
+        """
+        if self.number_param != 1:
+            raise WrongDimension(
+                f"Number of parameters {self.number_param} is wrong")
+
+        theta_min, theta_max = self.setting.theta_interval()
+        if theta_max <= theta_min:
+            return inf
+
+        def log_bound(theta: float) -> float:
+            if self.log_domain:
+                return self.eval_except(param_list=[theta])
+
+            return log_of_bound(self.eval_except(param_list=[theta]))
+
+        def brent(lower: float, upper: float) -> float:
+            return scipy.optimize.minimize_scalar(log_bound,
+                                                  bounds=(lower, upper),
+                                                  method="bounded",
+                                                  options={
+                                                      "xatol": xatol
+                                                  }).x
+
+        try:
+            theta_opt = None
+
+            if theta_start is not None and theta_min < theta_start < theta_max:
+                lower = max(theta_min, theta_start / 2)
+                upper = min(theta_max, 2 * theta_start)
+                theta_opt = brent(lower=lower, upper=upper)
+
+                if (lower > theta_min and theta_opt < lower + 10 * xatol) or (
+                        upper < theta_max and theta_opt > upper - 10 * xatol):
+                    theta_opt = None
+
+            if theta_opt is None:
+                theta_opt = brent(lower=theta_min, upper=theta_max)
+
+        except FloatingPointError:
+            return inf
+
+        self.opt_x = [float(theta_opt)]
+        if self.print_x:
+            print(f"bounded theta search optimal x: {theta_opt}")
+
+        return self.eval_except(param_list=[theta_opt])
+
+    @timed_method
+    @nan_on_infeasible
+    def zoom_theta_search(self,
+                          number_points=64,
+                          rounds=3,
+                          theta_start: Optional[float] = None) -> float:
+        """
+        Vectorized counterpart of bounded_theta_search: evaluates a grid of
+        number_points thetas within the analytic feasible interval at once
+        and zooms into the neighbourhood of its best point.
+
+        :param number_points: grid points per round
+        :param rounds:        number of zooms, each shrinks the interval by
+                              a factor of about number_points / 2
+        :param theta_start:   optimum of a similar setting. The first round
+                              only searches (theta_start / 2,
+                              2 * theta_start), unless the best point is at
+                              an inner edge.
+        :return:              optimized standard_bound
+        """
+        if self.number_param != 1:
+            raise WrongDimension(
+                f"Number of parameters {self.number_param} is wrong")
+
+        theta_min, theta_max = self.setting.theta_interval()
+        if theta_max <= theta_min:
+            return inf
+
+        def evaluate_grid(lower: float,
+                          upper: float) -> Tuple[np.ndarray, np.ndarray, int]:
+            # the ends of the open interval are infeasible
+            theta = np.linspace(lower, upper, number_points + 2)[1:-1]
+            values = self.eval_except_array(param_array=theta.reshape(-1, 1))
+
+            return theta, values, int(np.argmin(values))
+
+        lower, upper = theta_min, theta_max
+        if theta_start is not None and theta_min < theta_start < theta_max:
+            lower = max(theta_min, theta_start / 2)
+            upper = min(theta_max, 2 * theta_start)
+
+        try:
+            theta, values, index_min = evaluate_grid(lower=lower, upper=upper)
+
+            if (lower > theta_min and index_min == 0) or (
+                    upper < theta_max and index_min == number_points - 1):
+                # the optimum is not close to theta_start
+                lower, upper = theta_min, theta_max
+                theta, values, index_min = evaluate_grid(lower=lower,
+                                                         upper=upper)
+
+            for _ in range(rounds - 1):
+                if values[index_min] == inf:
+                    return inf
+
+                step = theta[1] - theta[0]
+                lower = max(lower, theta[index_min] - step)
+                upper = min(upper, theta[index_min] + step)
+                theta, values, index_min = evaluate_grid(lower=lower,
+                                                         upper=upper)
+
+        except FloatingPointError:
+            return inf
+
+        if values[index_min] == inf:
+            return inf
+
+        self.opt_x = [float(theta[index_min])]
+        if self.print_x:
+            print(f"zoom theta search optimal x: {self.opt_x}")
+
+        return float(values[index_min])
+
+    @timed_method
+    @nan_on_infeasible
     def pattern_search(self,
                        start_list: List[float],
                        delta=3.0,
-                       delta_min=0.01) -> float:
+                       delta_min=0.01,
+                       prune=False,
+                       max_evaluations: Optional[int] = None) -> float:
         """
         Optimization in Hooke and Jeeves.
 
-        :param start_list: list of starting values
-        :param delta:      initial granularity
-        :param delta_min:  final granularity
-        :return:           optimized standard_bound
+        :param start_list:      list of starting values
+        :param delta:           initial granularity
+        :param delta_min:       final granularity
+        :param prune:           do not evaluate points beyond the feasibility
+                                oracle theta_upper_bound
+        :param max_evaluations: stops after the first iteration that reaches
+                                this number of evaluations, None for no limit
+        :return:                optimized standard_bound
         """
 
         if len(start_list) != self.number_param:
             raise WrongDimension(
                 f"Number of parameters {len(start_list)} is wrong")
 
-        optimum_current = self.eval_except(param_list=start_list)
+        eval_fun = self.eval_pruned if prune else self.eval_except
+        evaluations_start = self.stats.evaluations
+
+        optimum_current = eval_fun(param_list=start_list)
 
         optimum_new = optimum_current
 
@@ -101,12 +503,16 @@ class Optimize(object):
         param_new = param_list[:]
 
         while delta > delta_min:
+            if (max_evaluations is not None and self.stats.evaluations -
+                    evaluations_start >= max_evaluations):
+                break
+
             for index, value in enumerate(param_list):
                 param_new[index] = value + delta
-                candidate_plus = self.eval_except(param_list=param_new)
+                candidate_plus = eval_fun(param_list=param_new)
 
                 param_new[index] = value - delta
-                candidate_minus = self.eval_except(param_list=param_new)
+                candidate_minus = eval_fun(param_list=param_new)
 
                 if candidate_plus < optimum_new:
                     param_new[index] = value + delta
@@ -124,7 +530,7 @@ class Optimize(object):
                     param_new[index] = 2 * param_list[index] - param_old[index]
 
                 # try a pattern step
-                candidate_new = self.eval_except(param_list=param_new)
+                candidate_new = eval_fun(param_list=param_new)
 
                 if candidate_new < optimum_current:
                     param_list = param_new[:]
@@ -133,11 +539,91 @@ class Optimize(object):
                 param_new = param_list[:]
                 delta *= 0.5
 
+        self.opt_x = param_list[:]
         if self.print_x:
             print(f"pattern search optimal x: {param_list}")
 
         return optimum_new
 
+    @timed_method
+    @nan_on_infeasible
+    def multi_start_search(self,
+                           bound_list: List[Tuple[float, float]],
+                           number_starts=MULTI_STARTS,
+                           max_evaluations=10**4,
+                           start_list: Optional[List[float]] = None,
+                           delta=3.0,
+                           delta_min=0.01,
+                           polish=True,
+                           processes=1,
+                           rng: Optional[np.random.Generator] = None) -> float:
+        """
+        Pattern searches from several random starting points. Their cost is
+        linear in the number of parameters, unlike the grid search, e.g., for
+        the Lyapunov parameters of OptimizeMitigator. The starts are
+        independent and run in a process pool if processes is not 1.
+
+        :param bound_list:      list of tuples of lower and upper bounds, the
+                                starting points are drawn uniformly from them
+        :param number_starts:   number of pattern searches
+        :param max_evaluations: evaluation budget, shared equally by the
+                                starts, at least one per start
+        :param start_list:      first starting point instead of a random one
+        :param delta:           initial granularity of the pattern searches
+        :param delta_min:       final granularity
+        :param polish:          local fmin-finish of each pattern search with
+                                the rest of its budget
+        :param processes:       number of worker processes, None uses all
+                                cores
+        :param rng:             random number generator, None uses the global
+                                np.random state
+        :return:                optimized standard_bound
+        """
+        if len(bound_list) != self.number_param:
+            raise WrongDimension(
+                f"Number of parameters {len(bound_list)} is wrong")
+
+        if max_evaluations < number_starts:
+            raise ValueError(f"max_evaluations = {max_evaluations} must be >= "
+                             f"number_starts = {number_starts}")
+
+        if rng is None:
+            rng = np.random
+
+        lower, upper = np.array(bound_list, dtype=float).T
+        starts = rng.uniform(low=lower,
+                             high=upper,
+                             size=(number_starts, self.number_param))
+        if start_list is not None:
+            starts[0] = start_list
+
+        tasks = []
+        for start in starts:
+            # every start counts in its own stats, they are merged below
+            local_optimizer = copy.copy(self)
+            local_optimizer.stats = OptimizerStats()
+            local_optimizer.print_x = False
+            tasks.append((local_optimizer, start.tolist(), delta, delta_min,
+                          max_evaluations // number_starts, polish))
+
+        if processes == 1:
+            results = list(map(_local_pattern_search, tasks))
+
+        else:
+            with Pool(processes=processes) as pool:
+                results = pool.map(_local_pattern_search, tasks)
+
+        for _, _, stats in results:
+            self.stats.merge(other=stats)
+
+        optimum, self.opt_x, _ = min(results, key=lambda result: result[0])
+        if self.print_x:
+            print(f"multi-start search optimal x: {self.opt_x}")
+
+        return optimum
+
+    @timed_method
+    @nan_on_infeasible
     def nelder_mead(self, simplex: np.ndarray, sd_min=10**(-2)) -> float:
         """
         Nelder-Mead optimization from the sciPy package.
@@ -151,7 +637,7 @@ class Optimize(object):
         try:
             nm_res = scipy.optimize.minimize(
                 self.eval_except,
-                x0=np.zeros(shape=(1, simplex.shape[1])),
+                x0=simplex[0],
                 method='Nelder-Mead',
                 options={
                     'initial_simplex': simplex,
@@ -161,11 +647,14 @@ class Optimize(object):
         except FloatingPointError:
             return inf
 
+        self.opt_x = nm_res.x.tolist()
         if self.print_x:
             print(f"Nelder Mead optimal x: {nm_res.x}")
 
         return nm_res.fun
 
+    @timed_method
+    @nan_on_infeasible
     def basin_hopping(self, start_list: List[float]) -> float:
         """
         Basin Hopping optimization from the sciPy package.
@@ -180,11 +669,14 @@ class Optimize(object):
         except FloatingPointError:
             return inf
 
+        self.opt_x = np.atleast_1d(bh_res.x).tolist()
         if self.print_x:
             print(f"basin hopping optimal x: {bh_res.x}")
 
         return bh_res.fun
 
+    @timed_method
+    @nan_on_infeasible
     def diff_evolution(self, bound_list: List[tuple]) -> float:
         """
         Differential Evolution optimization from the sciPy package.
@@ -201,22 +693,28 @@ class Optimize(object):
         except FloatingPointError:
             return inf
 
+        self.opt_x = de_res.x.tolist()
         if self.print_x:
             print(f"differential evolution optimal x: {de_res.x}")
 
         return de_res.fun
 
+    @timed_method
+    @nan_on_infeasible
     def dual_annealing(self, bound_list: List[Tuple[float, float]]):
 
         dual_anneal_res = scipy.optimize.dual_annealing(func=self.eval_except,
                                                         bounds=bound_list)
 
+        self.opt_x = dual_anneal_res.x.tolist()
         if self.print_x:
             print(f"dual annealing optimal x: {dual_anneal_res.x}")
 
         return dual_anneal_res.fun
 
     @deprecated
+    @timed_method
+    @nan_on_infeasible
     def sim_annealing(self, start_list: List[float],
                       sim_anneal_params: SimAnnealParams) -> float:
         """
@@ -277,6 +775,8 @@ class Optimize(object):
         return optimum_best
 
     @deprecated
+    @timed_method
+    @nan_on_infeasible
     def grid_search_old(self, bound_list: List[Tuple[float, float]],
                         delta: float) -> float:
         """
@@ -318,6 +818,8 @@ class Optimize(object):
         return y_opt
 
     @deprecated
+    @timed_method
+    @nan_on_infeasible
     def nelder_mead_old(self,
                         simplex: np.ndarray,
                         nelder_mead_param: NelderMeadParameters,
@@ -432,20 +934,72 @@ class Optimize(object):
 
         return y_value[best_index]
 
-    def bfgs(self, start_list: list) -> float:
+    @timed_method
+    @nan_on_infeasible
+    def bfgs(self, start_list: list, analytic_gradient=True) -> float:
+        """
+        BFGS from the sciPy package.
+
+        :param start_list:        initial guess
+        :param analytic_gradient: use eval_gradient if the setting has one,
+                                  else finite differences
+        :return:                  optimized standard_bound
+        """
         x0 = np.array(start_list)
 
+        jac = None
+        if analytic_gradient:
+            try:
+                self.eval_gradient(param_list=start_list)
+                jac = self.eval_gradient
+            except NotImplementedError:
+                pass
+
         np.seterr("raise")
 
         try:
             bfgs_res = scipy.optimize.minimize(fun=self.eval_except,
                                                x0=x0,
-                                               method="BFGS")
+                                               method="BFGS",
+                                               jac=jac)
 
         except FloatingPointError:
             return inf
 
+        self.opt_x = bfgs_res.x.tolist()
         if self.print_x:
             print(f"BFGS optimal x: {bfgs_res.x}")
 
         return bfgs_res.fun
+
+
+def _local_pattern_search(
+        task: Tuple[Optimize, List[float], float, float, int, bool]
+) -> Tuple[float, List[float], OptimizerStats]:
+    """
+    One start of Optimize.multi_start_search, module-level to be picklable.
+
+    :param task: optimizer, start_list, delta, delta_min, max_evaluations
+                 and polish
+    :return:     optimum, its parameters and the stats of the search
+    """
+    optimizer, start_list, delta, delta_min, max_evaluations, polish = task
+    optimum = optimizer.pattern_search(start_list=start_list,
+                                       delta=delta,
+                                       delta_min=delta_min,
+                                       max_evaluations=max_evaluations)
+    remaining = max_evaluations - optimizer.stats.evaluations
+
+    if polish and optimum < inf and remaining > 0:
+        # the simplex may contain infeasible points, i.e., inf - inf
+        with np.errstate(invalid="ignore"):
+            fmin_res = scipy.optimize.fmin(func=optimizer.eval_except,
+                                           x0=optimizer.opt_x,
+                                           maxfun=remaining,
+                                           full_output=True,
+                                           disp=False)
+
+        if fmin_res[1] < optimum:
+            return fmin_res[1], fmin_res[0].tolist(), optimizer.stats
+
+    return optimum, optimizer.opt_x, optimizer.stats
@@ -0,0 +1,175 @@
+"""Evaluation counters and timing of the optimizers."""
+
+import functools
+from math import inf
+from timeit import default_timer as timer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class OptimizerStats(object):
+    """
+    Instrumentation of an optimizer (see Optimize.stats), e.g., to see where
+    the time goes or to tune the delta of a grid search:
+
+        optimizer.grid_search(bound_list=[(0.1, 5.0)], delta=0.1)
+        print(optimizer.stats.to_dict())
+
+    The counters accumulate over all methods until reset is called.
+    """
+    def __init__(self,
+                 callback: Optional[Callable[[List[float], float],
+                                             None]] = None) -> None:
+        """
+        :param callback: called with the parameters and the value of every
+                         new best-so-far evaluation
+        """
+        self.callback = callback
+        self.reset()
+
+    def reset(self) -> None:
+        # number of evaluated parameter sets, also within arrays
+        self.evaluations = 0
+        # evaluations that are inf, including the exceptions
+        self.infeasible = 0
+        # parameter sets skipped by the feasibility oracle
+        self.pruned = 0
+        # analytic gradients, see Optimize.eval_gradient
+        self.gradients = 0
+        self.exceptions: Dict[str, int] = {}
+
+        self.method_calls: Dict[str, int] = {}
+        self.method_time: Dict[str, float] = {}
+        self.method_evaluations: Dict[str, int] = {}
+
+        self.best_value = inf
+        self.best_param: Optional[List[float]] = None
+        # (number of evaluations, best value so far) at every improvement
+        self.trajectory: List[Tuple[int, float]] = []
+
+    def record(self, param_list: List[float], value: float) -> float:
+        """
+        :param param_list: evaluated parameters
+        :param value:      bound at param_list
+        :return:           value
+        """
+        self.evaluations += 1
+
+        if value < self.best_value:
+            self._improve(param_list=param_list, value=value)
+        elif value == inf:
+            self.infeasible += 1
+
+        return value
+
+    def record_exception(self, exception: Exception) -> float:
+        """
+        :param exception: exception of an evaluation
+        :return:          inf
+        """
+        self.evaluations += 1
+        self.infeasible += 1
+        name = exception.__class__.__name__
+        self.exceptions[name] = self.exceptions.get(name, 0) + 1
+
+        return inf
+
+    def record_array(self, param_array: np.ndarray,
+                     values: np.ndarray) -> np.ndarray:
+        """
+        :param param_array: one row of evaluated parameters per point
+        :param values:      bounds per row, inf if infeasible
+        :return:            values
+        """
+        self.evaluations += values.size
+        self.infeasible += int(np.count_nonzero(values == inf))
+
+        if values.size > 0:
+            index_min = int(np.argmin(values))
+            if values[index_min] < self.best_value:
+                # the counterpart of record counts the whole array at once
+                self._improve(param_list=param_array[index_min].tolist(),
+                              value=float(values[index_min]))
+
+        return values
+
+    def _improve(self, param_list: List[float], value: float) -> None:
+        self.best_value = float(value)
+        self.best_param = [float(param) for param in param_list]
+        self.trajectory.append((self.evaluations, self.best_value))
+
+        if self.callback is not None:
+            self.callback(self.best_param, self.best_value)
+
+    def record_method(self, name: str, seconds: float,
+                      evaluations: int) -> None:
+        """
+        :param name:        name of the optimization method
+        :param seconds:     wall time of the call
+        :param evaluations: evaluations during the call
+        """
+        self.method_calls[name] = self.method_calls.get(name, 0) + 1
+        self.method_time[name] = self.method_time.get(name, 0.0) + seconds
+        self.method_evaluations[name] = self.method_evaluations.get(
+            name, 0) + evaluations
+
+    def merge(self, other: "OptimizerStats") -> None:
+        """
+        Adds the counters of another optimizer's stats, e.g., of a worker
+        process.
+
+        :param other: stats to add
+        """
+        self.evaluations += other.evaluations
+        self.infeasible += other.infeasible
+        self.pruned += other.pruned
+        self.gradients += other.gradients
+        for name, number in other.exceptions.items():
+            self.exceptions[name] = self.exceptions.get(name, 0) + number
+
+        for name, calls in other.method_calls.items():
+            self.method_calls[name] = self.method_calls.get(name, 0) + calls
+            self.method_time[name] = self.method_time.get(
+                name, 0.0) + other.method_time[name]
+            self.method_evaluations[name] = self.method_evaluations.get(
+                name, 0) + other.method_evaluations[name]
+
+        if other.best_value < self.best_value:
+            self._improve(param_list=other.best_param,
+                          value=other.best_value)
+
+    def to_dict(self) -> dict:
+        return {
+            "evaluations": self.evaluations,
+            "infeasible": self.infeasible,
+            "pruned": self.pruned,
+            "gradients": self.gradients,
+            "exceptions": dict(self.exceptions),
+            "method_calls": dict(self.method_calls),
+            "method_time": dict(self.method_time),
+            "method_evaluations": dict(self.method_evaluations),
+            "best_value": self.best_value,
+            "best_param": self.best_param,
+            "trajectory": list(self.trajectory)
+        }
+
+
+def timed_method(method):
+    """
+    Decorator of the optimization methods of Optimize, records their wall
+    time and number of evaluations in self.stats.
+    """
+    @functools.wraps(method)
+    def new_method(self, *args, **kwargs):
+        evaluations = self.stats.evaluations
+        start = timer()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.stats.record_method(
+                name=method.__name__,
+                seconds=timer() - start,
+                evaluations=self.stats.evaluations - evaluations)
+
+    return new_method
@@ -0,0 +1,230 @@
+"""Persistent on-disk cache of optimized bounds."""
+
+import hashlib
+import json
+import sqlite3
+from enum import Enum
+from math import nan
+from typing import Optional
+
+import numpy as np
+
+# maximal number of stored bounds, the least recently used one is dropped
+RESULT_CACHE_MAXSIZE = 100000
+
+# number of writes after which the changes are committed
+RESULT_CACHE_COMMIT_INTERVAL = 1000
+
+# part of every key, increase it if the bounds of existing code change
+RESULT_CACHE_VERSION = 1
+
+
+def fingerprint(obj):
+    """
+    Canonical, JSON-serializable content of an object, e.g., of a setting
+    with all its arrivals, servers and performance parameter. Attributes
+    starting with an underscore (e.g., compiled operator plans) are ignored.
+
+    :param obj: optimizer, setting, arrival, parameter, ...
+    :return:    nested lists of class names and values
+    """
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return obj
+
+    elif isinstance(obj, float):
+        # repr is exact and also covers inf and nan
+        return repr(obj)
+
+    elif isinstance(obj, Enum):
+        return f"{obj.__class__.__name__}.{obj.name}"
+
+    elif isinstance(obj, np.ndarray):
+        return ["ndarray", fingerprint(obj.tolist())]
+
+    elif isinstance(obj, np.generic):
+        return fingerprint(obj.item())
+
+    elif isinstance(obj, (list, tuple, range)):
+        return [fingerprint(item) for item in obj]
+
+    elif isinstance(obj, dict):
+        return [[str(key), fingerprint(value)]
+                for key, value in sorted(obj.items(), key=lambda x: str(x[0]))
+                if not str(key).startswith("_")]
+
+    elif hasattr(obj, "__dict__"):
+        return [
+            f"{obj.__class__.__module__}.{obj.__class__.__qualname__}",
+            fingerprint(vars(obj))
+        ]
+
+    else:
+        return repr(obj)
+
+
+def result_key(optimizer, method: str, **kwargs) -> str:
+    """
+    :param optimizer: Optimize, OptimizeMitigator, OptimizeFPBound, ...
+    :param method:    name of the optimization method, e.g., "grid_search"
+    :param kwargs:    arguments of the method
+    :return:          SHA-256 content hash
+    """
+    # the optimal parameters and statistics of a previous run are no content
+    state = {
+        key: value
+        for key, value in vars(optimizer).items()
+        if key not in ("opt_x", "stats")
+    }
+    content = [
+        RESULT_CACHE_VERSION,
+        f"{optimizer.__class__.__module__}.{optimizer.__class__.__qualname__}",
+        fingerprint(state), method,
+        fingerprint(kwargs)
+    ]
+
+    return hashlib.sha256(
+        json.dumps(content, separators=(",", ":")).encode()).hexdigest()
+
+
+class ResultCache(object):
+    """
+    Stores optimized bounds in an SQLite file, keyed by the content hash of
+    the optimizer (incl. its setting), the method and its arguments, i.e.,
+    reruns of a study only compute the missing bounds:
+
+        with ResultCache("bounds.sqlite") as cache:
+            bound = cache.optimize(Optimize(setting, number_param=1),
+                                   "grid_search",
+                                   bound_list=[(0.1, 5.0)], delta=0.1)
+
+    Results of randomized methods are frozen at their first value, and a hit
+    does not set the optimizer's opt_x. The changes are committed every
+    RESULT_CACHE_COMMIT_INTERVAL writes and on close.
+    """
+    def __init__(self, path: str, maxsize=RESULT_CACHE_MAXSIZE) -> None:
+        """
+        :param path:    SQLite file, e.g., "bounds.sqlite"
+        :param maxsize: maximal number of stored bounds
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+            "value REAL, last_used INTEGER NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used "
+                                "ON results(last_used)")
+        self.connection.commit()
+
+        # counters instead of MAX(last_used) and COUNT(*) per lookup
+        self._last_use, self._size = self.connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0), COUNT(*) FROM results"
+        ).fetchone()
+        self._pending_writes = 0
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self._pending_writes = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.connection.close()
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM results")
+        self.commit()
+        self._size = 0
+
+    def _next_use(self) -> int:
+        self._last_use += 1
+        return self._last_use
+
+    def _written(self) -> None:
+        self._pending_writes += 1
+        if self._pending_writes >= RESULT_CACHE_COMMIT_INTERVAL:
+            self.commit()
+
+    def get(self, key: str) -> Optional[float]:
+        """
+        :param key: see result_key
+        :return:    stored bound, None if there is none
+        """
+        row = self.connection.execute(
+            "SELECT value FROM results WHERE key = ?", (key, )).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.connection.execute(
+            "UPDATE results SET last_used = ? WHERE key = ?",
+            (self._next_use(), key))
+        self._written()
+
+        # SQLite stores nan as NULL
+        return nan if row[0] is None else row[0]
+
+    def put(self, key: str, value: float) -> None:
+        """
+        :param key:   see result_key
+        :param value: optimized bound
+        """
+        cursor = self.connection.execute(
+            "UPDATE results SET value = ?, last_used = ? WHERE key = ?",
+            (float(value), self._next_use(), key))
+
+        if cursor.rowcount == 0:
+            self.connection.execute("INSERT INTO results VALUES (?, ?, ?)",
+                                    (key, float(value), self._last_use))
+            self._size += 1
+
+        if self._size > self.maxsize:
+            # the index on last_used finds the oldest rows without sorting
+            self.connection.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results "
+                "ORDER BY last_used LIMIT ?)", (self._size - self.maxsize, ))
+            self._size = self.maxsize
+
+        self._written()
+
+    def optimize(self, optimizer, method: str, **kwargs) -> float:
+        """
+        :param optimizer: Optimize, OptimizeMitigator, OptimizeFPBound, ...
+        :param method:    name of the optimization method, e.g.,
+                          "grid_search"
+        :param kwargs:    arguments of the method
+        :return:          optimized bound, computed only on a miss
+        """
+        key = result_key(optimizer, method, **kwargs)
+        value = self.get(key=key)
+
+        if value is None:
+            value = getattr(optimizer, method)(**kwargs)
+            self.put(key=key, value=value)
+
+        return value
+
+
+def optimize_cached(result_cache: Optional[ResultCache], optimizer,
+                    method: str, **kwargs) -> float:
+    """
+    :param result_cache: cache, None computes the bound directly
+    :return:             optimizer.method(**kwargs)
+    """
+    if result_cache is None:
+        return getattr(optimizer, method)(**kwargs)
+
+    return result_cache.optimize(optimizer, method, **kwargs)
@@ -0,0 +1,142 @@
+"""Warm-started optimization along a sweep of performance parameters."""
+
+from math import inf
+from typing import Iterable, List, Optional, Tuple
+
+from optimization.optimize import Optimize
+
+# width of the search box relative to a cold start
+WARM_START_SHRINK = 0.1
+
+
+def shrink_bound_list(bound_list: List[Tuple[float, float]],
+                      center: List[float],
+                      shrink: float) -> List[Tuple[float, float]]:
+    """
+    :param bound_list: list of tuples of lower and upper bounds
+    :param center:     center of the new box, e.g., the previous optimum
+    :param shrink:     width of the new box relative to the old one
+    :return:           shrunken box, clipped to bound_list
+    """
+    box = []
+    for (lower, upper), value in zip(bound_list, center):
+        # the local finish of the grid search can leave bound_list
+        value = min(max(value, lower), upper)
+        half_width = shrink * (upper - lower) / 2
+        box.append((max(lower, value - half_width),
+                    min(upper, value + half_width)))
+
+    return box
+
+
+def is_on_inner_edge(param_list: List[float], box: List[Tuple[float, float]],
+                     bound_list: List[Tuple[float, float]],
+                     delta: float) -> bool:
+    """
+    :return: True if a parameter lies within delta of an edge of the box
+             that is not an edge of bound_list, i.e., the optimum may lie
+             outside of the box
+    """
+    for value, (lower, upper), (lower_all, upper_all) in zip(
+            param_list, box, bound_list):
+        if lower > lower_all and value < lower + delta:
+            return True
+        if upper < upper_all and value > upper - delta:
+            return True
+
+    return False
+
+
+def warm_grid_search_sweep(
+        optimizer_list: Iterable[Optimize],
+        bound_list: List[Tuple[float, float]],
+        delta: float,
+        shrink=WARM_START_SHRINK,
+        vectorized=False) -> Tuple[List[float], List[Optional[List[float]]]]:
+    """
+    Grid search for every optimizer of a sweep. Only the first point (and
+    every point whose optimum hits the edge of its box) searches the whole
+    bound_list, all other points search a box around the previous optimum.
+
+    :param optimizer_list: one optimizer per point of the sweep, e.g., per
+                           value of a PerformParamList
+    :param bound_list:     list of tuples of lower and upper bounds
+    :param delta:          granularity of the grid search
+    :param shrink:         width of the box relative to bound_list
+    :param vectorized:     see Optimize.grid_search
+    :return:               optimized bounds and optimal parameters per point
+    """
+    bounds = []
+    opt_x_list = []
+    previous_x = None
+
+    for optimizer in optimizer_list:
+        bound = inf
+
+        if previous_x is not None:
+            box = shrink_bound_list(bound_list=bound_list,
+                                    center=previous_x,
+                                    shrink=shrink)
+            bound = optimizer.grid_search(bound_list=box,
+                                          delta=delta,
+                                          vectorized=vectorized)
+
+            if optimizer.opt_x is None or is_on_inner_edge(
+                    param_list=optimizer.opt_x,
+                    box=box,
+                    bound_list=bound_list,
+                    delta=delta):
+                bound = inf
+
+        if bound == inf:
+            optimizer.opt_x = None
+            bound = optimizer.grid_search(bound_list=bound_list,
+                                          delta=delta,
+                                          vectorized=vectorized)
+
+        previous_x = optimizer.opt_x if bound < inf else None
+        bounds.append(bound)
+        opt_x_list.append(optimizer.opt_x)
+
+    return bounds, opt_x_list
+
+
+def warm_pattern_search_sweep(
+        optimizer_list: Iterable[Optimize],
+        start_list: List[float],
+        delta=3.0,
+        delta_min=0.01,
+        shrink=1.0) -> Tuple[List[float], List[Optional[List[float]]]]:
+    """
+    Pattern search for every optimizer of a sweep. Every point starts at the
+    previous optimum with the initial granularity shrink * delta. As the
+    pattern search is local, a small shrink can miss an optimum that moved
+    far, i.e., by default only the start is reused.
+
+    :param optimizer_list: one optimizer per point of the sweep
+    :param start_list:     starting values of the first point
+    :param delta:          initial granularity of the first point
+    :param delta_min:      final granularity
+    :param shrink:         initial granularity relative to delta
+    :return:               optimized bounds and optimal parameters per point
+    """
+    bounds = []
+    opt_x_list = []
+    previous_x = None
+
+    for optimizer in optimizer_list:
+        if previous_x is None:
+            bound = optimizer.pattern_search(start_list=start_list,
+                                             delta=delta,
+                                             delta_min=delta_min)
+        else:
+            bound = optimizer.pattern_search(start_list=previous_x,
+                                             delta=max(shrink * delta,
+                                                       2 * delta_min),
+                                             delta_min=delta_min)
+
+        previous_x = optimizer.opt_x if bound < inf else None
+        bounds.append(bound)
+        opt_x_list.append(optimizer.opt_x)
+
+    return bounds, opt_x_list
@@ -1,5 +1,12 @@
 """"One file for all custom exception classes"""
 
+import functools
+from math import nan
+from typing import Callable, List
+
+# stack of the NanOnInfeasible contexts that are turned on
+_NAN_ON_INFEASIBLE: List["NanOnInfeasible"] = []
+
 
 class ParameterOutOfBounds(Exception):
     """Exception if input parameter is not feasible in the optimization"""
@@ -31,3 +38,49 @@ class NotEnoughResults(Exception):
         msg = f"number of results {parameter} is not sufficient"
         super(NotEnoughResults, self).__init__(msg)
         self.parameter = parameter
+
+
+class NanOnInfeasible(object):
+    """
+    Exception-free evaluation contract: while turned on, infeasible
+    parameters make sigma, rho and the performance bounds return nan instead
+    of raising ParameterOutOfBounds (see out_of_bounds), e.g., within the
+    optimizers:
+
+        with NanOnInfeasible():
+            # nan if infeasible
+            bound = setting.standard_bound(param_list=[0.5])
+
+    Errors of the math module (OverflowError, ValueError) are still raised,
+    as well as ParameterOutOfBounds for an infeasible Hoelder p (get_q,
+    get_p_n), which is checked when the operators are built.
+    """
+    def __enter__(self) -> "NanOnInfeasible":
+        _NAN_ON_INFEASIBLE.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _NAN_ON_INFEASIBLE.pop()
+
+
+def out_of_bounds(parameter) -> float:
+    """
+    Replaces "raise ParameterOutOfBounds(parameter)".
+
+    :param parameter: description of the infeasible parameter
+    :return:          nan within NanOnInfeasible
+    """
+    if _NAN_ON_INFEASIBLE:
+        return nan
+
+    raise ParameterOutOfBounds(parameter)
+
+
+def nan_on_infeasible(fun: Callable) -> Callable:
+    """Decorator that evaluates fun within NanOnInfeasible."""
+    @functools.wraps(fun)
+    def new_fun(*args, **kwargs):
+        with NanOnInfeasible():
+            return fun(*args, **kwargs)
+
+    return new_fun
@@ -1,12 +1,13 @@
 """Helper functions"""
 
 from itertools import product
-from typing import List
+from math import exp, expm1, inf, log, nan
+from typing import Callable, List
 
 import numpy as np
 import pandas as pd
 
-from utils.exceptions import ParameterOutOfBounds
+from utils.exceptions import NanOnInfeasible, ParameterOutOfBounds
 
 EPSILON = 1e-09
 
@@ -25,6 +26,17 @@ def get_q(p: float) -> float:
     return p / (p - 1.0)
 
 
+def get_q_array(p: np.ndarray) -> np.ndarray:
+    """
+    :param p: array of Hoelder p's
+    :return: array of q's, nan where p <= 1
+    """
+    p = np.asarray(p, dtype=float)
+
+    with np.errstate(all="ignore"):
+        return np.where(p > 1.0, p / (p - 1.0), nan)
+
+
 def get_p_n(p_list: List[float]) -> float:
     """
     :param p_list: first p_1, ..., p_n in generalized Hoelder inequality
@@ -39,6 +51,30 @@ def get_p_n(p_list: List[float]) -> float:
     return 1.0 / (1.0 - sum(inv_p))
 
 
+def k_sig_derivative(theta: float, rho_diff: float,
+                     rho_diff_derivative: float) -> float:
+    """
+    :param theta:               mgf parameter
+    :param rho_diff:            rho difference (< 0) at theta
+    :param rho_diff_derivative: d rho_diff / d theta
+    :return:                    d / d theta of
+                                -log(1 - exp(theta * rho_diff)) / theta
+    """
+    k_sig = -log(1 - exp(theta * rho_diff)) / theta
+
+    return (-k_sig + (rho_diff + theta * rho_diff_derivative) /
+            expm1(-theta * rho_diff)) / theta
+
+
+def log_of_bound(value: float) -> float:
+    """
+    :param value: bound
+    :return:      log of the bound, bounds <= 0 are all optimal, nan stays
+                  nan
+    """
+    return log(max(value, np.finfo(float).tiny))
+
+
 def is_equal(float1: float, float2: float, epsilon=EPSILON) -> bool:
     """
     :param float1: real 1
@@ -77,6 +113,50 @@ def average_towards_best_row(simplex: np.ndarray, best_index: int,
     return simplex
 
 
+def evaluate_elementwise(fun: Callable[[float], float],
+                         theta: np.ndarray) -> np.ndarray:
+    """
+    Fallback for the array-valued sigma / rho methods.
+
+    :param fun:   scalar function of theta, e.g., sigma or rho
+    :param theta: array of mgf parameters
+    :return:      array of function values, nan where fun is infeasible
+    """
+    theta = np.asarray(theta, dtype=float)
+    res = np.empty(theta.shape)
+
+    for index, value in np.ndenumerate(theta):
+        try:
+            res[index] = fun(float(value))
+        except (FloatingPointError, OverflowError, ParameterOutOfBounds,
+                ValueError, ZeroDivisionError):
+            res[index] = nan
+
+    return res
+
+
+def evaluate_rows(fun: Callable[[List[float]], float],
+                  param_array: np.ndarray) -> np.ndarray:
+    """
+    Fallback for the array-valued bounds of a setting.
+
+    :param fun:         bound that takes one parameter list
+    :param param_array: one parameter list (theta, p, ...) per row
+    :return:            array of bounds, inf where fun is infeasible
+    """
+    res = np.empty(param_array.shape[0])
+
+    with NanOnInfeasible():
+        for i, row in enumerate(param_array):
+            try:
+                res[i] = fun(row)
+            except (FloatingPointError, OverflowError, ParameterOutOfBounds,
+                    ValueError):
+                res[i] = inf
+
+    return np.where(np.isnan(res), inf, res)
+
+
 def get_unit_vector(length: int, index: int) -> List[float]:
     """
     :param length: length of unit vector
@@ -1,7 +1,12 @@
 """This superclass represents our get_value abstract class"""
 
 from abc import abstractmethod
-from typing import List
+from math import inf
+from typing import List, Tuple
+
+import numpy as np
+
+from utils.helper_functions import evaluate_rows, log_of_bound
 
 
 class Setting(object):
@@ -17,9 +22,59 @@ class Setting(object):
         """
         pass
 
+    def standard_bound_array(self, param_array: np.ndarray) -> np.ndarray:
+        """
+        standard bound for many parameter sets at once, inf if infeasible.
+        Override this method for a vectorized evaluation.
+
+        :param param_array: one row of theta and Hoelder parameters per point
+        """
+        return evaluate_rows(fun=self.standard_bound, param_array=param_array)
+
+    def standard_log_bound(self, param_list: List[float]) -> float:
+        """
+        Logarithm of the standard bound. Override this method with a
+        log-domain evaluation that does not overflow.
+
+        :param param_list: theta and Hoelder parameters
+        """
+        return log_of_bound(self.standard_bound(param_list=param_list))
+
+    def standard_bound_gradient(self, param_list: List[float]) -> np.ndarray:
+        """
+        Analytic gradient of the standard bound, nan if infeasible. Override
+        this method to replace the finite differences of the gradient-based
+        optimizers.
+
+        :param param_list: theta and Hoelder parameters
+        """
+        raise NotImplementedError(
+            f"{self.to_name()} has no analytic gradient")
+
     @abstractmethod
     def approximate_utilization(self) -> float:
         pass
 
+    def theta_upper_bound(self, p_array: np.ndarray) -> np.ndarray:
+        """
+        Feasibility oracle of the standard bound: every theta from this bound
+        on is infeasible, e.g., as an mgf does not exist or the system is not
+        stable. Override this method if such a bound is known analytically.
+
+        :param p_array: one row of the remaining parameters (e.g., Hoelder
+                        p's) per point
+        :return:        upper bound of theta per row, inf if unknown
+        """
+        return np.full(p_array.shape[0], inf)
+
+    def theta_interval(self) -> Tuple[float, float]:
+        """
+        Feasible open interval of theta, needed for
+        Optimize.bounded_theta_search. Override this method if the
+        interval is known analytically.
+        """
+        raise NotImplementedError(
+            f"{self.to_name()} has no analytic theta interval")
+
     def to_name(self) -> str:
         return self.__class__.__name__
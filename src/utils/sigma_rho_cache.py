@@ -0,0 +1,130 @@
+"""Opt-in memoization of sigma(theta) and rho(theta)"""
+
+import functools
+from typing import Callable, List, Optional
+
+from utils.sigma_rho_trace import _ACTIVE_TRACERS
+
+# maximal number of stored values per cache
+CACHE_MAXSIZE = 4096
+
+# stack of the caches that are turned on, the last one is active
+_ACTIVE_CACHES: List["SigmaRhoCache"] = []
+
+
+class SigmaRhoCache(object):
+    """
+    Memoizes all sigma and rho methods that are decorated with
+    memoize_sigma_rho (e.g., the operators in nc_operations) while the cache
+    is turned on:
+
+        with SigmaRhoCache():
+            setting.standard_bound(param_list=[0.5])
+
+    Values are keyed by the object's identity, the method and theta, i.e.,
+    the objects must not be changed while the cache is on. Exceptions, e.g.,
+    ParameterOutOfBounds, are memoized as well.
+    """
+    def __init__(self, maxsize=CACHE_MAXSIZE) -> None:
+        """
+        :param maxsize: maximal number of stored values, the oldest value is
+                        dropped first
+        """
+        self.maxsize = maxsize
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> "SigmaRhoCache":
+        _ACTIVE_CACHES.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _ACTIVE_CACHES.remove(self)
+        self.clear()
+
+    def clear(self) -> None:
+        self.values.clear()
+
+    def call(self, method: Callable, obj, theta: float) -> float:
+        """
+        :param method: undecorated sigma or rho method
+        :param obj:    arrival or server
+        :param theta:  mgf parameter
+        :return:       method(obj, theta)
+        """
+        key = (id(obj), method, theta)
+        entry = self.values.get(key)
+
+        # the entry keeps obj alive, i.e., its id cannot be reused
+        if entry is not None and entry[0] is obj:
+            self.hits += 1
+            if isinstance(entry[1], Exception):
+                raise entry[1].with_traceback(None)
+
+            return entry[1]
+
+        self.misses += 1
+        try:
+            value = method(obj, theta)
+        except Exception as exception:
+            self._store(key=key, entry=(obj, exception))
+            raise
+
+        self._store(key=key, entry=(obj, value))
+
+        return value
+
+    def _store(self, key: tuple, entry: tuple) -> None:
+        if len(self.values) >= self.maxsize:
+            del self.values[next(iter(self.values))]
+
+        self.values[key] = entry
+
+
+def active_cache() -> Optional[SigmaRhoCache]:
+    """
+    :return: cache that is turned on, None if there is none
+    """
+    return _ACTIVE_CACHES[-1] if _ACTIVE_CACHES else None
+
+
+def invalidate_sigma_rho_cache() -> None:
+    """Clears the active cache, e.g., between two optimizer steps."""
+    if _ACTIVE_CACHES:
+        _ACTIVE_CACHES[-1].clear()
+
+
+def memoize_sigma_rho(method: Callable) -> Callable:
+    """
+    Decorator for sigma / rho that uses the active cache and the active
+    tracer (see SigmaRhoTracer). Without either of them (or other arguments
+    than theta), the method is called directly.
+    """
+    def cached(self, *args, **kwargs):
+        if not _ACTIVE_CACHES:
+            return method(self, *args, **kwargs)
+
+        if len(args) == 1 and not kwargs:
+            theta = args[0]
+        elif not args and len(kwargs) == 1 and "theta" in kwargs:
+            theta = kwargs["theta"]
+        else:
+            return method(self, *args, **kwargs)
+
+        return _ACTIVE_CACHES[-1].call(method=method, obj=self, theta=theta)
+
+    @functools.wraps(method)
+    def memoized(self, *args, **kwargs):
+        if not _ACTIVE_CACHES and not _ACTIVE_TRACERS:
+            return method(self, *args, **kwargs)
+
+        if _ACTIVE_TRACERS:
+            return _ACTIVE_TRACERS[-1].call(
+                method=method,
+                obj=self,
+                fun=lambda: cached(self, *args, **kwargs))
+
+        return cached(self, *args, **kwargs)
+
+    return memoized
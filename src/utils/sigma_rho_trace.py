@@ -0,0 +1,130 @@
+"""Opt-in tracing of sigma(theta) and rho(theta) in operator trees"""
+
+from timeit import default_timer as timer
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+# stack of the tracers that are turned on, the last one is active
+_ACTIVE_TRACERS: List["SigmaRhoTracer"] = []
+
+
+class SigmaRhoTracer(object):
+    """
+    Records call counts and times of all sigma and rho methods that are
+    decorated with memoize_sigma_rho (e.g., the operators in nc_operations)
+    while the tracer is turned on:
+
+        with SigmaRhoTracer() as tracer:
+            setting.standard_bound(param_list=[0.5])
+        print(tracer.report())
+
+    The settings build a new operator tree per evaluation, so nodes are
+    named by their path in the tree: the class of the node and its index
+    among the children of the same class in the parent's call, e.g.,
+    "Convolve/LeftoverARB[1]/Deconvolve[0]". The time of the undecorated leaves
+    (arrivals, servers) is part of the self time of their parent.
+    """
+    def __init__(self) -> None:
+        # (node, method) -> [calls, cumulative time, self time]
+        self.methods: Dict[tuple, list] = {}
+        # call stack "a.rho;b.sigma" -> self time
+        self.stacks: Dict[str, float] = {}
+
+        self._frames: List[_Frame] = []
+
+    def __enter__(self) -> "SigmaRhoTracer":
+        _ACTIVE_TRACERS.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _ACTIVE_TRACERS.remove(self)
+
+    def call(self, method: Callable, obj, fun: Callable[[], float]) -> float:
+        """
+        :param method: undecorated sigma or rho method
+        :param obj:    operator
+        :param fun:    traced call without arguments
+        :return:       fun()
+        """
+        if self._frames:
+            parent = self._frames[-1]
+            node = f"{parent.node}/{parent.child_name(obj)}"
+            stack = f"{parent.stack};{node}.{method.__name__}"
+        else:
+            node = obj.__class__.__name__
+            stack = f"{node}.{method.__name__}"
+
+        frame = _Frame(node=node, stack=stack)
+        self._frames.append(frame)
+
+        start = timer()
+        try:
+            return fun()
+
+        finally:
+            elapsed = timer() - start
+            self_time = elapsed - frame.child_time
+            self._frames.pop()
+            if self._frames:
+                self._frames[-1].child_time += elapsed
+
+            entry = self.methods.setdefault((node, method.__name__),
+                                            [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += self_time
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + self_time
+
+    def report(self) -> pd.DataFrame:
+        """
+        :return: calls, cumulative and self time in seconds per node and
+                 method, sorted by self time
+        """
+        res_df = pd.DataFrame(
+            [[node, method] + entry
+             for (node, method), entry in self.methods.items()],
+            columns=["node", "method", "calls", "cumulative", "self"])
+
+        return res_df.sort_values(by="self",
+                                  ascending=False,
+                                  ignore_index=True)
+
+    def flame_graph(self, path: Optional[str] = None) -> str:
+        """
+        :param path: file to write to, e.g., for flamegraph.pl or speedscope
+        :return:     collapsed stacks "a;b;c self_time" in microseconds
+        """
+        lines = "".join(f"{stack} {round(self_time * 1e6)}\n"
+                        for stack, self_time in self.stacks.items())
+
+        if path is not None:
+            with open(path, "w") as flame_file:
+                flame_file.write(lines)
+
+        return lines
+
+
+class _Frame(object):
+    """Open call of a traced method."""
+    def __init__(self, node: str, stack: str) -> None:
+        self.node = node
+        self.stack = stack
+        # time spent in the traced children
+        self.child_time = 0.0
+        # id -> (child, name), the entry keeps the child alive
+        self.children: Dict[int, tuple] = {}
+        self.class_counts: Dict[str, int] = {}
+
+    def child_name(self, obj) -> str:
+        entry = self.children.get(id(obj))
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+
+        class_name = obj.__class__.__name__
+        index = self.class_counts.get(class_name, 0)
+        self.class_counts[class_name] = index + 1
+        name = f"{class_name}[{index}]"
+        self.children[id(obj)] = (obj, name)
+
+        return name
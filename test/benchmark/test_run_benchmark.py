@@ -0,0 +1,51 @@
+"""Test of the benchmark runner."""
+
+import numpy as np
+
+from benchmark.benchmark_cases import BenchmarkCase
+from benchmark.run_benchmark import find_regressions, measure, run_benchmarks
+
+
+def results(seconds_per_call, peak_memory_bytes):
+    return {
+        "cases": {
+            "case": {
+                "seconds_per_call": seconds_per_call,
+                "calls_per_second": 1 / seconds_per_call,
+                "peak_memory_bytes": peak_memory_bytes
+            }
+        }
+    }
+
+
+def test_find_regressions():
+    baseline = results(seconds_per_call=1e-3, peak_memory_bytes=10**6)
+
+    assert find_regressions(results=results(1.1e-3, 10**6),
+                            baseline=baseline) == []
+    assert len(find_regressions(results=results(2e-3, 10**6),
+                                baseline=baseline)) == 1
+    assert len(find_regressions(results=results(2e-3, 2 * 10**6),
+                                baseline=baseline)) == 2
+    assert find_regressions(results=results(2e-3, 10**6),
+                            baseline={"cases": {}}) == []
+
+
+def test_measure():
+    result = measure(case=BenchmarkCase(name="sum",
+                                        fun=lambda: sum(range(100)),
+                                        group="evaluation"),
+                     min_round_time=0.001)
+
+    assert result["seconds_per_call"] > 0.0
+    assert result["calls_per_second"] == 1 / result["seconds_per_call"]
+
+
+def test_run_benchmarks_keeps_error_handling():
+    err = np.geterr()
+    case = BenchmarkCase(name="sum",
+                         fun=lambda: sum(range(100)),
+                         group="evaluation")
+    run_benchmarks(cases=[case], min_round_time=0.001, rounds=1)
+
+    assert np.geterr() == err
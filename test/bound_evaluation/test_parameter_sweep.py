@@ -0,0 +1,276 @@
+"""Test of the Monte Carlo parameter sweep."""
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from bound_evaluation import mc_enum_to_dist
+from bound_evaluation.change_enum import ChangeEnum
+from bound_evaluation.checkpoint import SweepCheckpoint
+from bound_evaluation.mc_enum import MCEnum
+from bound_evaluation.monte_carlo_dist import MonteCarloDist
+from bound_evaluation.parameter_sweep import (ParameterSweep,
+                                              param_row_to_arr_list,
+                                              param_row_to_ser_list)
+from bound_evaluation.result_writer import ResultWriter
+from h_mitigator.array_to_results import TwoColResults
+from h_mitigator.csv_fat_cross_param_power_mit import \
+    csv_fat_cross_param_power
+from h_mitigator.fat_cross_perform import FatCrossPerform
+from msob_and_fp.compare_avoid_dep import compare_avoid_dep_212
+from msob_and_fp.csv_msob_fp_param import csv_msob_fp_param
+from msob_and_fp.overlapping_tandem_perform import OverlappingTandemPerform
+from msob_and_fp.square_perform import SquarePerform
+from nc_arrivals.arrival_enum import ArrivalEnum
+from nc_operations.perform_enum import PerformEnum
+from optimization.opt_method import OptMethod
+from optimization.optimize import Optimize
+from utils.perform_parameter import PerformParameter
+
+
+def standard_bound_comparator(setting: FatCrossPerform) -> tuple:
+    standard_bound = Optimize(setting=setting, number_param=1).grid_search(
+        bound_list=[(0.1, 4.0)], delta=0.5)
+
+    return standard_bound, setting.approximate_utilization()
+
+
+SWEEP = ParameterSweep(setting_factory=FatCrossPerform,
+                       comparator=standard_bound_comparator,
+                       arrival_enum=ArrivalEnum.DM1,
+                       number_flows=2,
+                       number_servers=2,
+                       perform_param=PerformParameter(
+                           perform_metric=PerformEnum.DELAY_PROB, value=4),
+                       mc_dist=MonteCarloDist(mc_enum=MCEnum.UNIFORM,
+                                              param_list=[10.0]),
+                       number_results=2,
+                       target_util=0.2)
+
+
+def test_parallel_equals_serial():
+    sweep = SWEEP
+
+    np.random.seed(1)
+    param_array = sweep.sample_param_array(total_iterations=40)
+
+    sink_starts = []
+    res_serial = sweep.run(param_array=param_array,
+                           chunksize=16,
+                           sink=lambda start, res_chunk: sink_starts.append(
+                               start))
+    res_parallel = sweep.run(param_array=param_array,
+                             processes=2,
+                             chunksize=16)
+
+    assert sink_starts == [0, 16, 32]
+    np.testing.assert_array_equal(res_serial, res_parallel)
+
+    # rows outside of the target utilization are nan
+    util = res_serial[~np.isnan(res_serial[:, 1]), 1]
+    assert np.all((util >= 0.2) & (util <= 1.0))
+
+
+def test_resume_from_checkpoint(tmp_path):
+    checkpoint = SweepCheckpoint(path=str(tmp_path / "sweep.npz"))
+
+    np.random.seed(2)
+    param_array, res_array = SWEEP.sample_and_run(total_iterations=30,
+                                                  checkpoint=checkpoint)
+    rng_after_sampling = np.random.get_state()[1]
+
+    # simulate a crash after the first 10 rows
+    _, res_partial, done, rng_state = checkpoint.load()
+    res_partial[10:, ] = np.nan
+    done[10:] = False
+    checkpoint.save(param_array=param_array,
+                    res_array=res_partial,
+                    done=done,
+                    rng_state=rng_state,
+                    fingerprint=checkpoint.load_fingerprint())
+
+    np.random.seed(99)
+    param_resumed, res_resumed = SWEEP.sample_and_run(total_iterations=30,
+                                                      checkpoint=checkpoint)
+
+    np.testing.assert_array_equal(param_resumed, param_array)
+    np.testing.assert_array_equal(res_resumed, res_array)
+    np.testing.assert_array_equal(np.random.get_state()[1],
+                                  rng_after_sampling)
+    assert checkpoint.load()[2].all()
+
+
+@pytest.mark.parametrize("arrival_enum, mc_dist", [
+    (ArrivalEnum.DM1,
+     MonteCarloDist(mc_enum=MCEnum.EXPONENTIAL, param_list=[1.0])),
+    (ArrivalEnum.MMOOFluid, SWEEP.mc_dist),
+])
+def test_checkpoint_of_another_study(tmp_path, arrival_enum, mc_dist):
+    checkpoint = SweepCheckpoint(path=str(tmp_path / "sweep.npz"))
+    SWEEP.sample_and_run(total_iterations=20, checkpoint=checkpoint)
+
+    other_sweep = ParameterSweep(setting_factory=SWEEP.setting_factory,
+                                 comparator=SWEEP.comparator,
+                                 arrival_enum=arrival_enum,
+                                 number_flows=SWEEP.number_flows,
+                                 number_servers=SWEEP.number_servers,
+                                 perform_param=SWEEP.perform_param,
+                                 mc_dist=mc_dist,
+                                 number_results=SWEEP.number_results,
+                                 target_util=SWEEP.target_util)
+
+    with pytest.raises(ValueError):
+        other_sweep.sample_and_run(total_iterations=20,
+                                   checkpoint=checkpoint)
+
+
+def seeded_sweep() -> ParameterSweep:
+    return ParameterSweep(setting_factory=SWEEP.setting_factory,
+                          comparator=SWEEP.comparator,
+                          arrival_enum=SWEEP.arrival_enum,
+                          number_flows=SWEEP.number_flows,
+                          number_servers=SWEEP.number_servers,
+                          perform_param=SWEEP.perform_param,
+                          mc_dist=SWEEP.mc_dist,
+                          number_results=SWEEP.number_results,
+                          target_util=SWEEP.target_util,
+                          seed=7)
+
+
+def test_seeded_sweep_is_reproducible():
+    sweep = seeded_sweep()
+
+    np.random.seed(3)
+    param_array = sweep.sample_param_array(total_iterations=2500)
+    np.random.seed(4)
+    np.testing.assert_array_equal(
+        sweep.sample_param_array(total_iterations=2500), param_array)
+
+    # blocks do not depend on the total number of iterations
+    np.testing.assert_array_equal(
+        sweep.sample_param_array(total_iterations=1500),
+        param_array[:1500, ])
+
+    res_serial = sweep.run(param_array=param_array[:40, ], chunksize=16)
+    res_parallel = sweep.run(param_array=param_array[:40, ],
+                             processes=2,
+                             chunksize=7)
+
+    np.testing.assert_array_equal(res_serial, res_parallel)
+
+
+def random_comparator(setting: FatCrossPerform) -> tuple:
+    # e.g., a random initial simplex
+    return np.random.uniform(), setting.approximate_utilization()
+
+
+def test_seeded_rows_keep_global_rng_state():
+    sweep = seeded_sweep()
+    sweep.comparator = random_comparator
+    param_array = sweep.sample_param_array(total_iterations=40)
+
+    np.random.seed(5)
+    res_array = sweep.run(param_array=param_array, chunksize=16)
+    np.testing.assert_array_equal(np.random.get_state()[1],
+                                  np.random.RandomState(5).get_state()[1])
+
+    # the rows are seeded, i.e., they do not depend on the global state
+    np.random.seed(6)
+    np.testing.assert_array_equal(
+        sweep.run(param_array=param_array, chunksize=16), res_array)
+
+
+def test_stream_equals_in_memory_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(mc_enum_to_dist, "SAMPLE_BLOCK_SIZE", 16)
+    sweep = seeded_sweep()
+
+    param_array, res_array = sweep.sample_and_run(total_iterations=40)
+
+    block_starts = []
+    results = TwoColResults()
+
+    def block_sink(start, param_block, res_block):
+        block_starts.append(start)
+        results.update(start=start,
+                       param_block=param_block,
+                       res_block=res_block)
+
+    param_stream, res_stream = sweep.sample_and_stream(
+        total_iterations=40,
+        writer=ResultWriter(path=str(tmp_path / "sweep")),
+        processes=2,
+        chunksize=5,
+        block_sink=block_sink)
+
+    assert isinstance(res_stream, np.memmap)
+    np.testing.assert_array_equal(param_stream, param_array)
+    np.testing.assert_array_equal(res_stream, res_array)
+
+    # the statistics of the blocks equal the ones of the whole arrays
+    assert len(block_starts) > 1
+    in_memory = TwoColResults(sample_size=None)
+    in_memory.update(start=0, param_block=param_array, res_block=res_array)
+    assert results.improvement.max_index == in_memory.improvement.max_index
+    np.testing.assert_array_equal(results.improvement.max_row,
+                                  in_memory.improvement.max_row)
+    assert results.improvement.mean == pytest.approx(
+        in_memory.improvement.mean)
+    assert results.improvement.median() == in_memory.improvement.median()
+    assert results.number_improved == in_memory.number_improved
+    np.testing.assert_array_equal(results.count_nan, in_memory.count_nan)
+
+
+@pytest.mark.parametrize("csv_param", [
+    partial(csv_fat_cross_param_power, opt_method=OptMethod.GRID_SEARCH),
+    partial(csv_msob_fp_param,
+            name="square",
+            opt_method=OptMethod.GRID_SEARCH,
+            comparator=compare_avoid_dep_212,
+            compare_metric=ChangeEnum.RATIO_REF_NEW)
+])
+def test_stream_cannot_be_checkpointed(csv_param, tmp_path):
+    with pytest.raises(ValueError):
+        csv_param(arrival_enum=ArrivalEnum.DM1,
+                  number_flows=2,
+                  number_servers=2,
+                  perform_param=SWEEP.perform_param,
+                  mc_dist=SWEEP.mc_dist,
+                  total_iterations=40,
+                  target_util=0.2,
+                  checkpoint_path=str(tmp_path / "sweep.npz"),
+                  stream_path=str(tmp_path / "sweep"))
+
+
+@pytest.mark.parametrize("setting_factory, arrival_enum, number_servers", [
+    (FatCrossPerform, ArrivalEnum.MD1, 3),
+    (SquarePerform, ArrivalEnum.MMOODisc, 4),
+    (OverlappingTandemPerform, ArrivalEnum.EBB, 3),
+])
+def test_rejection_sampling(setting_factory, arrival_enum, number_servers):
+    sweep = ParameterSweep(setting_factory=setting_factory,
+                           comparator=standard_bound_comparator,
+                           arrival_enum=arrival_enum,
+                           number_flows=number_servers,
+                           number_servers=number_servers,
+                           perform_param=SWEEP.perform_param,
+                           mc_dist=SWEEP.mc_dist,
+                           number_results=2,
+                           target_util=0.5,
+                           seed=11)
+
+    param_array = sweep.sample_param_array(total_iterations=300)
+    assert param_array.shape[1] == sweep.number_parameters()
+    assert param_array.shape[0] == 300
+
+    for param_row in param_array:
+        util = setting_factory(
+            arr_list=param_row_to_arr_list(param_row=param_row,
+                                           arrival_enum=arrival_enum,
+                                           number_flows=number_servers),
+            ser_list=param_row_to_ser_list(param_row=param_row,
+                                           arrival_enum=arrival_enum,
+                                           number_flows=number_servers,
+                                           number_servers=number_servers),
+            perform_param=sweep.perform_param).approximate_utilization()
+        assert 0.5 <= util <= 1
@@ -0,0 +1,44 @@
+"""Test of the statistics that are updated block by block."""
+
+import numpy as np
+import pytest
+
+from bound_evaluation.running_stats import RunningStats
+
+
+def blocks_of(vector: np.ndarray, block_size: int) -> list:
+    return [(start, vector[start:start + block_size])
+            for start in range(0, vector.shape[0], block_size)]
+
+
+@pytest.mark.parametrize("sample_size", [None, 1000])
+def test_blocks_equal_nan_functions(sample_size):
+    rng = np.random.default_rng(5)
+    vector = rng.lognormal(size=700)
+    vector[rng.random(700) < 0.2] = np.nan
+    rows = np.column_stack((vector, np.arange(700)))
+
+    stats = RunningStats(sample_size=sample_size)
+    for start, block in blocks_of(vector=vector, block_size=64):
+        stats.update(values=block,
+                     start=start,
+                     rows=rows[start:start + block.shape[0]])
+
+    assert stats.count == np.count_nonzero(~np.isnan(vector))
+    assert stats.max_index == np.nanargmax(vector)
+    np.testing.assert_array_equal(stats.max_row, rows[np.nanargmax(vector)])
+    assert stats.mean == pytest.approx(np.nanmean(vector))
+    # the sample holds all values
+    assert stats.median() == np.nanmedian(vector)
+
+
+def test_sampled_median():
+    rng = np.random.default_rng(6)
+    vector = rng.normal(loc=2.0, size=20000)
+
+    stats = RunningStats(sample_size=2000, seed=1)
+    for start, block in blocks_of(vector=vector, block_size=512):
+        stats.update(values=block, start=start)
+
+    assert stats.max_value == np.max(vector)
+    assert stats.median() == pytest.approx(np.median(vector), abs=0.05)
@@ -0,0 +1,46 @@
+"""Test of the array-valued sigma and rho methods."""
+
+from math import isnan
+
+import numpy as np
+import pytest
+
+from nc_arrivals.ebb import EBB
+from nc_arrivals.markov_modulated import MMOODisc, MMOOFluid
+from nc_arrivals.qt import DM1, MD1, MM1, DPoisson1
+from nc_arrivals.regulated_arrivals import (DetermTokenBucket,
+                                            LeakyBucketMassOne)
+from nc_server.constant_rate_server import ConstantRateServer
+from nc_server.rate_latency_server import RateLatencyServer
+from utils.helper_functions import evaluate_elementwise
+
+THETA = np.array([-0.5, 0.0, 0.1, 0.5, 1.0, 1.2, 2.5])
+
+PROCESSES = [
+    DM1(lamb=1.2, n=2),
+    MD1(lamb=0.8, mu=1.5),
+    MM1(lamb=0.8, mu=1.5),
+    DPoisson1(lamb=0.7),
+    MMOOFluid(mu=0.7, lamb=0.4, peak_rate=1.2, n=3),
+    MMOODisc(stay_on=0.6, stay_off=0.3, peak_rate=2.0),
+    EBB(factor_m=1.5, decay=2.0, rho_single=0.4),
+    DetermTokenBucket(sigma_single=1.0, rho_single=1.5, n=8),
+    LeakyBucketMassOne(sigma_single=0.5, rho_single=0.4, n=20),
+    ConstantRateServer(rate=2.0),
+    RateLatencyServer(rate=2.0, latency=0.3)
+]
+
+
+@pytest.mark.parametrize("process", PROCESSES)
+def test_array_matches_scalar(process):
+    for array_fun, scalar_fun in [(process.sigma_array, process.sigma),
+                                  (process.rho_array, process.rho)]:
+        expected = evaluate_elementwise(fun=scalar_fun, theta=THETA)
+        result = array_fun(theta=THETA)
+
+        assert result.shape == THETA.shape
+        for res_i, exp_i in zip(result, expected):
+            if isnan(exp_i):
+                assert isnan(res_i)
+            else:
+                assert res_i == pytest.approx(exp_i)
@@ -0,0 +1,65 @@
+"""Test of the bulk bandwidth dimensioning."""
+
+import numpy as np
+import pytest
+
+from nc_arrivals.arrival_enum import ArrivalEnum
+from nc_arrivals.markov_modulated import MMOOFluid
+from nc_operations.capacity_planning import required_rates
+from nc_operations.get_bandwidth import get_bandwidth_from_delay
+from optimization.opt_method import OptMethod
+
+PARAM_ARRAY = np.array([[0.2, 0.5, 2.6], [0.5, 0.5, 1.5], [0.9, 0.3, 2.0]])
+TARGET_ARRAY = np.array([[6, 0.034], [6, 1e-3], [10, 1e-4]])
+
+
+def test_rates_equal_single_queries():
+    rates = required_rates(arrival_enum=ArrivalEnum.MMOOFluid,
+                           param_array=PARAM_ARRAY,
+                           target_array=TARGET_ARRAY,
+                           lower_interval=0.0,
+                           upper_interval=200.0)
+
+    for rate, param_row, target_row in zip(rates, PARAM_ARRAY,
+                                           TARGET_ARRAY):
+        assert rate == pytest.approx(get_bandwidth_from_delay(
+            arr_list=[
+                MMOOFluid(mu=param_row[0],
+                          lamb=param_row[1],
+                          peak_rate=param_row[2])
+            ],
+            target_delay=target_row[0],
+            target_delay_prob=target_row[1],
+            lower_interval=0.0,
+            upper_interval=200.0,
+            opt_method=OptMethod.BOUNDED_THETA),
+                                     rel=1e-5)
+
+
+def test_pool_equals_serial():
+    serial = required_rates(arrival_enum=ArrivalEnum.DM1,
+                            param_array=np.array([[1.0], [2.0], [4.0]]),
+                            target_array=np.array([6, 1e-3]),
+                            lower_interval=0.0,
+                            upper_interval=200.0,
+                            chunksize=2)
+    pool = required_rates(arrival_enum=ArrivalEnum.DM1,
+                          param_array=np.array([[1.0], [2.0], [4.0]]),
+                          target_array=np.array([6, 1e-3]),
+                          lower_interval=0.0,
+                          upper_interval=200.0,
+                          processes=2,
+                          chunksize=2)
+
+    assert np.array_equal(serial, pool)
+
+
+def test_rate_outside_of_interval_is_nan():
+    rates = required_rates(arrival_enum=ArrivalEnum.DM1,
+                           param_array=np.array([[1.0], [0.1]]),
+                           target_array=np.array([6, 1e-3]),
+                           lower_interval=0.0,
+                           upper_interval=5.0)
+
+    assert not np.isnan(rates[0])
+    assert np.isnan(rates[1])
@@ -0,0 +1,49 @@
+"""Test of the bandwidth dimensioning."""
+
+import pytest
+
+from nc_arrivals.markov_modulated import MMOOFluid
+from nc_arrivals.qt import DM1
+from nc_operations.get_bandwidth import (get_bandwidth_from_delay,
+                                         get_bandwidths_from_delays)
+from optimization.opt_method import OptMethod
+
+
+@pytest.mark.parametrize("arr", [
+    DM1(lamb=1.0),
+    MMOOFluid(mu=0.2, lamb=0.5, peak_rate=2.6),
+])
+def test_brent_equals_bisection(arr):
+    bisection = get_bandwidth_from_delay(arr_list=[arr],
+                                         target_delay=6,
+                                         target_delay_prob=0.034,
+                                         lower_interval=0.0,
+                                         upper_interval=200.0)
+    brent = get_bandwidth_from_delay(arr_list=[arr],
+                                     target_delay=6,
+                                     target_delay_prob=0.034,
+                                     lower_interval=0.0,
+                                     upper_interval=200.0,
+                                     opt_method=OptMethod.BOUNDED_THETA)
+
+    assert brent == pytest.approx(bisection, rel=1e-5)
+
+
+def test_many_targets():
+    arr_list = [MMOOFluid(mu=0.2, lamb=0.5, peak_rate=2.6)]
+    target_list = [(8, 1e-3), (4, 1e-2), (6, 1e-3)]
+
+    rates = get_bandwidths_from_delays(arr_list=arr_list,
+                                       target_list=target_list,
+                                       lower_interval=0.0,
+                                       upper_interval=200.0)
+
+    for rate, (target_delay, target_delay_prob) in zip(rates, target_list):
+        assert rate == pytest.approx(get_bandwidth_from_delay(
+            arr_list=arr_list,
+            target_delay=target_delay,
+            target_delay_prob=target_delay_prob,
+            lower_interval=0.0,
+            upper_interval=200.0,
+            opt_method=OptMethod.BOUNDED_THETA),
+                                     rel=1e-5)
@@ -1,11 +1,16 @@
 """Test of the network operations."""
 
+from math import isnan
+
 import pytest
 
 from nc_arrivals.qt import DM1
 from nc_operations.arb_scheduling import LeftoverARB
 from nc_operations.operations import Convolve, Deconvolve
 from nc_server.constant_rate_server import ConstantRateServer
+from utils.exceptions import NanOnInfeasible, ParameterOutOfBounds
+from utils.sigma_rho_cache import SigmaRhoCache
+from utils.sigma_rho_trace import SigmaRhoTracer
 
 
 def test_deconvolve_sigma():
@@ -129,3 +134,85 @@ def test_convolve_leftover_rho():
                                      cross_arr=DM1(lamb=1.2)),
                     indep=False,
                     p=1.8).rho(theta=0.5) == pytest.approx(1.459672932)
+
+
+def test_nan_on_infeasible():
+    # the pole of DM1 is at lamb
+    deconvolve = Deconvolve(arr=DM1(lamb=1.2),
+                            ser=ConstantRateServer(2.0),
+                            indep=True)
+    # unstable
+    leftover = LeftoverARB(ser=ConstantRateServer(1.0),
+                           cross_arr=Deconvolve(arr=DM1(lamb=1.2),
+                                                ser=ConstantRateServer(0.5)))
+
+    with NanOnInfeasible():
+        assert isnan(deconvolve.rho(theta=1.5))
+        assert isnan(deconvolve.sigma(theta=1.5))
+        assert isnan(leftover.rho(theta=0.5))
+        assert deconvolve.rho(theta=1.0) == pytest.approx(1.791759469)
+
+    with pytest.raises(ParameterOutOfBounds):
+        deconvolve.rho(theta=1.5)
+
+    with pytest.raises(ParameterOutOfBounds):
+        leftover.rho(theta=0.5)
+
+
+def test_sigma_rho_cache():
+    deconvolve = Deconvolve(arr=DM1(lamb=1.2),
+                            ser=ConstantRateServer(2.0),
+                            indep=True)
+
+    with SigmaRhoCache() as cache:
+        assert deconvolve.sigma(theta=1.0) == pytest.approx(1.671375549)
+        assert deconvolve.sigma(1.0) == pytest.approx(1.671375549)
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+        # the pole of DM1 is at lamb
+        for _ in range(2):
+            with pytest.raises(ParameterOutOfBounds):
+                deconvolve.rho(theta=1.5)
+        assert cache.hits == 2
+
+    assert not cache.values
+
+
+def test_sigma_rho_cache_maxsize():
+    deconvolve = Deconvolve(arr=DM1(lamb=1.2),
+                            ser=ConstantRateServer(2.0),
+                            indep=True)
+
+    with SigmaRhoCache(maxsize=2) as cache:
+        for theta in [0.1, 0.2, 0.3]:
+            deconvolve.rho(theta=theta)
+        assert len(cache.values) == 2
+
+
+def test_sigma_rho_tracer():
+    leftover = LeftoverARB(ser=Deconvolve(arr=DM1(lamb=1.2),
+                                          ser=ConstantRateServer(2.0),
+                                          indep=True),
+                           cross_arr=DM1(lamb=1.0),
+                           indep=True)
+
+    with SigmaRhoTracer() as tracer:
+        for _ in range(3):
+            leftover.rho(theta=0.5)
+
+    report = tracer.report().set_index(["node", "method"])
+    assert report.loc[("LeftoverARB", "rho"), "calls"] == 3
+    assert report.loc[("LeftoverARB/Deconvolve[0]", "rho"), "calls"] == 3
+    assert report.loc[("LeftoverARB", "rho"), "cumulative"] >= report.loc[(
+        "LeftoverARB/Deconvolve[0]", "rho"), "cumulative"]
+
+    stacks = [line.split(" ")[0] for line in tracer.flame_graph().split("\n")
+              if line]
+    assert stacks == [
+        "LeftoverARB.rho;LeftoverARB/Deconvolve[0].rho", "LeftoverARB.rho"
+    ]
+
+    # turned off
+    leftover.rho(theta=0.5)
+    assert tracer.methods[("LeftoverARB", "rho")][0] == 3
@@ -0,0 +1,94 @@
+"""Test of the compiled operator plans."""
+
+import numpy as np
+import pytest
+
+from msob_and_fp.overlapping_tandem_perform import OverlappingTandemPerform
+from msob_and_fp.square_perform import SquarePerform
+from nc_arrivals.markov_modulated import MMOODisc
+from nc_arrivals.qt import DM1
+from nc_operations.arb_scheduling import LeftoverARB
+from nc_operations.operations import Convolve, Deconvolve
+from nc_operations.operator_plan import OperatorPlan
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.single_hop_bound import single_hop_bound
+from nc_server.constant_rate_server import ConstantRateServer
+from utils.exceptions import ParameterOutOfBounds
+from utils.helper_functions import evaluate_elementwise, evaluate_rows
+from utils.perform_parameter import PerformParameter
+
+THETA = np.arange(0.1, 4.0, 0.1)
+
+
+def test_plan_matches_operators():
+    s_e2e = Convolve(ser1=LeftoverARB(ser=ConstantRateServer(rate=3.0),
+                                      cross_arr=DM1(lamb=1.2)),
+                     ser2=LeftoverARB(ser=ConstantRateServer(rate=4.0),
+                                      cross_arr=Deconvolve(
+                                          arr=DM1(lamb=2.0),
+                                          ser=ConstantRateServer(rate=3.0))),
+                     indep=False,
+                     p=1.5)
+
+    sigma, rho = OperatorPlan(root=s_e2e).sigma_rho_array(theta=THETA)
+
+    np.testing.assert_allclose(
+        sigma, evaluate_elementwise(fun=s_e2e.sigma, theta=THETA))
+    np.testing.assert_allclose(rho,
+                               evaluate_elementwise(fun=s_e2e.rho,
+                                                    theta=THETA))
+
+
+@pytest.mark.parametrize("setting", [
+    SquarePerform(arr_list=[DM1(lamb=l) for l in [2.3, 4.5, 1.7, 4.5]],
+                  ser_list=[
+                      ConstantRateServer(rate=r)
+                      for r in [3.6, 6.2, 7.3, 6.2]
+                  ],
+                  perform_param=PerformParameter(
+                      perform_metric=PerformEnum.DELAY_PROB, value=6)),
+    OverlappingTandemPerform(
+        arr_list=[MMOODisc(stay_on=0.6, stay_off=0.4, peak_rate=r)
+                  for r in [0.9, 0.5, 0.7]],
+        ser_list=[ConstantRateServer(rate=r) for r in [3.2, 6.2, 7.3]],
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY,
+                                       value=1e-3))
+])
+def test_setting_bound_arrays(setting):
+    theta, p = np.meshgrid(THETA, np.arange(1.1, 5.0, 0.3))
+    param_array = np.column_stack((theta.ravel(), p.ravel()))
+
+    for bound, bound_array in [
+        (setting.standard_bound, setting.standard_bound_array),
+        (setting.server_bound, setting.server_bound_array),
+        (setting.fp_bound, setting.fp_bound_array),
+    ]:
+        np.testing.assert_allclose(
+            bound_array(param_array),
+            evaluate_rows(fun=bound, param_array=param_array))
+
+
+def test_infeasible_pmoo_case():
+    setting = OverlappingTandemPerform(
+        arr_list=[DM1(lamb=l) for l in [4.0, 4.0, 2.0]],
+        ser_list=[ConstantRateServer(rate=r) for r in [8.0, 3.5, 4.0]],
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=4))
+    s_e2e_1, s_e2e_2 = setting.standard_s_e2e_list(p=5.0)
+
+    # theta * p = 3.0 is beyond the mgf of the third flow in the first case
+    with pytest.raises(ParameterOutOfBounds):
+        single_hop_bound(foi=setting.arr_list[0],
+                         s_e2e=s_e2e_1,
+                         theta=0.6,
+                         perform_param=setting.perform_param)
+
+    res_2 = single_hop_bound(foi=setting.arr_list[0],
+                             s_e2e=s_e2e_2,
+                             theta=0.6,
+                             perform_param=setting.perform_param)
+
+    assert setting.standard_bound(param_list=[0.6, 5.0]) == pytest.approx(
+        res_2)
+    assert setting.standard_bound_array(
+        param_array=np.array([[0.6, 5.0]]))[0] == pytest.approx(res_2)
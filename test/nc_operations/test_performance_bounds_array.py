@@ -0,0 +1,61 @@
+"""Test of the array-valued performance bounds."""
+
+from math import inf
+
+import numpy as np
+import pytest
+
+from nc_arrivals.qt import DM1
+from nc_operations.performance_bounds_array import (backlog_prob_array,
+                                                    delay_prob_array,
+                                                    output_array)
+from nc_server.constant_rate_server import ConstantRateServer
+
+
+def test_backlog_prob_array():
+    assert backlog_prob_array(arr=DM1(lamb=1.2),
+                              ser=ConstantRateServer(2.0),
+                              theta=np.array([1.0, 1.2, 2.0]),
+                              backlog_value=3.0,
+                              indep=True).tolist() == pytest.approx(
+                                  [0.2648413131, inf, inf])
+
+    assert backlog_prob_array(arr=DM1(lamb=1.2),
+                              ser=ConstantRateServer(3.0),
+                              theta=np.array([0.5, 0.5]),
+                              backlog_value=3.0,
+                              indep=False,
+                              p=np.array([2.0, 1.0])).tolist(
+                              ) == pytest.approx([0.4920777142, inf])
+
+
+def test_delay_prob_array():
+    assert delay_prob_array(arr=DM1(lamb=1.2),
+                            ser=ConstantRateServer(3.0),
+                            theta=np.array([1.0, -1.0]),
+                            delay_value=3,
+                            indep=True).tolist() == pytest.approx(
+                                [0.0001759785367, inf])
+
+    assert delay_prob_array(arr=DM1(lamb=1.0),
+                            ser=ConstantRateServer(1.6),
+                            theta=np.array([0.6]),
+                            delay_value=10,
+                            indep=True).tolist() == pytest.approx(
+                                [0.001583639096])
+
+
+def test_output_array():
+    assert output_array(arr=DM1(lamb=1.2),
+                        ser=ConstantRateServer(2.0),
+                        theta=np.array([1.0, 0.0]),
+                        delta_time=3,
+                        indep=True).tolist() == pytest.approx(
+                            [1149.007674, inf])
+
+    assert output_array(arr=DM1(lamb=1.2),
+                        ser=ConstantRateServer(3.0),
+                        theta=np.array([0.5]),
+                        delta_time=3,
+                        indep=False,
+                        p=2.0).tolist() == pytest.approx([32.41173617])
@@ -0,0 +1,101 @@
+"""Test of the analytic gradients of the single hop bounds."""
+
+import pytest
+
+from h_mitigator.fat_cross_perform import FatCrossPerform
+from nc_arrivals.markov_modulated import MMOOFluid
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.performance_bounds_derivative import (
+    single_hop_bound_gradient)
+from nc_operations.single_hop_bound import single_hop_bound
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.optimize import Optimize
+from utils.perform_parameter import PerformParameter
+
+PERFORM_PARAM_LIST = [
+    PerformParameter(perform_metric=PerformEnum.BACKLOG_PROB, value=3.0),
+    PerformParameter(perform_metric=PerformEnum.DELAY_PROB, value=6),
+    PerformParameter(perform_metric=PerformEnum.BACKLOG, value=0.01),
+    PerformParameter(perform_metric=PerformEnum.DELAY, value=0.01),
+    PerformParameter(perform_metric=PerformEnum.OUTPUT, value=4)
+]
+
+
+def finite_differences(fun, param_list: list, h=1e-6) -> list:
+    res = []
+    for i in range(len(param_list)):
+        upper = list(param_list)
+        lower = list(param_list)
+        upper[i] += h
+        lower[i] -= h
+        res.append((fun(upper) - fun(lower)) / (2 * h))
+
+    return res
+
+
+@pytest.mark.parametrize("perform_param", PERFORM_PARAM_LIST)
+def test_single_hop_bound_gradient(perform_param):
+    foi = MMOOFluid(mu=1.2, lamb=2.1, peak_rate=1.5)
+    ser = ConstantRateServer(rate=2.0)
+
+    def bound(param_list: list) -> float:
+        return single_hop_bound(foi=foi,
+                                s_e2e=ser,
+                                theta=param_list[0],
+                                perform_param=perform_param,
+                                indep=False,
+                                p=param_list[1])
+
+    gradient = single_hop_bound_gradient(foi=foi,
+                                         s_e2e=ser,
+                                         theta=0.3,
+                                         perform_param=perform_param,
+                                         indep=False,
+                                         p=2.5)
+
+    assert gradient.tolist() == pytest.approx(
+        finite_differences(fun=bound, param_list=[0.3, 2.5]), rel=1e-5)
+
+
+@pytest.mark.parametrize("perform_param", PERFORM_PARAM_LIST)
+def test_h_mit_bound_gradient(perform_param):
+    setting = FatCrossPerform(arr_list=[
+        MMOOFluid(mu=1.2, lamb=2.1, peak_rate=1.5),
+        MMOOFluid(mu=3.7, lamb=1.5, peak_rate=0.4),
+        MMOOFluid(mu=1.0, lamb=1.0, peak_rate=0.8)
+    ],
+                              ser_list=[
+                                  ConstantRateServer(rate=8.5),
+                                  ConstantRateServer(rate=4.4),
+                                  ConstantRateServer(rate=2.0)
+                              ],
+                              perform_param=perform_param)
+
+    assert setting.h_mit_bound_gradient(
+        param_l_list=[0.2, 2.2, 1.7]).tolist() == pytest.approx(
+            finite_differences(fun=setting.h_mit_bound,
+                               param_list=[0.2, 2.2, 1.7]),
+            rel=1e-5)
+
+
+def test_bfgs_analytic_gradient():
+    setting = FatCrossPerform(
+        arr_list=[DM1(lamb=0.4), DM1(lamb=3.5),
+                  DM1(lamb=1.2)],
+        ser_list=[
+            ConstantRateServer(rate=8.5),
+            ConstantRateServer(rate=4.4),
+            ConstantRateServer(rate=2.0)
+        ],
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=6))
+
+    bfgs_optimizer = Optimize(setting=setting, number_param=1)
+    grid_optimizer = Optimize(setting=setting, number_param=1)
+
+    assert bfgs_optimizer.bfgs(start_list=[0.1]) == pytest.approx(
+        grid_optimizer.grid_search(bound_list=[(0.01, 1.0)], delta=0.001),
+        rel=1e-3)
+    assert bfgs_optimizer.stats.gradients > 0
+    assert bfgs_optimizer.stats.evaluations < 50
@@ -0,0 +1,129 @@
+"""Test of the log-domain performance bounds."""
+
+from math import log
+
+import pytest
+
+from h_mitigator.fat_cross_perform import FatCrossPerform
+from msob_and_fp.optimize_fp_bound import OptimizeFPBound
+from msob_and_fp.optimize_server_bound import OptimizeServerBound
+from msob_and_fp.overlapping_tandem_perform import OverlappingTandemPerform
+from msob_and_fp.square_perform import SquarePerform
+from nc_arrivals.markov_modulated import MMOOFluid
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.single_hop_bound import (single_hop_bound,
+                                            single_hop_log_bound)
+from nc_operations.single_server_perform import SingleServerPerform
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.optimize import Optimize
+from utils.perform_parameter import PerformParameter
+
+PERFORM_PARAM_LIST = [
+    PerformParameter(perform_metric=PerformEnum.BACKLOG_PROB, value=3.0),
+    PerformParameter(perform_metric=PerformEnum.DELAY_PROB, value=4),
+    PerformParameter(perform_metric=PerformEnum.OUTPUT, value=3),
+    PerformParameter(perform_metric=PerformEnum.BACKLOG, value=0.01)
+]
+
+
+@pytest.mark.parametrize("perform_param", PERFORM_PARAM_LIST)
+@pytest.mark.parametrize("geom_series", [True, False])
+def test_single_hop_log_bound(perform_param, geom_series):
+    for foi in [DM1(lamb=1.0), MMOOFluid(mu=1.2, lamb=2.1, peak_rate=1.5)]:
+        for indep, p in [(True, 1.0), (False, 2.5)]:
+            kwargs = dict(foi=foi,
+                          s_e2e=ConstantRateServer(rate=3.0),
+                          theta=0.3,
+                          perform_param=perform_param,
+                          indep=indep,
+                          p=p,
+                          geom_series=geom_series)
+
+            assert single_hop_log_bound(**kwargs) == pytest.approx(
+                log(single_hop_bound(**kwargs)))
+
+
+def test_h_mit_log_bound():
+    setting = FatCrossPerform(
+        arr_list=[DM1(lamb=0.4), DM1(lamb=3.5),
+                  DM1(lamb=1.2)],
+        ser_list=[
+            ConstantRateServer(rate=8.5),
+            ConstantRateServer(rate=4.4),
+            ConstantRateServer(rate=2.0)
+        ],
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=4))
+
+    assert setting.h_mit_log_bound(
+        param_l_list=[0.2, 1.5, 2.0]) == pytest.approx(
+            log(setting.h_mit_bound(param_l_list=[0.2, 1.5, 2.0])))
+
+
+SQUARE = SquarePerform(
+    arr_list=[DM1(lamb=2.3), DM1(lamb=4.5),
+              DM1(lamb=3.9), DM1(lamb=2.7)],
+    ser_list=[
+        ConstantRateServer(rate=4.0),
+        ConstantRateServer(rate=4.0),
+        ConstantRateServer(rate=1.5),
+        ConstantRateServer(rate=1.5)
+    ],
+    perform_param=PERFORM_PARAM_LIST[1])
+
+OVERLAPPING_TANDEM = OverlappingTandemPerform(
+    arr_list=[DM1(lamb=2.3), DM1(lamb=4.5),
+              DM1(lamb=3.9)],
+    ser_list=[
+        ConstantRateServer(rate=4.0),
+        ConstantRateServer(rate=1.5),
+        ConstantRateServer(rate=4.0)
+    ],
+    perform_param=PERFORM_PARAM_LIST[1])
+
+
+@pytest.mark.parametrize("setting, fp_bound_list", [
+    (SQUARE, [(0.05, 1.0), (1.05, 5.0)]),
+    (OVERLAPPING_TANDEM, [(0.05, 1.0)]),
+])
+def test_msob_fp_log_bounds(setting, fp_bound_list):
+    fp_param_list = [0.5, 2.0][:len(fp_bound_list)]
+    assert setting.fp_log_bound(param_list=fp_param_list) == pytest.approx(
+        log(setting.fp_bound(param_list=fp_param_list)))
+    assert setting.server_log_bound(param_list=[0.5]) == pytest.approx(
+        log(setting.server_bound(param_list=[0.5])))
+
+    for optimizer_class, bound_list in [(OptimizeFPBound, fp_bound_list),
+                                        (OptimizeServerBound, [(0.05, 1.0)])
+                                        ]:
+        optimum = optimizer_class(
+            setting_msob_fp=setting,
+            number_param=len(bound_list)).grid_search(bound_list=bound_list,
+                                                      delta=0.05)
+        log_optimum = optimizer_class(
+            setting_msob_fp=setting,
+            number_param=len(bound_list),
+            log_domain=True).grid_search(bound_list=bound_list, delta=0.05)
+
+        assert log_optimum == pytest.approx(log(optimum))
+
+
+def test_log_domain_does_not_underflow():
+    setting = SingleServerPerform(
+        arr_list=[DM1(lamb=1.0)],
+        server=ConstantRateServer(rate=1.6),
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=2000))
+
+    # the bound underflows to 0.0 for most thetas, i.e., any of them is
+    # "optimal"
+    assert Optimize(setting=setting, number_param=1).grid_search(
+        bound_list=[(0.05, 0.99)], delta=0.01) == 0.0
+
+    log_optimizer = Optimize(setting=setting, number_param=1, log_domain=True)
+    log_optimum = log_optimizer.grid_search(bound_list=[(0.05, 0.99)],
+                                            delta=0.01)
+
+    assert log_optimum == pytest.approx(-2045.44, rel=1e-5)
+    assert log_optimizer.opt_x[0] == pytest.approx(0.6417, rel=1e-3)
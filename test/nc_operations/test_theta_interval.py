@@ -0,0 +1,136 @@
+"""Test of the analytic theta interval, the feasibility oracle and the
+searches that use them."""
+
+import numpy as np
+import pytest
+
+from nc_arrivals.ebb import EBB
+from nc_arrivals.markov_modulated import MMOOFluid
+from msob_and_fp.overlapping_tandem_perform import OverlappingTandemPerform
+from msob_and_fp.square_perform import SquarePerform
+from nc_arrivals.qt import DM1, MD1
+from nc_operations import single_server_perform
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.single_server_perform import SingleServerPerform
+from nc_operations.theta_interval import (feasible_theta_interval,
+                                         stability_theta_max)
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.optimize import Optimize
+from utils.perform_parameter import PerformParameter
+
+
+@pytest.mark.parametrize("arr", [
+    DM1(lamb=1.0),
+    MD1(lamb=0.8, mu=1.0),
+    MMOOFluid(mu=0.2, lamb=0.5, peak_rate=2.6),
+])
+def test_interval_ends_at_stability(arr):
+    ser = ConstantRateServer(rate=1.5)
+    theta_min, theta_max = feasible_theta_interval(arr=arr, ser=ser)
+
+    assert theta_min == 0.0
+    assert arr.rho(theta=theta_max) == pytest.approx(ser.rate)
+
+
+def test_unstable_interval_is_empty():
+    assert feasible_theta_interval(arr=DM1(lamb=0.5),
+                                   ser=ConstantRateServer(rate=1.5)) == (0.0,
+                                                                         0.0)
+
+
+@pytest.mark.parametrize("arr", [
+    DM1(lamb=1.0),
+    MD1(lamb=0.8, mu=1.0),
+    EBB(factor_m=1.0, decay=2.0, rho_single=0.5),
+])
+@pytest.mark.parametrize("perform_param", [
+    PerformParameter(perform_metric=PerformEnum.DELAY_PROB, value=6),
+    PerformParameter(perform_metric=PerformEnum.BACKLOG, value=1e-3),
+])
+def test_bounded_theta_search(arr, perform_param):
+    setting = SingleServerPerform(arr_list=[arr],
+                                  server=ConstantRateServer(rate=1.6),
+                                  perform_param=perform_param)
+    optimize = Optimize(setting=setting, number_param=1)
+
+    assert optimize.bounded_theta_search() == pytest.approx(
+        optimize.grid_search(bound_list=[(0.05, 4.0)], delta=0.05), rel=1e-6)
+
+
+def test_zoom_theta_search_uses_theta_start():
+    setting = SingleServerPerform(arr_list=[DM1(lamb=1.0)],
+                                  server=ConstantRateServer(rate=1.6),
+                                  perform_param=PerformParameter(
+                                      perform_metric=PerformEnum.DELAY_PROB,
+                                      value=6))
+    optimize = Optimize(setting=setting, number_param=1)
+    optimize.bounded_theta_search(xatol=1e-8)
+    theta_opt = optimize.opt_x[0]
+
+    optimize.zoom_theta_search(rounds=1)
+    theta_no_start = optimize.opt_x[0]
+
+    # the first grid is finer close to theta_start
+    optimize.zoom_theta_search(rounds=1, theta_start=1.1 * theta_opt)
+    assert abs(optimize.opt_x[0] - theta_opt) < abs(theta_no_start -
+                                                    theta_opt)
+
+    # the optimum is not within (theta_start / 2, 2 * theta_start)
+    optimize.zoom_theta_search(rounds=1, theta_start=theta_opt / 10)
+    assert optimize.opt_x[0] == theta_no_start
+
+
+@pytest.mark.parametrize("setting", [
+    SquarePerform(arr_list=[DM1(lamb=l) for l in [2.3, 4.5, 1.7, 4.5]],
+                  ser_list=[
+                      ConstantRateServer(rate=r)
+                      for r in [3.6, 6.2, 7.3, 6.2]
+                  ],
+                  perform_param=PerformParameter(
+                      perform_metric=PerformEnum.DELAY_PROB, value=4)),
+    OverlappingTandemPerform(
+        arr_list=[DM1(lamb=l) for l in [4.3, 4.5, 3.7]],
+        ser_list=[ConstantRateServer(rate=r) for r in [3.6, 6.2, 7.3]],
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=4))
+])
+def test_pruned_grid_search(setting):
+    theta, p = np.meshgrid(np.arange(0.1, 10.0, 0.2), np.arange(1.1, 10.0,
+                                                                0.2))
+    param_array = np.column_stack((theta.ravel(), p.ravel()))
+    beyond = param_array[:, 0] >= setting.theta_upper_bound(
+        p_array=param_array[:, 1:])
+
+    assert beyond.any()
+    assert np.all(
+        np.isinf(
+            setting.standard_bound_array(param_array=param_array[beyond])))
+
+    optimize = Optimize(setting=setting, number_param=2)
+    bound_list = [(0.1, 10.0), (1.1, 10.0)]
+
+    assert optimize.grid_search(bound_list=bound_list, delta=0.2,
+                                prune=True) == optimize.grid_search(
+                                    bound_list=bound_list, delta=0.2)
+
+
+def test_theta_upper_bound_is_computed_once(monkeypatch):
+    calls = []
+
+    def counted_theta_max(arr, ser):
+        calls.append(arr)
+        return stability_theta_max(arr=arr, ser=ser)
+
+    monkeypatch.setattr(single_server_perform, "stability_theta_max",
+                        counted_theta_max)
+    setting = SingleServerPerform(
+        arr_list=[DM1(lamb=1.0)],
+        server=ConstantRateServer(rate=2.0),
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=6))
+    optimize = Optimize(setting=setting, number_param=1)
+
+    assert optimize.pattern_search(start_list=[0.1],
+                                   prune=True) == optimize.pattern_search(
+                                       start_list=[0.1])
+    assert len(calls) == 1
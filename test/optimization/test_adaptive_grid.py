@@ -0,0 +1,53 @@
+"""Test of the coarse-to-fine grid search."""
+
+import numpy as np
+import pytest
+
+from h_mitigator.fat_cross_perform import FatCrossPerform
+from h_mitigator.optimize_mitigator import OptimizeMitigator
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.adaptive_grid import adaptive_grid
+from utils.perform_parameter import PerformParameter
+
+
+def test_adaptive_grid_equals_fine_grid():
+    ranges = (slice(0.1, 10.0, 0.05), slice(1.1, 10.0, 0.05))
+    evaluations = []
+
+    def fun(param_list: np.ndarray) -> float:
+        evaluations.append(param_list)
+        return (param_list[0] - 2.0)**2 + (param_list[1] - 7.3)**2
+
+    fine_grid = np.reshape(np.mgrid[ranges], (2, -1)).T
+    fine_values = np.array([fun(point) for point in fine_grid])
+    evaluations.clear()
+
+    opt_x, opt_value = adaptive_grid(func=fun, ranges=ranges, polish=False)
+
+    assert opt_value == pytest.approx(fine_values.min())
+    assert opt_x.tolist() == pytest.approx(
+        fine_grid[np.argmin(fine_values)].tolist())
+    assert len(evaluations) < fine_grid.shape[0] / 10
+
+
+def test_adaptive_grid_search_equals_grid_search():
+    setting = FatCrossPerform(
+        arr_list=[DM1(lamb=0.4), DM1(lamb=3.5)],
+        ser_list=[ConstantRateServer(rate=4.5),
+                  ConstantRateServer(rate=0.4)],
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=6))
+    bound_list = [(0.1, 5.0), (0.9, 6.0)]
+
+    grid_optimizer = OptimizeMitigator(setting_h_mit=setting, number_param=2)
+    adaptive_optimizer = OptimizeMitigator(setting_h_mit=setting,
+                                           number_param=2)
+
+    assert adaptive_optimizer.adaptive_grid_search(
+        bound_list=bound_list,
+        delta=0.05) == pytest.approx(
+            grid_optimizer.grid_search(bound_list=bound_list, delta=0.05))
+    assert adaptive_optimizer.stats.evaluations < \
+        grid_optimizer.stats.evaluations / 5
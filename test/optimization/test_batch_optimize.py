@@ -0,0 +1,71 @@
+"""Test of the lock-step optimization of many settings at once."""
+
+import numpy as np
+import pytest
+
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.single_server_perform import SingleServerPerform
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.batch_optimize import BatchOptimize
+from optimization.nelder_mead_parameters import NelderMeadParameters
+from optimization.optimize import Optimize
+from utils.perform_parameter import PerformParameter
+
+DELAY_PROB = PerformParameter(perform_metric=PerformEnum.DELAY_PROB, value=6)
+
+# lambda, rate; the last instance is not stable
+INSTANCE_ARRAY = np.array([[1.0, 2.0], [1.5, 2.5], [0.8, 1.5], [2.0, 3.0],
+                           [1.2, 2.2], [0.5, 1.1], [1.0, 0.5]])
+
+
+def single_server(rows: np.ndarray) -> SingleServerPerform:
+    return SingleServerPerform(arr_list=[DM1(lamb=rows[:, 0])],
+                               server=ConstantRateServer(rate=rows[:, 1]),
+                               perform_param=DELAY_PROB)
+
+
+def optimizer_list():
+    return [
+        Optimize(setting=SingleServerPerform(
+            arr_list=[DM1(lamb=lamb)],
+            server=ConstantRateServer(rate=rate),
+            perform_param=DELAY_PROB),
+                 number_param=1) for lamb, rate in INSTANCE_ARRAY
+    ]
+
+
+def test_batch_pattern_search_equals_pattern_search():
+    expected = [
+        optimizer.pattern_search(start_list=[0.1])
+        for optimizer in optimizer_list()
+    ]
+
+    batch_optimizer = BatchOptimize(setting_factory=single_server,
+                                    instance_array=INSTANCE_ARRAY,
+                                    number_param=1)
+
+    assert batch_optimizer.pattern_search(
+        start_list=[0.1]).tolist() == pytest.approx(expected)
+    assert batch_optimizer.opt_x.shape == (INSTANCE_ARRAY.shape[0], 1)
+    # lock-step, i.e., far fewer calls than instances times iterations
+    assert batch_optimizer.evaluation_calls < 100
+
+
+def test_batch_nelder_mead_equals_nelder_mead_old():
+    simplex = np.array([[0.1], [0.3]])
+
+    # the std of a simplex with an inf value is nan, i.e., it stops
+    with pytest.deprecated_call(), np.errstate(invalid="ignore"):
+        expected = [
+            optimizer.nelder_mead_old(simplex=simplex.copy(),
+                                      nelder_mead_param=NelderMeadParameters())
+            for optimizer in optimizer_list()
+        ]
+
+    batch_optimizer = BatchOptimize(setting_factory=single_server,
+                                    instance_array=INSTANCE_ARRAY,
+                                    number_param=1)
+
+    assert batch_optimizer.nelder_mead(
+        simplex=simplex).tolist() == pytest.approx(expected)
@@ -0,0 +1,68 @@
+"""Test of the multi-start pattern search."""
+
+import numpy as np
+import pytest
+
+from h_mitigator.fat_cross_perform import FatCrossPerform
+from h_mitigator.optimize_mitigator import OptimizeMitigator
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_server.constant_rate_server import ConstantRateServer
+from utils.perform_parameter import PerformParameter
+
+SETTING = FatCrossPerform(arr_list=[DM1(lamb=0.4),
+                                    DM1(lamb=3.5),
+                                    DM1(lamb=1.2)],
+                          ser_list=[
+                              ConstantRateServer(rate=8.5),
+                              ConstantRateServer(rate=4.4),
+                              ConstantRateServer(rate=2.0)
+                          ],
+                          perform_param=PerformParameter(
+                              perform_metric=PerformEnum.DELAY_PROB,
+                              value=6))
+
+BOUND_LIST = [(0.1, 4.0), (0.9, 4.0), (0.9, 4.0)]
+
+
+def test_multi_start_search_equals_grid_search():
+    grid_optimizer = OptimizeMitigator(setting_h_mit=SETTING, number_param=3)
+    multi_start_optimizer = OptimizeMitigator(setting_h_mit=SETTING,
+                                              number_param=3)
+
+    assert multi_start_optimizer.multi_start_search(
+        bound_list=BOUND_LIST,
+        max_evaluations=4000,
+        rng=np.random.default_rng(0)) == pytest.approx(
+            grid_optimizer.grid_search(bound_list=BOUND_LIST, delta=0.1),
+            rel=1e-4)
+
+    # the budget is checked once per iteration of the pattern searches
+    stats = multi_start_optimizer.stats
+    assert stats.evaluations <= 4000 + 8 * 7
+    assert stats.evaluations < grid_optimizer.stats.evaluations / 5
+    assert stats.method_calls["pattern_search"] == 8
+
+
+def test_process_pool_equals_sequential():
+    res = []
+    for processes in [1, 2]:
+        optimizer = OptimizeMitigator(setting_h_mit=SETTING, number_param=3)
+        res.append((optimizer.multi_start_search(
+            bound_list=BOUND_LIST,
+            number_starts=4,
+            max_evaluations=1000,
+            processes=processes,
+            rng=np.random.default_rng(1)), optimizer.opt_x,
+                    optimizer.stats.evaluations))
+
+    assert res[0] == res[1]
+
+
+def test_budget_below_number_starts():
+    optimizer = OptimizeMitigator(setting_h_mit=SETTING, number_param=3)
+
+    with pytest.raises(ValueError):
+        optimizer.multi_start_search(bound_list=BOUND_LIST,
+                                     number_starts=8,
+                                     max_evaluations=7)
@@ -0,0 +1,26 @@
+"""Test of the Nelder-Mead search of the Optimize class."""
+
+import numpy as np
+import pytest
+
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.single_server_perform import SingleServerPerform
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.optimize import Optimize
+from utils.perform_parameter import PerformParameter
+
+
+def test_nelder_mead_starts_at_the_simplex():
+    setting = SingleServerPerform(arr_list=[DM1(lamb=1.0)],
+                                  server=ConstantRateServer(rate=1.6),
+                                  perform_param=PerformParameter(
+                                      perform_metric=PerformEnum.DELAY_PROB,
+                                      value=6))
+    optimize = Optimize(setting=setting, number_param=1)
+
+    # scipy rejects an x0 with the shape (1, number_param)
+    bound = optimize.nelder_mead(simplex=np.array([[0.1], [0.3]]),
+                                 sd_min=1e-10)
+
+    assert bound == pytest.approx(optimize.bounded_theta_search(), rel=1e-6)
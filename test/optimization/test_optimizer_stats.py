@@ -0,0 +1,53 @@
+"""Test of the optimizer instrumentation."""
+
+from math import inf
+
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.single_server_perform import SingleServerPerform
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.optimize import Optimize
+from optimization.optimizer_stats import OptimizerStats
+from utils.perform_parameter import PerformParameter
+
+SETTING = SingleServerPerform(arr_list=[DM1(lamb=1.0)],
+                              server=ConstantRateServer(rate=2.0),
+                              perform_param=PerformParameter(
+                                  perform_metric=PerformEnum.DELAY_PROB,
+                                  value=6))
+
+
+def test_grid_search_stats():
+    optimizer = Optimize(setting=SETTING, number_param=1)
+    bound = optimizer.grid_search(bound_list=[(0.1, 5.0)], delta=0.1)
+    stats = optimizer.stats
+
+    assert stats.method_calls == {"grid_search": 1}
+    assert stats.method_evaluations["grid_search"] == stats.evaluations
+    # the theta beyond the pole of the mgf of DM1 are infeasible, but they
+    # do not raise within the optimizer (see NanOnInfeasible)
+    assert stats.infeasible > 0
+    assert "ParameterOutOfBounds" not in stats.exceptions
+    assert stats.best_value == bound
+    assert stats.trajectory[-1][1] == bound
+    assert [value for _, value in stats.trajectory] == sorted(
+        [value for _, value in stats.trajectory], reverse=True)
+
+
+def test_vectorized_stats_and_callback():
+    improvements = []
+    optimizer = Optimize(setting=SETTING, number_param=1)
+    optimizer.stats = OptimizerStats(
+        callback=lambda param_list, value: improvements.append(value))
+
+    optimizer.grid_search(bound_list=[(0.1, 5.0)],
+                          delta=0.1,
+                          vectorized=True,
+                          prune=True)
+
+    assert optimizer.stats.pruned > 0
+    assert improvements == [value for _, value in optimizer.stats.trajectory]
+
+    optimizer.stats.reset()
+    assert optimizer.stats.evaluations == 0
+    assert optimizer.stats.best_value == inf
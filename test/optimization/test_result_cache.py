@@ -0,0 +1,107 @@
+"""Test of the persistent cache of optimized bounds."""
+
+import sqlite3
+from contextlib import closing
+from math import inf
+
+from h_mitigator.fat_cross_perform import FatCrossPerform
+from h_mitigator.optimize_mitigator import OptimizeMitigator
+from nc_arrivals.qt import DM1
+from nc_operations.perform_enum import PerformEnum
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.optimize import Optimize
+from optimization.result_cache import ResultCache, result_key
+from utils.perform_parameter import PerformParameter
+
+
+def fat_cross(lamb: float) -> FatCrossPerform:
+    return FatCrossPerform(
+        arr_list=[DM1(lamb=lamb), DM1(lamb=8.0)],
+        ser_list=[ConstantRateServer(rate=8.0),
+                  ConstantRateServer(rate=0.2)],
+        perform_param=PerformParameter(perform_metric=PerformEnum.DELAY_PROB,
+                                       value=6))
+
+
+def test_key_depends_on_content():
+    key = result_key(Optimize(setting=fat_cross(lamb=0.2), number_param=1),
+                     "grid_search",
+                     bound_list=[(0.1, 10.0)],
+                     delta=0.1)
+
+    assert key == result_key(
+        Optimize(setting=fat_cross(lamb=0.2), number_param=1),
+        "grid_search",
+        bound_list=[(0.1, 10.0)],
+        delta=0.1)
+    assert key != result_key(
+        Optimize(setting=fat_cross(lamb=0.3), number_param=1),
+        "grid_search",
+        bound_list=[(0.1, 10.0)],
+        delta=0.1)
+    assert key != result_key(
+        OptimizeMitigator(setting_h_mit=fat_cross(lamb=0.2), number_param=1),
+        "grid_search",
+        bound_list=[(0.1, 10.0)],
+        delta=0.1)
+
+
+def test_rerun_is_a_hit(tmp_path):
+    path = str(tmp_path / "bounds.sqlite")
+    optimizer = Optimize(setting=fat_cross(lamb=0.2), number_param=1)
+
+    with ResultCache(path) as cache:
+        bound = cache.optimize(optimizer,
+                               "grid_search",
+                               bound_list=[(0.1, 10.0)],
+                               delta=0.1)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+    with ResultCache(path) as cache:
+        assert cache.optimize(optimizer,
+                              "grid_search",
+                              bound_list=[(0.1, 10.0)],
+                              delta=0.1) == bound
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    with ResultCache(str(tmp_path / "bounds.sqlite"), maxsize=2) as cache:
+        cache.put(key="a", value=1.0)
+        cache.put(key="b", value=inf)
+        assert cache.get(key="a") == 1.0
+
+        cache.put(key="c", value=3.0)
+
+        assert len(cache) == 2
+        assert cache.get(key="b") is None
+        assert cache.get(key="c") == 3.0
+
+
+def test_commits_are_batched(tmp_path):
+    path = str(tmp_path / "bounds.sqlite")
+
+    cache = ResultCache(path, maxsize=3)
+    for key in ["a", "b", "c", "d"]:
+        cache.put(key=key, value=1.0)
+
+    # nothing is committed before close
+    with closing(sqlite3.connect(path)) as connection:
+        assert connection.execute(
+            "SELECT COUNT(*) FROM results").fetchone()[0] == 0
+    cache.close()
+
+    with ResultCache(path, maxsize=3) as cache:
+        assert len(cache) == 3
+        assert "results_last_used" in str(
+            cache.connection.execute(
+                "EXPLAIN QUERY PLAN SELECT key FROM results "
+                "ORDER BY last_used LIMIT 1").fetchall())
+
+        # the order of use continues across sessions
+        assert cache.get(key="b") == 1.0
+        cache.put(key="e", value=2.0)
+
+        assert cache.get(key="a") is None
+        assert cache.get(key="c") is None
+        assert cache.get(key="b") == 1.0
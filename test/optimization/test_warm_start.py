@@ -0,0 +1,55 @@
+"""Test of the warm-started optimization along a sweep."""
+
+import pytest
+
+from nc_arrivals.qt import MD1
+from nc_operations.perform_enum import PerformEnum
+from nc_operations.single_server_perform import SingleServerPerform
+from nc_server.constant_rate_server import ConstantRateServer
+from optimization.optimize import Optimize
+from optimization.warm_start import (shrink_bound_list, warm_grid_search_sweep,
+                                     warm_pattern_search_sweep)
+from utils.perform_param_list import PerformParamList
+
+DELAY_LIST = PerformParamList(perform_metric=PerformEnum.DELAY_PROB,
+                              values_list=range(15, 25))
+
+
+def optimizer_list():
+    return [
+        Optimize(setting=SingleServerPerform(
+            arr_list=[MD1(lamb=0.8, mu=1.0)],
+            server=ConstantRateServer(rate=1.0),
+            perform_param=DELAY_LIST.get_parameter_at_i(i)),
+                 number_param=1) for i in range(len(DELAY_LIST))
+    ]
+
+
+def test_shrink_bound_list():
+    assert shrink_bound_list(bound_list=[(0.0, 10.0), (1.0, 3.0)],
+                             center=[0.2, 2.0],
+                             shrink=0.5) == [(0.0, 2.7), (1.5, 2.5)]
+
+
+def test_warm_grid_search_equals_cold():
+    cold = [
+        optimizer.grid_search(bound_list=[(0.1, 4.0)], delta=0.1)
+        for optimizer in optimizer_list()
+    ]
+    warm, opt_x_list = warm_grid_search_sweep(optimizer_list=optimizer_list(),
+                                              bound_list=[(0.1, 4.0)],
+                                              delta=0.1)
+
+    assert warm == pytest.approx(cold, rel=1e-5)
+    assert all(len(opt_x) == 1 for opt_x in opt_x_list)
+
+
+def test_warm_pattern_search_equals_cold():
+    cold = [
+        optimizer.pattern_search(start_list=[0.5], delta=3.0, delta_min=0.01)
+        for optimizer in optimizer_list()
+    ]
+    warm, _ = warm_pattern_search_sweep(optimizer_list=optimizer_list(),
+                                        start_list=[0.5])
+
+    assert warm == pytest.approx(cold, rel=1e-3)